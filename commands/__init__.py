@@ -4,7 +4,13 @@ Contains split command classes organized by domain for better maintainability
 """
 
 from .project_commands import CleanupProjectCommand, ArchiveProjectCommand
-from .docker_commands import DockerBuildAndTestCommand, BuildDockerFilesCommand
+from .docker_commands import (
+    DockerBuildAndTestCommand,
+    DockerBuildAndTestAllCommand,
+    TestHistoryReportCommand,
+    ImageGcCommand,
+    BuildDockerFilesCommand,
+)
 from .git_commands import GitViewCommand, GitCheckoutAllCommand
 from .sync_commands import SyncRunTestsCommand
 from .validation_commands import ValidateProjectGroupCommand
@@ -13,6 +19,9 @@ __all__ = [
     "CleanupProjectCommand",
     "ArchiveProjectCommand",
     "DockerBuildAndTestCommand",
+    "DockerBuildAndTestAllCommand",
+    "TestHistoryReportCommand",
+    "ImageGcCommand",
     "BuildDockerFilesCommand",
     "GitViewCommand",
     "GitCheckoutAllCommand",
@@ -4,11 +4,16 @@ Handles Docker build, test, and file generation operations
 """
 
 import asyncio
+from dataclasses import asdict
 from typing import Dict, Any
 
 from utils.async_base import AsyncCommand, AsyncResult, ProcessError
 from models.project import Project
 from services.project_group_service import ProjectGroup
+from services.docker_service import docker_tag_for
+from services.image_gc import format_gc_report, image_gc
+from services.test_history import format_history_report, get_test_history
+from utils.async_utils import run_in_executor
 from config.config import get_config
 
 COLORS = get_config().gui.colors
@@ -21,7 +26,7 @@ class DockerBuildAndTestCommand(AsyncCommand):
         super().__init__(**kwargs)
         self.project = project
         self.docker_service = docker_service
-        self.docker_tag = f"{self.project.parent}_{self.project.name}".lower()
+        self.docker_tag = docker_tag_for(project)
         self.window = window
         self.terminal_window = None
 
@@ -36,7 +41,9 @@ class DockerBuildAndTestCommand(AsyncCommand):
             # Create terminal window immediately (before starting operation)
             def create_window():
                 self.terminal_window = TerminalOutputWindow(
-                    self.window, f"Docker Build & Test - {self.project.name}"
+                    self.window,
+                    f"Docker Build & Test - {self.project.name}",
+                    output_channel=self.output_channel,
                 )
                 self.terminal_window.create_window()
                 self.terminal_window.update_status(
@@ -131,6 +138,258 @@ class DockerBuildAndTestCommand(AsyncCommand):
             )
 
 
+class DockerBuildAndTestAllCommand(AsyncCommand):
+    """Build and test all versions of a project group concurrently in one window"""
+
+    def __init__(
+        self, project_group: ProjectGroup, docker_service, window=None, **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.project_group = project_group
+        self.docker_service = docker_service
+        self.window = window
+        self.terminal_window = None
+
+    async def execute(self) -> AsyncResult[Dict[str, Any]]:
+        """Run build and test for every version, then show the pass/fail matrix"""
+        try:
+            # Import here to avoid circular imports
+            from gui import TerminalOutputWindow
+
+            versions = self.project_group.get_all_versions()
+            if not versions:
+                return AsyncResult.error_result(
+                    ProcessError("No project versions found", error_code="NO_VERSIONS")
+                )
+
+            max_parallel = get_config().service.max_parallel_builds
+            self._update_progress(
+                f"Building and testing {len(versions)} versions of "
+                f"{self.project_group.name}...",
+                "info",
+            )
+
+            def create_window():
+                self.terminal_window = TerminalOutputWindow(
+                    self.window,
+                    f"Docker Build & Test All - {self.project_group.name}",
+                    output_channel=self.output_channel,
+                )
+                self.terminal_window.create_window()
+                self.terminal_window.update_status(
+                    f"Building {len(versions)} versions...", COLORS["warning"]
+                )
+
+            if self.window:
+                self.window.after(0, create_window)
+                await asyncio.sleep(0.1)  # Wait for window creation
+
+            def streaming_output_callback(message: str):
+                if self.terminal_window:
+                    self.terminal_window.append_output(message)
+
+            def streaming_status_callback(status: str, color: str):
+                if self.terminal_window:
+                    self.terminal_window.update_status(status, color)
+
+            streaming_output_callback(
+                f"Building and testing {len(versions)} versions, "
+                f"{max_parallel} at a time\n\n"
+            )
+
+            result = await self.docker_service.build_and_test_group(
+                versions,
+                max_parallel=max_parallel,
+                progress_callback=streaming_output_callback,
+                status_callback=streaming_status_callback,
+            )
+
+            if result.is_error:
+                if self.terminal_window:
+                    self.terminal_window.update_status(
+                        "Build and test failed", COLORS["error"]
+                    )
+                    self.terminal_window.append_output(f"\n❌ {result.error.message}\n")
+                return AsyncResult.error_result(result.error)
+
+            matrix = (result.metadata or {}).get("matrix", "")
+            if self.terminal_window:
+                self.terminal_window.append_output(
+                    f"\n=== RESULTS ===\n{matrix}\n{result.message}\n"
+                )
+                self.terminal_window.update_status(
+                    result.message,
+                    COLORS["warning"] if result.is_partial else COLORS["success"],
+                )
+
+            if self.terminal_window and self.window:
+
+                def add_buttons():
+                    if self.terminal_window.text_area:
+                        full_output = self.terminal_window.text_area.get(
+                            "1.0", "end-1c"
+                        )
+                        self.terminal_window.add_final_buttons(copy_text=full_output)
+
+                self.window.after(0, add_buttons)
+
+            result_data = {
+                "message": result.message,
+                "project_group_name": self.project_group.name,
+                "results": [asdict(outcome) for outcome in result.data],
+                "matrix": matrix,
+                "terminal_created": self.terminal_window is not None,
+            }
+            self._update_progress(
+                result.message, "warning" if result.is_partial else "success"
+            )
+
+            if result.is_partial:
+                return AsyncResult.partial_result(result_data, result.error)
+            return AsyncResult.success_result(result_data)
+
+        except Exception as e:
+            self.logger.exception(
+                f"Docker build and test all failed for {self.project_group.name}"
+            )
+            if self.terminal_window:
+                self.terminal_window.update_status("Error occurred", COLORS["error"])
+                self.terminal_window.append_output(f"\n❌ Error: {str(e)}\n")
+
+            return AsyncResult.error_result(
+                ProcessError(
+                    f"Docker build and test all failed: {str(e)}",
+                    error_code="DOCKER_ERROR",
+                )
+            )
+
+
+class TestHistoryReportCommand(AsyncCommand):
+    """Show recorded test runs of a project group: slowest, slower and flaky tests"""
+
+    __test__ = False  # Not a pytest test class
+
+    def __init__(self, project_group: ProjectGroup, window=None, **kwargs):
+        super().__init__(**kwargs)
+        self.project_group = project_group
+        self.window = window
+        self.terminal_window = None
+
+    async def execute(self) -> AsyncResult[Dict[str, Any]]:
+        """Build the report from the test history and show it in a window"""
+        try:
+            # Import here to avoid circular imports
+            from gui import TerminalOutputWindow
+
+            self._update_progress(
+                f"Loading test history of {self.project_group.name}...", "info"
+            )
+
+            # Versions are ordered by alias, so pre-edit comes first
+            versions = [p.parent for p in self.project_group.get_all_versions()]
+            base_version = versions[0] if versions else "pre-edit"
+            report = await run_in_executor(
+                format_history_report,
+                get_test_history(),
+                self.project_group.name,
+                base_version,
+                tuple(versions[1:]),
+            )
+
+            def create_window():
+                self.terminal_window = TerminalOutputWindow(
+                    self.window,
+                    f"Test History - {self.project_group.name}",
+                    output_channel=self.output_channel,
+                )
+                self.terminal_window.create_window()
+                self.terminal_window.update_status(
+                    "Test history loaded", COLORS["success"]
+                )
+                self.terminal_window.append_output(report)
+                self.terminal_window.add_final_buttons(copy_text=report)
+
+            if self.window:
+                self.window.after(0, create_window)
+                await asyncio.sleep(0.1)  # Wait for window creation
+
+            self._update_progress("Test history loaded", "success")
+            return AsyncResult.success_result(
+                {
+                    "message": f"Test history of {self.project_group.name}",
+                    "project_group_name": self.project_group.name,
+                    "report": report,
+                    "terminal_created": self.terminal_window is not None,
+                }
+            )
+
+        except Exception as e:
+            self.logger.exception(
+                f"Test history report failed for {self.project_group.name}"
+            )
+            return AsyncResult.error_result(
+                ProcessError(
+                    f"Test history report failed: {str(e)}",
+                    error_code="TEST_HISTORY_ERROR",
+                )
+            )
+
+
+class ImageGcCommand(AsyncCommand):
+    """Remove least recently used project images beyond the disk budget"""
+
+    def __init__(self, window=None, **kwargs):
+        super().__init__(**kwargs)
+        self.window = window
+        self.terminal_window = None
+
+    async def execute(self) -> AsyncResult[Dict[str, Any]]:
+        """Collect the images now and show what was removed in a window"""
+        try:
+            # Import here to avoid circular imports
+            from gui import TerminalOutputWindow
+
+            self._update_progress("Cleaning up project images...", "info")
+            report = await image_gc.collect()
+            text = format_gc_report(report)
+            status = "Images cleaned up" if not report.failed else "Some images kept"
+            color = COLORS["success"] if not report.failed else COLORS["warning"]
+
+            def create_window():
+                self.terminal_window = TerminalOutputWindow(
+                    self.window, "Clean Images", output_channel=self.output_channel
+                )
+                self.terminal_window.create_window()
+                self.terminal_window.update_status(status, color)
+                self.terminal_window.append_output(text)
+                self.terminal_window.add_final_buttons(copy_text=text)
+
+            if self.window:
+                self.window.after(0, create_window)
+                await asyncio.sleep(0.1)  # Wait for window creation
+
+            self._update_progress(status, "success")
+            return AsyncResult.success_result(
+                {
+                    "message": status,
+                    "removed": report.removed,
+                    "freed_bytes": report.freed_bytes,
+                    "failed": report.failed,
+                    "report": text,
+                    "terminal_created": self.terminal_window is not None,
+                }
+            )
+
+        except Exception as e:
+            self.logger.exception("Image cleanup failed")
+            return AsyncResult.error_result(
+                ProcessError(
+                    f"Image cleanup failed: {str(e)}",
+                    error_code="IMAGE_GC_ERROR",
+                )
+            )
+
+
 class BuildDockerFilesCommand(AsyncCommand):
     """Standardized command for building Docker files with complex file generation"""
 
@@ -176,6 +435,7 @@ class BuildDockerFilesCommand(AsyncCommand):
                 self.terminal_window = TerminalOutputWindow(
                     self.window,
                     f"Build Docker Files - {self.project_group.name} (Removing existing)",
+                    output_channel=self.output_channel,
                 )
                 self.terminal_window.create_window()
                 self.terminal_window.update_status(
@@ -313,7 +573,9 @@ class BuildDockerFilesCommand(AsyncCommand):
 
                 def create_window():
                     self.terminal_window = TerminalOutputWindow(
-                        self.window, f"Build Docker Files - {self.project_group.name}"
+                        self.window,
+                        f"Build Docker Files - {self.project_group.name}",
+                        output_channel=self.output_channel,
                     )
                     self.terminal_window.create_window()
                     self.terminal_window.update_status(
@@ -10,10 +10,19 @@ from utils.async_base import AsyncCommand, AsyncResult, ProcessError
 from models.project import Project
 from services.project_group_service import ProjectGroup
 from config.config import get_config
+from services.git_fetch_scheduler import fetch_scheduler, format_fetch_age
 
 COLORS = get_config().gui.colors
 
 
+def fetch_age_note(fetch_result) -> str:
+    """Status suffix saying how old the fetched data is, e.g. " - fetched 8 s ago" """
+    if not fetch_result.is_success:
+        return ""
+    age = (fetch_result.metadata or {}).get("age")
+    return f" - {format_fetch_age(age)}" if age is not None else ""
+
+
 class GitViewCommand(AsyncCommand):
     """Standardized command for Git operations with real-time window coordination"""
 
@@ -70,9 +79,10 @@ class GitViewCommand(AsyncCommand):
 
             self._update_progress("Fetching latest commits...", "info")
 
-            # Fetch latest commits
+            # Fetch latest commits, unless a (background) fetch was recent
+            fetch_scheduler.note_viewed([self.project.path])
             fetch_result = await self.git_service.fetch_latest_commits(
-                self.project.path
+                self.project.path, max_age=get_config().service.git_fetch_max_age
             )
 
             fetch_success = fetch_result.is_success
@@ -95,15 +105,42 @@ class GitViewCommand(AsyncCommand):
 
             # Get current repository information (including current commit)
             repo_info_result = await self.git_service.get_repository_info(
-                self.project.path
+                self.project.path, detailed=False
             )
             current_commit_hash = None
             if repo_info_result.is_success:
                 current_commit_hash = repo_info_result.data.current_commit
                 self._update_progress(f"Current commit: {current_commit_hash}", "info")
 
-            # Get commits
-            commits_result = await self.git_service.get_git_commits(self.project.path)
+            # Stream commits: the first page is shown as soon as it is read and
+            # source branches are filled in as they are attributed
+            streamed_pages = 0
+
+            def show_page(page):
+                nonlocal streamed_pages
+                if not self.git_window:
+                    return
+                if page.kind == "commits":
+                    if streamed_pages == 0:
+                        self._on_gui(
+                            self.git_window.update_with_commits,
+                            list(page.commits),
+                            current_commit_hash,
+                        )
+                    else:
+                        self._on_gui(self.git_window.append_commits, page.commits)
+                    if not page.done:
+                        self._on_gui(
+                            self.git_window.update_status,
+                            f"Loading commits... {page.total} so far",
+                        )
+                else:
+                    self._on_gui(self.git_window.refresh_commits, page.commits)
+                streamed_pages += 1
+
+            commits_result = await self.git_service.get_git_commits(
+                self.project.path, on_page=show_page
+            )
 
             if commits_result.is_error:
                 error_msg = commits_result.error.message
@@ -128,11 +165,16 @@ class GitViewCommand(AsyncCommand):
 
             # Update window with commits and current commit hash
             if self.git_window:
-                self.git_window.update_with_commits(commits, current_commit_hash)
                 status_text = f"Loaded all {len(commits)} commits from repository"
                 if current_commit_hash:
                     status_text += f" (current: {current_commit_hash})"
-                self.git_window.update_status(status_text)
+                status_text += fetch_age_note(fetch_result)
+                if streamed_pages:
+                    # Queue behind the page updates so they cannot overwrite it
+                    self._on_gui(self.git_window.update_status, status_text)
+                else:
+                    self.git_window.update_with_commits(commits, current_commit_hash)
+                    self.git_window.update_status(status_text)
 
             result_data = {
                 "message": f"Git information loaded for {self.project.name}",
@@ -162,6 +204,13 @@ class GitViewCommand(AsyncCommand):
                 ProcessError(f"Git operation failed: {str(e)}", error_code="GIT_ERROR")
             )
 
+    def _on_gui(self, func, *args):
+        """Run a git window update on the Tk thread, in call order"""
+        if self.window:
+            self.window.after(0, func, *args)
+        else:
+            func(*args)
+
 
 class GitCheckoutAllCommand(AsyncCommand):
     """Standardized command for Git checkout operations across all project versions"""
@@ -225,9 +274,12 @@ class GitCheckoutAllCommand(AsyncCommand):
 
             self._update_progress("Fetching latest commits...", "info")
 
-            # Fetch latest commits from the representative project
+            # Fetch latest commits from the representative project, unless a
+            # (background) fetch was recent
+            fetch_scheduler.note_viewed(version.path for version in all_versions)
             fetch_result = await self.git_service.fetch_latest_commits(
-                representative_project.path
+                representative_project.path,
+                max_age=get_config().service.git_fetch_max_age,
             )
 
             fetch_success = fetch_result.is_success
@@ -278,6 +330,7 @@ class GitCheckoutAllCommand(AsyncCommand):
                 self.git_window.update_with_commits(commits)
                 self.git_window.update_status(
                     f"Loaded all {len(commits)} commits. Ready to checkout to {len(all_versions)} versions."
+                    + fetch_age_note(fetch_result)
                 )
 
             result_data = {
@@ -346,7 +399,9 @@ class GitCheckoutAllCommand(AsyncCommand):
 
                 # Create terminal window for showing progress
                 terminal_window = TerminalOutputWindow(
-                    self.window, f"Git Checkout All - {self.project_group.name}"
+                    self.window,
+                    f"Git Checkout All - {self.project_group.name}",
+                    output_channel=self.output_channel,
                 )
                 terminal_window.create_window()
                 terminal_window.update_status(
@@ -364,136 +419,61 @@ class GitCheckoutAllCommand(AsyncCommand):
                 successful_checkouts = []
                 failed_checkouts = []
 
-                # Checkout each version
-                for i, project in enumerate(all_versions):
-                    terminal_window.update_status(
-                        f"Processing {project.parent}/{project.name} ({i+1}/{len(all_versions)})",
-                        COLORS["warning"],
-                    )
-                    terminal_window.append_output(
-                        f"📁 Processing {project.parent}/{project.name}...\n"
-                    )
-
-                    # First, fetch the latest commits to ensure this version knows about the target commit
-                    terminal_window.append_output(f"   🔄 Fetching latest commits...\n")
-                    fetch_result = await self.git_service.fetch_latest_commits(
-                        project.path
+                if get_config().service.parallel_git_checkout and len(all_versions) > 1:
+                    await self._checkout_versions_parallel(
+                        commit_hash,
+                        all_versions,
+                        terminal_window,
+                        successful_checkouts,
+                        failed_checkouts,
                     )
-
-                    if fetch_result.is_success:
-                        terminal_window.append_output(f"   ✅ Fetch completed\n")
-                    else:
-                        # Fetch failed, but we can still try to checkout if it's a local commit
-                        fetch_error = (
-                            fetch_result.error.message
-                            if fetch_result.error
-                            else "Unknown fetch error"
+                else:
+                    # Checkout each version
+                    for i, project in enumerate(all_versions):
+                        terminal_window.update_status(
+                            f"Processing {project.parent}/{project.name} ({i+1}/{len(all_versions)})",
+                            COLORS["warning"],
+                        )
+                        terminal_window.append_output(
+                            f"📁 Processing {project.parent}/{project.name}...\n"
                         )
-                        if "No remote repository" in fetch_error:
-                            terminal_window.append_output(
-                                f"   ℹ️  No remote configured, proceeding with local commits\n"
-                            )
-                        else:
-                            terminal_window.append_output(
-                                f"   ⚠️  Fetch failed: {fetch_error}\n"
-                            )
-                            terminal_window.append_output(
-                                f"   ℹ️  Attempting checkout with existing commits...\n"
-                            )
 
-                    # Now perform the checkout
-                    terminal_window.append_output(
-                        f"   🔀 Checking out to {commit_hash}...\n"
-                    )
-                    checkout_result = await self.git_service.checkout_commit(
-                        project.path, commit_hash
-                    )
-                    success = checkout_result.is_success
-                    message = checkout_result.message or (
-                        checkout_result.error.message
-                        if checkout_result.error
-                        else "Unknown error"
-                    )
+                        # First, fetch the latest commits to ensure this version knows about the target commit
+                        terminal_window.append_output(
+                            f"   🔄 Fetching latest commits...\n"
+                        )
+                        fetch_result = await self.git_service.fetch_latest_commits(
+                            project.path
+                        )
+                        self._report_fetch_result(fetch_result, terminal_window)
 
-                    if success:
-                        terminal_window.append_output(f"   ✅ {message}\n")
-                        successful_checkouts.append(f"{project.parent}/{project.name}")
-                    else:
-                        # Check if the error is due to unknown commit (after fetch failure)
+                        # Now perform the checkout
+                        terminal_window.append_output(
+                            f"   🔀 Checking out to {commit_hash}...\n"
+                        )
+                        checkout_result = await self.git_service.checkout_commit(
+                            project.path, commit_hash
+                        )
+                        blocked_message = self._record_checkout_result(
+                            project,
+                            commit_hash,
+                            checkout_result,
+                            terminal_window,
+                            successful_checkouts,
+                            failed_checkouts,
+                        )
                         if (
-                            "pathspec" in message.lower()
-                            and "did not match" in message.lower()
-                        ):
-                            terminal_window.append_output(
-                                f"   ❌ Commit {commit_hash} not found in this version\n"
-                            )
-                            failed_checkouts.append(
-                                f"{project.parent}/{project.name} (commit not found)"
+                            blocked_message is not None
+                            and not await self._resolve_local_changes(
+                                project,
+                                commit_hash,
+                                blocked_message,
+                                terminal_window,
+                                successful_checkouts,
+                                failed_checkouts,
                             )
-                        # Check if the error is due to local changes
-                        elif (
-                            "would be overwritten" in message
-                            or "local changes" in message.lower()
                         ):
-                            # Ask if user wants to force checkout for this specific version
-                            force_response = messagebox.askyesnocancel(
-                                "Local Changes Detected",
-                                f"Cannot checkout {project.parent}/{project.name} because local changes would be overwritten:\n\n"
-                                f"{message}\n\n"
-                                f"Would you like to discard changes and force checkout for this version?\n\n"
-                                f"• Yes: Force checkout this version\n"
-                                f"• No: Skip this version\n"
-                                f"• Cancel: Stop all checkouts",
-                            )
-
-                            if force_response is True:  # Yes - force checkout
-                                terminal_window.append_output(
-                                    f"   ⚠️  Forcing checkout (discarding local changes)...\n"
-                                )
-                                force_result = (
-                                    await self.git_service.force_checkout_commit(
-                                        project.path, commit_hash
-                                    )
-                                )
-                                force_success = force_result.is_success
-                                force_message = force_result.message or (
-                                    force_result.error.message
-                                    if force_result.error
-                                    else "Unknown error"
-                                )
-
-                                if force_success:
-                                    terminal_window.append_output(
-                                        f"   ✅ {force_message}\n"
-                                    )
-                                    successful_checkouts.append(
-                                        f"{project.parent}/{project.name}"
-                                    )
-                                else:
-                                    terminal_window.append_output(
-                                        f"   ❌ Force checkout failed: {force_message}\n"
-                                    )
-                                    failed_checkouts.append(
-                                        f"{project.parent}/{project.name} (force failed: {force_message})"
-                                    )
-                            elif force_response is False:  # No - skip
-                                terminal_window.append_output(
-                                    f"   ⏭️  Skipped (preserving local changes)\n"
-                                )
-                                failed_checkouts.append(
-                                    f"{project.parent}/{project.name} (skipped: local changes)"
-                                )
-                            else:  # Cancel - stop all
-                                terminal_window.append_output(
-                                    f"   🛑 Checkout cancelled by user\n"
-                                )
-                                break
-                        else:
-                            # Some other git error
-                            terminal_window.append_output(f"   ❌ {message}\n")
-                            failed_checkouts.append(
-                                f"{project.parent}/{project.name} ({message})"
-                            )
+                            break
 
                 # Final summary
                 terminal_window.append_output("\n" + "=" * 50 + "\n")
@@ -580,3 +560,250 @@ class GitCheckoutAllCommand(AsyncCommand):
             checkout_all_async(),
             task_name=f"checkout-all-{self.project_group.name}-{commit_hash[:8]}",
         )
+
+    async def _checkout_versions_parallel(
+        self,
+        commit_hash: str,
+        all_versions,
+        terminal_window,
+        successful_checkouts: list,
+        failed_checkouts: list,
+    ):
+        """
+        Fetch once per remote URL and check versions out concurrently with
+        bounded parallelism. The other clones of a remote update from the
+        clone that fetched. Versions blocked by local changes are offered a
+        force checkout afterwards, one at a time.
+        """
+        max_parallel = max(1, get_config().service.max_parallel_checkouts)
+        semaphore = asyncio.Semaphore(max_parallel)
+        loop = asyncio.get_running_loop()
+        names = {
+            project.path: f"{project.parent}/{project.name}" for project in all_versions
+        }
+
+        # The first version of each remote group does the network fetch
+        groups = await self.git_service.group_by_remote(
+            [project.path for project in all_versions]
+        )
+        leader_of = {}
+        leader_fetches = {}
+        for group in groups:
+            leader_fetches[group[0]] = loop.create_future()
+            for path in group[1:]:
+                leader_of[path] = group[0]
+
+        terminal_window.append_output(
+            f"⚡ Parallel checkout: {len(all_versions) - len(leader_of)} fetch(es), "
+            f"up to {max_parallel} versions at a time\n\n"
+        )
+        finished = 0
+
+        async def process(project):
+            nonlocal finished
+            prefix = f"   [{names[project.path]}] "
+            leader = leader_of.get(project.path)
+            # Wait outside the semaphore so the leader can always get a slot
+            leader_result = await leader_fetches[leader] if leader else None
+
+            async with semaphore:
+                fetch_result = None
+                try:
+                    if leader is None:
+                        terminal_window.append_output(
+                            f"{prefix}🔄 Fetching latest commits...\n"
+                        )
+                        fetch_result = await self.git_service.fetch_latest_commits(
+                            project.path
+                        )
+                    elif leader_result.is_success:
+                        terminal_window.append_output(
+                            f"{prefix}🔄 Updating from {names[leader]} (shared fetch)...\n"
+                        )
+                        fetch_result = await self.git_service.fetch_from_clone(
+                            project.path, leader
+                        )
+                    else:
+                        fetch_result = leader_result
+                finally:
+                    own_fetch = leader_fetches.get(project.path)
+                    if own_fetch is not None and not own_fetch.done():
+                        own_fetch.set_result(
+                            fetch_result
+                            or AsyncResult.error_result(
+                                ProcessError("Fetch did not complete")
+                            )
+                        )
+
+                self._report_fetch_result(fetch_result, terminal_window, prefix)
+                terminal_window.append_output(
+                    f"{prefix}🔀 Checking out to {commit_hash}...\n"
+                )
+                checkout_result = await self.git_service.checkout_commit(
+                    project.path, commit_hash
+                )
+
+            finished += 1
+            terminal_window.update_status(
+                f"Checked out {finished}/{len(all_versions)} versions",
+                COLORS["warning"],
+            )
+            return checkout_result
+
+        async def process_safely(project):
+            try:
+                return await process(project)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.exception(f"Checkout failed for {names[project.path]}")
+                return AsyncResult.error_result(ProcessError(str(e)))
+
+        results = await asyncio.gather(
+            *(process_safely(project) for project in all_versions)
+        )
+
+        terminal_window.append_output("\n")
+        blocked = []
+        for project, checkout_result in zip(all_versions, results):
+            prefix = f"   [{names[project.path]}] "
+            blocked_message = self._record_checkout_result(
+                project,
+                commit_hash,
+                checkout_result,
+                terminal_window,
+                successful_checkouts,
+                failed_checkouts,
+                prefix,
+            )
+            if blocked_message is not None:
+                blocked.append((project, blocked_message, prefix))
+
+        for project, message, prefix in blocked:
+            if not await self._resolve_local_changes(
+                project,
+                commit_hash,
+                message,
+                terminal_window,
+                successful_checkouts,
+                failed_checkouts,
+                prefix,
+            ):
+                break
+
+    @staticmethod
+    def _report_fetch_result(fetch_result, terminal_window, prefix: str = "   "):
+        """Write the outcome of a version's fetch to the terminal window"""
+        if fetch_result.is_success:
+            terminal_window.append_output(f"{prefix}✅ Fetch completed\n")
+            return
+
+        # Fetch failed, but we can still try to checkout if it's a local commit
+        fetch_error = (
+            fetch_result.error.message if fetch_result.error else "Unknown fetch error"
+        )
+        if "No remote repository" in fetch_error:
+            terminal_window.append_output(
+                f"{prefix}ℹ️  No remote configured, proceeding with local commits\n"
+            )
+        else:
+            terminal_window.append_output(f"{prefix}⚠️  Fetch failed: {fetch_error}\n")
+            terminal_window.append_output(
+                f"{prefix}ℹ️  Attempting checkout with existing commits...\n"
+            )
+
+    @staticmethod
+    def _record_checkout_result(
+        project,
+        commit_hash: str,
+        checkout_result,
+        terminal_window,
+        successful_checkouts: list,
+        failed_checkouts: list,
+        prefix: str = "   ",
+    ):
+        """
+        Report a version's checkout and record it as successful or failed.
+        Returns the git message if local changes blocked the checkout, so the
+        caller can offer a force checkout; otherwise None.
+        """
+        name = f"{project.parent}/{project.name}"
+        message = checkout_result.message or (
+            checkout_result.error.message if checkout_result.error else "Unknown error"
+        )
+
+        if checkout_result.is_success:
+            terminal_window.append_output(f"{prefix}✅ {message}\n")
+            successful_checkouts.append(name)
+        # Check if the error is due to unknown commit (after fetch failure)
+        elif "pathspec" in message.lower() and "did not match" in message.lower():
+            terminal_window.append_output(
+                f"{prefix}❌ Commit {commit_hash} not found in this version\n"
+            )
+            failed_checkouts.append(f"{name} (commit not found)")
+        # Check if the error is due to local changes
+        elif "would be overwritten" in message or "local changes" in message.lower():
+            return message
+        else:
+            # Some other git error
+            terminal_window.append_output(f"{prefix}❌ {message}\n")
+            failed_checkouts.append(f"{name} ({message})")
+        return None
+
+    async def _resolve_local_changes(
+        self,
+        project,
+        commit_hash: str,
+        message: str,
+        terminal_window,
+        successful_checkouts: list,
+        failed_checkouts: list,
+        prefix: str = "   ",
+    ) -> bool:
+        """
+        Ask whether to force checkout a version blocked by local changes.
+        Returns False if the user chose to stop all remaining checkouts.
+        """
+        from tkinter import messagebox
+
+        name = f"{project.parent}/{project.name}"
+
+        # Ask if user wants to force checkout for this specific version
+        force_response = messagebox.askyesnocancel(
+            "Local Changes Detected",
+            f"Cannot checkout {name} because local changes would be overwritten:\n\n"
+            f"{message}\n\n"
+            f"Would you like to discard changes and force checkout for this version?\n\n"
+            f"• Yes: Force checkout this version\n"
+            f"• No: Skip this version\n"
+            f"• Cancel: Stop all checkouts",
+        )
+
+        if force_response is True:  # Yes - force checkout
+            terminal_window.append_output(
+                f"{prefix}⚠️  Forcing checkout (discarding local changes)...\n"
+            )
+            force_result = await self.git_service.force_checkout_commit(
+                project.path, commit_hash
+            )
+            force_message = force_result.message or (
+                force_result.error.message if force_result.error else "Unknown error"
+            )
+
+            if force_result.is_success:
+                terminal_window.append_output(f"{prefix}✅ {force_message}\n")
+                successful_checkouts.append(name)
+            else:
+                terminal_window.append_output(
+                    f"{prefix}❌ Force checkout failed: {force_message}\n"
+                )
+                failed_checkouts.append(f"{name} (force failed: {force_message})")
+        elif force_response is False:  # No - skip
+            terminal_window.append_output(
+                f"{prefix}⏭️  Skipped (preserving local changes)\n"
+            )
+            failed_checkouts.append(f"{name} (skipped: local changes)")
+        else:  # Cancel - stop all
+            terminal_window.append_output(f"{prefix}🛑 Checkout cancelled by user\n")
+            return False
+        return True
@@ -47,7 +47,9 @@ class ValidateProjectGroupCommand(AsyncCommand):
 
                 def create_window():
                     self.terminal_window = TerminalOutputWindow(
-                        self.window, f"Validation - {self.project_group.name}"
+                        self.window,
+                        f"Validation - {self.project_group.name}",
+                        output_channel=self.output_channel,
                     )
                     self.terminal_window.create_window()
                     self.terminal_window.update_status(
@@ -230,9 +230,83 @@ class CommandConfig:
                 "version": ["docker", "--version"],
                 "info": ["docker", "info"],
                 "images": ["docker", "images", "-q", "{image_name}"],
+                "image_id": [
+                    "docker",
+                    "image",
+                    "inspect",
+                    "--format",
+                    "{{.Id}}",
+                    "{tag}",
+                ],
+                "image_size": [
+                    "docker",
+                    "image",
+                    "inspect",
+                    "--format",
+                    "{{.Id}} {{.Size}}",
+                    "{tag}",
+                ],
+                "image_platform": [
+                    "docker",
+                    "image",
+                    "inspect",
+                    "--format",
+                    "{{.Os}}/{{.Architecture}}",
+                    "{tag}",
+                ],
+                "pull": ["docker", "pull", "--platform", "{platform}", "{image}"],
                 "run": ["docker", "run", "--rm", "{image_name}"],
+                "stats": [
+                    "docker",
+                    "stats",
+                    "--no-stream",
+                    "--format",
+                    "{{json .}}",
+                    "{name}",
+                ],
                 "rmi": ["docker", "rmi", "{image_name}"],
                 "compose_up": ["docker", "compose", "up", "--build"],
+                "warm_start": [
+                    "docker",
+                    "run",
+                    "-d",
+                    "--name",
+                    "{name}",
+                    "--label",
+                    "docker-tools.warm={tag}",
+                    "--entrypoint",
+                    "tail",
+                    "{tag}",
+                    "-f",
+                    "/dev/null",
+                ],
+                "container_running": [
+                    "docker",
+                    "inspect",
+                    "--format",
+                    "{{.State.Running}}",
+                    "{name}",
+                ],
+                "container_workdir": [
+                    "docker",
+                    "inspect",
+                    "--format",
+                    "{{.Config.WorkingDir}}",
+                    "{name}",
+                ],
+                "copy_to": ["docker", "cp", "{source}", "{destination}"],
+                "exec_shell": ["docker", "exec", "{name}", "sh", "-c", "{command}"],
+                "remove_container": ["docker", "rm", "-f", "{name}"],
+                "buildx_inspect": ["docker", "buildx", "inspect", "{builder}"],
+                "buildx_create": [
+                    "docker",
+                    "buildx",
+                    "create",
+                    "--name",
+                    "{builder}",
+                    "--driver",
+                    "docker-container",
+                ],
             },
             # Git commands
             "GIT_COMMANDS": {
@@ -242,6 +316,29 @@ class CommandConfig:
                 "rev_parse_head": ["git", "rev-parse", "HEAD"],
                 "branch_show_current": ["git", "branch", "--show-current"],
                 "status_porcelain": ["git", "status", "--porcelain"],
+                "status_porcelain_tracked": [
+                    "git",
+                    "status",
+                    "--porcelain",
+                    "--untracked-files=no",
+                ],
+                "refresh_index": ["git", "update-index", "-q", "--refresh"],
+                "diff_index_quiet": ["git", "diff-index", "--quiet", "HEAD", "--"],
+                "untracked_files": [
+                    "git",
+                    "ls-files",
+                    "--others",
+                    "--exclude-standard",
+                    "--directory",
+                    "--no-empty-directory",
+                ],
+                "config_set": ["git", "config", "{key}", "{value}"],
+                "enable_fast_index": [
+                    "git",
+                    "update-index",
+                    "--untracked-cache",
+                    "--split-index",
+                ],
                 "remote_check": ["git", "remote"],
                 "log": [
                     "git",
@@ -265,7 +362,25 @@ class CommandConfig:
                 "clean": ["git", "clean", "-fd"],
                 "branch_contains": ["git", "branch", "--contains", "{commit}"],
                 "fetch": ["git", "fetch", "--all"],
+                "fetch_from_clone": ["git", "fetch", "--prune"],
                 "clone": ["git", "clone", "{repo_url}", "{project_name}"],
+                "clone_local": [
+                    "git",
+                    "clone",
+                    "--local",
+                    "{source_path}",
+                    "{project_name}",
+                ],
+                "clone_reference": [
+                    "git",
+                    "clone",
+                    "--reference",
+                    "{reference_path}",
+                    "--dissociate",
+                    "{repo_url}",
+                    "{project_name}",
+                ],
+                "remote_set_url": ["git", "remote", "set-url", "origin", "{repo_url}"],
             },
             # Test commands
             "TEST_COMMANDS": {
@@ -461,6 +576,76 @@ class ServiceConfig:
     max_concurrent_operations: int = 5
     task_queue_size: int = 100
 
+    # Parallel checkout settings
+    parallel_git_checkout: bool = True
+    max_parallel_checkouts: int = 4
+
+    # Parallel build settings
+    max_parallel_builds: int = 2
+
+    # Build skip settings
+    skip_unchanged_builds: bool = True
+    build_record_dir: str = ""  # ~/.cache/docker_tools/builds
+
+    # Build context settings
+    stream_build_context: bool = True
+
+    # BuildKit cache settings
+    buildkit_cache: bool = False
+    buildkit_cache_dir: str = ""  # ~/.cache/docker_tools/buildkit
+    buildkit_builder: str = "docker-tools"
+
+    # Test history settings
+    test_history: bool = True
+    test_history_path: str = ""  # ~/.cache/docker_tools/test_history.sqlite3
+    test_history_max_runs: int = 50
+
+    # Docker Engine API settings
+    docker_engine_api: bool = True
+
+    # Warm container settings
+    warm_containers: bool = False
+    warm_container_idle_timeout: float = 600.0
+
+    # Test sharding settings
+    test_sharding: bool = False
+    test_shards: int = 0  # 0: test_shard_cpu_fraction of the CPU cores
+    test_shard_cpu_fraction: float = 0.5
+
+    # Image cleanup settings
+    image_gc_budget_gb: float = 20.0
+    image_gc_schedule: bool = False
+    image_gc_interval: float = 3600.0
+    image_usage_path: str = ""  # ~/.cache/docker_tools/image_usage.json
+
+    # Resource sampling settings
+    resource_sampling: bool = True
+    resource_sample_interval: float = 1.0
+    test_cpus: float = 0.0  # 0: no limit
+    test_memory: str = ""  # e.g. "4g"; "": no limit
+
+    # Base image pre-pull settings
+    base_image_prepull: bool = True
+    base_image_prepull_concurrency: int = 2
+
+    # Layered Dockerfile settings
+    layered_dockerfiles: bool = True
+
+    # Clone settings
+    clone_strategy: str = "hardlink"  # hardlink, reference or independent
+
+    # Git fetch settings
+    git_fetch_max_age: float = 300.0
+    git_background_fetch: bool = True
+    git_fetch_interval: float = 240.0
+    git_fetch_jitter: float = 0.2
+    git_fetch_max_concurrent: int = 2
+    git_fetch_viewed_ttl: float = 1800.0
+
+    # Dirty check settings
+    git_dirty_check: str = "fast"  # fast or status
+    git_fast_index: bool = False
+
     # Validation settings
     validation_url: str = "http://localhost:8080"
     max_parallel_archives: int = 3
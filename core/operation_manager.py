@@ -22,6 +22,9 @@ from commands import (
     CleanupProjectCommand,
     ArchiveProjectCommand,
     DockerBuildAndTestCommand,
+    DockerBuildAndTestAllCommand,
+    TestHistoryReportCommand,
+    ImageGcCommand,
     GitViewCommand,
     GitCheckoutAllCommand,
     SyncRunTestsCommand,
@@ -88,6 +91,14 @@ class OperationManager:
         }
         color = color_map.get(level, COLORS["info"])
 
+        # Push the status to web event stream clients
+        with contextlib.suppress(Exception):
+            from models.web_event_hub import web_event_hub
+
+            web_event_hub.publish(
+                "status", {"message": message, "level": level, "color": color}
+            )
+
         # Update GUI status safely from any thread
         self.window.after(0, lambda: self._safe_status_update(message, color))
 
@@ -139,6 +150,42 @@ class OperationManager:
             command.run_with_progress(), task_name=f"docker-{project.name}"
         )
 
+    def docker_build_and_test_all(self, project_group: ProjectGroup):
+        """Execute Docker build and test for all versions of a project group"""
+        command = DockerBuildAndTestAllCommand(
+            project_group=project_group,
+            docker_service=self.docker_service,
+            window=self.window,
+            progress_callback=self._update_status,
+            completion_callback=self._handle_docker_completion,
+        )
+        task_manager.run_task(
+            command.run_with_progress(),
+            task_name=f"docker-all-{project_group.name}",
+        )
+
+    def test_history_report(self, project_group: ProjectGroup):
+        """Show the recorded test runs of a project group"""
+        command = TestHistoryReportCommand(
+            project_group=project_group,
+            window=self.window,
+            progress_callback=self._update_status,
+            completion_callback=self._handle_docker_completion,
+        )
+        task_manager.run_task(
+            command.run_with_progress(),
+            task_name=f"test-history-{project_group.name}",
+        )
+
+    def clean_images(self):
+        """Remove least recently used project images beyond the disk budget"""
+        command = ImageGcCommand(
+            window=self.window,
+            progress_callback=self._update_status,
+            completion_callback=self._handle_docker_completion,
+        )
+        task_manager.run_task(command.run_with_progress(), task_name="image-gc")
+
     def git_view(self, project: Project):
         """Execute git view operation"""
         command = GitViewCommand(
@@ -628,6 +675,10 @@ echo "Tests completed for {project.parent}"
                 successful_clones = []
                 failed_clones = []
 
+                # Only the first clone downloads; the rest reuse its objects
+                clone_strategy = get_config().service.clone_strategy
+                seed_path = None
+
                 # Clone into each subdirectory
                 for i, subdir in enumerate(subdirs):
                     try:
@@ -645,23 +696,42 @@ echo "Tests completed for {project.parent}"
                             )
                             continue
 
-                        # Clone the repository using platform service
-                        clone_success, clone_result = (
-                            PlatformService.run_command_with_result(
-                                "GIT_COMMANDS",
-                                subkey="clone",
-                                repo_url=repo_url,
-                                project_name=str(target_path),
-                                capture_output=True,
-                                text=True,
-                                timeout=300,  # 5 minute timeout
+                        if (
+                            seed_path is not None
+                            and clone_strategy != "independent"
+                            and self.git_service
+                        ):
+                            seeded_result = await self.git_service.clone_from_seed(
+                                repo_url, seed_path, target_path, clone_strategy
                             )
-                        )
+                            shared = f" (objects shared with {seed_path.parent.name})"
+                            clone_success = seeded_result.is_success
+                            clone_result = (
+                                seeded_result.message
+                                if clone_success
+                                else seeded_result.error.message
+                            )
+                        else:
+                            shared = ""
+                            # Clone the repository using platform service
+                            clone_success, clone_result = (
+                                PlatformService.run_command_with_result(
+                                    "GIT_COMMANDS",
+                                    subkey="clone",
+                                    repo_url=repo_url,
+                                    project_name=str(target_path),
+                                    capture_output=True,
+                                    text=True,
+                                    timeout=300,  # 5 minute timeout
+                                )
+                            )
+                            if clone_success:
+                                seed_path = target_path
 
                         if clone_success:
                             successful_clones.append(f"{subdir.name}/{project_name}")
                             output_window.append_output(
-                                f"✅ Cloned into {subdir.name}/{project_name}\n"
+                                f"✅ Cloned into {subdir.name}/{project_name}{shared}\n"
                             )
                         else:
                             failed_clones.append(
@@ -3,4 +3,39 @@
 DOCKER_TAG=${1:-java-unit-tests-base}
 DOCKER_DEFAULT_PLATFORM=${2:-linux/amd64}
 
-docker build --platform $DOCKER_DEFAULT_PLATFORM -t $DOCKER_TAG .
+# Docker Tools sets BUILD_CONTEXT=- and pipes the build context in as a tar
+# (.dockerignore already applied) so docker does not walk the folder again.
+BUILD_CONTEXT=${BUILD_CONTEXT:-.}
+
+# Dockerfiles generated from the dependency manifests use cache mounts
+# (RUN --mount), which only BuildKit supports; older CLIs default to the
+# legacy builder.
+if grep -q -- '--mount=' Dockerfile 2>/dev/null; then
+    export DOCKER_BUILDKIT=1
+fi
+
+# Optional BuildKit layer cache, shared by every image built from the same
+# base image. Docker Tools sets BUILD_CACHE_DIR (and BUILDX_BUILDER) when
+# the build cache is enabled; each tag exports to its own folder and
+# imports from all of them, so dependency layers are reused across
+# versions and projects.
+if [ -n "$BUILD_CACHE_DIR" ]; then
+    set --
+    for index in "$BUILD_CACHE_DIR"/*/index.json; do
+        [ -f "$index" ] && set -- "$@" --cache-from "type=local,src=${index%/index.json}"
+    done
+    if [ -n "$BUILDX_BUILDER" ]; then
+        set -- "$@" --builder "$BUILDX_BUILDER"
+    fi
+
+    CACHE_DEST="$BUILD_CACHE_DIR/$DOCKER_TAG"
+    CACHE_NEW="$BUILD_CACHE_DIR/.new-$DOCKER_TAG"
+    rm -rf "$CACHE_NEW"
+    docker buildx build "$@" --platform $DOCKER_DEFAULT_PLATFORM \
+        --cache-to "type=local,dest=$CACHE_NEW,mode=max" --load -t $DOCKER_TAG "$BUILD_CONTEXT" || exit $?
+    # Swap in the fresh export so stale blobs do not pile up
+    rm -rf "$CACHE_DEST" && mv "$CACHE_NEW" "$CACHE_DEST"
+    exit 0
+fi
+
+docker build --platform $DOCKER_DEFAULT_PLATFORM -t $DOCKER_TAG "$BUILD_CONTEXT"
@@ -31,6 +31,10 @@ from services.platform_service import PlatformService
 from services.validation_service import ValidationService
 from services.docker_files_service import DockerFilesService
 from services.file_monitor_service import file_monitor
+from services.base_images import base_image_prepull
+from services.git_fetch_scheduler import fetch_scheduler
+from services.image_gc import image_gc
+from services.warm_containers import warm_containers
 from gui import (
     MainWindow,
     AddProjectWindow,
@@ -164,6 +168,16 @@ class ProjectControlPanel:
             # Set up event loop for async operations
             task_manager.setup_event_loop()
             logger.info("Async integration setup complete")
+
+            # Keep recently viewed repositories fetched in the background
+            if get_config().service.git_background_fetch:
+                fetch_scheduler.start(self.git_service)
+            # Pull missing base images before the first builds need them
+            if get_config().service.base_image_prepull:
+                base_image_prepull.start(self.project_service, self._update_status)
+            # Keep the project images within their disk budget
+            if get_config().service.image_gc_schedule:
+                image_gc.start()
         except Exception as e:
             logger.error("Failed to setup async integration: %s", e)
             # Continue without async support
@@ -184,6 +198,9 @@ class ProjectControlPanel:
             "validate_project_group": self.validate_project_group,
             "build_docker_files_for_project_group": self.build_docker_files_for_project_group,
             "git_checkout_all": self.git_checkout_all,
+            "docker_build_and_test_all": self.docker_build_and_test_all,
+            "test_history_report": self.test_history_report,
+            "clean_images": self.clean_images,
         }
         self.main_window.set_callbacks(callbacks)
 
@@ -234,8 +251,13 @@ class ProjectControlPanel:
             # Stop web server
             if hasattr(self, "web_integration"):
                 self.web_integration.stop_web_server()
-            # Stop file monitoring
+            # Stop file monitoring and background fetches
             file_monitor.stop_all_monitoring()
+            fetch_scheduler.stop()
+            image_gc.stop()
+            base_image_prepull.stop()
+            # Remove the containers kept warm for test runs
+            warm_containers.shutdown()
             # Cancel any pending async operations with timeout
             shutdown_all(timeout=3.0)  # Shorter timeout for better UX
         except Exception as e:
@@ -294,6 +316,8 @@ class ProjectControlPanel:
             self.main_window.show_no_versions_message()
             return
 
+        fetch_scheduler.note_viewed(project.path for project in versions)
+
         # Group versions for better display
         for i, project in enumerate(versions):
             if i > 0:  # Add spacing between versions
@@ -352,6 +376,18 @@ class ProjectControlPanel:
         """Execute git checkout all operation"""
         self.operation_manager.git_checkout_all(project_group)
 
+    def docker_build_and_test_all(self, project_group: ProjectGroup):
+        """Execute Docker build and test for all versions of a project group"""
+        self.operation_manager.docker_build_and_test_all(project_group)
+
+    def test_history_report(self, project_group: ProjectGroup):
+        """Show the recorded test runs of a project group"""
+        self.operation_manager.test_history_report(project_group)
+
+    def clean_images(self):
+        """Remove least recently used project images beyond the disk budget"""
+        self.operation_manager.clean_images()
+
     def sync_run_tests_from_pre_edit(self, project_group: ProjectGroup):
         """Execute sync run tests operation"""
         self.operation_manager.sync_run_tests_from_pre_edit(project_group)
@@ -61,6 +61,9 @@ class MainWindow:
         self.validate_project_group_callback = None
         self.build_docker_files_callback = None
         self.git_checkout_all_callback = None
+        self.docker_build_all_callback = None
+        self.test_history_callback = None
+        self.clean_images_callback = None
 
     def _open_file_manager(self, project_path: Path):
         """Open the file manager at the specified project path"""
@@ -112,6 +115,9 @@ class MainWindow:
             "build_docker_files_for_project_group"
         )
         self.git_checkout_all_callback = callbacks.get("git_checkout_all")
+        self.docker_build_all_callback = callbacks.get("docker_build_and_test_all")
+        self.test_history_callback = callbacks.get("test_history_report")
+        self.clean_images_callback = callbacks.get("clean_images")
 
     def setup_window_protocol(self, on_close_callback: Callable):
         """Set up window close protocol"""
@@ -194,6 +200,15 @@ class MainWindow:
         )
         web_btn.pack(side="right", padx=(0, 10))
 
+        # Clean Images button
+        clean_images_btn = GuiUtils.create_styled_button(
+            selection_frame,
+            text="🧹 Clean Images",
+            command=self._clean_images,
+            style="docker",
+        )
+        clean_images_btn.pack(side="right", padx=(0, 10))
+
     def _on_project_selected(self, event=None):
         """Handle project selection from dropdown"""
         if self.on_project_selected_callback:
@@ -204,6 +219,11 @@ class MainWindow:
         if self.refresh_projects_callback:
             self.refresh_projects_callback()
 
+    def _clean_images(self):
+        """Handle clean images button click"""
+        if self.clean_images_callback:
+            self.clean_images_callback()
+
     def _open_add_project_window(self):
         """Handle add project button click"""
         if self.open_add_project_window_callback:
@@ -407,6 +427,24 @@ class MainWindow:
         )
         git_checkout_all_btn.pack(side="left", padx=(0, 10))
 
+        # Docker Build & Test All button
+        docker_all_btn = GuiUtils.create_styled_button(
+            buttons_container,
+            text="🐳 Build & Test All",
+            command=lambda: self._docker_build_all(project_group),
+            style="docker",
+        )
+        docker_all_btn.pack(side="left", padx=(0, 10))
+
+        # Test History button
+        test_history_btn = GuiUtils.create_styled_button(
+            buttons_container,
+            text="📈 Test History",
+            command=lambda: self._test_history(project_group),
+            style="docker",
+        )
+        test_history_btn.pack(side="left", padx=(0, 10))
+
     def _sync_run_tests(self, project_group: ProjectGroup):
         """Handle sync run tests button click"""
         if self.sync_run_tests_callback:
@@ -432,6 +470,16 @@ class MainWindow:
         if self.git_checkout_all_callback:
             self.git_checkout_all_callback(project_group)
 
+    def _docker_build_all(self, project_group: ProjectGroup):
+        """Handle build and test all versions button click"""
+        if self.docker_build_all_callback:
+            self.docker_build_all_callback(project_group)
+
+    def _test_history(self, project_group: ProjectGroup):
+        """Handle test history button click"""
+        if self.test_history_callback:
+            self.test_history_callback(project_group)
+
     def create_version_section(self, project: Project, project_service):
         """Create a version section for a project"""
         # Get alias for better display
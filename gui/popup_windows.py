@@ -15,8 +15,17 @@ FONTS = get_config().gui.fonts
 OUTPUT_WINDOW_SIZE = get_config().gui.output_window_size
 GIT_WINDOW_SIZE = get_config().gui.git_window_size
 
+# Commit list rows rendered per page, and how far down (as a fraction of the
+# rendered rows) the view must scroll before the next page is loaded
+COMMIT_PAGE_SIZE = 200
+COMMIT_PAGE_PREFETCH = 0.9
+# Delay before re-filtering while the user is typing (ms)
+COMMIT_FILTER_DELAY_MS = 150
+
 from gui.gui_utils import GuiUtils
+from models.commit_index import CommitIndex
 from services.project_group_service import ProjectGroup
+from services.test_sharding import discover_test_files
 
 
 class TerminalOutputWindow:
@@ -28,6 +37,7 @@ class TerminalOutputWindow:
         title: str,
         size: str = OUTPUT_WINDOW_SIZE,
         control_panel=None,
+        output_channel=None,
     ):
         self.parent_window = parent_window
         self.control_panel = control_panel
@@ -41,6 +51,22 @@ class TerminalOutputWindow:
         self.size = size
         self.is_created = False
 
+        # Per-operation web output channel; windows not driven by a command
+        # own theirs and finish it when the operation is done
+        self.owns_output_channel = output_channel is None
+        self.output_channel = output_channel
+        if self.output_channel is None:
+            with contextlib.suppress(Exception):
+                from models.output_channels import output_channels
+
+                self.output_channel = output_channels.open(title, {"window": title})
+        elif self.output_channel.title != title:
+            self.output_channel.title = title
+
+    def _finish_output_channel(self):
+        if self.owns_output_channel and self.output_channel:
+            self.output_channel.finish()
+
     def create_window(self):
         """Create the terminal output window"""
         if self.is_created:
@@ -126,11 +152,27 @@ class TerminalOutputWindow:
 
             web_terminal_buffer.append(text)
 
+        if self.output_channel:
+            with contextlib.suppress(Exception):
+                self.output_channel.append(text)
+
     def update_status(self, status_text: str, color: str = None):
         """Update status label with race condition protection"""
         if color is None:
             color = COLORS["warning"]
 
+        # Push the status to web event stream clients
+        with contextlib.suppress(Exception):
+            from models.web_event_hub import web_event_hub
+
+            web_event_hub.publish(
+                "status",
+                {"message": status_text, "color": color, "source": self.title},
+            )
+
+        if self.output_channel:
+            self.output_channel.set_status(status_text)
+
         if not self.is_created or not self.status_label:
             return
 
@@ -164,6 +206,7 @@ class TerminalOutputWindow:
         additional_buttons: Optional[List[Dict]] = None,
     ):
         """Add final buttons to the window"""
+        self._finish_output_channel()
         if not (self.window and self.window.winfo_exists()):
             return
 
@@ -230,6 +273,7 @@ class TerminalOutputWindow:
 
     def destroy(self):
         """Destroy the window"""
+        self._finish_output_channel()
         if self.window:
             self.window.destroy()
 
@@ -259,6 +303,14 @@ class GitCommitWindow:
         self.commit_listbox = None
         self.status_label = None
         self.checkout_btn = None
+        self.filter_var = None
+
+        # Commits are indexed once; only the filtered rows scrolled into view
+        # are inserted into the listbox, a page at a time
+        self.commit_index = None
+        self.visible_indices: List[int] = []
+        self.rendered_count = 0
+        self._filter_job = None
 
     def create_window(self, fetch_success: bool, fetch_message: str):
         """Create the git commit window"""
@@ -308,6 +360,26 @@ class GitCommitWindow:
         )
         info_label.pack(pady=(0, 10))
 
+        # Filter box (matches hash, author and subject)
+        filter_frame = GuiUtils.create_styled_frame(main_frame, bg_color="terminal_bg")
+        filter_frame.pack(fill="x", pady=(0, 5))
+
+        filter_label = GuiUtils.create_styled_label(
+            filter_frame,
+            text="Filter:",
+            font_key="info",
+            bg=COLORS["terminal_bg"],
+            fg=COLORS["terminal_text"],
+        )
+        filter_label.pack(side="left", padx=(0, 5))
+
+        self.filter_var = tk.StringVar()
+        filter_entry = tk.Entry(
+            filter_frame, textvariable=self.filter_var, font=FONTS["info"]
+        )
+        filter_entry.pack(side="left", fill="x", expand=True)
+        self.filter_var.trace_add("write", lambda *args: self._schedule_filter())
+
         # Create frame for listbox and scrollbar
         list_frame = GuiUtils.create_styled_frame(main_frame, bg_color="terminal_bg")
         list_frame.pack(fill=tk.BOTH, expand=True)
@@ -316,6 +388,12 @@ class GitCommitWindow:
         scrollbar = tk.Scrollbar(list_frame)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
+        def on_list_scroll(first, last):
+            scrollbar.set(first, last)
+            # Load the next page once the view nears the last rendered row
+            if float(last) >= COMMIT_PAGE_PREFETCH and self.has_more_rows:
+                self.window.after_idle(self.render_next_page)
+
         # Listbox for commits
         self.commit_listbox = tk.Listbox(
             list_frame,
@@ -324,7 +402,7 @@ class GitCommitWindow:
             fg=COLORS["terminal_text"],
             selectbackground=COLORS["info"],
             selectforeground=COLORS["terminal_text"],
-            yscrollcommand=scrollbar.set,
+            yscrollcommand=on_list_scroll,
             activestyle="none",
         )
         self.commit_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -335,15 +413,8 @@ class GitCommitWindow:
 
         # Handle double-click on commit
         def on_commit_select(event):
-            selection = self.commit_listbox.curselection()
-            if selection:
-                index = selection[0]
-                selected_commit = self.commits[index]
-                commit_hash = (
-                    selected_commit.hash
-                    if hasattr(selected_commit, "hash")
-                    else selected_commit.get("hash")
-                )
+            commit_hash = self.get_selected_commit_hash()
+            if commit_hash:
                 self.on_checkout_callback(commit_hash)
 
         self.commit_listbox.bind("<Double-1>", on_commit_select)
@@ -354,15 +425,8 @@ class GitCommitWindow:
 
         # Checkout button
         def checkout_selected():
-            selection = self.commit_listbox.curselection()
-            if selection:
-                index = selection[0]
-                selected_commit = self.commits[index]
-                commit_hash = (
-                    selected_commit.hash
-                    if hasattr(selected_commit, "hash")
-                    else selected_commit.get("hash")
-                )
+            commit_hash = self.get_selected_commit_hash()
+            if commit_hash:
                 self.on_checkout_callback(commit_hash)
             else:
                 messagebox.showwarning(
@@ -402,52 +466,79 @@ class GitCommitWindow:
         )
 
     def populate_commits(self):
-        """Populate the listbox with current commits"""
+        """Populate the listbox with the first page of (filtered) commits"""
+        if self.commit_index is None or self.commit_index.commits is not self.commits:
+            self.commit_index = CommitIndex(self.commits, self.current_commit_hash)
+            # Share the list so the index can tell when commits are replaced
+            self.commits = self.commit_index.commits
+        elif self.commit_index.current_hash != self.current_commit_hash:
+            self.commit_index.set_current_hash(self.current_commit_hash)
+
+        self.visible_indices = self.commit_index.filter(self.filter_query)
+        self.rendered_count = 0
         self.commit_listbox.delete(0, tk.END)
+        self.render_next_page()
 
-        for i, commit in enumerate(self.commits):
-            commit_hash = (
-                commit.hash if hasattr(commit, "hash") else commit.get("hash", "")
-            )
-            display_text = (
-                commit.display
-                if hasattr(commit, "display")
-                else commit.get("display", str(commit))
-            )
-
-            # Check if this is the current commit - try multiple matching strategies
-            is_current = False
-            if (
-                self.current_commit_hash
-                and commit_hash
-                and self.current_commit_hash not in [None, "unknown", ""]
-            ):
-
-                # Strategy 1: Use the shorter length for comparison (more robust)
-                min_length = min(
-                    len(self.current_commit_hash), len(commit_hash), 10
-                )  # Cap at 10 chars
-                if (
-                    min_length >= 4
-                ):  # Only match if we have at least 4 characters for reliability
-                    current_short = self.current_commit_hash[:min_length]
-                    commit_short = commit_hash[:min_length]
-                    is_current = current_short == commit_short or (
-                        commit_hash.startswith(self.current_commit_hash)
-                        or self.current_commit_hash.startswith(commit_hash)
-                    )
+    @property
+    def filter_query(self) -> str:
+        if self.filter_var is None:
+            return ""
+        with contextlib.suppress(tk.TclError):
+            return self.filter_var.get()
+        return ""
 
-            if is_current:
-                # Add ">> CURRENT" prefix to highlight the current commit
-                display_text = f">> CURRENT: {display_text}"
+    @property
+    def has_more_rows(self) -> bool:
+        return self.rendered_count < len(self.visible_indices)
 
-            self.commit_listbox.insert(tk.END, display_text)
+    def render_next_page(self):
+        """Insert the next page of filtered commits into the listbox"""
+        page = self.visible_indices[
+            self.rendered_count : self.rendered_count + COMMIT_PAGE_SIZE
+        ]
+        for commit_index in page:
+            self.commit_listbox.insert(
+                tk.END, self.commit_index.display_text(commit_index)
+            )
 
             # Highlight the current commit with a different background color
-            if is_current:
+            if commit_index == self.commit_index.current_index:
                 self.commit_listbox.itemconfig(
-                    i, bg=COLORS["success"], fg=COLORS["white"]
+                    self.rendered_count, bg=COLORS["success"], fg=COLORS["white"]
                 )
+            self.rendered_count += 1
+
+    def get_selected_commit_hash(self) -> Optional[str]:
+        """Hash of the commit selected in the listbox, if any"""
+        selection = self.commit_listbox.curselection()
+        if not selection or selection[0] >= self.rendered_count:
+            return None
+        return self.commit_index.hashes[self.visible_indices[selection[0]]] or None
+
+    def _schedule_filter(self):
+        """Re-filter shortly after the user stops typing"""
+        if not self.window:
+            return
+        if self._filter_job:
+            with contextlib.suppress(tk.TclError):
+                self.window.after_cancel(self._filter_job)
+        self._filter_job = self.window.after(COMMIT_FILTER_DELAY_MS, self.apply_filter)
+
+    def apply_filter(self):
+        """Show only commits matching the filter box"""
+        self._filter_job = None
+        if self.commit_index is None or not self.commits:
+            return
+        self.populate_commits()
+
+        query = self.filter_query.strip()
+        if query:
+            self.update_status(
+                f"Showing {len(self.visible_indices)} of {len(self.commits)} "
+                f"commits matching '{query}'"
+            )
+        else:
+            self.update_status(f"Showing all commits ({len(self.commits)} total)")
 
     def create_window_with_loading(self, fetch_success: bool, fetch_message: str):
         """Create the git commit window with loading state"""
@@ -490,6 +581,44 @@ class GitCommitWindow:
         )
         self.checkout_btn.config(state="normal")
 
+    def append_commits(self, commits):
+        """Add a newly streamed page of commits behind those already shown"""
+        if self.commit_index is None or self.commit_index.commits is not self.commits:
+            self.update_with_commits(list(commits))
+            return
+
+        start = len(self.commits)
+        self.commit_index.extend(commits)
+        self.visible_indices.extend(self.commit_index.filter(self.filter_query, start))
+
+        # Fill the first screen; later rows load as the list is scrolled
+        if self.rendered_count < COMMIT_PAGE_SIZE and self.has_more_rows:
+            self.render_next_page()
+
+    def refresh_commits(self, commits):
+        """Redraw rendered rows of commits whose source branch was filled in"""
+        if self.commit_index is None:
+            return
+        refreshed = set(self.commit_index.refresh(commits))
+        if not refreshed:
+            return
+
+        selection = self.commit_listbox.curselection()
+        for row in range(self.rendered_count):
+            commit_index = self.visible_indices[row]
+            if commit_index not in refreshed:
+                continue
+            self.commit_listbox.delete(row)
+            self.commit_listbox.insert(
+                row, self.commit_index.display_text(commit_index)
+            )
+            if commit_index == self.commit_index.current_index:
+                self.commit_listbox.itemconfig(
+                    row, bg=COLORS["success"], fg=COLORS["white"]
+                )
+        for row in selection:
+            self.commit_listbox.selection_set(row)
+
     def update_with_error(self, error_message):
         """Update window with error state"""
         self.commit_listbox.config(state="normal")
@@ -1081,20 +1210,6 @@ class EditRunTestsWindow:
         versions = self.project_group.get_all_versions()
         return versions[0] if versions else None
 
-    def _get_test_file_patterns(self):
-        """Get test file patterns based on the detected language"""
-        TEST_FILE_PATTERNS = get_config().test.file_patterns
-
-        return TEST_FILE_PATTERNS.get(
-            self.detected_language, ["test_*.py", "*_test.py"]
-        )
-
-    def _get_test_directories(self):
-        """Get test directories based on the detected language"""
-        TEST_DIRECTORIES = get_config().test.directories
-
-        return TEST_DIRECTORIES.get(self.detected_language, ["tests/"])
-
     def _load_test_files(self):
         """Load test files from the appropriate directories based on language"""
         self.all_test_files = []
@@ -1103,24 +1218,10 @@ class EditRunTestsWindow:
         if not pre_edit_version:
             return
 
-        test_patterns = self._get_test_file_patterns()
-        test_directories = self._get_test_directories()
-
-        # Search for test files in language-specific directories
-        for test_dir in test_directories:
-            dir_path = pre_edit_version.path / test_dir.rstrip("/")
-            if dir_path.exists() and dir_path.is_dir():
-                for pattern in test_patterns:
-                    for test_file in dir_path.rglob(pattern):
-                        if test_file.is_file():
-                            rel_path = test_file.relative_to(pre_edit_version.path)
-                            # Normalize to forward slashes
-                            normalized_path = str(rel_path).replace("\\", "/")
-                            if normalized_path not in self.all_test_files:
-                                self.all_test_files.append(normalized_path)
-
-        # Sort the test files for consistent display
-        self.all_test_files.sort()
+        # Sorted, for consistent display
+        self.all_test_files = discover_test_files(
+            pre_edit_version.path, self.detected_language
+        )
 
     def _get_currently_selected_tests(self):
         """Parse current run_tests.sh to determine which tests are currently selected"""
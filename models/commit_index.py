@@ -0,0 +1,166 @@
+"""
+Searchable index over a commit list for the git commit windows
+
+Display text, search keys and the current-commit position are computed once
+when commits are added, so rendering a page of rows or narrowing a filter
+does not repeat per-row work. Filtering is incremental: when a query extends
+the previous one, only the previous matches are rescanned.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def _commit_field(commit: Any, name: str, default: str = "") -> str:
+    """Read a field from a GitCommit or a plain dict"""
+    if isinstance(commit, dict):
+        value = commit.get(name, default)
+    else:
+        value = getattr(commit, name, default)
+    return value if value is not None else default
+
+
+def _commit_display(commit: Any) -> str:
+    if isinstance(commit, dict):
+        return commit.get("display", str(commit))
+    return getattr(commit, "display", str(commit))
+
+
+def is_current_commit(current_hash: Optional[str], commit_hash: str) -> bool:
+    """Match commit hashes of possibly different abbreviation lengths"""
+    if not current_hash or not commit_hash or current_hash == "unknown":
+        return False
+
+    # Compare on the shorter length, capped at 10 chars, and only when there
+    # are at least 4 characters for reliability
+    min_length = min(len(current_hash), len(commit_hash), 10)
+    if min_length < 4:
+        return False
+    return (
+        current_hash[:min_length] == commit_hash[:min_length]
+        or commit_hash.startswith(current_hash)
+        or current_hash.startswith(commit_hash)
+    )
+
+
+class CommitIndex:
+    """Prebuilt display and search data for a list of commits"""
+
+    def __init__(self, commits: Iterable = (), current_hash: Optional[str] = None):
+        self.commits: List = []
+        self.hashes: List[str] = []
+        self.displays: List[str] = []
+        self._search_keys: List[str] = []
+        self.current_hash = current_hash
+        self.current_index: Optional[int] = None
+        # Position of each indexed commit object, for refresh()
+        self._positions: Dict[int, int] = {}
+
+        # Last filter, used to narrow the next one incrementally
+        self._last_query: Optional[str] = None
+        self._last_matches: Optional[List[int]] = None
+
+        self.extend(commits)
+
+    def __len__(self) -> int:
+        return len(self.commits)
+
+    def extend(self, commits: Iterable):
+        """Index additional commits (e.g. a newly loaded page)"""
+        for commit in commits:
+            index = len(self.commits)
+            commit_hash = _commit_field(commit, "hash")
+            self.commits.append(commit)
+            self._positions[id(commit)] = index
+            self.hashes.append(commit_hash)
+            self.displays.append(_commit_display(commit))
+            self._search_keys.append(
+                "\n".join(
+                    (
+                        commit_hash,
+                        _commit_field(commit, "author"),
+                        _commit_field(commit, "subject"),
+                    )
+                ).lower()
+            )
+            if self.current_index is None and is_current_commit(
+                self.current_hash, commit_hash
+            ):
+                self.current_index = index
+
+        # Cached matches no longer cover every commit
+        self._last_query = None
+        self._last_matches = None
+
+    def refresh(self, commits: Iterable) -> List[int]:
+        """
+        Recompute display text for indexed commits that changed in place
+        (e.g. source branches filled in later). Returns their indices.
+        """
+        refreshed = []
+        for commit in commits:
+            index = self._positions.get(id(commit))
+            if index is not None and self.commits[index] is commit:
+                self.displays[index] = _commit_display(commit)
+                refreshed.append(index)
+        return refreshed
+
+    def set_current_hash(self, current_hash: Optional[str]):
+        """Recompute which commit is current"""
+        self.current_hash = current_hash
+        self.current_index = next(
+            (
+                i
+                for i, commit_hash in enumerate(self.hashes)
+                if is_current_commit(current_hash, commit_hash)
+            ),
+            None,
+        )
+
+    def filter(self, query: str, start: int = 0) -> List[int]:
+        """
+        Indices of commits matching every whitespace-separated term of query
+        in their hash, author or subject (case-insensitive). With start, only
+        commits from that index on are considered (e.g. a newly added page).
+        """
+        normalized = " ".join(query.lower().split())
+        if not normalized:
+            return list(range(start, len(self.commits)))
+
+        terms = normalized.split(" ")
+        keys = self._search_keys
+        if start:
+            return [
+                i
+                for i in range(start, len(self.commits))
+                if all(term in keys[i] for term in terms)
+            ]
+
+        candidates = range(len(self.commits))
+        if (
+            self._last_query
+            and self._last_matches is not None
+            and self._narrows(self._last_query, normalized)
+        ):
+            candidates = self._last_matches
+
+        matches = [i for i in candidates if all(term in keys[i] for term in terms)]
+
+        self._last_query = normalized
+        self._last_matches = matches
+        return matches
+
+    @staticmethod
+    def _narrows(previous: str, query: str) -> bool:
+        """True if every match of query is guaranteed to match previous"""
+        previous_terms = previous.split(" ")
+        query_terms = query.split(" ")
+        if len(query_terms) < len(previous_terms):
+            return False
+        # Each earlier term must be contained in the corresponding new term
+        return all(old in new for old, new in zip(previous_terms, query_terms))
+
+    def display_text(self, index: int) -> str:
+        """Row text for a commit, marking the current commit"""
+        if index == self.current_index:
+            return f">> CURRENT: {self.displays[index]}"
+        return self.displays[index]
@@ -0,0 +1,196 @@
+"""
+Operation-scoped output channels for the web interface
+
+Every operation gets its own bounded output buffer so concurrent operations
+(e.g. a Docker test run and a validation) can be viewed separately. Finished
+channels are kept for later viewing and evicted least-recently-used once the
+total retained output exceeds a memory cap. Running channels are never
+evicted; each is bounded by its own buffer size.
+"""
+
+import contextlib
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from models.web_terminal_buffer import TerminalChunk, WebTerminalBuffer
+
+# Per-channel and total caps on retained output (bytes of UTF-8)
+DEFAULT_CHANNEL_MAX_BYTES = 200000
+DEFAULT_TOTAL_MAX_BYTES = 2000000
+
+
+class OutputChannel:
+    """Output and metadata for a single operation"""
+
+    def __init__(
+        self,
+        channel_id: str,
+        title: str,
+        max_bytes: int,
+        metadata: Optional[Dict[str, Any]] = None,
+        registry: "OutputChannelRegistry" = None,
+    ):
+        self.id = channel_id
+        self.title = title
+        self.metadata = dict(metadata or {})
+        self.buffer = WebTerminalBuffer(max_bytes=max_bytes)
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.state = "running"
+        self.status_message = ""
+        self._registry = registry
+
+    @property
+    def is_running(self) -> bool:
+        return self.finished_at is None
+
+    def append(self, text: str) -> int:
+        """Append output and return its sequence number"""
+        seq = self.buffer.append(text)
+        if self._registry and text:
+            self._registry._on_output(self)
+        return seq
+
+    def set_status(self, message: str):
+        self.status_message = message
+
+    def finish(self, state: str = "completed"):
+        """Mark the channel finished, making it eligible for eviction"""
+        if self._registry:
+            self._registry.finish(self.id, state)
+        elif self.is_running:
+            self.state = state
+            self.finished_at = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "state": self.state,
+            "status": self.status_message,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "last_seq": self.buffer.last_seq,
+            "size_bytes": self.buffer.size_bytes,
+            "metadata": self.metadata,
+        }
+
+
+class OutputChannelRegistry:
+    def __init__(
+        self,
+        channel_max_bytes: int = DEFAULT_CHANNEL_MAX_BYTES,
+        total_max_bytes: int = DEFAULT_TOTAL_MAX_BYTES,
+    ):
+        self.channel_max_bytes = channel_max_bytes
+        self.total_max_bytes = total_max_bytes
+        # Ordered least to most recently used
+        self._channels: "OrderedDict[str, OutputChannel]" = OrderedDict()
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+        self.evicted_channels = 0
+
+    def open(
+        self, title: str, metadata: Optional[Dict[str, Any]] = None
+    ) -> OutputChannel:
+        """Create a new running channel"""
+        with self._lock:
+            channel_id = f"op-{next(self._counter)}"
+            channel = OutputChannel(
+                channel_id, title, self.channel_max_bytes, metadata, registry=self
+            )
+            self._channels[channel_id] = channel
+
+        channel.buffer.add_listener(
+            lambda chunk, channel_id=channel_id: _publish_channel_chunk(
+                channel_id, chunk
+            )
+        )
+        _publish_channel_event("opened", channel)
+        self._evict()
+        return channel
+
+    def get(self, channel_id: str) -> Optional[OutputChannel]:
+        """Look up a channel, marking it recently used"""
+        with self._lock:
+            channel = self._channels.get(channel_id)
+            if channel:
+                self._channels.move_to_end(channel_id)
+            return channel
+
+    def list(self) -> List[OutputChannel]:
+        """All retained channels, newest first"""
+        with self._lock:
+            channels = list(self._channels.values())
+        return sorted(channels, key=lambda c: c.created_at, reverse=True)
+
+    def finish(self, channel_id: str, state: str = "completed"):
+        with self._lock:
+            channel = self._channels.get(channel_id)
+            if not channel or not channel.is_running:
+                return
+            channel.state = state
+            channel.finished_at = time.time()
+            self._channels.move_to_end(channel_id)
+
+        _publish_channel_event("finished", channel)
+        self._evict()
+
+    def remove(self, channel_id: str) -> bool:
+        with self._lock:
+            return self._channels.pop(channel_id, None) is not None
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            channels = list(self._channels.values())
+        return sum(channel.buffer.size_bytes for channel in channels)
+
+    def _on_output(self, channel: OutputChannel):
+        with self._lock:
+            if channel.id in self._channels:
+                self._channels.move_to_end(channel.id)
+        self._evict()
+
+    def _evict(self):
+        """Drop least recently used finished channels until under the cap"""
+        evicted = []
+        with self._lock:
+            total = sum(c.buffer.size_bytes for c in self._channels.values())
+            for channel_id, channel in list(self._channels.items()):
+                if total <= self.total_max_bytes:
+                    break
+                if channel.is_running:
+                    continue
+                total -= channel.buffer.size_bytes
+                del self._channels[channel_id]
+                evicted.append(channel)
+            self.evicted_channels += len(evicted)
+
+        for channel in evicted:
+            _publish_channel_event("evicted", channel)
+
+
+def _publish_channel_event(action: str, channel: OutputChannel):
+    """Push channel lifecycle changes to web event stream clients"""
+    with contextlib.suppress(Exception):
+        from models.web_event_hub import web_event_hub
+
+        web_event_hub.publish("channel", {"action": action, **channel.to_dict()})
+
+
+def _publish_channel_chunk(channel_id: str, chunk: TerminalChunk):
+    """Push channel output to web event stream clients"""
+    from models.web_event_hub import web_event_hub
+
+    web_event_hub.publish(
+        "channel_output",
+        {"channel_id": channel_id, "seq": chunk.seq, "output": chunk.text},
+    )
+
+
+# Singleton instance
+output_channels = OutputChannelRegistry()
@@ -0,0 +1,165 @@
+"""
+Server-Sent Events hub for the web interface
+
+Publishers (terminal buffer, status updates, selection changes, operation
+lifecycle) push events into every subscribed client's bounded queue. A client
+that falls behind and fills its queue is dropped rather than slowing down the
+publisher; browsers reconnect automatically and resync from Last-Event-ID.
+"""
+
+import json
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+# Per-client queue bound and client cap
+DEFAULT_MAX_QUEUE_SIZE = 256
+DEFAULT_MAX_CLIENTS = 32
+
+
+@dataclass(frozen=True)
+class WebEvent:
+    """A single event pushed to web clients"""
+
+    type: str
+    data: Dict[str, Any]
+    id: Optional[int] = None
+
+    def to_sse(self) -> str:
+        """Serialize the event in text/event-stream wire format"""
+        lines = []
+        if self.id is not None:
+            lines.append(f"id: {self.id}")
+        lines.append(f"event: {self.type}")
+        payload = json.dumps(self.data, default=str)
+        lines.extend(f"data: {line}" for line in payload.split("\n"))
+        return "\n".join(lines) + "\n\n"
+
+
+# Sentinel placed in a client's queue to end its stream
+_CLOSE = object()
+
+
+class WebEventClient:
+    """A subscribed client with its own bounded queue"""
+
+    def __init__(
+        self,
+        max_queue_size: int,
+        event_filter: Optional[Callable[[WebEvent], bool]] = None,
+    ):
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self.event_filter = event_filter
+        self.connected_at = time.time()
+        self.dropped = False
+        self.closed = False
+
+    def next_event(self, timeout: float):
+        """
+        Wait for the next event.
+
+        Returns a WebEvent, None on timeout, or the close sentinel when the
+        hub has disconnected this client.
+        """
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def is_close(self, item) -> bool:
+        return item is _CLOSE
+
+    def wants(self, event: WebEvent) -> bool:
+        if self.event_filter is None:
+            return True
+        try:
+            return bool(self.event_filter(event))
+        except Exception:
+            return False
+
+
+class WebEventHub:
+    def __init__(
+        self,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        max_clients: int = DEFAULT_MAX_CLIENTS,
+    ):
+        self.max_queue_size = max_queue_size
+        self.max_clients = max_clients
+        self._clients: List[WebEventClient] = []
+        self._lock = threading.Lock()
+        self.dropped_clients = 0
+
+    def subscribe(
+        self, event_filter: Optional[Callable[[WebEvent], bool]] = None
+    ) -> Optional[WebEventClient]:
+        """
+        Register a new client, or return None if the hub is full.
+
+        event_filter, if given, selects which published events the client
+        receives.
+        """
+        with self._lock:
+            if len(self._clients) >= self.max_clients:
+                return None
+            client = WebEventClient(self.max_queue_size, event_filter)
+            self._clients.append(client)
+            return client
+
+    def unsubscribe(self, client: WebEventClient):
+        with self._lock:
+            if client in self._clients:
+                self._clients.remove(client)
+
+    def _disconnect(self, client: WebEventClient):
+        """Drop a client and wake its stream so it can finish"""
+        client.closed = True
+        # Make room for the close sentinel; pending events are discarded
+        with client.queue.mutex:
+            client.queue.queue.clear()
+        client.queue.put_nowait(_CLOSE)
+
+    def publish(self, event_type: str, data: Dict[str, Any], event_id: int = None):
+        """Push an event to every client without ever blocking the publisher"""
+        event = WebEvent(event_type, data, event_id)
+
+        with self._lock:
+            clients = list(self._clients)
+
+        slow_clients = []
+        for client in clients:
+            if not client.wants(event):
+                continue
+            try:
+                client.queue.put_nowait(event)
+            except queue.Full:
+                slow_clients.append(client)
+
+        if slow_clients:
+            with self._lock:
+                for client in slow_clients:
+                    if client in self._clients:
+                        self._clients.remove(client)
+                        client.dropped = True
+                        self.dropped_clients += 1
+            for client in slow_clients:
+                self._disconnect(client)
+
+    def close_all(self):
+        """Disconnect every client"""
+        with self._lock:
+            clients = list(self._clients)
+            self._clients.clear()
+        for client in clients:
+            self._disconnect(client)
+
+    @property
+    def client_count(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+
+# Singleton instance
+web_event_hub = WebEventHub()
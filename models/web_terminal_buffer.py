@@ -1,25 +1,156 @@
+"""
+Shared terminal output buffer for the web interface
+
+Output is stored as a ring of chunks, each tagged with a monotonically
+increasing sequence number, so web clients can fetch only what they have not
+seen yet. Memory is bounded by the UTF-8 size of the retained chunks.
+"""
+
+import contextlib
 import threading
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, List
+
+# Default cap on retained output (bytes of UTF-8)
+DEFAULT_MAX_BYTES = 50000
+
+
+@dataclass(frozen=True)
+class TerminalChunk:
+    """A single piece of terminal output"""
+
+    seq: int
+    text: str
+    size: int
+
+
+@dataclass
+class TerminalDelta:
+    """Output appended after a given sequence number"""
+
+    output: str
+    seq: int
+    first_seq: int
+    epoch: int
+    reset: bool
 
 
 class WebTerminalBuffer:
-    def __init__(self):
-        self._output = ""
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._chunks: deque = deque()
+        self._size = 0
+        self._last_seq = 0
+        self._epoch = 0
         self._lock = threading.Lock()
+        self._listeners: List[Callable[[TerminalChunk], None]] = []
+
+    def add_listener(self, callback: Callable[[TerminalChunk], None]):
+        """Add a callback to be called with every appended chunk"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[TerminalChunk], None]):
+        """Remove a chunk listener"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    @staticmethod
+    def _trim_to_bytes(text: str, max_bytes: int) -> str:
+        """Keep the tail of text that fits in max_bytes of UTF-8"""
+        encoded = text.encode("utf-8")
+        if len(encoded) <= max_bytes:
+            return text
+        return encoded[-max_bytes:].decode("utf-8", errors="ignore")
+
+    def append(self, text: str) -> int:
+        """Append text as a new chunk and return its sequence number"""
+        if not text:
+            return self.last_seq
+
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            text = self._trim_to_bytes(text, self.max_bytes)
+            size = len(text.encode("utf-8"))
+
+        with self._lock:
+            self._last_seq += 1
+            chunk = TerminalChunk(self._last_seq, text, size)
+            self._chunks.append(chunk)
+            self._size += size
+
+            # Evict whole chunks from the front until we are within budget
+            while self._size > self.max_bytes and len(self._chunks) > 1:
+                evicted = self._chunks.popleft()
+                self._size -= evicted.size
+
+            # Notify under the lock so listeners see chunks in sequence order.
+            # Listeners must not call back into the buffer.
+            for listener in list(self._listeners):
+                with contextlib.suppress(Exception):
+                    listener(chunk)
+
+            return chunk.seq
+
+    def get(self) -> str:
+        """Get all retained output"""
+        with self._lock:
+            return "".join(chunk.text for chunk in self._chunks)
+
+    def get_since(self, since: int) -> TerminalDelta:
+        """
+        Get output appended after sequence number since.
+
+        reset is True when the caller's view can't be extended incrementally
+        (output was evicted or cleared), in which case output holds
+        everything retained and should replace what the caller has.
+        """
+        with self._lock:
+            first_seq = self._chunks[0].seq if self._chunks else self._last_seq + 1
+            reset = since > self._last_seq or (since < first_seq - 1 and since > 0)
+            start = 0 if reset else max(since, 0)
+
+            count = min(self._last_seq - start, len(self._chunks))
+            if count > 0:
+                newest = list(islice(reversed(self._chunks), count))
+                output = "".join(chunk.text for chunk in reversed(newest))
+            else:
+                output = ""
+
+            return TerminalDelta(
+                output=output,
+                seq=self._last_seq,
+                first_seq=first_seq,
+                epoch=self._epoch,
+                reset=reset,
+            )
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the most recent chunk"""
+        with self._lock:
+            return self._last_seq
 
-    def append(self, text):
+    @property
+    def epoch(self) -> int:
+        """Counter incremented every time the buffer is cleared"""
         with self._lock:
-            self._output += text
-            # Limit buffer size to last 50KB
-            if len(self._output) > 50000:
-                self._output = self._output[-50000:]
+            return self._epoch
 
-    def get(self):
+    @property
+    def size_bytes(self) -> int:
+        """Total UTF-8 size of retained output"""
         with self._lock:
-            return self._output
+            return self._size
 
     def clear(self):
         with self._lock:
-            self._output = ""
+            self._chunks.clear()
+            self._size = 0
+            # Sequence numbers keep increasing so stale cursors never match new data
+            self._epoch += 1
 
 
 # Singleton instance
@@ -0,0 +1,281 @@
+"""
+Base image pre-pull
+
+The first build of a new language variant would otherwise stall while
+docker pulls its base image. At startup, the FROM images of every template
+in defaults/ and of the projects' own Dockerfiles are checked, and those
+missing for the build platform are pulled in the background, a few at a
+time (service.base_image_prepull_concurrency). The state of every base image
+is kept so readiness can be reported.
+"""
+
+import asyncio
+import logging
+import re
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from config.config import get_config
+from services.platform_service import PlatformService
+from utils.async_utils import run_in_executor, task_manager
+from utils.docker_engine import (
+    ENGINE_ERRORS,
+    DockerEngineError,
+    configured_engine_client,
+)
+
+logger = logging.getLogger("BaseImages")
+
+
+# Pulls of large SDK images take a while on slow links
+PULL_TIMEOUT = 1800.0
+
+# What the build_docker.sh templates build for (their DOCKER_DEFAULT_PLATFORM)
+BUILD_PLATFORM = "linux/amd64"
+
+# Base image states
+PRESENT = "present"  # Already there at startup
+QUEUED = "queued"
+PULLING = "pulling"
+PULLED = "pulled"
+FAILED = "failed"
+
+_FROM_LINE = re.compile(
+    r"^\s*FROM\s+(?:--\S+\s+)*(\S+)(?:\s+AS\s+(\S+))?",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def dockerfile_base_images(text: str) -> List[str]:
+    """
+    Images the FROM lines of a Dockerfile pull, in order; earlier stages,
+    scratch and images named through build args are left out
+    """
+    images, stages = [], set()
+    for match in _FROM_LINE.finditer(text.replace("\\\n", " ")):
+        image, stage = match.group(1), match.group(2)
+        if (
+            image.lower() not in stages
+            and image != "scratch"
+            and "$" not in image
+            and image not in images
+        ):
+            images.append(image)
+        if stage:
+            stages.add(stage.lower())
+    return images
+
+
+def find_base_images(
+    template_dir: Path, project_paths: Iterable[Path] = ()
+) -> Dict[str, List[str]]:
+    """Base image -> the Dockerfiles using it, templates first"""
+    dockerfiles = sorted(Path(template_dir).glob("*/Dockerfile*"))
+    dockerfiles += [Path(path) / "Dockerfile" for path in project_paths]
+
+    images: Dict[str, List[str]] = {}
+    for dockerfile in dockerfiles:
+        try:
+            text = dockerfile.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            continue  # Projects without a Dockerfile yet
+        for image in dockerfile_base_images(text):
+            images.setdefault(image, []).append(str(dockerfile))
+    return images
+
+
+def split_reference(image: str) -> Tuple[str, str]:
+    """(repository, tag or digest) to pull; a digest wins over a tag"""
+    name, _, digest = image.partition("@")
+    repository, tag = name, "latest"
+    if ":" in name.rsplit("/", 1)[-1]:
+        repository, tag = name.rsplit(":", 1)
+    return repository, digest or tag
+
+
+def platform_matches(found: str, wanted: str) -> bool:
+    """Whether an image's "os/architecture" is the one wanted (variants aside)"""
+    return found.strip().lower().split("/")[:2] == wanted.lower().split("/")[:2]
+
+
+def format_readiness(states: Dict[str, str], errors: Dict[str, str]) -> str:
+    """e.g. "Base images ready: 6/7 (failed: node:22 - manifest unknown)" """
+    ready = sum(state in (PRESENT, PULLED) for state in states.values())
+    pulled = sum(state == PULLED for state in states.values())
+    text = f"Base images ready: {ready}/{len(states)}"
+    if pulled:
+        text += f", {pulled} pulled"
+    failed = [f"{image} - {error}" for image, error in errors.items()]
+    if failed:
+        text += f" (failed: {'; '.join(failed)})"
+    return text
+
+
+class BaseImagePrepull:
+    """Pulls missing base images in the background and tracks their state"""
+
+    def __init__(self, platform: str = BUILD_PLATFORM):
+        self.platform = platform
+        self.states: Dict[str, str] = {}
+        self.errors: Dict[str, str] = {}
+        self._future = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether every known base image is present"""
+        return all(state in (PRESENT, PULLED) for state in self.states.values())
+
+    def readiness(self) -> str:
+        return format_readiness(self.states, self.errors)
+
+    async def prepull(
+        self,
+        images: Iterable[str],
+        concurrency: Optional[int] = None,
+        progress_callback: Callable[[str], None] = None,
+    ) -> Dict[str, str]:
+        """Pull the images that are not present; their states when done"""
+        if concurrency is None:
+            concurrency = get_config().service.base_image_prepull_concurrency
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        images = list(dict.fromkeys(images))
+        await asyncio.gather(
+            *(self._prepare(image, semaphore, progress_callback) for image in images)
+        )
+        return {image: self.states[image] for image in images}
+
+    async def _prepare(
+        self,
+        image: str,
+        semaphore: asyncio.Semaphore,
+        progress_callback: Callable[[str], None] = None,
+    ):
+        if self.states.get(image) in (PRESENT, PULLED):
+            return
+        if await self._present(image):
+            self.states[image] = PRESENT
+            return
+        self.states[image] = QUEUED
+        async with semaphore:
+            self.states[image] = PULLING
+            if progress_callback:
+                progress_callback(f"Pulling base image {image}...")
+            error = await self._pull(image)
+        if error is None:
+            self.states[image] = PULLED
+            self.errors.pop(image, None)
+            logger.info(f"Pulled base image {image}")
+        else:
+            self.states[image] = FAILED
+            self.errors[image] = error
+            logger.warning(f"Cannot pull base image {image}: {error}")
+
+    async def _present(self, image: str) -> bool:
+        """Whether the image is there for self.platform"""
+        engine = configured_engine_client()
+        if engine is not None:
+            try:
+                found = await run_in_executor(engine.inspect_image, image)
+            except ENGINE_ERRORS as e:
+                logger.debug(f"Engine API unavailable: {e}")
+            else:
+                return found is not None and platform_matches(
+                    f"{found.get('Os', '')}/{found.get('Architecture', '')}",
+                    self.platform,
+                )
+        try:
+            result = await PlatformService.run_command_async(
+                "DOCKER_COMMANDS",
+                subkey="image_platform",
+                tag=image,
+                capture_output=True,
+                timeout=30.0,
+            )
+        except Exception as e:
+            logger.debug(f"Cannot inspect image {image}: {e}")
+            return False
+        return result.returncode == 0 and platform_matches(result.stdout, self.platform)
+
+    async def _pull(self, image: str) -> Optional[str]:
+        """None once pulled, else the error"""
+        engine = configured_engine_client()
+        if engine is not None:
+            repository, tag = split_reference(image)
+            try:
+                # On its own thread: a pull blocks for minutes
+                await asyncio.to_thread(
+                    engine.pull_image, repository, tag, PULL_TIMEOUT, self.platform
+                )
+                return None
+            except DockerEngineError as e:
+                return e.message
+            except ENGINE_ERRORS as e:
+                logger.debug(f"Engine API unavailable: {e}")
+        try:
+            success, output = await PlatformService.run_command_with_result_async(
+                "DOCKER_COMMANDS",
+                subkey="pull",
+                image=image,
+                platform=self.platform,
+                capture_output=True,
+                text=True,
+                timeout=PULL_TIMEOUT,
+            )
+        except Exception as e:
+            return str(e)
+        return None if success else output.strip()
+
+    # Startup task
+
+    @property
+    def is_running(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def start(
+        self,
+        project_service=None,
+        status_callback: Callable[[str, str], None] = None,
+        template_dir: Path = Path("defaults"),
+    ):
+        """
+        Pre-pull the base images of the templates and of project_service's
+        projects; status_callback(message, level) gets the progress and the
+        readiness at the end
+        """
+        if self.is_running:
+            return
+        self._future = task_manager.run_task(
+            self._run(project_service, status_callback, template_dir),
+            task_name="base_image_prepull",
+        )
+
+    def stop(self):
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+    async def _run(
+        self,
+        project_service,
+        status_callback: Callable[[str, str], None],
+        template_dir: Path,
+    ):
+        project_paths = []
+        if project_service is not None:
+            projects = await run_in_executor(project_service.find_two_layer_projects)
+            project_paths = [project.path for project in projects]
+        images = await run_in_executor(find_base_images, template_dir, project_paths)
+
+        def progress(message: str):
+            if status_callback:
+                status_callback(message, "info")
+
+        await self.prepull(images, progress_callback=progress)
+        readiness = self.readiness()
+        logger.info(readiness)
+        if status_callback:
+            status_callback(readiness, "success" if self.ready else "warning")
+
+
+# Global instance for the application
+base_image_prepull = BaseImagePrepull()
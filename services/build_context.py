@@ -0,0 +1,484 @@
+"""
+Docker build context digests
+
+The files Docker would send for `docker build .` (the context directory minus
+what .dockerignore excludes) are hashed in-process. The digest of the last
+successful build is kept per image tag together with the image id, so a
+build whose context is unchanged can be skipped while the image still exists.
+File hashes are reused while a file's size, mtime and inode are unchanged,
+so re-checking a large context mostly costs one stat per file.
+
+The same walk writes the context as a tar stream for `docker build -`, so
+the CLI does not walk the folder again, and sizes it up front: the largest
+top-level entries and files show what makes a context slow to send.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import stat
+import tarfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+RECORD_VERSION = 1
+
+# Sent by `docker build` even when .dockerignore excludes them
+ALWAYS_SENT = ("Dockerfile", ".dockerignore")
+
+_HASH_CHUNK = 1024 * 1024
+
+# Top-level entries that are rarely meant to be in an image
+USUALLY_IGNORED = (
+    ".git",
+    ".venv",
+    "venv",
+    "node_modules",
+    "__pycache__",
+    ".pytest_cache",
+    ".mypy_cache",
+    ".tox",
+)
+
+logger = logging.getLogger("BuildContext")
+
+
+def _pattern_to_regex(pattern: str) -> "re.Pattern":
+    """Translate a .dockerignore pattern like Docker's patternmatcher does"""
+    regex = "^"
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "*":
+            if pattern[i + 1 : i + 2] == "*":
+                i += 1
+                # Treat "**/" as "**"
+                if pattern[i + 1 : i + 2] == "/":
+                    i += 1
+                if i + 1 >= len(pattern):
+                    regex += ".*"
+                else:
+                    regex += "(.*/)?"
+            else:
+                regex += "[^/]*"
+        elif ch == "?":
+            regex += "[^/]"
+        elif ch == "\\" and i + 1 < len(pattern):
+            i += 1
+            regex += re.escape(pattern[i])
+        elif ch in ".+()|{}$^":
+            regex += "\\" + ch
+        else:
+            regex += ch
+        i += 1
+    return re.compile(regex + "$")
+
+
+@dataclass
+class IgnorePattern:
+    text: str
+    exclusion: bool  # A "!" pattern that re-includes matching paths
+    regex: "re.Pattern"
+
+
+class DockerIgnore:
+    """Matcher for .dockerignore patterns (last matching pattern wins)"""
+
+    def __init__(self, lines: List[str]):
+        self.patterns: List[IgnorePattern] = []
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            exclusion = line.startswith("!")
+            if exclusion:
+                line = line[1:].strip()
+            text = os.path.normpath(line).replace(os.sep, "/")
+            if len(text) > 1 and text.startswith("/"):
+                text = text[1:]
+            if text == ".":
+                continue
+            try:
+                regex = _pattern_to_regex(text)
+            except re.error:
+                logger.warning(f"Ignoring invalid .dockerignore pattern: {line}")
+                continue
+            self.patterns.append(IgnorePattern(text, exclusion, regex))
+
+    @classmethod
+    def load(cls, context_dir: Path) -> "DockerIgnore":
+        path = Path(context_dir) / ".dockerignore"
+        try:
+            return cls(path.read_text(encoding="utf-8").splitlines())
+        except (OSError, UnicodeDecodeError):
+            return cls([])
+
+    @property
+    def has_exclusions(self) -> bool:
+        return any(p.exclusion for p in self.patterns)
+
+    def matches(self, rel_path: str) -> bool:
+        """Whether rel_path (or one of its parent directories) is ignored"""
+        parents = rel_path.split("/")[:-1]
+        matched = False
+        for pattern in self.patterns:
+            # An exception only matters for something already excluded
+            if pattern.exclusion and not matched:
+                continue
+            match = bool(pattern.regex.match(rel_path))
+            if not match and parents:
+                match = any(
+                    pattern.regex.match("/".join(parents[: i + 1]))
+                    for i in range(len(parents))
+                )
+            if match:
+                matched = not pattern.exclusion
+        return matched
+
+    def may_reinclude(self, rel_dir: str) -> bool:
+        """Whether an exception pattern could re-include files under rel_dir"""
+        prefix = rel_dir + "/"
+        return any(
+            p.exclusion and (p.text + "/").startswith(prefix) for p in self.patterns
+        )
+
+
+def iter_context_entries(
+    context_dir: Path, ignore: Optional[DockerIgnore] = None
+) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    (relative path, lstat) of every directory, file and symlink docker would
+    send, in a stable order. Excluded directories are not descended into
+    unless an exception pattern may re-include something below them.
+    """
+    context_dir = Path(context_dir)
+    ignore = ignore if ignore is not None else DockerIgnore.load(context_dir)
+
+    def walk(rel_dir: str) -> Iterator[Tuple[str, os.stat_result]]:
+        try:
+            with os.scandir(context_dir / rel_dir if rel_dir else context_dir) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            logger.debug(f"Cannot list {rel_dir or context_dir}: {e}")
+            return
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                info = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            excluded = ignore.matches(rel_path) and rel_path not in ALWAYS_SENT
+            if stat.S_ISDIR(info.st_mode):
+                if not excluded:
+                    yield rel_path, info
+                    yield from walk(rel_path)
+                elif ignore.has_exclusions and ignore.may_reinclude(rel_path):
+                    yield from walk(rel_path)
+            elif not excluded:
+                yield rel_path, info
+
+    yield from walk("")
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class ContextDigest:
+    """Digest of a build context and the per-file hashes it was built from"""
+
+    digest: str
+    file_count: int
+    total_bytes: int
+    # path -> [size, mtime_ns, inode, sha256], reused by the next computation
+    file_hashes: Dict[str, list] = field(default_factory=dict)
+    elapsed_ms: float = 0.0
+
+
+def compute_context_digest(
+    context_dir: Path,
+    extra: str = "",
+    known_hashes: Optional[Dict[str, list]] = None,
+) -> ContextDigest:
+    """
+    Digest over the relative path, permission bits and content (or link
+    target) of everything in the build context, plus `extra` (e.g. the
+    image tag and build script, which change the image but may be ignored).
+    """
+    started = time.perf_counter()
+    context_dir = Path(context_dir)
+    known_hashes = known_hashes or {}
+    file_hashes: Dict[str, list] = {}
+    digest = hashlib.sha256(extra.encode("utf-8"))
+    file_count = 0
+    total_bytes = 0
+
+    for rel_path, info in iter_context_entries(context_dir):
+        mode = stat.S_IMODE(info.st_mode)
+        if stat.S_ISDIR(info.st_mode):
+            entry = f"d {rel_path} {mode:o}"
+        elif stat.S_ISLNK(info.st_mode):
+            entry = f"l {rel_path} {os.readlink(context_dir / rel_path)}"
+        elif stat.S_ISREG(info.st_mode):
+            key = [info.st_size, info.st_mtime_ns, info.st_ino]
+            known = known_hashes.get(rel_path)
+            if known and known[:3] == key:
+                file_sha = known[3]
+            else:
+                try:
+                    file_sha = _file_sha256(context_dir / rel_path)
+                except OSError:
+                    # Unreadable files make docker build fail; never match
+                    file_sha = f"unreadable-{time.time_ns()}"
+            file_hashes[rel_path] = key + [file_sha]
+            file_count += 1
+            total_bytes += info.st_size
+            entry = f"f {rel_path} {mode:o} {file_sha}"
+        else:
+            continue  # Sockets, fifos and devices are not sent
+        digest.update(entry.encode("utf-8", "surrogateescape"))
+        digest.update(b"\0")
+
+    return ContextDigest(
+        digest=digest.hexdigest(),
+        file_count=file_count,
+        total_bytes=total_bytes,
+        file_hashes=file_hashes,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+    )
+
+
+class _CountingWriter:
+    """Write-only file object that counts what passes through"""
+
+    def __init__(self, fileobj: BinaryIO):
+        self.fileobj = fileobj
+        self.written = 0
+
+    def write(self, data: bytes) -> int:
+        self.fileobj.write(data)
+        self.written += len(data)
+        return len(data)
+
+
+@dataclass
+class ContextArchive:
+    """What was sent when streaming a build context"""
+
+    file_count: int
+    total_bytes: int  # File contents
+    archive_bytes: int  # Tar stream, headers and padding included
+    elapsed_ms: float
+
+
+def write_context_tar(
+    context_dir: Path, fileobj: BinaryIO, ignore: Optional[DockerIgnore] = None
+) -> ContextArchive:
+    """
+    Stream the build context to fileobj as an uncompressed tar, as the
+    docker CLI would send it: .dockerignore applied, owner root, modes and
+    mtimes kept. Nothing is buffered beyond tarfile's blocks.
+    """
+    started = time.perf_counter()
+    context_dir = Path(context_dir)
+    counter = _CountingWriter(fileobj)
+    file_count = 0
+    total_bytes = 0
+
+    with tarfile.open(fileobj=counter, mode="w|", format=tarfile.PAX_FORMAT) as tar:
+        for rel_path, info in iter_context_entries(context_dir, ignore):
+            path = context_dir / rel_path
+            if not (
+                stat.S_ISDIR(info.st_mode)
+                or stat.S_ISREG(info.st_mode)
+                or stat.S_ISLNK(info.st_mode)
+            ):
+                continue  # Sockets, fifos and devices are not sent
+            member = tar.gettarinfo(str(path), arcname=rel_path)
+            member.uid = member.gid = 0
+            member.uname = member.gname = ""
+            if member.isreg():
+                with open(path, "rb") as f:
+                    tar.addfile(member, f)
+                file_count += 1
+                total_bytes += member.size
+            else:
+                tar.addfile(member)
+
+    return ContextArchive(
+        file_count=file_count,
+        total_bytes=total_bytes,
+        archive_bytes=counter.written,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+    )
+
+
+def context_file_sizes(context_dir: Path) -> Dict[str, int]:
+    """Size of every file docker would send, by relative path"""
+    return {
+        rel_path: info.st_size
+        for rel_path, info in iter_context_entries(context_dir)
+        if stat.S_ISREG(info.st_mode)
+    }
+
+
+@dataclass
+class ContextSizeReport:
+    """Where the bytes of a build context are"""
+
+    file_count: int
+    total_bytes: int
+    # (top-level name, bytes, files), directories with a trailing "/"
+    top_level: List[Tuple[str, int, int]]
+    largest_files: List[Tuple[str, int]]
+
+
+def context_size_report(sizes: Dict[str, int], limit: int = 5) -> ContextSizeReport:
+    """Largest top-level entries and files of a context's file sizes"""
+    top_level: Dict[str, List[int]] = {}
+    for rel_path, size in sizes.items():
+        head, separator, _ = rel_path.partition("/")
+        totals = top_level.setdefault(head + separator, [0, 0])
+        totals[0] += size
+        totals[1] += 1
+    by_size = sorted(top_level.items(), key=lambda item: (-item[1][0], item[0]))
+    largest = sorted(sizes.items(), key=lambda item: (-item[1], item[0]))
+    return ContextSizeReport(
+        file_count=len(sizes),
+        total_bytes=sum(sizes.values()),
+        top_level=[(name, size, files) for name, (size, files) in by_size[:limit]],
+        largest_files=largest[:limit],
+    )
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def format_context_report(report: ContextSizeReport) -> str:
+    """Text shown before a build"""
+    lines = [
+        f"Build context: {report.file_count} files, "
+        f"{_format_bytes(report.total_bytes)}"
+    ]
+    if report.top_level:
+        lines.append("Largest entries:")
+    for name, size, files in report.top_level:
+        hint = ""
+        if name.rstrip("/") in USUALLY_IGNORED:
+            hint = "  <- usually belongs in .dockerignore"
+        count = f" ({files} files)" if name.endswith("/") else ""
+        lines.append(f"   {_format_bytes(size):>10}  {name}{count}{hint}")
+    if report.largest_files:
+        lines.append("Largest files:")
+    for rel_path, size in report.largest_files:
+        lines.append(f"   {_format_bytes(size):>10}  {rel_path}")
+    return "\n".join(lines) + "\n"
+
+
+class BuildRecordStore:
+    """Last successful build (context digest and image id) per image tag"""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def path_for(self, docker_tag: str) -> Path:
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", docker_tag)
+        return self.directory / f"{safe}.json"
+
+    def load(self, docker_tag: str) -> Optional[dict]:
+        path = self.path_for(docker_tag)
+        if not path.is_file():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+            if record.get("version") != RECORD_VERSION:
+                return None
+            return record if record.get("tag") == docker_tag else None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable build record {path}: {e}")
+            return None
+
+    def save(
+        self,
+        docker_tag: str,
+        context: ContextDigest,
+        image_id: Optional[str],
+        context_dir: Path,
+    ):
+        record = {
+            "version": RECORD_VERSION,
+            "tag": docker_tag,
+            "context_dir": str(context_dir),
+            "digest": context.digest,
+            "image_id": image_id,
+            "built_at": time.time(),
+            "files": context.file_hashes,
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(docker_tag)
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, separators=(",", ":"))
+        # Atomic so a concurrent reader never sees a partial file
+        os.replace(temp_path, path)
+
+    def forget(self, docker_tag: str):
+        try:
+            self.path_for(docker_tag).unlink()
+        except FileNotFoundError:
+            pass
+
+
+def default_record_dir() -> Path:
+    return Path.home() / ".cache" / "docker_tools" / "builds"
+
+
+_FROM_LINE = re.compile(r"^\s*FROM\s+(?:--\S+\s+)*(\S+)", re.IGNORECASE | re.MULTILINE)
+
+
+def base_image_key(context_dir: Path, dockerfile: str = "Dockerfile") -> str:
+    """
+    Folder name for the build cache shared by images with the same base: the
+    repository of the first FROM image without registry, tag or digest
+    (e.g. "python", "node", "dotnet_sdk"). "default" when it cannot be told.
+    """
+    try:
+        text = (Path(context_dir) / dockerfile).read_text(
+            encoding="utf-8", errors="replace"
+        )
+    except OSError:
+        return "default"
+    match = _FROM_LINE.search(text)
+    if not match or "$" in match.group(1):
+        return "default"
+
+    image = match.group(1).split("@", 1)[0]
+    parts = image.split("/")
+    if len(parts) > 1 and (
+        "." in parts[0] or ":" in parts[0] or parts[0] == "localhost"
+    ):
+        parts = parts[1:]  # Registry host
+    if parts[0] == "library":
+        parts = parts[1:]
+    parts[-1] = parts[-1].split(":", 1)[0]
+    key = re.sub(r"[^A-Za-z0-9_.-]", "_", "_".join(parts).lower())
+    return key or "default"
+
+
+def default_buildkit_cache_dir() -> Path:
+    return Path.home() / ".cache" / "docker_tools" / "buildkit"
@@ -0,0 +1,261 @@
+"""
+Container resource sampling
+
+While tests run, their container's stats are sampled every
+service.resource_sample_interval seconds, through the Engine API
+(`GET /containers/{id}/stats?stream=0`) or `docker stats --no-stream`, and
+the peaks are kept: CPU %, memory and PIDs. Block I/O is a running total,
+so its last sample is its peak.
+
+Test containers can also be given --cpus/--memory limits (service.test_cpus,
+service.test_memory) so timings of different versions are comparable.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import shlex
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+from config.config import get_config
+from services.platform_service import PlatformService
+from utils.docker_engine import ENGINE_ERRORS, DockerEngineClient
+
+logger = logging.getLogger("ContainerStats")
+
+
+# Units of `docker stats` (decimal kB/MB/..., binary KiB/MiB/...)
+_STATS_UNITS = {
+    "b": 1,
+    "kb": 1000,
+    "mb": 1000**2,
+    "gb": 1000**3,
+    "tb": 1000**4,
+    "kib": 1024,
+    "mib": 1024**2,
+    "gib": 1024**3,
+    "tib": 1024**4,
+}
+
+# Units of --memory ("512m", "4g"; always binary)
+_LIMIT_UNITS = {"": 1, "b": 1, "k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4}
+
+
+def parse_size(text: str) -> int:
+    """Bytes of a `docker stats` size such as "1.5MiB" or "12kB" (0 if unknown)"""
+    match = re.fullmatch(r"\s*([\d.]+)\s*([a-zA-Z]*)\s*", text)
+    if not match:
+        return 0
+    unit = _STATS_UNITS.get(match.group(2).lower() or "b")
+    return int(float(match.group(1)) * unit) if unit else 0
+
+
+def memory_limit_bytes(text: str) -> int:
+    """Bytes of a --memory value such as "512m" or "4g" """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([bkmgt]?)b?\s*", text.lower())
+    if not match:
+        raise ValueError(f"Invalid memory limit: {text!r}")
+    return int(float(match.group(1)) * _LIMIT_UNITS[match.group(2)])
+
+
+@dataclass
+class ResourceSample:
+    """One reading of a container's stats"""
+
+    cpu_percent: float = 0.0  # 100 per fully used core
+    memory_bytes: int = 0
+    memory_limit_bytes: int = 0
+    block_read_bytes: int = 0
+    block_write_bytes: int = 0
+    pids: int = 0
+
+
+def cli_sample(line: str) -> Optional[ResourceSample]:
+    """A sample from `docker stats --no-stream --format "{{json .}}"`"""
+    try:
+        stats = json.loads(line)
+    except ValueError:
+        return None
+    memory, _, limit = stats.get("MemUsage", "").partition("/")
+    read, _, written = stats.get("BlockIO", "").partition("/")
+    pids = stats.get("PIDs", "")
+    return ResourceSample(
+        cpu_percent=float(stats.get("CPUPerc", "0").rstrip("%") or 0),
+        memory_bytes=parse_size(memory),
+        memory_limit_bytes=parse_size(limit),
+        block_read_bytes=parse_size(read),
+        block_write_bytes=parse_size(written),
+        pids=int(pids) if pids.isdigit() else 0,
+    )
+
+
+def engine_sample(stats: Dict[str, Any]) -> ResourceSample:
+    """A sample from the Engine API stats, computed the way `docker stats` does"""
+    cpu, precpu = stats.get("cpu_stats", {}), stats.get("precpu_stats", {})
+    cpu_delta = cpu.get("cpu_usage", {}).get("total_usage", 0) - precpu.get(
+        "cpu_usage", {}
+    ).get("total_usage", 0)
+    system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+    online_cpus = cpu.get("online_cpus") or len(
+        cpu.get("cpu_usage", {}).get("percpu_usage") or [None]
+    )
+    cpu_percent = (
+        cpu_delta / system_delta * online_cpus * 100.0
+        if cpu_delta > 0 and system_delta > 0
+        else 0.0
+    )
+
+    memory = stats.get("memory_stats", {})
+    details = memory.get("stats", {})
+    # Page cache is reclaimable: cgroup v2 reports inactive_file, v1 the total_
+    inactive = details.get("inactive_file", details.get("total_inactive_file", 0))
+
+    block = {"read": 0, "write": 0}
+    entries = stats.get("blkio_stats", {}).get("io_service_bytes_recursive") or []
+    for entry in entries:
+        op = entry.get("op", "").lower()
+        if op in block:
+            block[op] += entry.get("value", 0)
+
+    return ResourceSample(
+        cpu_percent=cpu_percent,
+        memory_bytes=max(0, memory.get("usage", 0) - inactive),
+        memory_limit_bytes=memory.get("limit", 0),
+        block_read_bytes=block["read"],
+        block_write_bytes=block["write"],
+        pids=stats.get("pids_stats", {}).get("current", 0),
+    )
+
+
+@dataclass
+class ResourcePeaks:
+    """Highest readings over a run"""
+
+    samples: int = 0
+    cpu_percent: float = 0.0
+    memory_bytes: int = 0
+    memory_limit_bytes: int = 0
+    block_read_bytes: int = 0
+    block_write_bytes: int = 0
+    pids: int = 0
+
+    def add(self, sample: ResourceSample):
+        self.samples += 1
+        self.cpu_percent = max(self.cpu_percent, sample.cpu_percent)
+        self.memory_bytes = max(self.memory_bytes, sample.memory_bytes)
+        self.memory_limit_bytes = sample.memory_limit_bytes
+        self.block_read_bytes = max(self.block_read_bytes, sample.block_read_bytes)
+        self.block_write_bytes = max(self.block_write_bytes, sample.block_write_bytes)
+        self.pids = max(self.pids, sample.pids)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def describe(self) -> str:
+        """e.g. "CPU 187.5%, memory 412.0 MiB / 7.7 GiB, block I/O ..." """
+
+        def mib(size: int) -> str:
+            if size >= 1024**3:
+                return f"{size / 1024**3:.1f} GiB"
+            return f"{size / 1024**2:.1f} MiB"
+
+        memory = mib(self.memory_bytes)
+        if self.memory_limit_bytes:
+            memory += f" / {mib(self.memory_limit_bytes)}"
+        return (
+            f"CPU {self.cpu_percent:.1f}%, memory {memory}, "
+            f"block I/O {mib(self.block_read_bytes)} read / "
+            f"{mib(self.block_write_bytes)} written, {self.pids} PIDs "
+            f"({self.samples} samples)"
+        )
+
+
+class ContainerSampler:
+    """
+    Samples a container in the background for as long as it is entered
+    (async with); readings start one interval in, when the container is up
+    """
+
+    def __init__(
+        self,
+        container: str,
+        engine: Optional[DockerEngineClient] = None,
+        interval: Optional[float] = None,
+    ):
+        self.container = container
+        self.engine = engine
+        self.interval = (
+            get_config().service.resource_sample_interval
+            if interval is None
+            else interval
+        )
+        self.peaks = ResourcePeaks()
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "ContainerSampler":
+        self._task = asyncio.ensure_future(self._run())
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            sample = await self.sample()
+            if sample is not None:
+                self.peaks.add(sample)
+
+    async def sample(self) -> Optional[ResourceSample]:
+        """One reading, or None while the container is not running"""
+        if self.engine is not None:
+            try:
+                # Blocks about a second: the daemon waits for a second reading
+                stats = await asyncio.to_thread(self.engine.stats, self.container)
+            except ENGINE_ERRORS as e:
+                logger.debug(f"No stats for {self.container}: {e}")
+                return None
+            # A container that is not running yet reports no memory stats
+            return engine_sample(stats) if stats.get("memory_stats") else None
+        try:
+            result = await PlatformService.run_command_async(
+                "DOCKER_COMMANDS",
+                subkey="stats",
+                name=self.container,
+                capture_output=True,
+                timeout=30.0,
+            )
+        except Exception as e:
+            logger.debug(f"No stats for {self.container}: {e}")
+            return None
+        if result.returncode != 0 or not result.stdout.strip():
+            return None
+        return cli_sample(result.stdout.strip().splitlines()[-1])
+
+
+def limit_options() -> str:
+    """--cpus/--memory options for `docker run` ("" when unlimited)"""
+    service_config = get_config().service
+    options = ""
+    if service_config.test_cpus:
+        options += f" --cpus {service_config.test_cpus:g}"
+    if service_config.test_memory:
+        options += f" --memory {shlex.quote(service_config.test_memory)}"
+    return options
+
+
+def limit_host_config() -> Dict[str, int]:
+    """The same limits as Engine API HostConfig fields"""
+    service_config = get_config().service
+    host_config = {}
+    if service_config.test_cpus:
+        host_config["NanoCpus"] = int(service_config.test_cpus * 1e9)
+    if service_config.test_memory:
+        host_config["Memory"] = memory_limit_bytes(service_config.test_memory)
+    return host_config
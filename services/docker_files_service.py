@@ -10,6 +10,7 @@ from typing import Tuple, List, Callable, Optional
 from config.config import get_config
 from services.project_group_service import ProjectGroup
 from services.platform_service import PlatformService
+from services.dockerfile_generator import generate_dockerfile
 from models.project import Project
 
 LANGUAGE_EXTENSIONS = get_config().language.extensions
@@ -282,7 +283,9 @@ class DockerFilesService:
                 content = f.read()
             output_callback("   ✅ Based on existing .gitignore\n")
         else:
-            output_callback("   ⚠️  No .gitignore found, creating empty .dockerignore\n")
+            output_callback(
+                "   ⚠️  No .gitignore found, creating empty .dockerignore\n"
+            )
 
         # Add the required line
         if not content.endswith("\n") and content:
@@ -569,6 +572,21 @@ require (
         if not source.exists():
             raise FileNotFoundError(f"Template file not found: {source}")
 
+        # The python variants install system packages around pip, so they
+        # are kept as they are
+        if get_config().service.layered_dockerfiles and template_name == "Dockerfile":
+            generated = generate_dockerfile(
+                project.path, language, source.read_text(encoding="utf-8")
+            )
+            if generated is not None:
+                with open(dest, "w", encoding="utf-8") as f:
+                    f.write(generated.text)
+                output_callback(
+                    f"   ✅ Generated {description} Dockerfile from "
+                    f"{', '.join(generated.manifests)}\n"
+                )
+                return
+
         # Use platform service for standardized file copying
         copy_success, copy_error = PlatformService.copy_file(
             str(source), str(dest), preserve_attrs=True
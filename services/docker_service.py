@@ -2,10 +2,58 @@
 Docker Service - Standardized Async Version
 """
 
+import asyncio
+import contextlib
+import shlex
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Dict, Any
-
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from models.project import Project
+from services.build_context import (
+    BuildRecordStore,
+    ContextArchive,
+    ContextDigest,
+    base_image_key,
+    compute_context_digest,
+    context_file_sizes,
+    context_size_report,
+    default_buildkit_cache_dir,
+    default_record_dir,
+    format_context_report,
+    write_context_tar,
+)
+from services.container_stats import (
+    ContainerSampler,
+    ResourcePeaks,
+    limit_host_config,
+    limit_options,
+)
+from services.image_gc import image_gc
 from services.platform_service import PlatformService
+from services.test_history import get_test_history
+from services.test_result_parser import (
+    ResultSummary,
+    TestResultCollector,
+    framework_for_script,
+    latest_test_results,
+    parse_test_output,
+    run_status,
+)
+from services.test_sharding import (
+    SHARDABLE_LANGUAGES,
+    Shard,
+    default_shard_count,
+    discover_test_files,
+    format_shard_plan,
+    merge_summaries,
+    plan_shards,
+    shard_command,
+)
+from services.warm_containers import warm_containers
 from utils.async_base import (
     AsyncServiceInterface,
     ServiceResult,
@@ -16,22 +64,126 @@ from utils.async_base import (
 from utils.async_utils import (
     run_in_executor,
 )
+from utils.docker_engine import (
+    ENGINE_ERRORS,
+    NO_TIMEOUT,
+    DockerEngineClient,
+    configured_engine_client,
+)
+from utils.language_detection import detect_project_language_sync
 from config.config import get_config
 
 COLORS = get_config().gui.colors
 
 
+def docker_tag_for(project: Project) -> str:
+    """Image tag used when building a project version"""
+    return f"{project.parent}_{project.name}".lower()
+
+
+@dataclass
+class VersionRunResult:
+    """Outcome of building and testing one version of a project group"""
+
+    version: str
+    docker_tag: str
+    build_passed: bool = False
+    tests_passed: Optional[bool] = None  # None when the tests did not run
+    test_status: str = ""
+    build_seconds: float = 0.0
+    test_seconds: float = 0.0
+    error: Optional[str] = None
+    cache_hit: bool = False  # Build skipped, context unchanged
+    test_counts: str = ""  # e.g. "12 passed, 1 failed (13 total)"
+
+    @property
+    def passed(self) -> bool:
+        return self.build_passed and bool(self.tests_passed)
+
+    @property
+    def total_seconds(self) -> float:
+        return self.build_seconds + self.test_seconds
+
+
+class TaggedOutput:
+    """
+    Output callback that prefixes every line with a version label, so that
+    the interleaved output of concurrent runs stays readable. Partial lines
+    are held back until they are complete (or flushed).
+    """
+
+    def __init__(self, label: str, callback: Optional[Callable[[str], None]]):
+        self.prefix = f"[{label}] "
+        self.callback = callback
+        self._pending = ""
+
+    def __call__(self, message: str):
+        if not self.callback:
+            return
+        lines = (self._pending + message).split("\n")
+        self._pending = lines.pop()
+        if lines:
+            self.callback("".join(f"{self.prefix}{line}\n" for line in lines))
+
+    def flush(self):
+        if self.callback and self._pending:
+            self.callback(f"{self.prefix}{self._pending}\n")
+        self._pending = ""
+
+
+def format_run_matrix(results: List[VersionRunResult]) -> str:
+    """Pass/fail and timing table for a group build-and-test run"""
+    width = max([len("Version")] + [len(r.version) for r in results])
+    lines = [
+        f"{'Version':<{width}}  {'Build':<6}  {'Tests':<6}  "
+        f"{'Build':>8}  {'Test':>8}  {'Total':>8}  Status"
+    ]
+    for r in results:
+        build = ("cached" if r.cache_hit else "pass") if r.build_passed else "FAIL"
+        tests = "-" if r.tests_passed is None else "pass" if r.tests_passed else "FAIL"
+        status = r.test_status or r.error or ""
+        if r.test_counts:
+            status = f"{status.splitlines()[0]} - {r.test_counts}"
+        lines.append(
+            f"{r.version:<{width}}  {build:<6}  {tests:<6}  "
+            f"{r.build_seconds:>7.1f}s  {r.test_seconds:>7.1f}s  "
+            f"{r.total_seconds:>7.1f}s  {status.splitlines()[0] if status else ''}"
+        )
+    return "\n".join(lines) + "\n"
+
+
 class DockerService(AsyncServiceInterface):
     """Standardized Docker service with consistent async interface"""
 
     def __init__(self):
         super().__init__("DockerService")
         self.platform_service = PlatformService()
+        # buildx builder name -> whether it exists (checked once per process)
+        self._buildx_builders: Dict[str, bool] = {}
+        self._buildx_lock = asyncio.Lock()
 
     async def health_check(self) -> ServiceResult[Dict[str, Any]]:
         """Check Docker service health"""
         async with self.operation_context("health_check", timeout=10.0) as ctx:
             try:
+                engine = configured_engine_client()
+                if engine is not None:
+                    try:
+                        version = await run_in_executor(engine.version)
+                        return ServiceResult.success(
+                            {
+                                "status": "healthy",
+                                "docker_version": (
+                                    f"Docker Engine {version.get('Version')} "
+                                    f"(API {version.get('ApiVersion')})"
+                                ),
+                                "platform": self.platform_service.get_platform(),
+                                "engine_api": True,
+                            }
+                        )
+                    except ENGINE_ERRORS as e:
+                        self.logger.debug(f"Engine API unavailable: {e}")
+
                 # Check if Docker is available using new async method
                 success, result_output = (
                     await PlatformService.run_command_with_result_async(
@@ -130,9 +282,13 @@ class DockerService(AsyncServiceInterface):
         docker_tag: str,
         progress_callback: Callable[[str], None] = None,
         status_callback: Callable[[str, str], None] = None,
+        force_rebuild: bool = False,
     ) -> ServiceResult[str]:
         """
-        Build Docker image with standardized result format
+        Build Docker image with standardized result format. The build is
+        skipped (metadata "cache_hit") when the build context is unchanged
+        since the last successful build of docker_tag and that image still
+        exists, unless force_rebuild is set.
         """
         # Validate inputs
         if not project_path.exists():
@@ -143,7 +299,9 @@ class DockerService(AsyncServiceInterface):
             error = ValidationError("Docker tag cannot be empty")
             return ServiceResult.error(error)
 
-        async with self.operation_context("build_docker_image", timeout=300.0) as ctx:
+        async with self.operation_context(
+            "build_docker_image", timeout=300.0
+        ) as ctx, image_gc.in_use(docker_tag):
             try:
                 if progress_callback:
                     progress_callback(f"=== DOCKER BUILD ===\n")
@@ -250,8 +408,48 @@ class DockerService(AsyncServiceInterface):
                         f"Warning: Failed to set run_tests.sh execute permissions: {error_msg}\n"
                     )
 
+                # Skip the build when nothing docker would be sent has changed
+                context = None
+                if get_config().service.skip_unchanged_builds:
+                    context, unchanged = await self._check_build_context(
+                        project_path, docker_tag
+                    )
+                    if unchanged and not force_rebuild:
+                        return await self._build_cache_hit(
+                            project_path,
+                            docker_tag,
+                            context,
+                            progress_callback,
+                            status_callback,
+                        )
+
+                if progress_callback:
+                    sizes = (
+                        {path: known[0] for path, known in context.file_hashes.items()}
+                        if context is not None
+                        else await run_in_executor(context_file_sizes, project_path)
+                    )
+                    progress_callback(format_context_report(context_size_report(sizes)))
+
                 # Use bash command execution for the build script
                 build_cmd = f"./build_docker.sh {docker_tag}"
+                cache_env, cache_dir = await self._buildkit_cache_env(
+                    project_path, progress_callback
+                )
+                if cache_env:
+                    build_cmd = f"{cache_env} {build_cmd}"
+
+                # Pipe the context in rather than have docker walk the folder
+                sent: List[ContextArchive] = []
+                stream_context = get_config().service.stream_build_context and (
+                    "BUILD_CONTEXT"
+                    in build_script_path.read_text(encoding="utf-8", errors="replace")
+                )
+                if stream_context:
+                    build_cmd = f"BUILD_CONTEXT=- {build_cmd}"
+
+                def send_context(stdin):
+                    sent.append(write_context_tar(project_path, stdin))
 
                 if progress_callback:
                     progress_callback(f"Command: {build_cmd}\n\n")
@@ -264,13 +462,23 @@ class DockerService(AsyncServiceInterface):
                         command=build_cmd,
                         cwd=str(project_path),
                         output_callback=progress_callback,
+                        input_writer=send_context if stream_context else None,
                     )
                 )
+                if sent and progress_callback:
+                    progress_callback(
+                        f"\nSent build context: {sent[0].file_count} files, "
+                        f"{sent[0].archive_bytes / 1024:.0f} KiB in "
+                        f"{sent[0].elapsed_ms:.0f} ms\n"
+                    )
 
                 if return_code == 0:
                     if status_callback:
                         status_callback("Build Successful", COLORS["success"])
 
+                    if context is not None:
+                        await self._record_build(project_path, docker_tag, context)
+
                     return ServiceResult.success(
                         docker_tag,
                         message="Docker image built successfully",
@@ -278,6 +486,13 @@ class DockerService(AsyncServiceInterface):
                             "build_output": build_output,
                             "project_path": str(project_path),
                             "command": build_cmd,
+                            "cache_hit": False,
+                            "context_digest": context.digest if context else None,
+                            "buildkit_cache": str(cache_dir) if cache_dir else None,
+                            "context_streamed": stream_context,
+                            "context_archive_bytes": (
+                                sent[0].archive_bytes if sent else None
+                            ),
                         },
                     )
                 else:
@@ -301,6 +516,232 @@ class DockerService(AsyncServiceInterface):
                 error = ProcessError(f"Docker build error: {str(e)}")
                 return ServiceResult.error(error)
 
+    async def _buildkit_cache_env(
+        self, project_path: Path, progress_callback: Callable[[str], None] = None
+    ) -> Tuple[str, Optional[Path]]:
+        """
+        Environment assignments that make build_docker.sh use the shared
+        BuildKit cache for the project's base image, and that cache folder.
+        ("", None) when the cache is disabled or cannot be used.
+        """
+        service_config = get_config().service
+        if not service_config.buildkit_cache:
+            return "", None
+
+        script = project_path / "build_docker.sh"
+        if "BUILD_CACHE_DIR" not in script.read_text(
+            encoding="utf-8", errors="replace"
+        ):
+            if progress_callback:
+                progress_callback(
+                    "BuildKit cache skipped: build_docker.sh does not support it "
+                    "(regenerate the Docker files to update it)\n"
+                )
+            return "", None
+
+        builder = service_config.buildkit_builder
+        if builder and not await self._ensure_buildx_builder(builder):
+            if progress_callback:
+                progress_callback(
+                    f"BuildKit cache skipped: buildx builder '{builder}' is not available\n"
+                )
+            return "", None
+
+        root = (
+            Path(service_config.buildkit_cache_dir)
+            if service_config.buildkit_cache_dir
+            else default_buildkit_cache_dir()
+        )
+        cache_dir = root / await run_in_executor(base_image_key, project_path)
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            self.logger.warning(f"Cannot create BuildKit cache {cache_dir}: {e}")
+            return "", None
+
+        if progress_callback:
+            progress_callback(f"BuildKit cache: {cache_dir}\n")
+        env = f"BUILD_CACHE_DIR={shlex.quote(cache_dir.as_posix())}"
+        if builder:
+            env += f" BUILDX_BUILDER={shlex.quote(builder)}"
+        return env, cache_dir
+
+    async def _ensure_buildx_builder(self, builder: str) -> bool:
+        """
+        Make sure the docker-container builder exists; the default docker
+        driver cannot export a local cache. Created once, never made default.
+        """
+        async with self._buildx_lock:
+            if builder in self._buildx_builders:
+                return self._buildx_builders[builder]
+
+            exists, _ = await PlatformService.run_command_with_result_async(
+                "DOCKER_COMMANDS",
+                subkey="buildx_inspect",
+                builder=builder,
+                capture_output=True,
+                text=True,
+                timeout=30.0,
+            )
+            if not exists:
+                exists, output = await PlatformService.run_command_with_result_async(
+                    "DOCKER_COMMANDS",
+                    subkey="buildx_create",
+                    builder=builder,
+                    capture_output=True,
+                    text=True,
+                    timeout=60.0,
+                )
+                if not exists:
+                    self.logger.warning(
+                        f"Cannot create buildx builder {builder}: {output}"
+                    )
+            self._buildx_builders[builder] = exists
+            return exists
+
+    def _build_records(self) -> BuildRecordStore:
+        directory = get_config().service.build_record_dir
+        return BuildRecordStore(Path(directory) if directory else default_record_dir())
+
+    async def _image_id(self, docker_tag: str) -> Optional[str]:
+        """Id of the local image tagged docker_tag, or None if there is none"""
+        engine = configured_engine_client()
+        if engine is not None:
+            try:
+                return await run_in_executor(engine.image_id, docker_tag)
+            except ENGINE_ERRORS as e:
+                self.logger.debug(f"Engine API unavailable: {e}")
+        try:
+            result = await PlatformService.run_command_async(
+                "DOCKER_COMMANDS",
+                subkey="image_id",
+                tag=docker_tag,
+                capture_output=True,
+                timeout=30.0,
+            )
+        except Exception as e:
+            self.logger.debug(f"Cannot inspect image {docker_tag}: {e}")
+            return None
+        image_id = result.stdout.strip() if result.returncode == 0 else ""
+        return image_id or None
+
+    async def _check_build_context(
+        self, project_path: Path, docker_tag: str
+    ) -> Tuple[ContextDigest, bool]:
+        """
+        Digest the build context and tell whether the image currently tagged
+        docker_tag was built from exactly this context.
+        """
+        records = self._build_records()
+        record = await run_in_executor(records.load, docker_tag)
+
+        # The tag and build script shape the image too, even if .dockerignore'd
+        script = project_path / "build_docker.sh"
+        extra = f"tag={docker_tag}\n" + script.read_text(
+            encoding="utf-8", errors="replace"
+        )
+        context, image_id = await asyncio.gather(
+            run_in_executor(
+                compute_context_digest,
+                project_path,
+                extra,
+                record.get("files") if record else None,
+            ),
+            self._image_id(docker_tag),
+        )
+        unchanged = bool(
+            record
+            and image_id
+            and record.get("digest") == context.digest
+            and record.get("image_id") == image_id
+        )
+        return context, unchanged
+
+    async def _record_build(
+        self, project_path: Path, docker_tag: str, context: ContextDigest
+    ):
+        """Remember the context an image was built from (needs the image id)"""
+        image_id = await self._image_id(docker_tag)
+        if not image_id:
+            return
+        try:
+            await run_in_executor(
+                self._build_records().save, docker_tag, context, image_id, project_path
+            )
+        except OSError as e:
+            self.logger.warning(f"Cannot save build record for {docker_tag}: {e}")
+
+    async def _build_for_tests(
+        self,
+        project_path: Path,
+        docker_tag: str,
+        progress_callback: Callable[[str], None] = None,
+        status_callback: Callable[[str, str], None] = None,
+    ) -> ServiceResult[str]:
+        """
+        Build the image a test run needs, unless its warm container can be
+        brought up to date by copying the changed files in
+        """
+        if get_config().service.warm_containers:
+            container = await warm_containers.reuse(
+                project_path, docker_tag, progress_callback
+            )
+            if container is not None:
+                if progress_callback:
+                    progress_callback(
+                        f"Warm container {container.name} is up to date, "
+                        f"skipping the build of {docker_tag}\n"
+                    )
+                if status_callback:
+                    status_callback("Build Skipped (Warm Container)", COLORS["success"])
+                return ServiceResult.success(
+                    docker_tag,
+                    message="Warm container up to date, build skipped",
+                    metadata={
+                        "build_output": "",
+                        "project_path": str(project_path),
+                        "cache_hit": True,
+                        "warm_container": container.name,
+                    },
+                )
+        return await self.build_docker_image(
+            project_path, docker_tag, progress_callback, status_callback
+        )
+
+    async def _build_cache_hit(
+        self,
+        project_path: Path,
+        docker_tag: str,
+        context: ContextDigest,
+        progress_callback: Callable[[str], None] = None,
+        status_callback: Callable[[str, str], None] = None,
+    ) -> ServiceResult[str]:
+        if progress_callback:
+            progress_callback(
+                f"Build context unchanged ({context.file_count} files, "
+                f"{context.total_bytes / 1024:.0f} KiB, digest "
+                f"{context.digest[:12]}, checked in {context.elapsed_ms:.0f} ms)\n"
+                f"Cache hit: using existing image {docker_tag}\n"
+            )
+        if status_callback:
+            status_callback("Build Skipped (Cache Hit)", COLORS["success"])
+
+        # Refresh the stored file stats so the next check hashes nothing
+        await self._record_build(project_path, docker_tag, context)
+
+        return ServiceResult.success(
+            docker_tag,
+            message="Build context unchanged, using existing image",
+            metadata={
+                "build_output": "",
+                "project_path": str(project_path),
+                "cache_hit": True,
+                "context_digest": context.digest,
+                "context_files": context.file_count,
+                "context_bytes": context.total_bytes,
+            },
+        )
+
     async def run_docker_tests(
         self,
         project_path: Path,
@@ -316,7 +757,9 @@ class DockerService(AsyncServiceInterface):
             error = ValidationError(f"Project path does not exist: {project_path}")
             return ServiceResult.error(error)
 
-        async with self.operation_context("run_docker_tests", timeout=300.0) as ctx:
+        async with self.operation_context(
+            "run_docker_tests", timeout=300.0
+        ) as ctx, image_gc.in_use(docker_tag):
             try:
                 if status_callback:
                     status_callback("Running Tests...", COLORS["info"])
@@ -324,71 +767,371 @@ class DockerService(AsyncServiceInterface):
                 if progress_callback:
                     progress_callback(f"\n=== DOCKER TEST ===\n")
 
-                # Use bash command execution for the test command
-                test_cmd = f"docker run --rm {docker_tag} ./run_tests.sh"
-
-                if progress_callback:
-                    progress_callback(f"Command: {test_cmd}\n\n")
+                # Parse results while the output streams
+                collector = TestResultCollector(
+                    await run_in_executor(self._test_framework, project_path)
+                )
 
-                # Use streaming subprocess for real-time output
-                return_code, test_output = (
-                    await PlatformService.run_command_streaming_async(
-                        "SHELL_COMMANDS",
-                        subkey="bash_execute",
-                        command=test_cmd,
-                        cwd=str(project_path),
-                        output_callback=progress_callback,
+                def stream_output(chunk: str):
+                    collector.feed(chunk)
+                    if progress_callback:
+                        progress_callback(chunk)
+
+                async with (
+                    warm_containers.session(project_path, docker_tag, progress_callback)
+                    if get_config().service.warm_containers
+                    else contextlib.nullcontext()
+                ) as container:
+                    # Named, so that its resource usage can be sampled
+                    name = (
+                        container.name
+                        if container is not None
+                        else f"docker-tools-test-{uuid.uuid4().hex[:12]}"
                     )
+                    # Use bash command execution for the test command
+                    test_cmd = (
+                        container.exec_command()
+                        if container is not None
+                        else f"docker run --rm --name {name}{limit_options()} "
+                        f"{docker_tag} ./run_tests.sh"
+                    )
+                    engine = configured_engine_client() if container is None else None
+
+                    if progress_callback:
+                        via = " (Engine API)" if engine is not None else ""
+                        progress_callback(f"Command: {test_cmd}{via}\n\n")
+
+                    started_at = time.time()
+                    started = time.perf_counter()
+                    run = None
+                    async with (
+                        ContainerSampler(name, engine)
+                        if get_config().service.resource_sampling
+                        else contextlib.nullcontext()
+                    ) as sampler:
+                        if engine is not None:
+                            try:
+                                run = await self._run_with_engine(
+                                    engine,
+                                    docker_tag,
+                                    ["./run_tests.sh"],
+                                    stream_output,
+                                    name=name,
+                                    host_config=limit_host_config(),
+                                )
+                            except ENGINE_ERRORS as e:
+                                if collector.fed_chars:
+                                    raise  # The tests started; do not run them twice
+                                self.logger.debug(f"Engine API unavailable: {e}")
+                                # Sample the CLI run through the CLI too
+                                if sampler is not None:
+                                    sampler.engine = None
+                        if run is None:
+                            run = await PlatformService.run_command_streaming_async(
+                                "SHELL_COMMANDS",
+                                subkey="bash_execute",
+                                command=test_cmd,
+                                cwd=str(project_path),
+                                output_callback=stream_output,
+                            )
+                    return_code, test_output = run
+                    wall_seconds = time.perf_counter() - started
+                if not collector.fed_chars and test_output:
+                    collector.feed(test_output)  # Output was not streamed
+                summary = collector.close()
+                if sampler is not None and sampler.peaks.samples:
+                    summary.resources = sampler.peaks.to_dict()
+                return await self._report_test_run(
+                    project_path,
+                    docker_tag,
+                    summary,
+                    return_code,
+                    test_output,
+                    wall_seconds,
+                    started_at,
+                    progress_callback,
+                    status_callback,
+                    metadata={"warm_container": container and container.name},
                 )
 
-                # Analyze test results
-                test_status = self._analyze_test_results(test_output, "", return_code)
+            except Exception as e:
+                self.logger.exception("Unexpected error during test execution")
+                error = ProcessError(f"Test execution error: {str(e)}")
+                return ServiceResult.error(error)
 
-                # Determine status color
-                final_color = (
-                    COLORS["success"]
-                    if "COMPLETED" in test_status and "Failed" not in test_status
-                    else COLORS["error"]
+    async def _report_test_run(
+        self,
+        project_path: Path,
+        docker_tag: str,
+        summary: ResultSummary,
+        return_code: int,
+        test_output: str,
+        wall_seconds: float,
+        started_at: float,
+        progress_callback: Callable[[str], None] = None,
+        status_callback: Callable[[str, str], None] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        extra_data: Optional[Dict[str, Any]] = None,
+    ) -> ServiceResult[Dict[str, Any]]:
+        """Record a finished test run, report its status and build the result"""
+        latest_test_results.record(docker_tag, summary)
+        if get_config().service.test_history:
+            await self._record_test_run(
+                project_path,
+                docker_tag,
+                summary,
+                wall_seconds,
+                return_code,
+                started_at,
+            )
+
+        test_status = run_status(summary, return_code)
+
+        # Determine status color
+        final_color = (
+            COLORS["success"]
+            if "COMPLETED" in test_status and "Failed" not in test_status
+            else COLORS["error"]
+        )
+
+        if status_callback:
+            status_callback(
+                (
+                    f"{test_status}: {summary.describe()}"
+                    if summary.recognised
+                    else test_status
+                ),
+                final_color,
+            )
+
+        if progress_callback:
+            progress_callback(f"\nTest Status: {test_status}\n")
+            if summary.recognised:
+                progress_callback(
+                    f"Tests ({summary.framework}): {summary.describe()}\n"
                 )
+                for case in summary.slowest(5):
+                    progress_callback(f"   {case.duration:8.3f}s  {case.name}\n")
+            if summary.resources:
+                peaks = ResourcePeaks(**summary.resources)
+                progress_callback(f"Resources (peak): {peaks.describe()}\n")
+            progress_callback(f"Exit Code: {return_code}\n")
+
+        test_data = {
+            "status": test_status,
+            "return_code": return_code,
+            "raw_output": test_output,
+            "stdout": test_output,
+            "stderr": "",
+            "summary": summary.to_dict(),
+            **(extra_data or {}),
+        }
+        metadata = {"test_summary": summary, **(metadata or {})}
+
+        if return_code == 0:
+            return ServiceResult.success(
+                test_data,
+                message=f"Tests completed: {test_status}",
+                metadata={
+                    "docker_tag": docker_tag,
+                    "project_path": str(project_path),
+                    **metadata,
+                },
+            )
+        # Partial success - tests ran but some failed
+        error = ProcessError(
+            f"Tests failed: {test_status}",
+            return_code=return_code,
+            stdout=test_output,
+            stderr="",
+        )
+        return ServiceResult.partial(test_data, error, metadata=metadata)
+
+    def _plan_test_shards(
+        self, project_path: Path, shard_count: Optional[int] = None
+    ) -> Tuple[Optional[str], List[Shard]]:
+        """(language, shards) for a sharded run; no shards if it cannot split"""
+        language = detect_project_language_sync(project_path)
+        if language not in SHARDABLE_LANGUAGES:
+            return language, []
+        files = discover_test_files(project_path, language)
+
+        service_config = get_config().service
+        if shard_count is None:
+            shard_count = service_config.test_shards or default_shard_count()
+        durations = {}
+        if service_config.test_history:
+            try:
+                durations = get_test_history().file_durations(
+                    project_path.name, project_path.parent.name
+                )
+            except (OSError, sqlite3.Error) as e:
+                self.logger.warning(f"Cannot read test durations: {e}")
+        return language, plan_shards(files, shard_count, durations)
 
-                if status_callback:
-                    status_callback(test_status, final_color)
+    async def run_sharded_tests(
+        self,
+        project_path: Path,
+        docker_tag: str,
+        shard_count: Optional[int] = None,
+        progress_callback: Callable[[str], None] = None,
+        status_callback: Callable[[str, str], None] = None,
+    ) -> ServiceResult[Dict[str, Any]]:
+        """
+        Run the test files split over shard_count containers of docker_tag
+        at once (service.test_shards, or a share of the CPU cores by
+        default), with one merged output and result. Runs run_docker_tests
+        instead when the suite cannot be split in two.
+        """
+        if not project_path.exists():
+            error = ValidationError(f"Project path does not exist: {project_path}")
+            return ServiceResult.error(error)
 
-                if progress_callback:
-                    progress_callback(f"\nTest Status: {test_status}\n")
-                    progress_callback(f"Exit Code: {return_code}\n")
-
-                test_data = {
-                    "status": test_status,
-                    "return_code": return_code,
-                    "raw_output": test_output,
-                    "stdout": test_output,
-                    "stderr": "",
-                }
+        language, shards = await run_in_executor(
+            self._plan_test_shards, project_path, shard_count
+        )
+        if len(shards) < 2:
+            if progress_callback:
+                reason = (
+                    f"{language} test commands do not take test files"
+                    if language not in SHARDABLE_LANGUAGES
+                    else f"{sum(len(s.files) for s in shards)} test file(s)"
+                )
+                progress_callback(f"Not sharding the tests: {reason}\n")
+            return await self.run_docker_tests(
+                project_path, docker_tag, progress_callback, status_callback
+            )
 
-                if return_code == 0:
-                    return ServiceResult.success(
-                        test_data,
-                        message=f"Tests completed: {test_status}",
-                        metadata={
-                            "docker_tag": docker_tag,
-                            "project_path": str(project_path),
-                        },
+        async with self.operation_context(
+            "run_sharded_tests", timeout=300.0
+        ) as ctx, image_gc.in_use(docker_tag):
+            try:
+                if status_callback:
+                    status_callback(
+                        f"Running Tests ({len(shards)} shards)...", COLORS["info"]
+                    )
+                if progress_callback:
+                    progress_callback(f"\n=== DOCKER TEST (SHARDED) ===\n")
+                    progress_callback(format_shard_plan(shards))
+
+                framework = await run_in_executor(self._test_framework, project_path)
+                started_at = time.time()
+                started = time.perf_counter()
+                runs = await asyncio.gather(
+                    *(
+                        self._run_shard(
+                            project_path,
+                            docker_tag,
+                            shard_command(language, shard.files),
+                            TestResultCollector(framework),
+                            TaggedOutput(shard.label(len(shards)), progress_callback),
+                        )
+                        for shard in shards
                     )
-                # Partial success - tests ran but some failed
-                error = ProcessError(
-                    f"Tests failed: {test_status}",
-                    return_code=return_code,
-                    stdout=test_output,
-                    stderr="",
                 )
-                return ServiceResult.partial(test_data, error)
+                wall_seconds = time.perf_counter() - started
+
+                summary = merge_summaries([run[2] for run in runs])
+                return_code = next((run[0] for run in runs if run[0] != 0), 0)
+                test_output = "".join(
+                    f"=== {shard.label(len(shards))}: {' '.join(shard.files)} ===\n"
+                    f"{output}\n"
+                    for shard, (_, output, _) in zip(shards, runs)
+                )
+                shard_data = [
+                    {
+                        "index": shard.index,
+                        "files": shard.files,
+                        "estimated_seconds": shard.estimated_seconds,
+                        "return_code": shard_return_code,
+                        "summary": shard_summary.to_dict(include_cases=False),
+                    }
+                    for shard, (shard_return_code, _, shard_summary) in zip(
+                        shards, runs
+                    )
+                ]
+                return await self._report_test_run(
+                    project_path,
+                    docker_tag,
+                    summary,
+                    return_code,
+                    test_output,
+                    wall_seconds,
+                    started_at,
+                    progress_callback,
+                    status_callback,
+                    extra_data={"shards": shard_data},
+                )
 
             except Exception as e:
-                self.logger.exception("Unexpected error during test execution")
+                self.logger.exception("Unexpected error during sharded test execution")
                 error = ProcessError(f"Test execution error: {str(e)}")
                 return ServiceResult.error(error)
 
+    async def _run_shard(
+        self,
+        project_path: Path,
+        docker_tag: str,
+        command: str,
+        collector: TestResultCollector,
+        output: TaggedOutput,
+    ) -> Tuple[int, str, ResultSummary]:
+        """One shard in its own container; (exit code, output, summary)"""
+
+        def stream_output(chunk: str):
+            collector.feed(chunk)
+            output(chunk)
+
+        output(f"Command: {command}\n")
+        run = None
+        engine = configured_engine_client()
+        if engine is not None:
+            try:
+                run = await self._run_with_engine(
+                    engine,
+                    docker_tag,
+                    ["sh", "-c", command],
+                    stream_output,
+                    host_config=limit_host_config(),
+                )
+            except ENGINE_ERRORS as e:
+                if collector.fed_chars:
+                    raise  # The tests started; do not run them twice
+                self.logger.debug(f"Engine API unavailable: {e}")
+        if run is None:
+            run = await PlatformService.run_command_streaming_async(
+                "SHELL_COMMANDS",
+                subkey="bash_execute",
+                command=f"docker run --rm{limit_options()} {docker_tag} "
+                f"sh -c {shlex.quote(command)}",
+                cwd=str(project_path),
+                output_callback=stream_output,
+            )
+        return_code, test_output = run
+        if not collector.fed_chars and test_output:
+            collector.feed(test_output)  # Output was not streamed
+        output.flush()
+        return return_code, test_output, collector.close()
+
+    async def _run_tests(
+        self,
+        project_path: Path,
+        docker_tag: str,
+        progress_callback: Callable[[str], None] = None,
+        status_callback: Callable[[str, str], None] = None,
+    ) -> ServiceResult[Dict[str, Any]]:
+        """The test run of a build-and-test: sharded when configured"""
+        if get_config().service.test_sharding:
+            return await self.run_sharded_tests(
+                project_path,
+                docker_tag,
+                progress_callback=progress_callback,
+                status_callback=status_callback,
+            )
+        return await self.run_docker_tests(
+            project_path, docker_tag, progress_callback, status_callback
+        )
+
     async def build_and_test(
         self,
         project_path: Path,
@@ -399,10 +1142,12 @@ class DockerService(AsyncServiceInterface):
         """
         Build Docker image and run tests with standardized result format
         """
-        async with self.operation_context("build_and_test", timeout=600.0) as ctx:
+        async with self.operation_context(
+            "build_and_test", timeout=600.0
+        ) as ctx, image_gc.in_use(docker_tag):
             try:
                 # Step 1: Build Docker image
-                build_result = await self.build_docker_image(
+                build_result = await self._build_for_tests(
                     project_path, docker_tag, progress_callback, status_callback
                 )
 
@@ -410,7 +1155,7 @@ class DockerService(AsyncServiceInterface):
                     return ServiceResult.error(build_result.error)
 
                 # Step 2: Run tests
-                test_result = await self.run_docker_tests(
+                test_result = await self._run_tests(
                     project_path, docker_tag, progress_callback, status_callback
                 )
 
@@ -442,38 +1187,179 @@ class DockerService(AsyncServiceInterface):
                 error = ProcessError(f"Build and test error: {str(e)}")
                 return ServiceResult.error(error)
 
-    def _analyze_test_results(self, stdout: str, stderr: str, return_code: int) -> str:
-        """Analyze pytest output to determine actual test status"""
-        output_text = (stdout + stderr).lower()
-
-        if all(
-            indicator not in output_text
-            for indicator in [
-                "collected",
-                "passed",
-                "failed",
-                "error",
-                "::test_",
-                "pytest",
-            ]
-        ):
-            return "FAILED TO RUN" if return_code != 0 else "COMPLETED (No Output)"
+    async def build_and_test_group(
+        self,
+        projects: List[Project],
+        max_parallel: Optional[int] = None,
+        progress_callback: Callable[[str], None] = None,
+        status_callback: Callable[[str, str], None] = None,
+    ) -> ServiceResult[List[VersionRunResult]]:
+        """
+        Build and test several project versions concurrently, at most
+        max_parallel at a time (service.max_parallel_builds by default).
+        Output lines are prefixed with the version they belong to. The result
+        is partial when any version failed to build or pass its tests.
+        """
+        if not projects:
+            error = ValidationError("No project versions to build")
+            return ServiceResult.error(error)
 
-        # Check for specific patterns first
-        if "passed" in output_text and "failed" in output_text:
-            # Look for patterns like "X failed" or "0 failed"
-            import re
+        if max_parallel is None:
+            max_parallel = get_config().service.max_parallel_builds
+        semaphore = asyncio.Semaphore(max(1, max_parallel))
+        finished = 0
 
-            failed_match = re.search(r"(\d+)\s+failed", output_text)
-            if failed_match and int(failed_match.group(1)) == 0:
-                return "COMPLETED (All Tests Passed)"
-            else:
-                return "COMPLETED (Some Tests Failed)"
-        elif "failed" in output_text:
-            return "COMPLETED (All Tests Failed)"
-        elif "passed" in output_text:
-            return "COMPLETED (All Tests Passed)"
-        elif return_code == 0:
-            return "COMPLETED (Success)"
-        else:
-            return "COMPLETED (With Issues)"
+        async def run(project: Project) -> VersionRunResult:
+            nonlocal finished
+            output = TaggedOutput(project.parent, progress_callback)
+            outcome = VersionRunResult(
+                version=project.parent, docker_tag=docker_tag_for(project)
+            )
+            async with image_gc.in_use(outcome.docker_tag), semaphore:
+                started = time.perf_counter()
+                build_result = await self._build_for_tests(
+                    project.path, outcome.docker_tag, output
+                )
+                outcome.build_seconds = time.perf_counter() - started
+                outcome.build_passed = build_result.is_success
+                outcome.cache_hit = bool((build_result.metadata or {}).get("cache_hit"))
+
+                if build_result.is_success:
+                    started = time.perf_counter()
+                    test_result = await self._run_tests(
+                        project.path, outcome.docker_tag, output
+                    )
+                    outcome.test_seconds = time.perf_counter() - started
+                    outcome.tests_passed = test_result.is_success
+                    outcome.test_status = (test_result.data or {}).get("status", "")
+                    summary = (test_result.metadata or {}).get("test_summary")
+                    if summary is not None and summary.recognised:
+                        outcome.test_counts = summary.describe()
+                    if not test_result.is_success:
+                        outcome.error = test_result.error.message
+                else:
+                    outcome.error = build_result.error.message
+
+            output.flush()
+            finished += 1
+            if status_callback:
+                status_callback(
+                    f"{finished}/{len(projects)} versions finished", COLORS["info"]
+                )
+            return outcome
+
+        async with self.operation_context("build_and_test_group") as ctx:
+            try:
+                results = list(await asyncio.gather(*(run(p) for p in projects)))
+            except Exception as e:
+                self.logger.exception("Unexpected error during group build and test")
+                error = ProcessError(f"Group build and test error: {str(e)}")
+                return ServiceResult.error(error)
+
+        passed = sum(1 for r in results if r.passed)
+        message = f"{passed}/{len(results)} versions built and passed their tests"
+        metadata = {"matrix": format_run_matrix(results)}
+        if passed == len(results):
+            return ServiceResult.success(results, message=message, metadata=metadata)
+        error = ProcessError(message, error_code="GROUP_BUILD_TEST_FAILED")
+        return ServiceResult.partial(results, error, message=message, metadata=metadata)
+
+    async def _run_with_engine(
+        self,
+        engine: DockerEngineClient,
+        docker_tag: str,
+        command: List[str],
+        output_callback: Callable[[str], None],
+        name: Optional[str] = None,
+        host_config: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[int, str]:
+        """
+        `docker run --rm` through the Engine API; returns (exit code, output)
+        with stdout and stderr interleaved as they arrived
+        """
+        loop = asyncio.get_running_loop()
+        chunks: List[str] = []
+
+        def forward(text: str):
+            chunks.append(text)
+            loop.call_soon_threadsafe(output_callback, text)
+
+        # On its own thread: following the logs blocks for the whole run, with
+        # no socket timeout as tests may be silent for longer than the client's
+        name = name or f"docker-tools-test-{uuid.uuid4().hex[:12]}"
+        try:
+            return_code, _, _ = await asyncio.to_thread(
+                engine.run,
+                docker_tag,
+                command,
+                output_callback=forward,
+                timeout=NO_TIMEOUT,
+                name=name,
+                host_config=host_config,
+            )
+        except asyncio.CancelledError:
+            # Removing the container ends the logs the thread is blocked on
+            with contextlib.suppress(*ENGINE_ERRORS):
+                await asyncio.to_thread(engine.remove_container, name)
+            raise
+        return return_code, "".join(chunks)
+
+    async def _head_commit(self, project_path: Path) -> Optional[str]:
+        """Commit checked out in project_path, or None outside a repository"""
+        try:
+            result = await PlatformService.run_command_async(
+                "GIT_COMMANDS",
+                subkey="rev_parse_head",
+                cwd=str(project_path),
+                capture_output=True,
+                timeout=10.0,
+            )
+        except Exception as e:
+            self.logger.debug(f"Cannot read HEAD of {project_path}: {e}")
+            return None
+        commit = result.stdout.strip() if result.returncode == 0 else ""
+        return commit or None
+
+    async def _record_test_run(
+        self,
+        project_path: Path,
+        docker_tag: str,
+        summary: ResultSummary,
+        wall_seconds: float,
+        return_code: int,
+        started_at: float,
+    ):
+        """Add a finished run to the test history (project layout: version/name)"""
+        commit_sha, image_id = await asyncio.gather(
+            self._head_commit(project_path), self._image_id(docker_tag)
+        )
+        try:
+            await run_in_executor(
+                get_test_history().record_run,
+                project_path.name,
+                project_path.parent.name,
+                docker_tag,
+                summary,
+                wall_seconds,
+                return_code,
+                commit_sha,
+                image_id,
+                started_at,
+            )
+        except (OSError, sqlite3.Error) as e:
+            self.logger.warning(f"Cannot record test run of {docker_tag}: {e}")
+
+    def _test_framework(self, project_path: Path) -> Optional[str]:
+        """Test runner named in the project's run_tests.sh, if any"""
+        try:
+            script = (project_path / "run_tests.sh").read_text(
+                encoding="utf-8", errors="replace"
+            )
+        except OSError:
+            return None
+        return framework_for_script(script)
+
+    def _analyze_test_results(self, stdout: str, stderr: str, return_code: int) -> str:
+        """Status of a finished test run, from its parsed per-test results"""
+        output = f"{stdout}\n{stderr}" if stderr else stdout
+        return run_status(parse_test_output(output), return_code)
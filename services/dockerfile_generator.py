@@ -0,0 +1,312 @@
+"""
+Layered Dockerfile generation
+
+Instead of a template that copies the whole project before installing its
+dependencies, a Dockerfile is generated from the project's dependency
+manifests (requirements files and pyproject.toml, package.json and its
+lockfile, Cargo.toml, go.mod, pom.xml, *.csproj): only the manifests are
+copied before the install step, so source edits never invalidate the
+dependency layers, and the package manager's download cache is a BuildKit
+cache mount, so a manifest change only downloads what changed.
+
+Where the tests need the packages at run time (Go modules, crates, Maven
+and NuGet repositories) only this project's are installed in the image:
+the cache mount is shared by every project and only ever serves as a
+download cache. The FROM line and system packages still come
+from the language's template in defaults/, so base images stay pinned in
+one place.
+"""
+
+import re
+import xml.etree.ElementTree as ElementTree
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# TOML parser: tomllib (Python 3.11+) or tomli; without either, pyproject.toml
+# and Cargo.toml are not read (Cargo projects keep their template)
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+_INSTRUCTION = re.compile(r"^\s*([A-Za-z]+)\s")
+
+# Folders never searched for manifests
+_SKIPPED_DIRS = {".git", "node_modules", "bin", "obj", "target", "build", "dist"}
+
+
+@dataclass
+class GeneratedDockerfile:
+    """A Dockerfile and the manifests its dependency layers are built from"""
+
+    text: str
+    manifests: List[str]
+
+
+def optional(path: str) -> str:
+    """
+    COPY source that may be missing: a one-character wildcard, the way the
+    templates copy optional files, so other versions without it still build
+    """
+    return f"{path[:-1]}[{path[-1]}]"
+
+
+def template_preamble(template: str) -> List[str]:
+    """
+    The template's lines before its first COPY/ADD (FROM, WORKDIR, system
+    packages), without the comments and blank lines that led into the copy
+    """
+    lines = []
+    for line in template.splitlines():
+        match = _INSTRUCTION.match(line)
+        if match and match.group(1).upper() in ("COPY", "ADD"):
+            break
+        lines.append(line.rstrip())
+    while lines and (not lines[-1].strip() or lines[-1].lstrip().startswith("#")):
+        lines.pop()
+    return lines
+
+
+def _read_toml(path: Path) -> Optional[dict]:
+    if tomllib is None:
+        return None
+    try:
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError):
+        return None
+
+
+def _run(mounts: List[str], commands: List[str]) -> List[str]:
+    """A RUN instruction with cache mounts, one command per line"""
+    options = "".join(f"--mount=type=cache,target={target} " for target in mounts)
+    body = " && \\\n    ".join(commands)
+    return [f"RUN {options}\\\n    {body}"]
+
+
+# Per language: (dependency layer lines, manifests found), or None when the
+# project has no manifest to build them from
+
+
+def _python_layers(project_path: Path) -> Optional[Tuple[List[str], List[str]]]:
+    requirements = sorted(
+        str(path.relative_to(project_path)).replace("\\", "/")
+        for pattern in ("requirements*.txt", "tests/requirements*.txt")
+        for path in project_path.glob(pattern)
+    )
+    pyproject = _read_toml(project_path / "pyproject.toml") or {}
+    has_project_deps = bool(pyproject.get("project", {}).get("dependencies")) or bool(
+        pyproject.get("project", {}).get("optional-dependencies")
+    )
+    if not requirements and not has_project_deps:
+        return None
+
+    manifests = requirements + (["pyproject.toml"] if has_project_deps else [])
+    lines = [
+        "COPY requirements*.tx[t] pyproject.tom[l] ./",
+        "COPY tests/requirements*.tx[t] tests/",
+    ]
+    commands = [
+        "set --",
+        'for f in requirements*.txt tests/requirements*.txt; do [ -f "$f" ] && '
+        'set -- "$@" -r "$f"; done',
+    ]
+    if has_project_deps:
+        # Dependencies and test/dev extras without installing the project
+        # itself, which needs the source
+        commands += [
+            "python -c \"import tomllib; p = tomllib.load(open('pyproject.toml', "
+            "'rb')).get('project', {}); x = p.get('optional-dependencies', {}); "
+            "print('\\n'.join(p.get('dependencies', []) + [d for k in ('test', "
+            "'tests', 'dev') for d in x.get(k, [])]))\" > /tmp/pyproject.txt",
+            'set -- "$@" -r /tmp/pyproject.txt',
+        ]
+    commands += ['{ [ $# -eq 0 ] || pip install "$@"; }', "pip install pytest"]
+    return lines + _run(["/root/.cache/pip"], commands), manifests
+
+
+def _node_layers(project_path: Path) -> Optional[Tuple[List[str], List[str]]]:
+    if not (project_path / "package.json").is_file():
+        return None
+    lockfiles = [
+        name
+        for name in (
+            "package-lock.json",
+            "npm-shrinkwrap.json",
+            "yarn.lock",
+            "pnpm-lock.yaml",
+            ".npmrc",
+        )
+        if (project_path / name).is_file()
+    ]
+    if "pnpm-lock.yaml" in lockfiles:
+        mounts = ["/root/.local/share/pnpm/store"]
+        commands = ["corepack enable", "pnpm install --frozen-lockfile"]
+    elif "yarn.lock" in lockfiles:
+        mounts = ["/usr/local/share/.cache/yarn"]
+        commands = ["yarn install --frozen-lockfile"]
+    else:
+        # npm install, as the template has it: the lockfile may be the
+        # placeholder created with the project files, out of step with
+        # package.json, which npm ci refuses
+        mounts = ["/root/.npm"]
+        commands = ["npm install --prefer-offline --no-audit"]
+    sources = ["package.json"] + [optional(name) for name in lockfiles]
+    lines = [f"COPY {' '.join(sources)} ./"]
+    return lines + _run(mounts, commands), ["package.json"] + lockfiles
+
+
+def _rust_layers(project_path: Path) -> Optional[Tuple[List[str], List[str]]]:
+    cargo = _read_toml(project_path / "Cargo.toml")
+    if cargo is None or "workspace" in cargo:
+        return None  # Workspace members would each need their manifest
+    manifests = ["Cargo.toml"]
+    if (project_path / "Cargo.lock").is_file():
+        manifests.append("Cargo.lock")
+    lines = ["COPY Cargo.toml Cargo.loc[k] ./"]
+    # cargo needs a target to read the manifest; the stand-ins are removed
+    # before the real sources are copied. The project's crates are vendored
+    # into the image's CARGO_HOME, downloaded through the shared cache, and
+    # the source replacement cargo vendor prints points later builds there.
+    commands = [
+        "mkdir -p src",
+        "echo 'fn main() {}' > src/main.rs && touch src/lib.rs",
+        'vendor="$CARGO_HOME/vendor" && config="$CARGO_HOME/config.toml"',
+        'CARGO_HOME=/cache/cargo cargo vendor "$vendor" >> "$config"',
+        "rm -rf src",
+    ]
+    return lines + _run(["/cache/cargo"], commands), manifests
+
+
+def _go_layers(project_path: Path) -> Optional[Tuple[List[str], List[str]]]:
+    if not (project_path / "go.mod").is_file():
+        return None
+    manifests = ["go.mod"]
+    if (project_path / "go.sum").is_file():
+        manifests.append("go.sum")
+    lines = ["COPY go.mod go.su[m] ./"]
+    # Downloaded into the shared cache, then into the image's module cache
+    # with the shared one as a module proxy, which copies only these modules
+    commands = [
+        "GOMODCACHE=/cache/gomod go mod download",
+        "GOPROXY=file:///cache/gomod/cache/download go mod download",
+    ]
+    return lines + _run(["/cache/gomod"], commands), manifests
+
+
+def _maven_modules(project_path: Path, module_dir: str = "") -> List[str]:
+    """pom.xml paths of a project and its <modules>, parents first"""
+    pom = f"{module_dir}/pom.xml" if module_dir else "pom.xml"
+    try:
+        root = ElementTree.parse(project_path / pom).getroot()
+    except (OSError, ElementTree.ParseError):
+        return []
+    poms = [pom]
+    namespace = root.tag[: root.tag.index("}") + 1] if root.tag.startswith("{") else ""
+    for module in root.iterfind(f"{namespace}modules/{namespace}module"):
+        name = (module.text or "").strip().rstrip("/")
+        if name and ".." not in name:
+            child = f"{module_dir}/{name}" if module_dir else name
+            poms += _maven_modules(project_path, child)
+    return poms
+
+
+def _maven_layers(project_path: Path) -> Optional[Tuple[List[str], List[str]]]:
+    poms = _maven_modules(project_path)
+    if not poms:
+        return None
+    lines = []
+    for pom in poms:
+        directory = pom.rsplit("/", 1)[0] + "/" if "/" in pom else "./"
+        lines.append(f"COPY {optional(pom)} {directory}")
+    # Straight into the image's repository, which the tests run offline
+    # against: Maven has no download cache apart from it to mount
+    commands = [
+        "mvn --batch-mode --no-transfer-progress "
+        "dependency:go-offline dependency:resolve-plugins dependency:resolve "
+        "dependency:sources",
+    ]
+    return lines + _run([], commands), poms
+
+
+def _dotnet_layers(project_path: Path) -> Optional[Tuple[List[str], List[str]]]:
+    projects = sorted(
+        str(path.relative_to(project_path)).replace("\\", "/")
+        for path in project_path.rglob("*.csproj")
+        if not _SKIPPED_DIRS.intersection(path.relative_to(project_path).parts[:-1])
+    )
+    if not projects:
+        return None
+    solutions = sorted(path.name for path in project_path.glob("*.sln"))
+    settings = [
+        name
+        for name in (
+            "global.json",
+            "NuGet.config",
+            "nuget.config",
+            "Directory.Build.props",
+            "Directory.Packages.props",
+        )
+        if (project_path / name).is_file()
+    ]
+
+    lines = [f"COPY {' '.join(optional(n) for n in solutions + settings)} ./"] * bool(
+        solutions or settings
+    )
+    for csproj in projects:
+        directory = csproj.rsplit("/", 1)[0] + "/" if "/" in csproj else "./"
+        lines.append(f"COPY {optional(csproj)} {directory}")
+    targets = solutions[:1] or projects
+    # Only NuGet's HTTP cache is shared; packages are extracted in the image
+    commands = [
+        f"NUGET_HTTP_CACHE_PATH=/cache/nuget dotnet restore {target}"
+        for target in targets
+    ]
+    return lines + _run(["/cache/nuget"], commands), solutions + settings + projects
+
+
+_LAYERS: Dict[str, Callable[[Path], Optional[Tuple[List[str], List[str]]]]] = {
+    "python": _python_layers,
+    "javascript": _node_layers,
+    "typescript": _node_layers,
+    "rust": _rust_layers,
+    "go": _go_layers,
+    "java": _maven_layers,
+    "csharp": _dotnet_layers,
+}
+
+# Build steps after the sources are copied, as the templates have them
+_BUILD_STEPS = {"rust": ["RUN cargo build"]}
+
+
+def generate_dockerfile(
+    project_path: Path, language: str, template: str
+) -> Optional[GeneratedDockerfile]:
+    """
+    A Dockerfile with dependency layers built from the project's manifests
+    on the template's base, or None when the language or project has no
+    manifest to build them from (the template is used as it is then)
+    """
+    layers = _LAYERS.get(language)
+    found = layers(Path(project_path)) if layers else None
+    if found is None:
+        return None
+    dependency_lines, manifests = found
+
+    lines = template_preamble(template)
+    lines += [
+        "",
+        "# Dependency manifests only: source edits keep the install layer cached",
+        *dependency_lines,
+        "",
+        "# copy in code + tests",
+        "COPY . .",
+        *_BUILD_STEPS.get(language, []),
+        "",
+        'CMD ["sh"]',
+    ]
+    return GeneratedDockerfile("\n".join(lines) + "\n", manifests)
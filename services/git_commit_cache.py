@@ -0,0 +1,143 @@
+"""
+Persistent per-repository commit cache
+
+Parsed commits, their parents, main-branch (first-parent) membership and
+source branches are stored inside the repository's git directory, keyed by a
+fingerprint of HEAD, packed-refs and the loose refs. When the fingerprint is
+unchanged the cached commits are returned without running git at all; when
+refs move, only commits that are not reachable from the previously cached
+ref tips need to be read and attributed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+CACHE_FILE_NAME = "docker-tools-commit-cache.json"
+CACHE_VERSION = 1
+
+logger = logging.getLogger("GitCommitCache")
+
+
+def find_git_dir(project_path: Path) -> Optional[Path]:
+    """Locate the git directory of a working tree (handles .git files)"""
+    dot_git = Path(project_path) / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():
+        # Worktrees and submodules use a "gitdir: <path>" file
+        try:
+            content = dot_git.read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+        if content.startswith("gitdir:"):
+            git_dir = Path(content[len("gitdir:") :].strip())
+            if not git_dir.is_absolute():
+                git_dir = (Path(project_path) / git_dir).resolve()
+            return git_dir if git_dir.is_dir() else None
+    return None
+
+
+def refs_fingerprint(git_dir: Path) -> str:
+    """Digest of HEAD, packed-refs and every loose ref"""
+    digest = hashlib.sha1()
+
+    for name in ("HEAD", "packed-refs"):
+        path = git_dir / name
+        if path.is_file():
+            digest.update(name.encode())
+            digest.update(path.read_bytes())
+
+    refs_dir = git_dir / "refs"
+    for root, dirs, files in os.walk(refs_dir):
+        dirs.sort()
+        for file_name in sorted(files):
+            path = Path(root) / file_name
+            digest.update(path.relative_to(git_dir).as_posix().encode())
+            try:
+                digest.update(path.read_bytes())
+            except OSError:
+                # A ref being rewritten; a changed digest is the safe outcome
+                digest.update(b"?")
+
+    return digest.hexdigest()
+
+
+class GitCommitCache:
+    """Cached commit rows for one repository"""
+
+    def __init__(
+        self,
+        fingerprint: str,
+        tips: List[str],
+        rows: List[Dict[str, Any]],
+    ):
+        self.fingerprint = fingerprint
+        self.tips = tips
+        self.rows = rows
+
+    @staticmethod
+    def path_for(git_dir: Path) -> Path:
+        return git_dir / CACHE_FILE_NAME
+
+    @classmethod
+    def load(cls, git_dir: Path) -> Optional["GitCommitCache"]:
+        path = cls.path_for(git_dir)
+        if not path.is_file():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != CACHE_VERSION:
+                return None
+            return cls(data["fingerprint"], data["tips"], data["commits"])
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug(f"Ignoring unreadable commit cache {path}: {e}")
+            return None
+
+    def save(self, git_dir: Path):
+        path = self.path_for(git_dir)
+        temp_path = path.with_suffix(".tmp")
+        data = {
+            "version": CACHE_VERSION,
+            "fingerprint": self.fingerprint,
+            "tips": self.tips,
+            "commits": self.rows,
+        }
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        # Atomic so a concurrent reader never sees a partial file
+        os.replace(temp_path, path)
+
+    @property
+    def known_hashes(self) -> Set[str]:
+        return {row["full_hash"] for row in self.rows}
+
+    def merge(
+        self,
+        new_rows: List[Dict[str, Any]],
+        reachable: Set[str],
+        main_history: Set[str],
+        fingerprint: str,
+        tips: List[str],
+    ):
+        """
+        Add newly read commits ahead of the cached ones, drop commits no
+        longer reachable from any ref and refresh main-branch membership.
+        """
+        known = self.known_hashes
+        rows = [row for row in new_rows if row["full_hash"] not in known]
+        rows.extend(row for row in self.rows if row["full_hash"] in reachable)
+
+        for row in rows:
+            row["on_main"] = row["full_hash"] in main_history
+            if row["on_main"]:
+                # e.g. fast-forwarded into main: no longer a branch commit
+                row["source_branch"] = None
+
+        self.rows = rows
+        self.fingerprint = fingerprint
+        self.tips = tips
@@ -0,0 +1,147 @@
+"""
+In-process commit graph for batch branch attribution
+
+The graph is loaded from one `git for-each-ref` and one
+`git rev-list --all --parents` call, so questions that used to need a
+subprocess per commit (is it on the main branch's first-parent history, which
+branches contain it) are answered by walking the graph in memory.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
+
+# Refs checked, in order, for the main branch's first-parent history
+MAIN_BRANCH_REFS = ["origin/master", "origin/main", "master", "main"]
+
+# Branch names never reported as a commit's source branch
+MAIN_BRANCH_NAMES = ["master", "main", "HEAD"]
+
+# Format for `git for-each-ref`: current-branch marker, object id, ref name
+FOR_EACH_REF_FORMAT = "%(HEAD) %(objectname) %(refname)"
+
+
+@dataclass
+class GitRef:
+    """A branch ref and the commit it points to"""
+
+    name: str
+    hash: str
+    is_head: bool = False
+
+    @property
+    def short_name(self) -> str:
+        """Name as accepted by rev-parse, e.g. origin/master or master"""
+        for prefix in ("refs/heads/", "refs/remotes/"):
+            if self.name.startswith(prefix):
+                return self.name[len(prefix) :]
+        return self.name
+
+    @property
+    def is_local_branch(self) -> bool:
+        return self.name.startswith("refs/heads/")
+
+
+class CommitGraph:
+    """Parent links for every commit reachable from any ref"""
+
+    def __init__(self, parents: Dict[str, List[str]], refs: List[GitRef]):
+        self.parents = parents
+        self.refs = refs
+        self._prefix_maps: Dict[int, Dict[str, str]] = {}
+
+    @classmethod
+    def parse(cls, rev_list_output: str, for_each_ref_output: str) -> "CommitGraph":
+        """Build a graph from `rev-list --parents` and `for-each-ref` output"""
+        parents: Dict[str, List[str]] = {}
+        for line in rev_list_output.splitlines():
+            fields = line.split()
+            if fields:
+                parents[fields[0]] = fields[1:]
+
+        refs = []
+        for line in for_each_ref_output.splitlines():
+            # "* <hash> <refname>" for the checked-out branch, "  <hash> <refname>"
+            # otherwise
+            is_head = line.startswith("*")
+            fields = line[1:].split()
+            if len(fields) == 2:
+                refs.append(GitRef(name=fields[1], hash=fields[0], is_head=is_head))
+
+        return cls(parents, refs)
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def resolve(self, abbrev: str) -> Optional[str]:
+        """Full hash for an abbreviated hash, or None if unknown or ambiguous"""
+        if abbrev in self.parents:
+            return abbrev
+
+        length = len(abbrev)
+        prefix_map = self._prefix_maps.get(length)
+        if prefix_map is None:
+            prefix_map = {}
+            for full_hash in self.parents:
+                prefix = full_hash[:length]
+                # Mark ambiguous prefixes so they never resolve
+                prefix_map[prefix] = "" if prefix in prefix_map else full_hash
+            self._prefix_maps[length] = prefix_map
+        return prefix_map.get(abbrev) or None
+
+    def find_ref(self, short_name: str) -> Optional[GitRef]:
+        return next((ref for ref in self.refs if ref.short_name == short_name), None)
+
+    def first_parent_history(self, tip: str) -> Set[str]:
+        """Commits on the first-parent chain starting at tip"""
+        history = set()
+        commit = tip
+        while commit and commit not in history:
+            history.add(commit)
+            parents = self.parents.get(commit)
+            commit = parents[0] if parents else None
+        return history
+
+    def reachable_from(self, tip: str) -> Set[str]:
+        """All commits reachable from tip"""
+        seen = set()
+        stack = [tip]
+        while stack:
+            commit = stack.pop()
+            if commit in seen or commit not in self.parents:
+                continue
+            seen.add(commit)
+            stack.extend(self.parents[commit])
+        return seen
+
+    def main_branch_tip(self) -> Optional[str]:
+        """Tip of the first main branch ref that exists"""
+        for name in MAIN_BRANCH_REFS:
+            ref = self.find_ref(name)
+            if ref and ref.hash in self.parents:
+                return ref.hash
+        return None
+
+    def first_containing_branches(
+        self, commits: Iterable[str], branch_filter=None
+    ) -> Dict[str, str]:
+        """
+        For each commit, the first local branch (in ref name order, skipping the
+        checked-out branch, as listed by `git branch --contains`) that contains
+        it. branch_filter(ref) decides which branches are eligible.
+        """
+        pending = set(commits)
+        found: Dict[str, str] = {}
+
+        for ref in sorted(self.refs, key=lambda r: r.name):
+            if not pending:
+                break
+            if not ref.is_local_branch or ref.is_head:
+                continue
+            if branch_filter and not branch_filter(ref):
+                continue
+
+            for commit in pending & self.reachable_from(ref.hash):
+                found[commit] = ref.short_name
+            pending.difference_update(found)
+
+        return found
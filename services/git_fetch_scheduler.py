@@ -0,0 +1,207 @@
+"""
+Background fetching for the git views
+
+Repositories of recently viewed project groups are fetched periodically (with
+jitter, a few at a time) so that opening the git window or checkout-all can
+reuse data fetched a moment ago instead of blocking on `git fetch --all`.
+The time of the last successful fetch is kept per repository.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from config.config import get_config
+from services.git_commit_cache import find_git_dir
+from utils.async_utils import task_manager
+
+logger = logging.getLogger("GitFetchScheduler")
+
+
+def format_fetch_age(age: float) -> str:
+    """Human readable age of a fetch, e.g. "fetched 42 s ago" """
+    if age < 60:
+        return f"fetched {int(age)} s ago"
+    if age < 3600:
+        return f"fetched {int(age // 60)} min ago"
+    return f"fetched {int(age // 3600)} h ago"
+
+
+class FetchFreshness:
+    """Last successful fetch time (wall clock) per repository"""
+
+    def __init__(self):
+        self._fetched_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(project_path: Path) -> str:
+        return str(Path(project_path).resolve())
+
+    def record(self, project_path: Path, when: Optional[float] = None):
+        """Remember that project_path was fetched at `when` (default: now)"""
+        with self._lock:
+            self._fetched_at[self._key(project_path)] = (
+                time.time() if when is None else when
+            )
+
+    def forget(self, project_path: Path):
+        with self._lock:
+            self._fetched_at.pop(self._key(project_path), None)
+
+    def last_fetch(self, project_path: Path) -> Optional[float]:
+        """
+        Time of the last fetch, or None if unknown. Repositories not fetched
+        by this process fall back to the modification time of FETCH_HEAD.
+        """
+        with self._lock:
+            when = self._fetched_at.get(self._key(project_path))
+        if when is not None:
+            return when
+
+        git_dir = find_git_dir(Path(project_path))
+        if git_dir is None:
+            return None
+        try:
+            return (git_dir / "FETCH_HEAD").stat().st_mtime
+        except OSError:
+            return None
+
+    def age(self, project_path: Path, now: Optional[float] = None) -> Optional[float]:
+        """Seconds since the last fetch, or None if never fetched"""
+        when = self.last_fetch(project_path)
+        if when is None:
+            return None
+        return max(0.0, (time.time() if now is None else now) - when)
+
+    def is_fresh(self, project_path: Path, max_age: float) -> bool:
+        age = self.age(project_path)
+        return age is not None and age < max_age
+
+
+class GitFetchScheduler:
+    """Periodically fetches the repositories of recently viewed project groups"""
+
+    def __init__(
+        self,
+        freshness: FetchFreshness,
+        interval: Optional[float] = None,
+        jitter: Optional[float] = None,
+        max_concurrent: Optional[int] = None,
+        viewed_ttl: Optional[float] = None,
+        max_viewed: int = 32,
+    ):
+        service_config = get_config().service
+        self.freshness = freshness
+        self.interval = (
+            service_config.git_fetch_interval if interval is None else interval
+        )
+        self.jitter = service_config.git_fetch_jitter if jitter is None else jitter
+        self.max_concurrent = (
+            service_config.git_fetch_max_concurrent
+            if max_concurrent is None
+            else max_concurrent
+        )
+        self.viewed_ttl = (
+            service_config.git_fetch_viewed_ttl if viewed_ttl is None else viewed_ttl
+        )
+        self.max_viewed = max_viewed
+        self.git_service = None
+
+        # Repository path -> monotonic time it was last viewed, oldest first
+        self._viewed: "OrderedDict[Path, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._future = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def note_viewed(self, project_paths: Iterable[Path]):
+        """Mark repositories as recently viewed so they are kept fresh"""
+        now = time.monotonic()
+        with self._lock:
+            for path in project_paths:
+                path = Path(path)
+                self._viewed.pop(path, None)
+                self._viewed[path] = now
+            while len(self._viewed) > self.max_viewed:
+                self._viewed.popitem(last=False)
+
+    def due_paths(self) -> List[Path]:
+        """Recently viewed repositories whose last fetch is older than interval"""
+        now = time.monotonic()
+        with self._lock:
+            for path, viewed_at in list(self._viewed.items()):
+                if now - viewed_at > self.viewed_ttl:
+                    del self._viewed[path]
+            viewed = list(self._viewed)
+        return [
+            path
+            for path in viewed
+            if path.exists() and not self.freshness.is_fresh(path, self.interval)
+        ]
+
+    async def fetch_due(self, git_service=None) -> Dict[Path, bool]:
+        """Fetch every due repository, max_concurrent at a time"""
+        git_service = git_service or self.git_service
+        paths = self.due_paths()
+        if git_service is None or not paths:
+            return {}
+
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrent))
+
+        async def fetch(path: Path) -> bool:
+            async with semaphore:
+                try:
+                    result = await git_service.fetch_latest_commits(path)
+                except Exception as e:
+                    logger.debug(f"Background fetch of {path} failed: {e}")
+                    return False
+                if result.is_error:
+                    logger.debug(
+                        f"Background fetch of {path} failed: {result.error.message}"
+                    )
+                return result.is_success
+
+        results = await asyncio.gather(*(fetch(path) for path in paths))
+        return dict(zip(paths, results))
+
+    def next_delay(self) -> float:
+        """Interval with random jitter so repositories are not fetched in lockstep"""
+        spread = self.interval * self.jitter
+        return max(1.0, self.interval + random.uniform(-spread, spread))
+
+    def start(self, git_service):
+        """Start fetching in the background on the shared task loop"""
+        self.git_service = git_service
+        if self.is_running:
+            return
+        self._future = task_manager.run_task(
+            self._run(), task_name="git_fetch_scheduler"
+        )
+        logger.info(f"Background git fetch every ~{self.interval:.0f}s")
+
+    def stop(self):
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.next_delay())
+            fetched = await self.fetch_due()
+            if fetched:
+                logger.debug(
+                    f"Background fetch: {sum(fetched.values())}/{len(fetched)} repositories"
+                )
+
+
+# Global instances for the application
+fetch_freshness = FetchFreshness()
+fetch_scheduler = GitFetchScheduler(fetch_freshness)
@@ -0,0 +1,161 @@
+"""
+In-process reader for repository state kept in the git directory
+
+HEAD, loose refs, packed-refs and the remotes in the repository config are
+plain files, so the current branch, current commit and remotes can be read
+without starting git. Layouts the reader does not understand (such as the
+reftable ref backend) yield None so callers fall back to running git.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from services.git_commit_cache import find_git_dir
+
+# Symbolic refs are followed at most this many levels (as git does)
+MAX_SYMREF_DEPTH = 5
+
+_REMOTE_SECTION = re.compile(r'^\s*\[\s*remote\s+"((?:[^"\\]|\\.)*)"\s*\]')
+_HEX_HASH = re.compile(r"^[0-9a-f]{40}([0-9a-f]{24})?$")
+
+logger = logging.getLogger("GitRepositoryReader")
+
+
+@dataclass
+class GitDirState:
+    """Branch, commit and remotes read straight from the git directory"""
+
+    git_dir: Path
+    current_branch: str = ""  # Empty when HEAD is detached
+    current_commit: Optional[str] = None  # None on an unborn branch
+    remotes: List[str] = field(default_factory=list)
+    remote_urls: Dict[str, str] = field(default_factory=dict)
+
+
+def common_dir(git_dir: Path) -> Path:
+    """Directory holding refs and config (differs from git_dir in worktrees)"""
+    commondir_file = git_dir / "commondir"
+    if commondir_file.is_file():
+        path = Path(commondir_file.read_text(encoding="utf-8").strip())
+        return path if path.is_absolute() else (git_dir / path).resolve()
+    return git_dir
+
+
+def read_packed_refs(refs_dir: Path) -> Dict[str, str]:
+    """Ref name to object id from packed-refs (peeled tag lines skipped)"""
+    packed = {}
+    path = refs_dir / "packed-refs"
+    if not path.is_file():
+        return packed
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line or line.startswith(("#", "^")):
+            continue
+        fields = line.split(" ", 1)
+        if len(fields) == 2:
+            packed[fields[1].strip()] = fields[0]
+    return packed
+
+
+def resolve_ref(
+    git_dir: Path, ref_name: str, packed: Optional[Dict[str, str]] = None
+) -> Optional[str]:
+    """Object id a ref points to, following symbolic refs, or None"""
+    refs_dir = common_dir(git_dir)
+    if packed is None:
+        packed = read_packed_refs(refs_dir)
+
+    for _ in range(MAX_SYMREF_DEPTH):
+        # Per-worktree refs (HEAD, refs/bisect, ...) live in git_dir itself
+        base = git_dir if ref_name == "HEAD" else refs_dir
+        loose = base / ref_name
+        if loose.is_file():
+            content = loose.read_text(encoding="utf-8").strip()
+            if content.startswith("ref:"):
+                ref_name = content[len("ref:") :].strip()
+                continue
+            return content if _HEX_HASH.match(content) else None
+        return packed.get(ref_name)
+    return None
+
+
+def read_config_remote_urls(refs_dir: Path) -> Dict[str, Optional[str]]:
+    """
+    Remote name to (first) URL, in the order the remotes appear in the
+    repository config. Remotes without a url entry map to None.
+    """
+    remotes: Dict[str, Optional[str]] = {}
+    config = refs_dir / "config"
+    if not config.is_file():
+        return remotes
+
+    current = None
+    for line in config.read_text(encoding="utf-8").splitlines():
+        match = _REMOTE_SECTION.match(line)
+        if match:
+            current = re.sub(r"\\(.)", r"\1", match.group(1))
+            remotes.setdefault(current, None)
+            continue
+        if line.lstrip().startswith("["):
+            current = None
+            continue
+        if current is not None and remotes[current] is None:
+            key, _, value = line.partition("=")
+            if key.strip().lower() == "url" and value.strip():
+                remotes[current] = value.strip().strip('"')
+    return remotes
+
+
+def read_config_remotes(refs_dir: Path) -> List[str]:
+    """Remote names in the order they appear in the repository config"""
+    return list(read_config_remote_urls(refs_dir))
+
+
+def uses_reftable(refs_dir: Path) -> bool:
+    return (refs_dir / "reftable").is_dir()
+
+
+def read_git_dir_state(project_path: Path) -> Optional[GitDirState]:
+    """
+    Current branch, commit and remotes of the repository at project_path,
+    or None when project_path is not a repository root this reader can
+    handle.
+    """
+    git_dir = find_git_dir(project_path)
+    if git_dir is None:
+        return None
+
+    try:
+        refs_dir = common_dir(git_dir)
+        if uses_reftable(refs_dir) or not (git_dir / "HEAD").is_file():
+            return None
+
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        packed = read_packed_refs(refs_dir)
+        if head.startswith("ref:"):
+            head_ref = head[len("ref:") :].strip()
+            current_branch = (
+                head_ref[len("refs/heads/") :]
+                if head_ref.startswith("refs/heads/")
+                else ""
+            )
+            current_commit = resolve_ref(git_dir, head_ref, packed)
+        elif _HEX_HASH.match(head):
+            current_branch = ""
+            current_commit = head
+        else:
+            return None
+
+        remote_urls = read_config_remote_urls(refs_dir)
+        return GitDirState(
+            git_dir=git_dir,
+            current_branch=current_branch,
+            current_commit=current_commit,
+            remotes=list(remote_urls),
+            remote_urls={name: url for name, url in remote_urls.items() if url},
+        )
+    except (OSError, UnicodeDecodeError) as e:
+        logger.debug(f"Cannot read git directory of {project_path}: {e}")
+        return None
@@ -2,15 +2,26 @@
 Git Service - Standardized Async Version
 """
 
+import asyncio
 import contextlib
+import subprocess
+import time
 from pathlib import Path
-from typing import List, Dict, Optional, Any
-from dataclasses import dataclass
+from typing import AsyncIterator, Callable, List, Dict, Optional, Any
+from dataclasses import dataclass, field
 
 from config.config import get_config
 
 COMMANDS = get_config().commands.commands
 from services.platform_service import PlatformService
+from services.git_commit_cache import GitCommitCache, find_git_dir, refs_fingerprint
+from services.git_commit_graph import (
+    CommitGraph,
+    FOR_EACH_REF_FORMAT,
+    MAIN_BRANCH_NAMES,
+)
+from services.git_fetch_scheduler import fetch_freshness
+from services.git_repository_reader import read_git_dir_state
 from utils.async_base import (
     AsyncServiceInterface,
     ServiceResult,
@@ -19,7 +30,20 @@ from utils.async_base import (
     ResourceError,
     AsyncServiceContext,
 )
-from utils.async_utils import run_subprocess_async, run_in_executor
+from utils.async_utils import (
+    run_subprocess_async,
+    run_in_executor,
+    stream_subprocess_lines_async,
+)
+
+# Commits per page yielded while streaming the log
+COMMIT_STREAM_PAGE_SIZE = 200
+
+# Commits attributed per branch update once the commit graph is loaded
+ATTRIBUTION_CHUNK_SIZE = 2000
+
+# Ways to derive further clones from one already on disk (see clone_from_seed)
+CLONE_STRATEGIES = ("hardlink", "reference")
 
 
 @dataclass
@@ -125,6 +149,21 @@ class GitCommit:
         }
 
 
+@dataclass
+class GitLogPage:
+    """
+    One update from a streamed git log. kind is "commits" for newly read
+    commits (in log order) or "branches" when source branches were filled in
+    for commits already delivered. total is the number of commits read so
+    far; done marks the last update.
+    """
+
+    commits: List[GitCommit] = field(default_factory=list)
+    kind: str = "commits"
+    total: int = 0
+    done: bool = False
+
+
 @dataclass
 class GitRepositoryInfo:
     """Information about a git repository"""
@@ -135,6 +174,19 @@ class GitRepositoryInfo:
     current_commit: str
     is_clean: bool
     uncommitted_changes: int
+    # Latency of the working tree check (not part of equality)
+    dirty_check_ms: Optional[float] = field(default=None, compare=False)
+
+
+@dataclass
+class GitDirtyState:
+    """Result of a quick working tree check (see GitService.check_dirty)"""
+
+    is_dirty: bool
+    tracked_changes: bool
+    untracked_files: Optional[bool]  # None when untracked files were not checked
+    elapsed_ms: float
+    method: str  # "diff-index" or "status" (fallback, e.g. on an unborn branch)
 
 
 class GitService(AsyncServiceInterface):
@@ -142,6 +194,8 @@ class GitService(AsyncServiceInterface):
 
     def __init__(self):
         super().__init__("GitService")
+        # Repositories already switched to the untracked cache and split index
+        self._fast_index_repos = set()
 
     async def health_check(self) -> ServiceResult[Dict[str, Any]]:
         """Check Git service health"""
@@ -175,117 +229,313 @@ class GitService(AsyncServiceInterface):
                 return ServiceResult.error(error)
 
     async def get_repository_info(
-        self, project_path: Path
+        self, project_path: Path, detailed: bool = True
     ) -> ServiceResult[GitRepositoryInfo]:
-        """Get comprehensive information about a git repository"""
+        """
+        Get comprehensive information about a git repository. Branch, commit
+        and remotes are read from the git directory when possible, so only the
+        working tree status runs git. With detailed=False the status check
+        skips untracked files, which is much cheaper on large trees.
+        """
         # Validate input
         if not project_path.exists():
             error = ValidationError(f"Project path does not exist: {project_path}")
             return ServiceResult.error(error)
 
         async with self.operation_context("get_repository_info", timeout=30.0) as ctx:
-            try:
-                # Check if it's a git repository
-                git_dir_check = await PlatformService.run_command_async(
+            # The status check is the only part that needs git; start it first
+            fast_check = not detailed and get_config().service.git_dirty_check == "fast"
+            started = time.perf_counter()
+            status_task = asyncio.ensure_future(
+                self.check_dirty(project_path)
+                if fast_check
+                else PlatformService.run_command_async(
                     "GIT_COMMANDS",
-                    subkey="rev_parse_git_dir",
+                    subkey=(
+                        "status_porcelain" if detailed else "status_porcelain_tracked"
+                    ),
                     cwd=str(project_path),
                     capture_output=True,
                 )
+            )
+            try:
+                state = await run_in_executor(read_git_dir_state, project_path)
+                if state is not None:
+                    has_remote = bool(state.remotes)
+                    remote_urls = state.remotes
+                    current_branch = state.current_branch
+                    current_commit = state.current_commit
+                else:
+                    fields = await self._read_repository_fields(project_path)
+                    if fields is None:
+                        error = ResourceError(f"Not a git repository: {project_path}")
+                        return ServiceResult.error(error)
+                    has_remote, remote_urls, current_branch, current_commit = fields
 
-                if git_dir_check.returncode != 0:
-                    error = ResourceError(f"Not a git repository: {project_path}")
-                    return ServiceResult.error(error)
+                # Check if working tree is clean
+                status_result = await status_task
+
+                if fast_check:
+                    if status_result.is_error:
+                        return ServiceResult.error(status_result.error)
+                    # A quick check stops at the first change, so it can only
+                    # tell whether there are uncommitted changes, not how many
+                    is_clean = not status_result.data.is_dirty
+                    uncommitted_changes = 0 if is_clean else 1
+                    dirty_check_ms = status_result.data.elapsed_ms
+                else:
+                    is_clean = (
+                        status_result.returncode == 0
+                        and not status_result.stdout.strip()
+                    )
+                    uncommitted_changes = (
+                        len(status_result.stdout.strip().split("\n"))
+                        if status_result.stdout.strip()
+                        else 0
+                    )
+                    dirty_check_ms = (time.perf_counter() - started) * 1000
 
-                # Get remote information
-                remote_result = await PlatformService.run_command_async(
-                    "GIT_COMMANDS",
-                    subkey="remote_check",
-                    cwd=str(project_path),
-                    capture_output=True,
+                repo_info = GitRepositoryInfo(
+                    has_remote=has_remote,
+                    remote_urls=remote_urls,
+                    current_branch=current_branch,
+                    current_commit=(
+                        current_commit[:8] if current_commit else None
+                    ),  # Short commit hash only if valid
+                    is_clean=is_clean,
+                    uncommitted_changes=uncommitted_changes,
+                    dirty_check_ms=dirty_check_ms,
                 )
 
-                has_remote = (
-                    remote_result.returncode == 0 and remote_result.stdout.strip()
-                )
-                remote_urls = (
-                    remote_result.stdout.strip().split("\n") if has_remote else []
+                return ServiceResult.success(
+                    repo_info, "Repository information retrieved successfully"
                 )
 
-                # Get current branch
-                branch_result = await PlatformService.run_command_async(
+            except Exception as e:
+                self.logger.exception("Unexpected error getting repository info")
+                error = ProcessError(f"Failed to get repository info: {str(e)}")
+                return ServiceResult.error(error)
+            finally:
+                if not status_task.done():
+                    status_task.cancel()
+
+    async def check_dirty(
+        self, project_path: Path, include_untracked: bool = False
+    ) -> ServiceResult[GitDirtyState]:
+        """
+        Quick check for uncommitted changes that stops at the first one.
+
+        Runs `git diff-index --quiet HEAD` instead of `git status`, so a clean
+        check costs one lstat per tracked file and no directory walk; only when
+        it reports changes is the index refreshed and the check repeated, to
+        rule out files that were touched but not modified. With
+        include_untracked, untracked (not ignored) files count as changes too;
+        `git ls-files --others` is served by git's untracked cache when it is
+        enabled (see enable_fast_index).
+        """
+        if not project_path.exists():
+            error = ValidationError(f"Project path does not exist: {project_path}")
+            return ServiceResult.error(error)
+
+        if get_config().service.git_fast_index:
+            await self.enable_fast_index(project_path)
+
+        started = time.perf_counter()
+        cwd = str(project_path)
+        try:
+            diff_result = await PlatformService.run_command_async(
+                "GIT_COMMANDS", subkey="diff_index_quiet", cwd=cwd, capture_output=True
+            )
+            if diff_result.returncode == 1:
+                # diff-index only compares stat data, so files that were merely
+                # touched (or rewritten by a checkout) look modified: refresh
+                # the index and look again. A clean tree never gets here.
+                await PlatformService.run_command_async(
                     "GIT_COMMANDS",
-                    subkey="branch_show_current",
-                    cwd=str(project_path),
+                    subkey="refresh_index",
+                    cwd=cwd,
                     capture_output=True,
                 )
-                current_branch = (
-                    branch_result.stdout.strip()
-                    if branch_result.returncode == 0
-                    else "unknown"
-                )
-
-                # Get current commit
-                commit_result = await PlatformService.run_command_async(
+                diff_result = await PlatformService.run_command_async(
                     "GIT_COMMANDS",
-                    subkey="rev_parse_head",
-                    cwd=str(project_path),
+                    subkey="diff_index_quiet",
+                    cwd=cwd,
                     capture_output=True,
                 )
-                current_commit = (
-                    commit_result.stdout.strip()
-                    if commit_result.returncode == 0 and commit_result.stdout.strip()
-                    else None  # Use None instead of "unknown" for easier checking
-                )
 
-                # Check if working tree is clean
+            method = "diff-index"
+            if diff_result.returncode in (0, 1):
+                tracked_changes = diff_result.returncode == 1
+            else:
+                # No HEAD to compare against (unborn branch): ask git status
+                method = "status"
                 status_result = await PlatformService.run_command_async(
                     "GIT_COMMANDS",
-                    subkey="status_porcelain",
-                    cwd=str(project_path),
+                    subkey="status_porcelain_tracked",
+                    cwd=cwd,
                     capture_output=True,
                 )
+                if status_result.returncode != 0:
+                    error = ResourceError(
+                        f"Not a git repository: {project_path}",
+                        resource_path=cwd,
+                    )
+                    return ServiceResult.error(error)
+                tracked_changes = bool(status_result.stdout.strip())
 
-                is_clean = (
-                    status_result.returncode == 0 and not status_result.stdout.strip()
-                )
-                uncommitted_changes = (
-                    len(status_result.stdout.strip().split("\n"))
-                    if status_result.stdout.strip()
-                    else 0
+            untracked_files = None
+            if include_untracked and not tracked_changes:
+                untracked_result = await PlatformService.run_command_async(
+                    "GIT_COMMANDS",
+                    subkey="untracked_files",
+                    cwd=cwd,
+                    capture_output=True,
                 )
+                untracked_files = bool(untracked_result.stdout.strip())
 
-                repo_info = GitRepositoryInfo(
-                    has_remote=has_remote,
-                    remote_urls=remote_urls,
-                    current_branch=current_branch,
-                    current_commit=(
-                        current_commit[:8] if current_commit else None
-                    ),  # Short commit hash only if valid
-                    is_clean=is_clean,
-                    uncommitted_changes=uncommitted_changes,
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.logger.debug(
+                f"Dirty check of {project_path}: {elapsed_ms:.1f} ms ({method})"
+            )
+            state = GitDirtyState(
+                is_dirty=tracked_changes or bool(untracked_files),
+                tracked_changes=tracked_changes,
+                untracked_files=untracked_files,
+                elapsed_ms=elapsed_ms,
+                method=method,
+            )
+            return ServiceResult.success(
+                state,
+                message="Uncommitted changes" if state.is_dirty else "Clean",
+                metadata={"elapsed_ms": elapsed_ms, "method": method},
+            )
+
+        except Exception as e:
+            self.logger.exception("Unexpected error checking for local changes")
+            error = ProcessError(f"Failed to check for local changes: {str(e)}")
+            return ServiceResult.error(error)
+
+    async def enable_fast_index(self, project_path: Path) -> ServiceResult[str]:
+        """
+        Turn on git's untracked cache and split index in a repository (once
+        per repository and process). The untracked cache lets untracked-file
+        checks skip directories that did not change; the split index keeps
+        index writes small on very large trees.
+        """
+        key = str(project_path)
+        if key in self._fast_index_repos:
+            return ServiceResult.success("already_enabled")
+
+        cwd = str(project_path)
+        try:
+            for config_key in ("core.untrackedCache", "core.splitIndex"):
+                await PlatformService.run_command_async(
+                    "GIT_COMMANDS",
+                    subkey="config_set",
+                    key=config_key,
+                    value="true",
+                    cwd=cwd,
+                    capture_output=True,
                 )
+            # Apply both to the current index instead of waiting for the next write
+            result = await PlatformService.run_command_async(
+                "GIT_COMMANDS", subkey="enable_fast_index", cwd=cwd, capture_output=True
+            )
+        except Exception as e:
+            self.logger.exception("Unexpected error enabling the untracked cache")
+            return ServiceResult.error(
+                ProcessError(f"Failed to enable the untracked cache: {str(e)}")
+            )
 
-                return ServiceResult.success(
-                    repo_info, "Repository information retrieved successfully"
+        # Attempted once either way; a failure is not retried on every check
+        self._fast_index_repos.add(key)
+        if result.returncode != 0:
+            # e.g. a filesystem where git's untracked cache self-test fails
+            self.logger.warning(
+                f"Cannot enable untracked cache/split index in {project_path}: "
+                f"{result.stderr.strip()}"
+            )
+            error = ProcessError(
+                f"Failed to enable the untracked cache: {result.stderr}",
+                return_code=result.returncode,
+                stderr=result.stderr,
+            )
+            return ServiceResult.error(error)
+
+        return ServiceResult.success(
+            "enabled", message="Enabled untracked cache and split index"
+        )
+
+    async def _read_repository_fields(self, project_path: Path) -> Optional[tuple]:
+        """
+        (has_remote, remotes, current_branch, current_commit) using git, for
+        paths the in-process reader cannot handle (e.g. a subdirectory of a
+        working tree). Returns None if project_path is not in a repository.
+        """
+        git_dir_check = await PlatformService.run_command_async(
+            "GIT_COMMANDS",
+            subkey="rev_parse_git_dir",
+            cwd=str(project_path),
+            capture_output=True,
+        )
+        if git_dir_check.returncode != 0:
+            return None
+
+        remote_result, branch_result, commit_result = await asyncio.gather(
+            *(
+                PlatformService.run_command_async(
+                    "GIT_COMMANDS",
+                    subkey=subkey,
+                    cwd=str(project_path),
+                    capture_output=True,
                 )
+                for subkey in ("remote_check", "branch_show_current", "rev_parse_head")
+            )
+        )
 
-            except Exception as e:
-                self.logger.exception("Unexpected error getting repository info")
-                error = ProcessError(f"Failed to get repository info: {str(e)}")
-                return ServiceResult.error(error)
+        remotes = (
+            remote_result.stdout.strip().split("\n")
+            if remote_result.returncode == 0 and remote_result.stdout.strip()
+            else []
+        )
+        current_branch = (
+            branch_result.stdout.strip() if branch_result.returncode == 0 else "unknown"
+        )
+        current_commit = (
+            commit_result.stdout.strip()
+            if commit_result.returncode == 0 and commit_result.stdout.strip()
+            else None  # Use None instead of "unknown" for easier checking
+        )
+        return bool(remotes), remotes, current_branch, current_commit
 
-    async def fetch_latest_commits(self, project_path: Path) -> ServiceResult[str]:
-        """Fetch latest commits from remote repository"""
+    async def fetch_latest_commits(
+        self, project_path: Path, max_age: Optional[float] = None
+    ) -> ServiceResult[str]:
+        """
+        Fetch latest commits from remote repository. With max_age, the fetch
+        is skipped when the repository was fetched less than max_age seconds
+        ago (metadata "skipped" and "age" tell how old the data is).
+        """
         # Validate input
         if not project_path.exists():
             error = ValidationError(f"Project path does not exist: {project_path}")
             return ServiceResult.error(error)
 
+        if max_age is not None:
+            age = await run_in_executor(fetch_freshness.age, project_path)
+            if age is not None and age < max_age:
+                return ServiceResult.success(
+                    "fetch_skipped",
+                    message=f"Using commits fetched {int(age)}s ago",
+                    metadata={"skipped": True, "age": age},
+                )
+
         async with self.operation_context("fetch_latest_commits", timeout=60.0) as ctx:
             try:
                 # Check repository info first
-                repo_info_result = await self.get_repository_info(project_path)
+                repo_info_result = await self.get_repository_info(
+                    project_path, detailed=False
+                )
                 if repo_info_result.is_error:
                     return ServiceResult.error(repo_info_result.error)
 
@@ -303,12 +553,15 @@ class GitService(AsyncServiceInterface):
                 )
 
                 if fetch_result.returncode == 0:
+                    fetch_freshness.record(project_path)
                     return ServiceResult.success(
                         "fetch_completed",
                         message="Successfully fetched latest commits",
                         metadata={
                             "remote_urls": repo_info.remote_urls,
                             "fetch_output": fetch_result.stdout,
+                            "skipped": False,
+                            "age": 0.0,
                         },
                     )
                 error = ProcessError(
@@ -323,10 +576,107 @@ class GitService(AsyncServiceInterface):
                 error = ProcessError(f"Error during fetch: {str(e)}")
                 return ServiceResult.error(error)
 
+    async def group_by_remote(self, project_paths: List[Path]) -> List[List[Path]]:
+        """
+        Group repositories that fetch from the same remote URLs, keeping the
+        input order. Repositories whose remotes cannot be read from the git
+        directory form groups of their own.
+        """
+        states = await asyncio.gather(
+            *(run_in_executor(read_git_dir_state, path) for path in project_paths)
+        )
+
+        groups: Dict[Any, List[Path]] = {}
+        for path, state in zip(project_paths, states):
+            if state is not None and state.remote_urls:
+                key = tuple(sorted(set(state.remote_urls.values())))
+            else:
+                key = ("path", str(path))
+            groups.setdefault(key, []).append(path)
+        return list(groups.values())
+
+    async def fetch_from_clone(
+        self, project_path: Path, source_path: Path
+    ) -> ServiceResult[str]:
+        """
+        Update remote-tracking branches from another local clone of the same
+        remote (which has just fetched), instead of fetching over the network.
+        """
+        if not project_path.exists():
+            error = ValidationError(f"Project path does not exist: {project_path}")
+            return ServiceResult.error(error)
+
+        async with self.operation_context("fetch_from_clone", timeout=60.0) as ctx:
+            try:
+                target, source = await asyncio.gather(
+                    run_in_executor(read_git_dir_state, project_path),
+                    run_in_executor(read_git_dir_state, source_path),
+                )
+                if target is None or source is None:
+                    error = ResourceError(
+                        f"Cannot read remotes of {project_path} or {source_path}"
+                    )
+                    return ServiceResult.error(error)
+
+                # Map each of our remotes onto the source's remote with the same URL
+                source_names = {url: name for name, url in source.remote_urls.items()}
+                refspecs = [
+                    f"+refs/remotes/{source_names[url]}/*:refs/remotes/{name}/*"
+                    for name, url in target.remote_urls.items()
+                    if url in source_names
+                ]
+                if not refspecs:
+                    error = ResourceError(
+                        f"{source_path} shares no remote with {project_path}"
+                    )
+                    return ServiceResult.error(error)
+                # Tags too, as a plain fetch would bring those it reaches
+                refspecs.append("+refs/tags/*:refs/tags/*")
+
+                result = await run_subprocess_async(
+                    COMMANDS["GIT_COMMANDS"]["fetch_from_clone"]
+                    + [str(source_path)]
+                    + refspecs,
+                    cwd=str(project_path),
+                    capture_output=True,
+                    timeout=60.0,
+                )
+                if result.returncode == 0:
+                    # Our remote-tracking refs are now as fresh as the source's
+                    source_fetched = fetch_freshness.last_fetch(source_path)
+                    if source_fetched is not None:
+                        fetch_freshness.record(project_path, source_fetched)
+                    return ServiceResult.success(
+                        "fetch_completed",
+                        message=f"Updated from {source_path}",
+                        metadata={
+                            "fetched_from": str(source_path),
+                            "remote_urls": target.remotes,
+                        },
+                    )
+                error = ProcessError(
+                    f"Fetch from {source_path} failed: {result.stderr}",
+                    return_code=result.returncode,
+                    stderr=result.stderr,
+                )
+                return ServiceResult.error(error)
+
+            except Exception as e:
+                self.logger.exception("Unexpected error fetching from local clone")
+                error = ProcessError(f"Error during fetch: {str(e)}")
+                return ServiceResult.error(error)
+
     async def get_git_commits(
-        self, project_path: Path, limit: int = None
+        self,
+        project_path: Path,
+        limit: int = None,
+        on_page: Optional[Callable[[GitLogPage], None]] = None,
     ) -> ServiceResult[List[GitCommit]]:
-        """Get list of git commits with standardized result format (all commits by default)"""
+        """
+        Get list of git commits with standardized result format (all commits by
+        default). When on_page is given, full history is streamed and on_page
+        is called with every GitLogPage as it arrives.
+        """
         # Validate input
         if not project_path.exists():
             error = ValidationError(f"Project path does not exist: {project_path}")
@@ -339,10 +689,45 @@ class GitService(AsyncServiceInterface):
         async with self.operation_context("get_git_commits", timeout=60.0) as ctx:
             try:
                 # Check if it's a git repository
-                repo_info_result = await self.get_repository_info(project_path)
+                repo_info_result = await self.get_repository_info(
+                    project_path, detailed=False
+                )
                 if repo_info_result.is_error:
                     return ServiceResult.error(repo_info_result.error)
 
+                if limit is None and on_page is not None:
+                    commits = []
+                    async for page in self.stream_git_commits(project_path):
+                        if page.kind == "commits":
+                            commits.extend(page.commits)
+                        on_page(page)
+                    return ServiceResult.success(
+                        commits,
+                        message=f"Retrieved {len(commits)} commits with branch information (all commits)",
+                        metadata={
+                            "total_commits": len(commits),
+                            "limit_applied": None,
+                            "repository_path": str(project_path),
+                            "streamed": True,
+                        },
+                    )
+
+                # Full history is served from the per-repository commit cache
+                if limit is None:
+                    cached = await self._get_commits_cached(project_path)
+                    if cached is not None:
+                        commits, cache_state = cached
+                        return ServiceResult.success(
+                            commits,
+                            message=f"Retrieved {len(commits)} commits with branch information (all commits)",
+                            metadata={
+                                "total_commits": len(commits),
+                                "limit_applied": None,
+                                "repository_path": str(project_path),
+                                "cache": cache_state,
+                            },
+                        )
+
                 # Run git log command with or without limit
                 if limit is not None:
                     # For limited results, we need to construct the command manually
@@ -389,11 +774,122 @@ class GitService(AsyncServiceInterface):
                     },
                 )
 
+            except ProcessError as e:
+                return ServiceResult.error(e)
             except Exception as e:
                 self.logger.exception("Unexpected error getting git commits")
                 error = ProcessError(f"Error accessing git repository: {str(e)}")
                 return ServiceResult.error(error)
 
+    async def stream_git_commits(
+        self, project_path: Path, page_size: int = COMMIT_STREAM_PAGE_SIZE
+    ) -> AsyncIterator[GitLogPage]:
+        """
+        Stream all commits in pages as `git log` produces them. Source branches
+        are attributed in chunks once the commit graph has loaded and delivered
+        as "branches" updates. A repository with a commit cache is served from
+        the cache instead, with branches already attributed.
+
+        Raises:
+            ProcessError: If git log fails
+        """
+        git_dir = find_git_dir(project_path)
+        if git_dir is not None and GitCommitCache.path_for(git_dir).is_file():
+            cached = await self._get_commits_cached(project_path)
+            if cached is not None:
+                commits, _ = cached
+                for start in range(0, max(len(commits), 1), page_size):
+                    page = commits[start : start + page_size]
+                    yield GitLogPage(
+                        page,
+                        total=start + len(page),
+                        done=start + page_size >= len(commits),
+                    )
+                return
+
+        fingerprint = None
+        if git_dir is not None:
+            fingerprint = await run_in_executor(refs_fingerprint, git_dir)
+
+        async def load_graph() -> Optional[CommitGraph]:
+            try:
+                return await self._load_commit_graph(project_path)
+            except Exception as e:
+                self.logger.debug(f"Batch branch attribution unavailable: {str(e)}")
+                return None
+
+        # The graph loads while the first pages are read and shown
+        graph_task = asyncio.ensure_future(load_graph())
+        commits: List[GitCommit] = []
+        unattributed: List[GitCommit] = []
+        main_history = None
+
+        try:
+            async for lines in stream_subprocess_lines_async(
+                COMMANDS["GIT_COMMANDS"]["log"],
+                cwd=str(project_path),
+                batch_lines=page_size,
+            ):
+                page = self._parse_commits("\n".join(lines))
+                commits.extend(page)
+                unattributed.extend(page)
+                yield GitLogPage(page, total=len(commits))
+
+                if len(unattributed) < ATTRIBUTION_CHUNK_SIZE or not graph_task.done():
+                    continue
+                graph = graph_task.result()
+                if graph is None:
+                    # Per-commit detection runs once, after the log is read
+                    continue
+                if main_history is None:
+                    main_history = await self._main_branch_history(project_path, graph)
+                await self._attribute_branches_batch(
+                    unattributed, project_path, graph, main_history
+                )
+                yield GitLogPage(unattributed, kind="branches", total=len(commits))
+                unattributed = []
+
+            graph = await graph_task
+            if graph is not None:
+                if main_history is None:
+                    main_history = await self._main_branch_history(project_path, graph)
+                await self._attribute_branches_batch(
+                    unattributed, project_path, graph, main_history
+                )
+            else:
+                unattributed = await self._detect_source_branches_per_commit(
+                    unattributed, project_path
+                )
+            yield GitLogPage(
+                unattributed, kind="branches", total=len(commits), done=True
+            )
+
+            if graph is not None and fingerprint is not None:
+                cache = GitCommitCache(fingerprint, [], [])
+                cache.merge(
+                    [
+                        self._commit_to_row(c, graph.resolve(c.hash))
+                        for c in commits
+                        if graph.resolve(c.hash)
+                    ],
+                    set(graph.parents),
+                    main_history,
+                    fingerprint,
+                    sorted({ref.hash for ref in graph.refs}),
+                )
+                with contextlib.suppress(OSError):
+                    await run_in_executor(cache.save, git_dir)
+
+        except subprocess.CalledProcessError as e:
+            raise ProcessError(
+                f"Error getting git log: {e.stderr}",
+                return_code=e.returncode,
+                stderr=e.stderr,
+            ) from e
+        finally:
+            if not graph_task.done():
+                graph_task.cancel()
+
     def _parse_commits(self, log_output: str) -> List[GitCommit]:
         """Parse git log output into GitCommit objects"""
         commits = []
@@ -432,6 +928,247 @@ class GitService(AsyncServiceInterface):
         self, commits: List[GitCommit], project_path: Path
     ) -> List[GitCommit]:
         """Detect source branches for each commit using improved logic"""
+        try:
+            graph = await self._load_commit_graph(project_path)
+            if graph is not None:
+                return await self._attribute_branches_batch(
+                    commits, project_path, graph
+                )
+        except Exception as e:
+            self.logger.debug(f"Batch branch attribution unavailable: {str(e)}")
+
+        return await self._detect_source_branches_per_commit(commits, project_path)
+
+    async def _get_commits_cached(self, project_path: Path) -> Optional[tuple]:
+        """
+        All commits via the on-disk commit cache, as (commits, cache_state)
+        where cache_state is "hit", "incremental" or "rebuilt". Returns None
+        when the cache cannot be used, so callers fall back to a full read.
+        """
+        try:
+            git_dir = find_git_dir(project_path)
+            if git_dir is None:
+                return None
+
+            fingerprint = await run_in_executor(refs_fingerprint, git_dir)
+            cache = await run_in_executor(GitCommitCache.load, git_dir)
+            if cache is not None and cache.fingerprint == fingerprint:
+                return self._commits_from_rows(cache.rows), "hit"
+
+            # Refs moved: read only what is not behind the cached tips
+            graph = await self._load_commit_graph(project_path)
+            if graph is None:
+                return None
+
+            new_commits = None
+            if cache is not None:
+                new_commits = await self._log_commits_excluding(
+                    project_path, cache.tips
+                )
+            cache_state = "incremental"
+            if new_commits is None:
+                # No cache, or cached tips were garbage collected
+                cache = GitCommitCache(fingerprint, [], [])
+                cache_state = "rebuilt"
+                new_commits = await self._log_commits_excluding(project_path, [])
+                if new_commits is None:
+                    return None
+
+            # Commits created after the graph was read are left for next time
+            new_commits = [c for c in new_commits if graph.resolve(c.hash)]
+            main_history = await self._main_branch_history(project_path, graph)
+            await self._attribute_branches_batch(
+                new_commits, project_path, graph, main_history
+            )
+
+            cache.merge(
+                [self._commit_to_row(c, graph.resolve(c.hash)) for c in new_commits],
+                set(graph.parents),
+                main_history,
+                fingerprint,
+                sorted({ref.hash for ref in graph.refs}),
+            )
+            with contextlib.suppress(OSError):
+                await run_in_executor(cache.save, git_dir)
+
+            return self._commits_from_rows(cache.rows), cache_state
+
+        except Exception as e:
+            self.logger.debug(f"Commit cache unavailable: {str(e)}")
+            return None
+
+    async def _log_commits_excluding(
+        self, project_path: Path, known_tips: List[str]
+    ) -> Optional[List[GitCommit]]:
+        """`git log --all` minus everything reachable from known_tips"""
+        result = await run_subprocess_async(
+            COMMANDS["GIT_COMMANDS"]["log"] + ["--stdin"],
+            cwd=str(project_path),
+            capture_output=True,
+            input="".join(f"^{tip}\n" for tip in known_tips),
+            timeout=60.0,
+        )
+        if result.returncode != 0:
+            return None
+        return await run_in_executor(self._parse_commits, result.stdout.strip())
+
+    @staticmethod
+    def _commit_to_row(commit: GitCommit, full_hash: str) -> Dict[str, Any]:
+        return {
+            "hash": commit.hash,
+            "full_hash": full_hash,
+            "parents": commit.parents or [],
+            "author": commit.author,
+            "date": commit.date,
+            "subject": commit.subject,
+            "source_branch": commit.source_branch,
+        }
+
+    @staticmethod
+    def _commits_from_rows(rows: List[Dict[str, Any]]) -> List[GitCommit]:
+        return [
+            GitCommit(
+                hash=row["hash"],
+                author=row["author"],
+                date=row["date"],
+                subject=row["subject"],
+                parents=list(row["parents"]),
+                source_branch=row.get("source_branch"),
+            )
+            for row in rows
+        ]
+
+    async def _load_commit_graph(self, project_path: Path) -> Optional[CommitGraph]:
+        """Load refs and the full commit graph with two git calls"""
+        refs_result = await run_subprocess_async(
+            ["git", "for-each-ref", f"--format={FOR_EACH_REF_FORMAT}"],
+            cwd=str(project_path),
+            capture_output=True,
+            timeout=10.0,
+        )
+        if refs_result.returncode != 0:
+            return None
+
+        graph_result = await run_subprocess_async(
+            ["git", "rev-list", "--all", "--parents"],
+            cwd=str(project_path),
+            capture_output=True,
+            timeout=60.0,
+        )
+        if graph_result.returncode != 0 or not graph_result.stdout.strip():
+            return None
+
+        return await run_in_executor(
+            CommitGraph.parse, graph_result.stdout, refs_result.stdout
+        )
+
+    async def _name_rev_batch(
+        self, project_path: Path, full_hashes: List[str]
+    ) -> Dict[str, str]:
+        """Name many commits with a single `git name-rev` reading stdin"""
+        if not full_hashes:
+            return {}
+
+        stdin = "\n".join(full_hashes) + "\n"
+        # --annotate-stdin replaced --stdin in git 2.35; try the new flag first
+        for stdin_flag in ("--annotate-stdin", "--stdin"):
+            result = await run_subprocess_async(
+                ["git", "name-rev", "--name-only", stdin_flag],
+                cwd=str(project_path),
+                capture_output=True,
+                input=stdin,
+                timeout=30.0,
+            )
+            if result.returncode == 0:
+                break
+        else:
+            return {}
+
+        names = {}
+        for full_hash, name in zip(full_hashes, result.stdout.splitlines()):
+            name = name.strip()
+            # Unnamed commits are echoed back unchanged
+            if name and name != full_hash and name != "undefined":
+                names[full_hash] = name
+        return names
+
+    async def _main_branch_history(self, project_path: Path, graph: CommitGraph) -> set:
+        """Full hashes on the main branch's first-parent history"""
+        main_tip = graph.main_branch_tip()
+        if main_tip is None:
+            self.logger.warning("No main branch reference found, falling back to HEAD")
+            head_result = await run_subprocess_async(
+                ["git", "rev-parse", "HEAD"],
+                cwd=str(project_path),
+                capture_output=True,
+                timeout=5.0,
+            )
+            if head_result.returncode == 0:
+                main_tip = head_result.stdout.strip()
+        return graph.first_parent_history(main_tip) if main_tip else set()
+
+    async def _attribute_branches_batch(
+        self,
+        commits: List[GitCommit],
+        project_path: Path,
+        graph: CommitGraph,
+        main_history: Optional[set] = None,
+    ) -> List[GitCommit]:
+        """
+        Attribute source branches for all commits with a constant number of
+        git calls, matching the per-commit name-rev / branch --contains logic.
+        """
+        if main_history is None:
+            main_history = await self._main_branch_history(project_path, graph)
+
+        full_hashes = {commit.hash: graph.resolve(commit.hash) for commit in commits}
+        candidates = list(
+            dict.fromkeys(
+                full_hash
+                for full_hash in full_hashes.values()
+                if full_hash and full_hash not in main_history
+            )
+        )
+
+        branches: Dict[str, str] = {}
+        unnamed = []
+        names = await self._name_rev_batch(project_path, candidates)
+        for full_hash in candidates:
+            cleaned = self._clean_branch_name(names.get(full_hash, ""))
+            if cleaned and cleaned not in MAIN_BRANCH_NAMES:
+                branches[full_hash] = cleaned
+            else:
+                unnamed.append(full_hash)
+
+        # Commits name-rev could not place: first containing feature branch
+        def is_feature_branch(ref) -> bool:
+            cleaned = self._clean_branch_name(ref.short_name)
+            return bool(
+                cleaned
+                and cleaned not in MAIN_BRANCH_NAMES
+                and not cleaned.startswith("HEAD")
+                and not cleaned.endswith("master")
+                and not cleaned.endswith("main")
+            )
+
+        if unnamed:
+            containing = await run_in_executor(
+                graph.first_containing_branches, unnamed, is_feature_branch
+            )
+            for full_hash, branch in containing.items():
+                branches[full_hash] = self._clean_branch_name(branch)
+
+        for commit in commits:
+            full_hash = full_hashes.get(commit.hash)
+            if full_hash in branches:
+                commit.source_branch = branches[full_hash]
+        return commits
+
+    async def _detect_source_branches_per_commit(
+        self, commits: List[GitCommit], project_path: Path
+    ) -> List[GitCommit]:
+        """Detect source branches one commit at a time (used when the commit
+        graph cannot be loaded)"""
         try:
             # Get the main branch commit history first
             main_branch_commits = await self._get_main_branch_commits(project_path)
@@ -670,7 +1407,9 @@ class GitService(AsyncServiceInterface):
         async with self.operation_context("checkout_commit", timeout=30.0) as ctx:
             try:
                 # Check repository status first
-                repo_info_result = await self.get_repository_info(project_path)
+                repo_info_result = await self.get_repository_info(
+                    project_path, detailed=False
+                )
                 if repo_info_result.is_error:
                     return ServiceResult.error(repo_info_result.error)
 
@@ -693,6 +1432,7 @@ class GitService(AsyncServiceInterface):
                             "previous_commit": repo_info.current_commit,
                             "previous_branch": repo_info.current_branch,
                             "checkout_output": result.stdout,
+                            "preflight_ms": repo_info.dirty_check_ms,
                         },
                     )
                     # Check if this is due to local changes
@@ -795,6 +1535,109 @@ class GitService(AsyncServiceInterface):
             indicator in error_message.lower() for indicator in local_change_indicators
         )
 
+    async def clone_from_seed(
+        self,
+        repo_url: str,
+        seed_path: Path,
+        target_path: Path,
+        strategy: str = "hardlink",
+    ) -> ServiceResult[Path]:
+        """
+        Clone repo_url into target_path reusing the objects of seed_path, an
+        existing clone of the same URL, instead of downloading them again.
+
+        "hardlink" clones the seed locally (object files are hardlinked where
+        the filesystem allows), points origin back at repo_url and copies the
+        seed's remote-tracking branches. "reference" clones repo_url with
+        --reference to the seed and --dissociate, so only objects the seed
+        lacks are downloaded. Either way the result is a standalone clone.
+        """
+        if not repo_url:
+            error = ValidationError("Repository URL cannot be empty")
+            return ServiceResult.error(error)
+
+        if strategy not in CLONE_STRATEGIES:
+            error = ValidationError(f"Unknown clone strategy: {strategy}")
+            return ServiceResult.error(error)
+
+        if not (seed_path / ".git").exists():
+            error = ValidationError(f"Seed is not a git clone: {seed_path}")
+            return ServiceResult.error(error)
+
+        async with self.operation_context("clone_from_seed", timeout=300.0) as ctx:
+            try:
+                if target_path.exists():
+                    error = ResourceError(
+                        f"Target directory already exists: {target_path}"
+                    )
+                    return ServiceResult.error(error)
+                target_path.parent.mkdir(parents=True, exist_ok=True)
+
+                if strategy == "reference":
+                    steps = [
+                        (
+                            "clone_reference",
+                            {
+                                "reference_path": str(seed_path),
+                                "repo_url": repo_url,
+                                "project_name": str(target_path),
+                                "cwd": str(target_path.parent),
+                            },
+                        )
+                    ]
+                else:
+                    steps = [
+                        (
+                            "clone_local",
+                            {
+                                "source_path": str(seed_path),
+                                "project_name": str(target_path),
+                                "cwd": str(target_path.parent),
+                            },
+                        ),
+                        (
+                            "remote_set_url",
+                            {"repo_url": repo_url, "cwd": str(target_path)},
+                        ),
+                    ]
+
+                for subkey, kwargs in steps:
+                    result = await PlatformService.run_command_async(
+                        "GIT_COMMANDS",
+                        subkey=subkey,
+                        capture_output=True,
+                        timeout=300.0,
+                        **kwargs,
+                    )
+                    if result.returncode != 0:
+                        error = ProcessError(
+                            f"Clone failed: {result.stderr}",
+                            return_code=result.returncode,
+                            stderr=result.stderr,
+                        )
+                        return ServiceResult.error(error)
+
+                if strategy == "hardlink":
+                    # A local clone tracks the seed's branches, not the remote's
+                    fetch_result = await self.fetch_from_clone(target_path, seed_path)
+                    if fetch_result.is_error:
+                        return ServiceResult.error(fetch_result.error)
+
+                return ServiceResult.success(
+                    target_path,
+                    message=f"Cloned {target_path.name} from {seed_path} ({strategy})",
+                    metadata={
+                        "repo_url": repo_url,
+                        "seed_path": str(seed_path),
+                        "strategy": strategy,
+                    },
+                )
+
+            except Exception as e:
+                self.logger.exception("Unexpected error during seeded clone")
+                error = ProcessError(f"Error cloning repository: {str(e)}")
+                return ServiceResult.error(error)
+
     async def clone_repository(
         self, repo_url: str, project_name: str, destination_path: Path
     ) -> ServiceResult[Path]:
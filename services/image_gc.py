@@ -0,0 +1,391 @@
+"""
+Garbage collection of project Docker images
+
+Every image tag this tool builds or tests is recorded with the time it was
+last used, in a small JSON file (~/.cache/docker_tools/image_usage.json by
+default). When the images of the recorded tags take more than the disk
+budget, the least recently used ones are removed until they fit again.
+Only recorded tags are ever removed, and never while a build or test run
+holds a lease on them or a warm container runs them.
+
+Sizes are those docker reports per image, so layers shared between images
+count once per image and the total errs on the large side.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.config import get_config
+from services.platform_service import PlatformService
+from services.warm_containers import warm_containers
+from utils.async_utils import run_in_executor, task_manager
+from utils.docker_engine import (
+    ENGINE_ERRORS,
+    DockerEngineError,
+    configured_engine_client,
+)
+
+logger = logging.getLogger("ImageGC")
+
+GIB = 1024**3
+
+
+def normalize_tag(tag: str) -> str:
+    """ "name" -> "name:latest"; tags and digests are kept"""
+    if "@" in tag or ":" in tag.rsplit("/", 1)[-1]:
+        return tag
+    return f"{tag}:latest"
+
+
+class ImageUsageStore:
+    """Last use (wall clock) of every image tag the tool created"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, float]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return {tag: float(when) for tag, when in data.get("tags", {}).items()}
+
+    def _write(self, tags: Dict[str, float]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"tags": tags}, f, separators=(",", ":"))
+        # Atomic so a concurrent reader never sees a partial file
+        os.replace(temp_path, self.path)
+
+    def touch(self, docker_tag: str, when: Optional[float] = None):
+        with self._lock:
+            tags = self._read()
+            tags[normalize_tag(docker_tag)] = time.time() if when is None else when
+            self._write(tags)
+
+    def forget(self, docker_tags: Iterable[str]):
+        with self._lock:
+            tags = self._read()
+            for tag in docker_tags:
+                tags.pop(normalize_tag(tag), None)
+            self._write(tags)
+
+    def last_used(self) -> Dict[str, float]:
+        with self._lock:
+            return self._read()
+
+
+@dataclass
+class ProjectImage:
+    """An image holding one or more recorded tags"""
+
+    image_id: str
+    size: int
+    tags: List[str]
+    last_used: float  # Of its most recently used tag
+
+
+@dataclass
+class GcReport:
+    """Outcome of one collection"""
+
+    budget_bytes: int
+    total_bytes: int  # Before removing anything
+    removed: List[str] = field(default_factory=list)  # Tags
+    freed_bytes: int = 0
+    protected: List[str] = field(default_factory=list)  # Over budget but in use
+    failed: Dict[str, str] = field(default_factory=dict)  # Tag -> error
+    forgotten: List[str] = field(default_factory=list)  # Images already gone
+
+    @property
+    def remaining_bytes(self) -> int:
+        return self.total_bytes - self.freed_bytes
+
+
+def plan_eviction(
+    images: List[ProjectImage], budget_bytes: int, protected: Iterable[str] = ()
+) -> Tuple[List[ProjectImage], List[ProjectImage]]:
+    """
+    (images to remove, least recently used first; protected images that
+    would have been removed) to bring the total size within budget_bytes
+    """
+    protected = {normalize_tag(tag) for tag in protected}
+    excess = sum(image.size for image in images) - budget_bytes
+    evict, skipped = [], []
+    for image in sorted(images, key=lambda image: (image.last_used, image.image_id)):
+        if excess <= 0:
+            break
+        if protected.intersection(image.tags):
+            skipped.append(image)
+            continue
+        evict.append(image)
+        excess -= image.size
+    return evict, skipped
+
+
+def format_gc_report(report: GcReport) -> str:
+    def gib(size: int) -> str:
+        return f"{size / GIB:.2f} GiB"
+
+    lines = [
+        f"Project images: {gib(report.total_bytes)} "
+        f"(budget {gib(report.budget_bytes)})"
+    ]
+    if report.removed:
+        lines.append(
+            f"Removed {len(report.removed)} least recently used tag(s), "
+            f"freed {gib(report.freed_bytes)}:"
+        )
+        lines += [f"   {tag}" for tag in report.removed]
+    elif report.total_bytes <= report.budget_bytes:
+        lines.append("Within budget, nothing removed")
+    if report.protected:
+        lines.append("Kept, in use by a build, test run or warm container:")
+        lines += [f"   {tag}" for tag in report.protected]
+    for tag, error in report.failed.items():
+        lines.append(f"Could not remove {tag}: {error}")
+    if report.forgotten:
+        lines.append(f"Forgot {len(report.forgotten)} tag(s) whose image is gone")
+    return "\n".join(lines) + "\n"
+
+
+class _Lease:
+    """Marks tags in use for as long as it is entered (with or async with)"""
+
+    def __init__(self, collector: "ImageGarbageCollector", tags: Tuple[str, ...]):
+        self.collector = collector
+        self.tags = tags
+
+    def __enter__(self):
+        self.collector._touch(self.collector._acquire(self.tags))
+        return self
+
+    def __exit__(self, *exc_info):
+        self.collector._touch(self.collector._release(self.tags))
+
+    async def __aenter__(self):
+        # The usage file is rewritten off the event loop
+        await run_in_executor(self.collector._touch, self.collector._acquire(self.tags))
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await run_in_executor(self.collector._touch, self.collector._release(self.tags))
+
+
+class ImageGarbageCollector:
+    """Keeps the tool's images within the disk budget, oldest use out first"""
+
+    def __init__(self, store: Optional[ImageUsageStore] = None):
+        self._store = store
+        self._leases: Counter = Counter()
+        self._lock = threading.Lock()
+        self._collect_lock: Optional[asyncio.Lock] = None
+        self._future = None
+
+    @property
+    def store(self) -> ImageUsageStore:
+        """The store at service.image_usage_path (default ~/.cache/docker_tools)"""
+        if self._store is None:
+            path = get_config().service.image_usage_path
+            self._store = ImageUsageStore(Path(path) if path else default_usage_path())
+        return self._store
+
+    # Usage and leases
+
+    def in_use(self, *docker_tags: str) -> _Lease:
+        """Protect tags from collection while a build or test run uses them"""
+        return _Lease(self, tuple(normalize_tag(tag) for tag in docker_tags))
+
+    def _acquire(self, tags: Tuple[str, ...]) -> List[str]:
+        """Lease tags; returns those not leased before (outermost leases)"""
+        with self._lock:
+            first = [tag for tag in tags if not self._leases[tag]]
+            self._leases.update(tags)
+        return first
+
+    def _release(self, tags: Tuple[str, ...]) -> List[str]:
+        """Release tags; returns those no longer leased"""
+        with self._lock:
+            self._leases.subtract(tags)
+            self._leases += Counter()  # Drop tags no longer leased
+            return [tag for tag in tags if tag not in self._leases]
+
+    def _touch(self, tags: List[str]):
+        # Only outermost leases record a use: nested ones (build_and_test ->
+        # build -> tests) would rewrite the file for the same run
+        for tag in tags:
+            try:
+                self.store.touch(tag)
+            except OSError as e:
+                logger.warning(f"Cannot record use of image {tag}: {e}")
+
+    def protected_tags(self) -> List[str]:
+        with self._lock:
+            leased = list(self._leases)
+        return leased + [
+            normalize_tag(container.docker_tag)
+            for container in warm_containers.containers
+        ]
+
+    # Collection
+
+    async def _project_images(
+        self, last_used: Dict[str, float]
+    ) -> Tuple[List[ProjectImage], List[str]]:
+        """(images of the recorded tags, recorded tags without an image)"""
+        found: Dict[str, Tuple[str, int]] = {}  # Tag -> (image id, size)
+        unknown = set()
+        engine = configured_engine_client()
+        if engine is not None:
+            try:
+                for image in await run_in_executor(engine.images):
+                    for tag in image.get("RepoTags") or []:
+                        if tag in last_used:
+                            found[tag] = (image["Id"], int(image.get("Size", 0)))
+                engine_listed = True
+            except ENGINE_ERRORS as e:
+                logger.debug(f"Engine API unavailable: {e}")
+                engine_listed = False
+        if engine is None or not engine_listed:
+            semaphore = asyncio.Semaphore(8)
+
+            async def inspect(tag: str):
+                try:
+                    async with semaphore:
+                        result = await PlatformService.run_command_async(
+                            "DOCKER_COMMANDS",
+                            subkey="image_size",
+                            tag=tag,
+                            capture_output=True,
+                            timeout=30.0,
+                        )
+                except Exception as e:
+                    # Unknown rather than gone: keep the tag recorded
+                    logger.debug(f"Cannot inspect image {tag}: {e}")
+                    unknown.add(tag)
+                    return
+                fields = result.stdout.split() if result.returncode == 0 else []
+                if len(fields) == 2 and fields[1].isdigit():
+                    found[tag] = (fields[0], int(fields[1]))
+
+            await asyncio.gather(*(inspect(tag) for tag in last_used))
+
+        images: Dict[str, ProjectImage] = {}
+        for tag, (image_id, size) in sorted(found.items()):
+            image = images.setdefault(image_id, ProjectImage(image_id, size, [], 0.0))
+            image.tags.append(tag)
+            image.last_used = max(image.last_used, last_used[tag])
+        missing = [tag for tag in last_used if tag not in found and tag not in unknown]
+        return list(images.values()), missing
+
+    async def _remove(self, tag: str) -> Optional[str]:
+        """Untag (and delete when it was the last tag); the error if that failed"""
+        engine = configured_engine_client()
+        if engine is not None:
+            try:
+                await run_in_executor(engine.remove_image, tag)
+                return None
+            except DockerEngineError as e:
+                return e.message
+            except ENGINE_ERRORS as e:
+                logger.debug(f"Engine API unavailable: {e}")
+        success, output = await PlatformService.run_command_with_result_async(
+            "DOCKER_COMMANDS",
+            subkey="rmi",
+            image_name=tag,
+            capture_output=True,
+            text=True,
+        )
+        return None if success else output.strip()
+
+    async def collect(self, budget_gb: Optional[float] = None) -> GcReport:
+        """
+        Remove the least recently used project images until the rest fit in
+        budget_gb (service.image_gc_budget_gb by default)
+        """
+        if budget_gb is None:
+            budget_gb = get_config().service.image_gc_budget_gb
+        budget_bytes = int(budget_gb * GIB)
+        if self._collect_lock is None:
+            self._collect_lock = asyncio.Lock()
+
+        async with self._collect_lock:
+            last_used = await run_in_executor(self.store.last_used)
+            images, missing = await self._project_images(last_used)
+            report = GcReport(budget_bytes, sum(image.size for image in images))
+            # Tags leased right now may be building their first image
+            leased = set(self.protected_tags())
+            report.forgotten = [tag for tag in missing if tag not in leased]
+
+            evict, skipped = plan_eviction(images, budget_bytes, leased)
+            report.protected = [tag for image in skipped for tag in image.tags]
+            for image in evict:
+                errors = {}
+                for tag in image.tags:
+                    if tag in self.protected_tags():
+                        errors[tag] = "in use"  # Leased since the plan was made
+                        continue
+                    error = await self._remove(tag)
+                    if error is None:
+                        report.removed.append(tag)
+                    else:
+                        errors[tag] = error
+                report.failed.update(errors)
+                if not errors:
+                    report.freed_bytes += image.size
+
+            gone = report.removed + report.forgotten
+            if gone:
+                await run_in_executor(self.store.forget, gone)
+        if report.removed:
+            logger.info(
+                f"Image GC removed {len(report.removed)} tag(s), "
+                f"freed {report.freed_bytes / GIB:.2f} GiB"
+            )
+        return report
+
+    # Schedule
+
+    @property
+    def is_running(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def start(self, interval: Optional[float] = None):
+        """Collect every interval seconds (service.image_gc_interval)"""
+        if self.is_running:
+            return
+        if interval is None:
+            interval = get_config().service.image_gc_interval
+        self._future = task_manager.run_task(self._run(interval), task_name="image_gc")
+        logger.info(f"Image GC every {interval:.0f}s")
+
+    def stop(self):
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+    async def _run(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.collect()
+            except Exception as e:
+                logger.warning(f"Image GC failed: {e}")
+
+
+def default_usage_path() -> Path:
+    return Path.home() / ".cache" / "docker_tools" / "image_usage.json"
+
+
+# Global instance for the application
+image_gc = ImageGarbageCollector()
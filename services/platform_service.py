@@ -765,7 +765,7 @@ class PlatformService:
         subprocess_kwargs = {
             k: v
             for k, v in kwargs.items()
-            if k in ["text", "encoding", "errors", "cwd", "timeout"]
+            if k in ["text", "encoding", "errors", "cwd", "timeout", "input_writer"]
         }
 
         return await run_subprocess_streaming_async(
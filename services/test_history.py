@@ -0,0 +1,490 @@
+"""
+Test run history
+
+Every run of a project version's tests is stored in a local SQLite database
+with the commit, image id, wall time and each test's outcome and duration,
+so that runs can be compared after the terminal window is closed: slowest
+tests, tests that got slower from one version to another, and flaky tests
+(tests that both passed and failed on the same commit and image).
+"""
+
+import sqlite3
+import statistics
+import threading
+import time
+from collections import defaultdict
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config.config import get_config
+from services.test_result_parser import ERROR, FAILED, PASSED, ResultSummary
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    group_name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    docker_tag TEXT NOT NULL,
+    commit_sha TEXT,
+    image_id TEXT,
+    started_at REAL NOT NULL,
+    wall_seconds REAL NOT NULL,
+    return_code INTEGER,
+    framework TEXT,
+    passed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    skipped INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_version ON runs (group_name, version, id);
+CREATE TABLE IF NOT EXISTS test_names (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS cases (
+    run_id INTEGER NOT NULL,
+    test_id INTEGER NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL,
+    PRIMARY KEY (run_id, test_id)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class TestRun:
+    """One recorded run of a version's tests"""
+
+    __test__ = False  # Not a pytest test class
+
+    id: int
+    group_name: str
+    version: str
+    docker_tag: str
+    commit_sha: Optional[str]
+    image_id: Optional[str]
+    started_at: float
+    wall_seconds: float
+    return_code: Optional[int]
+    framework: Optional[str]
+    passed: int
+    failed: int
+    errors: int
+    skipped: int
+
+
+@dataclass
+class TestTiming:
+    """Median duration of a test over a version's recent runs"""
+
+    __test__ = False  # Not a pytest test class
+
+    group_name: str
+    version: str
+    name: str
+    seconds: float
+    runs: int
+
+
+@dataclass
+class TestSlowdown:
+    """A test whose median duration grew between two versions"""
+
+    __test__ = False  # Not a pytest test class
+
+    name: str
+    base_seconds: float
+    compare_seconds: float
+
+    @property
+    def delta(self) -> float:
+        return self.compare_seconds - self.base_seconds
+
+    @property
+    def ratio(self) -> Optional[float]:
+        """None when the base median is 0.0 (pytest's 0.00s), with no finite ratio"""
+        if self.base_seconds <= 0:
+            return None
+        return self.compare_seconds / self.base_seconds
+
+
+@dataclass
+class FlakyTest:
+    """A test that both passed and failed on an unchanged commit and image"""
+
+    group_name: str
+    version: str
+    name: str
+    passes: int
+    failures: int
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / (self.passes + self.failures)
+
+
+class TestHistoryStore:
+    """SQLite store of test runs; safe to use from several threads"""
+
+    __test__ = False  # Not a pytest test class
+
+    def __init__(self, path: Path, max_runs_per_version: int = 50):
+        self.path = Path(path)
+        self.max_runs_per_version = max_runs_per_version
+        self._lock = threading.Lock()
+        self._initialised = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialised:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.path), timeout=10.0)
+        if not self._initialised:
+            with self._lock:
+                if not self._initialised:
+                    self._initialise(connection)
+                    self._initialised = True
+        return connection
+
+    def _initialise(self, connection: sqlite3.Connection):
+        connection.execute("PRAGMA journal_mode=WAL")
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            raise sqlite3.DatabaseError(
+                f"Unsupported test history schema {version} in {self.path}"
+            )
+        connection.executescript(_SCHEMA)
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        connection.commit()
+
+    def record_run(
+        self,
+        group_name: str,
+        version: str,
+        docker_tag: str,
+        summary: ResultSummary,
+        wall_seconds: float,
+        return_code: Optional[int] = None,
+        commit_sha: Optional[str] = None,
+        image_id: Optional[str] = None,
+        started_at: Optional[float] = None,
+    ) -> int:
+        """Store a run and its per-test results; returns the run id"""
+        with closing(self._connect()) as connection, connection:
+            cursor = connection.execute(
+                "INSERT INTO runs (group_name, version, docker_tag, commit_sha,"
+                " image_id, started_at, wall_seconds, return_code, framework,"
+                " passed, failed, errors, skipped)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    group_name,
+                    version,
+                    docker_tag,
+                    commit_sha,
+                    image_id,
+                    time.time() if started_at is None else started_at,
+                    wall_seconds,
+                    return_code,
+                    summary.framework,
+                    summary.passed,
+                    summary.failed,
+                    summary.errors,
+                    summary.skipped,
+                ),
+            )
+            run_id = cursor.lastrowid
+            if summary.cases:
+                connection.executemany(
+                    "INSERT OR IGNORE INTO test_names (name) VALUES (?)",
+                    ((case.name,) for case in summary.cases),
+                )
+                test_ids = self._test_ids(
+                    connection, [case.name for case in summary.cases]
+                )
+                connection.executemany(
+                    "INSERT OR REPLACE INTO cases (run_id, test_id, outcome, duration)"
+                    " VALUES (?, ?, ?, ?)",
+                    (
+                        (run_id, test_ids[case.name], case.outcome, case.duration)
+                        for case in summary.cases
+                    ),
+                )
+            self._prune(connection, group_name, version)
+        return run_id
+
+    @staticmethod
+    def _test_ids(connection: sqlite3.Connection, names: List[str]) -> Dict[str, int]:
+        ids = {}
+        # Stay below SQLite's bound parameter limit
+        for start in range(0, len(names), 500):
+            chunk = names[start : start + 500]
+            rows = connection.execute(
+                "SELECT name, id FROM test_names WHERE name IN "
+                f"({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            ids.update(rows)
+        return ids
+
+    def _prune(self, connection: sqlite3.Connection, group_name: str, version: str):
+        """Drop the oldest runs beyond max_runs_per_version"""
+        stale = [
+            row[0]
+            for row in connection.execute(
+                "SELECT id FROM runs WHERE group_name = ? AND version = ?"
+                " ORDER BY id DESC LIMIT -1 OFFSET ?",
+                (group_name, version, self.max_runs_per_version),
+            )
+        ]
+        if stale:
+            marks = ",".join("?" * len(stale))
+            connection.execute(f"DELETE FROM cases WHERE run_id IN ({marks})", stale)
+            connection.execute(f"DELETE FROM runs WHERE id IN ({marks})", stale)
+
+    def runs(
+        self,
+        group_name: Optional[str] = None,
+        version: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[TestRun]:
+        """Most recent runs first"""
+        where, params = self._where(group_name, version)
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT id, group_name, version, docker_tag, commit_sha, image_id,"
+                " started_at, wall_seconds, return_code, framework, passed, failed,"
+                f" errors, skipped FROM runs {where} ORDER BY id DESC LIMIT ?",
+                params + [limit],
+            ).fetchall()
+        return [TestRun(*row) for row in rows]
+
+    @staticmethod
+    def _where(group_name: Optional[str], version: Optional[str]):
+        clauses, params = [], []
+        if group_name is not None:
+            clauses.append("group_name = ?")
+            params.append(group_name)
+        if version is not None:
+            clauses.append("version = ?")
+            params.append(version)
+        return ("WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _recent_cases(
+        self, group_name: Optional[str], version: Optional[str], window: int
+    ) -> List[Tuple]:
+        """
+        (group, version, commit, image, test name, outcome, duration) of the
+        last `window` runs of every matching version
+        """
+        where, params = self._where(group_name, version)
+        with closing(self._connect()) as connection:
+            return connection.execute(
+                "WITH recent AS (SELECT id, group_name, version, commit_sha, image_id,"
+                " ROW_NUMBER() OVER (PARTITION BY group_name, version"
+                f" ORDER BY id DESC) AS n FROM runs {where})"
+                " SELECT r.group_name, r.version, r.commit_sha, r.image_id, t.name,"
+                " c.outcome, c.duration FROM recent r"
+                " JOIN cases c ON c.run_id = r.id"
+                " JOIN test_names t ON t.id = c.test_id"
+                " WHERE r.n <= ?",
+                params + [window],
+            ).fetchall()
+
+    def _median_durations(
+        self, group_name: Optional[str], version: Optional[str], window: int
+    ) -> Dict[Tuple[str, str, str], List[float]]:
+        durations = defaultdict(list)
+        for group, ver, _, _, name, _, duration in self._recent_cases(
+            group_name, version, window
+        ):
+            if duration is not None:
+                durations[(group, ver, name)].append(duration)
+        return durations
+
+    def slowest_tests(
+        self,
+        group_name: Optional[str] = None,
+        version: Optional[str] = None,
+        limit: int = 20,
+        window: int = 5,
+    ) -> List[TestTiming]:
+        """Tests with the highest median duration over each version's recent runs"""
+        timings = [
+            TestTiming(group, ver, name, statistics.median(values), len(values))
+            for (group, ver, name), values in self._median_durations(
+                group_name, version, window
+            ).items()
+        ]
+        timings.sort(key=lambda timing: timing.seconds, reverse=True)
+        return timings[:limit]
+
+    def file_durations(
+        self, group_name: str, version: str, window: int = 5
+    ) -> Dict[str, float]:
+        """
+        Seconds each test file took (the sum of its tests' median durations)
+        over a version's recent runs, for runners that name tests
+        "path::test" (pytest)
+        """
+        files: Dict[str, float] = defaultdict(float)
+        for (_, _, name), values in self._median_durations(
+            group_name, version, window
+        ).items():
+            path, separator, _ = name.partition("::")
+            if separator:
+                files[path] += statistics.median(values)
+        return dict(files)
+
+    def slower_tests(
+        self,
+        group_name: str,
+        base_version: str = "pre-edit",
+        compare_version: str = "post-edit",
+        window: int = 5,
+        min_ratio: float = 1.2,
+        min_delta: float = 0.05,
+        limit: int = 20,
+    ) -> List[TestSlowdown]:
+        """
+        Tests whose median duration in compare_version is at least min_ratio
+        times and min_delta seconds above their median in base_version
+        """
+        base = self._median_durations(group_name, base_version, window)
+        compare = self._median_durations(group_name, compare_version, window)
+        slowdowns = []
+        for (_, _, name), values in compare.items():
+            base_values = base.get((group_name, base_version, name))
+            if not base_values:
+                continue
+            slowdown = TestSlowdown(
+                name, statistics.median(base_values), statistics.median(values)
+            )
+            ratio = slowdown.ratio
+            if slowdown.delta >= min_delta and (ratio is None or ratio >= min_ratio):
+                slowdowns.append(slowdown)
+        slowdowns.sort(key=lambda slowdown: slowdown.delta, reverse=True)
+        return slowdowns[:limit]
+
+    def flaky_tests(
+        self,
+        group_name: Optional[str] = None,
+        version: Optional[str] = None,
+        window: int = 20,
+        limit: int = 20,
+    ) -> List[FlakyTest]:
+        """
+        Tests that both passed and failed within a version's recent runs of
+        the same commit and image, most frequently failing first
+        """
+        outcomes = defaultdict(lambda: [0, 0])
+        for group, ver, commit, image, name, outcome, _ in self._recent_cases(
+            group_name, version, window
+        ):
+            counts = outcomes[(group, ver, commit, image, name)]
+            if outcome == PASSED:
+                counts[0] += 1
+            elif outcome in (FAILED, ERROR):
+                counts[1] += 1
+
+        flaky: Dict[Tuple[str, str, str], FlakyTest] = {}
+        for (group, ver, _, _, name), (passes, failures) in outcomes.items():
+            if not (passes and failures):
+                continue
+            entry = flaky.setdefault(
+                (group, ver, name), FlakyTest(group, ver, name, 0, 0)
+            )
+            entry.passes += passes
+            entry.failures += failures
+        result = sorted(
+            flaky.values(),
+            key=lambda test: (test.failure_rate, test.failures),
+            reverse=True,
+        )
+        return result[:limit]
+
+
+def format_history_report(
+    store: TestHistoryStore,
+    group_name: str,
+    base_version: str = "pre-edit",
+    compare_versions: Tuple[str, ...] = ("post-edit",),
+    limit: int = 10,
+) -> str:
+    """
+    Plain text report of a project group's recent runs, for the GUI; tests
+    that got slower are listed for each of compare_versions against
+    base_version
+    """
+    lines = [f"=== TEST HISTORY: {group_name} ===", ""]
+
+    runs = store.runs(group_name, limit=limit)
+    lines.append("Recent runs:")
+    if not runs:
+        lines.append("   (no recorded runs)")
+    for run in runs:
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(run.started_at))
+        commit = (run.commit_sha or "-")[:10]
+        lines.append(
+            f"   {when}  {run.version:<14} {commit:<10}  "
+            f"{run.passed} passed, {run.failed + run.errors} failed, "
+            f"{run.skipped} skipped  {run.wall_seconds:7.1f}s"
+        )
+
+    lines += ["", "Slowest tests (median of recent runs):"]
+    slowest = store.slowest_tests(group_name, limit=limit)
+    if not slowest:
+        lines.append("   (no timings recorded)")
+    for timing in slowest:
+        lines.append(f"   {timing.seconds:8.3f}s  {timing.version:<14} {timing.name}")
+
+    for compare_version in compare_versions:
+        lines += ["", f"Slower in {compare_version} than in {base_version}:"]
+        slower = store.slower_tests(
+            group_name, base_version, compare_version, limit=limit
+        )
+        if not slower:
+            lines.append("   (none)")
+        for slowdown in slower:
+            ratio = "x-" if slowdown.ratio is None else f"x{slowdown.ratio:.1f}"
+            lines.append(
+                f"   {slowdown.base_seconds:8.3f}s -> {slowdown.compare_seconds:8.3f}s"
+                f"  ({ratio})  {slowdown.name}"
+            )
+
+    lines += ["", "Flaky tests (passed and failed on the same commit and image):"]
+    flaky = store.flaky_tests(group_name, limit=limit)
+    if not flaky:
+        lines.append("   (none)")
+    for test in flaky:
+        lines.append(
+            f"   {test.failures}/{test.passes + test.failures} failed  "
+            f"{test.version:<14} {test.name}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def default_history_path() -> Path:
+    return Path.home() / ".cache" / "docker_tools" / "test_history.sqlite3"
+
+
+_stores: Dict[Path, TestHistoryStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_test_history() -> TestHistoryStore:
+    """The store at service.test_history_path (default ~/.cache/docker_tools)"""
+    service_config = get_config().service
+    path = (
+        Path(service_config.test_history_path)
+        if service_config.test_history_path
+        else default_history_path()
+    )
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = TestHistoryStore(path, service_config.test_history_max_runs)
+            _stores[path] = store
+        return store
@@ -0,0 +1,671 @@
+"""
+Streaming test result parsing
+
+Test output is parsed line by line while it streams from the test container,
+instead of searching the finished log for words such as "passed". Each
+supported runner (pytest, jest/npm, cargo test, go test, dotnet test, Maven
+surefire, ctest) has a parser that recognises its per-test result lines and
+its own summary lines, so a test named `test_failed_login` is just a name.
+Results are kept as one (outcome, duration) pair per test name.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Type
+
+PASSED = "passed"
+FAILED = "failed"
+ERROR = "error"
+SKIPPED = "skipped"
+OUTCOMES = (PASSED, FAILED, ERROR, SKIPPED)
+
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+
+
+class CaseResult(NamedTuple):
+    """Result of a single test; duration in seconds when the runner reports it"""
+
+    name: str
+    outcome: str
+    duration: Optional[float] = None
+
+
+@dataclass
+class ResultSummary:
+    """Counts and per-test results of one test run"""
+
+    framework: Optional[str] = None
+    passed: int = 0
+    failed: int = 0
+    errors: int = 0
+    skipped: int = 0
+    duration: Optional[float] = None  # Whole run, as reported by the runner
+    cases: List[CaseResult] = field(default_factory=list)
+    # Peak container resource usage, when the run was sampled
+    resources: Optional[Dict[str, Any]] = None
+
+    @property
+    def total(self) -> int:
+        return self.passed + self.failed + self.errors + self.skipped
+
+    @property
+    def recognised(self) -> bool:
+        return self.framework is not None
+
+    def describe(self) -> str:
+        """e.g. "12 passed, 1 failed, 2 skipped (15 total)" """
+        parts = [f"{self.passed} passed"]
+        if self.failed:
+            parts.append(f"{self.failed} failed")
+        if self.errors:
+            parts.append(f"{self.errors} errors")
+        if self.skipped:
+            parts.append(f"{self.skipped} skipped")
+        return f"{', '.join(parts)} ({self.total} total)"
+
+    def slowest(self, count: int = 5) -> List[CaseResult]:
+        timed = [case for case in self.cases if case.duration is not None]
+        return sorted(timed, key=lambda case: case.duration, reverse=True)[:count]
+
+    def to_dict(self, include_cases: bool = True) -> Dict:
+        """JSON friendly form; cases as compact [name, outcome, seconds] lists"""
+        data = {
+            "framework": self.framework,
+            "passed": self.passed,
+            "failed": self.failed,
+            "errors": self.errors,
+            "skipped": self.skipped,
+            "total": self.total,
+            "duration": self.duration,
+            "resources": self.resources,
+        }
+        if include_cases:
+            data["cases"] = [list(case) for case in self.cases]
+        return data
+
+
+def _count_words(text: str, mapping: Dict[str, str]) -> Dict[str, int]:
+    """Counts from "3 passed, 1 failed"-style text, keyed by outcome"""
+    counts = dict.fromkeys(OUTCOMES, 0)
+    for number, word in re.findall(r"(\d+) ([a-z]+)", text.lower()):
+        outcome = mapping.get(word)
+        if outcome:
+            counts[outcome] += int(number)
+    return counts
+
+
+class TestOutputParser:
+    """
+    Base class for per-runner parsers. parse_line() is called for every
+    complete output line; results are collected in `cases` and counts from
+    the runner's own summary lines in `reported`.
+    """
+
+    __test__ = False  # Not a pytest test class
+    framework = ""
+    # Lines that identify this runner's output when no framework is known
+    signature: Optional["re.Pattern"] = None
+
+    def __init__(self):
+        # Test name -> (outcome, seconds), in the order tests were reported
+        self.cases: Dict[str, Tuple[str, Optional[float]]] = {}
+        self.reported: Optional[Dict[str, int]] = None
+        self.duration: Optional[float] = None
+
+    @classmethod
+    def detect(cls, line: str) -> bool:
+        return bool(cls.signature and cls.signature.search(line.strip()))
+
+    def parse_line(self, line: str):
+        raise NotImplementedError
+
+    def add(self, name: str, outcome: str, duration: Optional[float] = None):
+        previous = self.cases.get(name)
+        if duration is None and previous is not None:
+            duration = previous[1]
+        self.cases[name] = (outcome, duration)
+
+    def add_reported(self, counts: Dict[str, int]):
+        if self.reported is None:
+            self.reported = dict.fromkeys(OUTCOMES, 0)
+        for outcome, count in counts.items():
+            self.reported[outcome] += count
+
+    def add_duration(self, seconds: float):
+        self.duration = (self.duration or 0.0) + seconds
+
+    def counts(self) -> Dict[str, int]:
+        """The runner's summary counts when printed, else counted from cases"""
+        if self.reported is not None:
+            return dict(self.reported)
+        return self.case_counts()
+
+    def case_counts(self) -> Dict[str, int]:
+        counts = dict.fromkeys(OUTCOMES, 0)
+        for outcome, _ in self.cases.values():
+            counts[outcome] += 1
+        return counts
+
+    def summary(self) -> ResultSummary:
+        counts = self.counts()
+        return ResultSummary(
+            framework=self.framework,
+            passed=counts[PASSED],
+            failed=counts[FAILED],
+            errors=counts[ERROR],
+            skipped=counts[SKIPPED],
+            duration=self.duration,
+            cases=[CaseResult(name, *result) for name, result in self.cases.items()],
+        )
+
+
+class PytestParser(TestOutputParser):
+    """pytest, verbose (one line per test) or progress-dot output"""
+
+    framework = "pytest"
+    signature = re.compile(
+        r"test session starts|^collected \d+ items?|^\S+\.py::\S+|^=+ .*\d+ (passed|failed)"
+    )
+
+    _STATUS = {
+        "PASSED": PASSED,
+        "XPASS": PASSED,
+        "FAILED": FAILED,
+        "ERROR": ERROR,
+        "SKIPPED": SKIPPED,
+        "XFAIL": SKIPPED,
+    }
+    _SUMMARY_WORDS = {
+        "passed": PASSED,
+        "xpassed": PASSED,
+        "failed": FAILED,
+        "error": ERROR,
+        "errors": ERROR,
+        "skipped": SKIPPED,
+        "xfailed": SKIPPED,
+    }
+    _NODE = re.compile(r"^(\S+::[^\s\[]+(?:\[[^\]]*\])?)")
+    _TRAILING_STATUS = re.compile(
+        r"(?:^|\s)(PASSED|FAILED|ERROR|SKIPPED|XFAIL|XPASS)"
+        r"(?:\s+\(.*\))?(?:\s+\[\s*\d+%\])?$"
+    )
+    _SHORT_SUMMARY = re.compile(r"^(FAILED|ERROR) (\S+::\S+|\S+\.py)(?: - .*)?$")
+    _DURATION = re.compile(r"^(\d+(?:\.\d+)?)s (?:call|setup|teardown)\s+(\S+::\S+)$")
+    _FINAL = re.compile(
+        r"^=*\s*((?:\d+ [a-z]+(?:, )?)+) in (\d+(?:\.\d+)?)s\b(?: \(.*\))?\s*=*$"
+    )
+
+    def __init__(self):
+        super().__init__()
+        self._pending: Optional[str] = None  # Test started, status not seen yet
+        self._phase_durations: Dict[str, float] = {}
+
+    def parse_line(self, line: str):
+        line = line.strip()
+        node = self._NODE.match(line)
+        if node:
+            self._pending = node.group(1)
+            line = line[node.end() :]
+        if self._pending:
+            status = self._TRAILING_STATUS.search(line)
+            if status:
+                self.add(self._pending, self._STATUS[status.group(1)])
+                self._pending = None
+                return
+            if not line.startswith("="):
+                return  # Output of the running test (pytest -s)
+            self._pending = None  # Section banner; the test never reported
+
+        short = self._SHORT_SUMMARY.match(line)
+        if short:
+            self.add(short.group(2), self._STATUS[short.group(1)])
+            return
+        duration = self._DURATION.match(line)
+        if duration:
+            name = duration.group(2)
+            total = self._phase_durations.get(name, 0.0) + float(duration.group(1))
+            self._phase_durations[name] = total
+            if name in self.cases:
+                self.cases[name] = (self.cases[name][0], round(total, 6))
+            return
+        final = self._FINAL.match(line)
+        if final:
+            counts = _count_words(final.group(1), self._SUMMARY_WORDS)
+            if any(counts.values()) or "no tests ran" in line:
+                self.add_reported(counts)
+                self.add_duration(float(final.group(2)))
+
+
+class JestParser(TestOutputParser):
+    """jest (npm test with CI=true), default and verbose reporters"""
+
+    framework = "jest"
+    signature = re.compile(r"^(PASS|FAIL) \S|^Tests:\s+\d+")
+
+    _FILE = re.compile(r"^(PASS|FAIL)\s+(\S+)")
+    _CASE = re.compile(
+        r"^\s*(✓|✔|√|✕|✖|×|○|✎)\s+(.+?)(?:\s+\((\d+(?:\.\d+)?)\s*(ms|s)\))?$"
+    )
+    _MARKS = {
+        "✓": PASSED,
+        "✔": PASSED,
+        "√": PASSED,
+        "✕": FAILED,
+        "✖": FAILED,
+        "×": FAILED,
+        "○": SKIPPED,
+        "✎": SKIPPED,
+    }
+    _SUMMARY_WORDS = {
+        "passed": PASSED,
+        "failed": FAILED,
+        "skipped": SKIPPED,
+        "todo": SKIPPED,
+    }
+    _TESTS = re.compile(r"^Tests:\s+(.*\d+ total)")
+    _TIME = re.compile(r"^Time:\s+(\d+(?:\.\d+)?)\s*(ms|s)")
+
+    def __init__(self):
+        super().__init__()
+        self._file = ""
+
+    def parse_line(self, line: str):
+        test_file = self._FILE.match(line)
+        if test_file:
+            self._file = test_file.group(2)
+            return
+        case = self._CASE.match(line)
+        if case:
+            title = case.group(2)
+            if case.group(1) == "○" and title.startswith("skipped "):
+                title = title[len("skipped ") :]
+            name = f"{self._file} › {title}" if self._file else title
+            duration = None
+            if case.group(3):
+                duration = float(case.group(3)) / (1000 if case.group(4) == "ms" else 1)
+            self.add(name, self._MARKS[case.group(1)], duration)
+            return
+        tests = self._TESTS.match(line)
+        if tests:
+            self.add_reported(_count_words(tests.group(1), self._SUMMARY_WORDS))
+            return
+        elapsed = self._TIME.match(line)
+        if elapsed:
+            seconds = float(elapsed.group(1))
+            self.add_duration(seconds / 1000 if elapsed.group(2) == "ms" else seconds)
+
+
+class CargoParser(TestOutputParser):
+    """cargo test (libtest) output, summed over unit, integration and doc tests"""
+
+    framework = "cargo"
+    signature = re.compile(r"^running \d+ tests?$|^test result: ")
+
+    _CASE = re.compile(r"^test (.+?) \.\.\. (ok|FAILED|ignored\b.*)$")
+    _RESULT = re.compile(
+        r"^test result: \w+\. (\d+) passed; (\d+) failed; (\d+) ignored;"
+        r".*?(?:finished in (\d+(?:\.\d+)?)s)?$"
+    )
+
+    def parse_line(self, line: str):
+        case = self._CASE.match(line)
+        if case:
+            status = case.group(2)
+            outcome = (
+                PASSED if status == "ok" else FAILED if status == "FAILED" else SKIPPED
+            )
+            self.add(case.group(1), outcome)
+            return
+        result = self._RESULT.match(line)
+        if result:
+            self.add_reported(
+                {
+                    PASSED: int(result.group(1)),
+                    FAILED: int(result.group(2)),
+                    SKIPPED: int(result.group(3)),
+                }
+            )
+            if result.group(4):
+                self.add_duration(float(result.group(4)))
+
+
+class GoTestParser(TestOutputParser):
+    """
+    go test output. With -v every test (and subtest) is reported; without it
+    only failures are, so packages without reported tests count as one result.
+    """
+
+    framework = "go"
+    signature = re.compile(
+        r"^=== RUN\s|^\s*--- (PASS|FAIL|SKIP): |^(ok|FAIL|\?)\s+\S+\s+(\d|\[)"
+    )
+
+    _CASE = re.compile(r"^\s*--- (PASS|FAIL|SKIP): (\S+) \((\d+(?:\.\d+)?)s\)")
+    _PACKAGE = re.compile(
+        r"^(ok|FAIL|\?)\s+(\S+)\s+(?:(\d+(?:\.\d+)?)s|\(cached\)|\[(.*)\])"
+    )
+    _STATUS = {"PASS": PASSED, "FAIL": FAILED, "SKIP": SKIPPED}
+
+    def __init__(self):
+        super().__init__()
+        self._package_cases: List[Tuple[str, str, float]] = []
+
+    def parse_line(self, line: str):
+        case = self._CASE.match(line)
+        if case:
+            self._package_cases.append(
+                (case.group(2), self._STATUS[case.group(1)], float(case.group(3)))
+            )
+            return
+        package = self._PACKAGE.match(line)
+        if package:
+            status, name = package.group(1), package.group(2)
+            if self._package_cases:
+                for test, outcome, seconds in self._package_cases:
+                    self.add(f"{name}.{test}", outcome, seconds)
+            elif status == "?":
+                self.add(name, SKIPPED)  # [no test files]
+            else:
+                seconds = float(package.group(3)) if package.group(3) else None
+                self.add(name, PASSED if status == "ok" else FAILED, seconds)
+            self._package_cases = []
+            if package.group(3):
+                self.add_duration(float(package.group(3)))
+
+    def summary(self) -> ResultSummary:
+        # Tests of a package whose result line never came (e.g. a panic)
+        for test, outcome, seconds in self._package_cases:
+            self.add(test, outcome, seconds)
+        self._package_cases = []
+        return super().summary()
+
+
+_DOTNET_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _dotnet_seconds(text: str) -> Optional[float]:
+    """Seconds from dotnet durations such as "12 ms", "1 s 204 ms" or "< 1 ms" """
+    parts = re.findall(r"(\d+(?:\.\d+)?)\s*(ms|s|m|h)\b", text)
+    if not parts:
+        return None
+    return round(sum(float(value) * _DOTNET_UNITS[unit] for value, unit in parts), 6)
+
+
+class DotnetParser(TestOutputParser):
+    """dotnet test console logger, summed over test assemblies"""
+
+    framework = "dotnet"
+    signature = re.compile(
+        r"Starting test execution|^(Passed|Failed)!\s+-\s+Failed:|^\s+(Passed|Failed|Skipped) \S.* \[.+\]$"
+    )
+
+    _CASE = re.compile(r"^\s+(Passed|Failed|Skipped) (\S.*?)(?: \[([^\]]+)\])?$")
+    _TOTAL = re.compile(
+        r"^(?:Passed|Failed)!\s+-\s+Failed:\s+(\d+),\s+Passed:\s+(\d+),"
+        r"\s+Skipped:\s+(\d+),\s+Total:\s+\d+(?:,\s+Duration:\s+(.+?))?(?:\s+-\s+.*)?$"
+    )
+    _STATUS = {"Passed": PASSED, "Failed": FAILED, "Skipped": SKIPPED}
+
+    def parse_line(self, line: str):
+        total = self._TOTAL.match(line.strip())
+        if total:
+            self.add_reported(
+                {
+                    FAILED: int(total.group(1)),
+                    PASSED: int(total.group(2)),
+                    SKIPPED: int(total.group(3)),
+                }
+            )
+            seconds = _dotnet_seconds(total.group(4) or "")
+            if seconds is not None:
+                self.add_duration(seconds)
+            return
+        case = self._CASE.match(line)
+        if case and (case.group(3) or case.group(1) == "Skipped"):
+            self.add(
+                case.group(2),
+                self._STATUS[case.group(1)],
+                _dotnet_seconds(case.group(3) or ""),
+            )
+
+
+class SurefireParser(TestOutputParser):
+    """Maven surefire console output, summed over modules"""
+
+    framework = "surefire"
+    signature = re.compile(r"T E S T S|Tests run: \d+, Failures: \d+")
+
+    _LEVEL = re.compile(r"^\[(?:INFO|WARNING|ERROR)\]\s*")
+    _TESTS_RUN = re.compile(
+        r"^Tests run: (\d+), Failures: (\d+), Errors: (\d+), Skipped: (\d+)"
+        r"(?:, Time elapsed: (\d+(?:[.,]\d+)?) s)?"
+    )
+    # "testFoo(com.example.AppTest)  Time elapsed: 0.01 s  <<< FAILURE!" (2.x)
+    # "com.example.AppTest.testFoo -- Time elapsed: 0.01 s <<< FAILURE!" (3.x)
+    _CASE = re.compile(
+        r"^(\S+?)(?:\(([\w.$]+)\))?\s+(?:-- )?Time elapsed: (\d+(?:[.,]\d+)?) s(?:ec)?"
+        r"(?:\s+<<< (FAILURE|ERROR|SKIPPED)!?)?"
+    )
+    _STATUS = {None: PASSED, "FAILURE": FAILED, "ERROR": ERROR, "SKIPPED": SKIPPED}
+
+    def __init__(self):
+        super().__init__()
+        self._class_counts = dict.fromkeys(OUTCOMES, 0)
+        self._class_lines = 0
+
+    def parse_line(self, line: str):
+        line = self._LEVEL.sub("", line.strip())
+        tests_run = self._TESTS_RUN.match(line)
+        if tests_run:
+            run, failures, errors, skipped = (int(g) for g in tests_run.groups()[:4])
+            counts = {
+                PASSED: run - failures - errors - skipped,
+                FAILED: failures,
+                ERROR: errors,
+                SKIPPED: skipped,
+            }
+            if tests_run.group(5) is not None:
+                # Per test class; the module total follows under "Results:"
+                for outcome, count in counts.items():
+                    self._class_counts[outcome] += count
+                self._class_lines += 1
+                self.add_duration(float(tests_run.group(5).replace(",", ".")))
+            else:
+                self.add_reported(counts)
+            return
+        case = self._CASE.match(line)
+        if case:
+            name = case.group(1)
+            if case.group(2):
+                name = f"{case.group(2)}.{name}"
+            self.add(
+                name,
+                self._STATUS[case.group(4)],
+                float(case.group(3).replace(",", ".")),
+            )
+
+    def counts(self) -> Dict[str, int]:
+        if self.reported is None and self._class_lines:
+            return dict(self._class_counts)
+        return super().counts()
+
+
+class CtestParser(TestOutputParser):
+    """ctest output (each test's result line, then the percentage summary)"""
+
+    framework = "ctest"
+    signature = re.compile(
+        r"^\s*\d+/\d+ Test\s+#\d+: |^\d+% tests passed, \d+ tests? failed out of"
+    )
+
+    _CASE = re.compile(
+        r"^\s*\d+/\d+ Test\s+#\d+: (\S+) \.*\s*(?:\*\*\*)?"
+        r"(Passed|Failed|Not Run|Skipped|Timeout|Exception|\w+)\b.*?"
+        r"(\d+(?:\.\d+)?) sec"
+    )
+    _SUMMARY = re.compile(r"^\d+% tests passed, (\d+) tests? failed out of (\d+)")
+    _TOTAL_TIME = re.compile(r"^Total Test time \(real\) =\s+(\d+(?:\.\d+)?) sec")
+
+    def parse_line(self, line: str):
+        case = self._CASE.match(line)
+        if case:
+            status = case.group(2)
+            outcome = (
+                PASSED
+                if status == "Passed"
+                else SKIPPED if status in ("Not Run", "Skipped") else FAILED
+            )
+            self.add(case.group(1), outcome, float(case.group(3)))
+            return
+        summary = self._SUMMARY.match(line)
+        if summary:
+            failed, total = int(summary.group(1)), int(summary.group(2))
+            self.add_reported({PASSED: total - failed, FAILED: failed})
+            return
+        total_time = self._TOTAL_TIME.match(line)
+        if total_time:
+            self.add_duration(float(total_time.group(1)))
+
+    def counts(self) -> Dict[str, int]:
+        # The summary line does not tell skipped (disabled) tests apart
+        return self.case_counts() if self.cases else super().counts()
+
+
+PARSERS: Dict[str, Type[TestOutputParser]] = {
+    parser.framework: parser
+    for parser in (
+        PytestParser,
+        JestParser,
+        CargoParser,
+        GoTestParser,
+        DotnetParser,
+        SurefireParser,
+        CtestParser,
+    )
+}
+
+# Commands in run_tests.sh that tell which runner's output to expect
+_SCRIPT_HINTS = (
+    (re.compile(r"\bpytest\b|-m pytest\b"), "pytest"),
+    (re.compile(r"\bcargo\s+test\b"), "cargo"),
+    (re.compile(r"\bgo\s+test\b"), "go"),
+    (re.compile(r"\bdotnet\s+test\b"), "dotnet"),
+    (re.compile(r"\bmvn\w*\b"), "surefire"),
+    (re.compile(r"\bctest\b"), "ctest"),
+    (re.compile(r"\bjest\b|\bnpm\s+(run\s+)?test\b|\byarn\s+test\b"), "jest"),
+)
+
+
+def framework_for_script(script_text: str) -> Optional[str]:
+    """Test runner invoked by a run_tests.sh script, if recognisable"""
+    for pattern, framework in _SCRIPT_HINTS:
+        if pattern.search(script_text):
+            return framework
+    return None
+
+
+class TestResultCollector:
+    """
+    Output callback that parses test output as it streams. Chunks may split
+    lines anywhere. Without a framework hint, the first line that matches a
+    parser's signature decides which parser reads the rest of the output.
+    """
+
+    __test__ = False  # Not a pytest test class
+
+    def __init__(self, framework: Optional[str] = None):
+        self.parser: Optional[TestOutputParser] = (
+            PARSERS[framework]() if framework in PARSERS else None
+        )
+        self.fed_chars = 0
+        self._partial = ""
+
+    def __call__(self, chunk: str):
+        self.feed(chunk)
+
+    def feed(self, chunk: str):
+        if not chunk:
+            return
+        self.fed_chars += len(chunk)
+        lines = (self._partial + chunk).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._parse_line(line)
+
+    def close(self) -> ResultSummary:
+        """Parse a trailing partial line and return the summary"""
+        if self._partial:
+            self._parse_line(self._partial)
+            self._partial = ""
+        return self.summary()
+
+    def summary(self) -> ResultSummary:
+        if self.parser is None:
+            return ResultSummary()
+        return self.parser.summary()
+
+    def _parse_line(self, line: str):
+        line = line.rstrip("\r")
+        if "\x1b" in line:
+            line = _ANSI_ESCAPE.sub("", line)
+        if self.parser is None:
+            for parser in PARSERS.values():
+                if parser.detect(line):
+                    self.parser = parser()
+                    break
+            else:
+                return
+        self.parser.parse_line(line)
+
+
+def parse_test_output(output: str, framework: Optional[str] = None) -> ResultSummary:
+    """Parse a complete test log in one go"""
+    collector = TestResultCollector(framework)
+    collector.feed(output)
+    return collector.close()
+
+
+def run_status(summary: ResultSummary, return_code: int) -> str:
+    """Status line shown in the GUI, e.g. "COMPLETED (Some Tests Failed)" """
+    if not summary.recognised:
+        return "FAILED TO RUN" if return_code != 0 else "COMPLETED (No Output)"
+    failed = summary.failed + summary.errors
+    if failed and summary.passed:
+        return "COMPLETED (Some Tests Failed)"
+    if failed:
+        return "COMPLETED (All Tests Failed)"
+    if summary.passed:
+        return "COMPLETED (All Tests Passed)"
+    return "COMPLETED (Success)" if return_code == 0 else "COMPLETED (With Issues)"
+
+
+class TestResultStore:
+    """Latest parsed results per image tag, for the GUI and the web API"""
+
+    __test__ = False  # Not a pytest test class
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._results: "OrderedDict[str, ResultSummary]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, docker_tag: str, summary: ResultSummary):
+        with self._lock:
+            self._results.pop(docker_tag, None)
+            self._results[docker_tag] = summary
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    def get(self, docker_tag: str) -> Optional[ResultSummary]:
+        with self._lock:
+            return self._results.get(docker_tag)
+
+    def all(self) -> Dict[str, ResultSummary]:
+        with self._lock:
+            return dict(self._results)
+
+
+# Global instance for the application
+latest_test_results = TestResultStore()
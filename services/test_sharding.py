@@ -0,0 +1,133 @@
+"""
+Test sharding
+
+A large suite is split by test file into shards that run side by side, each
+in its own container from the same image. Files are found the way the Edit
+run_tests.sh window finds them (per-language directories and patterns) and
+spread over the shards by the time they took in recorded runs, longest
+first onto the least loaded shard, so the shards finish close together.
+"""
+
+import os
+import shlex
+import statistics
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config.config import get_config
+from services.test_result_parser import ResultSummary
+
+# Languages whose test command template takes test file paths
+SHARDABLE_LANGUAGES = ("python", "javascript", "typescript")
+
+# Added to a shard's command so that its per-test timings are recorded for
+# balancing the next runs
+TIMING_OPTIONS = {"python": "--durations=0"}
+
+# Estimate for a file without recorded timings when nothing is known at all
+DEFAULT_FILE_SECONDS = 1.0
+
+
+@dataclass
+class Shard:
+    """Test files run together in one container"""
+
+    index: int  # 1-based
+    files: List[str] = field(default_factory=list)
+    estimated_seconds: float = 0.0
+
+    def label(self, count: int) -> str:
+        return f"shard {self.index}/{count}"
+
+
+def discover_test_files(project_path: Path, language: str) -> List[str]:
+    """Test files below the language's test directories, relative and sorted"""
+    test_config = get_config().test
+    patterns = test_config.file_patterns.get(language, ["test_*.py", "*_test.py"])
+    directories = test_config.directories.get(language, ["tests/"])
+
+    test_files = set()
+    for test_dir in directories:
+        dir_path = project_path / test_dir.rstrip("/")
+        if not dir_path.is_dir():
+            continue
+        for pattern in patterns:
+            for test_file in dir_path.rglob(pattern):
+                if test_file.is_file():
+                    rel_path = test_file.relative_to(project_path)
+                    test_files.add(str(rel_path).replace("\\", "/"))
+    return sorted(test_files)
+
+
+def default_shard_count(cpu_fraction: Optional[float] = None) -> int:
+    """service.test_shard_cpu_fraction of the CPU cores, at least one"""
+    if cpu_fraction is None:
+        cpu_fraction = get_config().service.test_shard_cpu_fraction
+    return max(1, int((os.cpu_count() or 1) * cpu_fraction))
+
+
+def plan_shards(
+    files: List[str], count: int, durations: Optional[Dict[str, float]] = None
+) -> List[Shard]:
+    """
+    Split files into at most `count` non-empty shards, balanced by the
+    recorded seconds per file; files without a timing are estimated at the
+    median of the known ones
+    """
+    durations = durations or {}
+    known = [durations[path] for path in files if path in durations]
+    fallback = statistics.median(known) if known else DEFAULT_FILE_SECONDS
+    estimates = {path: durations.get(path, fallback) for path in files}
+
+    shards = [Shard(index) for index in range(1, min(count, len(files)) + 1)]
+    for path in sorted(files, key=lambda path: (-estimates[path], path)):
+        shard = min(shards, key=lambda shard: (shard.estimated_seconds, shard.index))
+        shard.files.append(path)
+        shard.estimated_seconds += estimates[path]
+    for shard in shards:
+        shard.files.sort()
+    return shards
+
+
+def shard_command(language: str, files: List[str]) -> str:
+    """The language's test command for only these files, reporting timings"""
+    template = get_config().test.command_templates.get(
+        language, "pytest -vv -s {test_paths}"
+    )
+    command = template.format(test_paths=" ".join(shlex.quote(f) for f in files))
+    if language in TIMING_OPTIONS:
+        command += f" {TIMING_OPTIONS[language]}"
+    return command
+
+
+def merge_summaries(summaries: List[ResultSummary]) -> ResultSummary:
+    """
+    One summary for all shards; the duration is the longest shard's, since
+    they ran at the same time
+    """
+    merged = ResultSummary()
+    durations = []
+    for summary in summaries:
+        if not summary.recognised:
+            continue
+        merged.framework = merged.framework or summary.framework
+        merged.passed += summary.passed
+        merged.failed += summary.failed
+        merged.errors += summary.errors
+        merged.skipped += summary.skipped
+        merged.cases.extend(summary.cases)
+        if summary.duration is not None:
+            durations.append(summary.duration)
+    merged.duration = max(durations) if durations else None
+    return merged
+
+
+def format_shard_plan(shards: List[Shard]) -> str:
+    lines = [f"Running {len(shards)} test shards in parallel:"]
+    for shard in shards:
+        lines.append(
+            f"   {shard.label(len(shards))}: {len(shard.files)} file(s), "
+            f"~{shard.estimated_seconds:.1f}s"
+        )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,491 @@
+"""
+Warm test containers
+
+Instead of `docker run --rm <tag> ./run_tests.sh` for every test run, one
+long-lived container is kept per image and the tests are started in it with
+`docker exec`, which skips container creation and startup. Files of the build
+context that changed since the container's files were last brought up to
+date are copied in (as one tar archive) before each run, so editing tests
+or run_tests.sh does not need a rebuild. That is only done when the
+Dockerfile copies the whole context into its working directory and the
+changed files are not used by earlier build steps (dependency manifests
+named in other COPY lines, the Dockerfile itself). Otherwise, or once the
+image is rebuilt, a fresh container is started. Containers unused for the
+idle timeout are removed by a reaper task.
+
+Test runs in a warm container share its state (files written by earlier
+runs, caches), which a fresh `docker run --rm` container would not.
+"""
+
+import asyncio
+import fnmatch
+import logging
+import os
+import re
+import shlex
+import tarfile
+import tempfile
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from config.config import get_config
+from services.build_context import (
+    BuildRecordStore,
+    ContextDigest,
+    compute_context_digest,
+    default_record_dir,
+)
+from services.platform_service import PlatformService
+from utils.async_utils import run_in_executor
+
+logger = logging.getLogger("WarmContainers")
+
+CONTAINER_PREFIX = "docker-tools-warm-"
+SYNC_ARCHIVE = "/tmp/.docker-tools-sync.tar"
+
+# Always shape the image itself, whatever the COPY lines say
+BUILD_FILES = ("Dockerfile", ".dockerignore", "build_docker.sh")
+
+_INSTRUCTION = re.compile(r"^\s*(\w+)\s+(.*)$")
+
+
+def container_name(docker_tag: str) -> str:
+    return CONTAINER_PREFIX + re.sub(r"[^A-Za-z0-9_.-]", "_", docker_tag)
+
+
+@dataclass
+class CopyPlan:
+    """What the Dockerfile copies from the build context"""
+
+    copies_context: bool  # `COPY . .` (or to the WORKDIR)
+    build_inputs: List[str] = field(default_factory=list)  # Other COPY sources
+
+
+def dockerfile_copy_plan(context_dir: Path, dockerfile: str = "Dockerfile") -> CopyPlan:
+    """Find the whole-context COPY and the sources of every other COPY/ADD"""
+    try:
+        text = (Path(context_dir) / dockerfile).read_text(
+            encoding="utf-8", errors="replace"
+        )
+    except OSError:
+        return CopyPlan(False)
+
+    plan = CopyPlan(False)
+    workdir = "/"
+    for line in text.replace("\\\n", " ").splitlines():
+        match = _INSTRUCTION.match(line)
+        if not match:
+            continue
+        instruction, arguments = match.group(1).upper(), match.group(2)
+        if instruction == "FROM":
+            workdir = "/"
+        elif instruction == "WORKDIR":
+            workdir = os.path.normpath(os.path.join(workdir, arguments.strip()))
+        elif instruction in ("COPY", "ADD"):
+            try:
+                words = [w for w in shlex.split(arguments) if not w.startswith("--")]
+            except ValueError:
+                continue
+            if "--from" in arguments or len(words) < 2:
+                continue  # Copies from another stage, not the context
+            sources, destination = words[:-1], words[-1]
+            if sources in (["."], ["./"]) and (
+                os.path.normpath(os.path.join(workdir, destination)) == workdir
+            ):
+                plan.copies_context = True
+            else:
+                plan.build_inputs.extend(
+                    os.path.normpath(source).lstrip("/") for source in sources
+                )
+    return plan
+
+
+def _is_build_input(rel_path: str, plan: CopyPlan) -> bool:
+    if rel_path in BUILD_FILES:
+        return True
+    return any(
+        fnmatch.fnmatchcase(rel_path, pattern)
+        or rel_path.startswith(pattern.rstrip("/") + "/")
+        for pattern in plan.build_inputs
+    )
+
+
+@dataclass
+class WarmContainer:
+    """A running container kept for repeated test runs of one image"""
+
+    docker_tag: str
+    name: str
+    image_id: str
+    project_path: Path
+    workdir: str
+    # Build context files as they are inside the container: path -> sha256
+    files: Dict[str, str] = field(default_factory=dict)
+    # Stat and hash of the host files at the last check, to skip rehashing
+    known_hashes: Dict[str, list] = field(default_factory=dict)
+    started_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    runs: int = 0
+
+    def exec_command(self, script: str = "./run_tests.sh") -> str:
+        return f"docker exec {self.name} {script}"
+
+
+@dataclass
+class ContextChanges:
+    digest: ContextDigest
+    changed: List[str]
+    deleted: List[str]
+    syncable: bool
+
+
+class WarmContainerPool:
+    """One warm container per image tag, removed after idle_timeout seconds"""
+
+    def __init__(
+        self,
+        idle_timeout: Optional[float] = None,
+        reap_interval: float = 30.0,
+    ):
+        self._idle_timeout = idle_timeout
+        self.reap_interval = reap_interval
+        self._containers: Dict[str, WarmContainer] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._lock = threading.Lock()
+        self._reaper: Optional[asyncio.Task] = None
+
+    @property
+    def idle_timeout(self) -> float:
+        if self._idle_timeout is not None:
+            return self._idle_timeout
+        return get_config().service.warm_container_idle_timeout
+
+    @property
+    def containers(self) -> List[WarmContainer]:
+        with self._lock:
+            return list(self._containers.values())
+
+    def _tag_lock(self, docker_tag: str) -> asyncio.Lock:
+        with self._lock:
+            lock = self._locks.get(docker_tag)
+            if lock is None:
+                lock = self._locks[docker_tag] = asyncio.Lock()
+            return lock
+
+    async def _docker(self, subkey: str, timeout: float = 60.0, **kwargs):
+        return await PlatformService.run_command_async(
+            "DOCKER_COMMANDS",
+            subkey=subkey,
+            capture_output=True,
+            timeout=timeout,
+            **kwargs,
+        )
+
+    async def _image_id(self, docker_tag: str) -> Optional[str]:
+        try:
+            result = await self._docker("image_id", timeout=30.0, tag=docker_tag)
+        except Exception as e:
+            logger.debug(f"Cannot inspect image {docker_tag}: {e}")
+            return None
+        return (result.stdout.strip() if result.returncode == 0 else "") or None
+
+    async def _is_running(self, container: WarmContainer) -> bool:
+        try:
+            result = await self._docker(
+                "container_running", timeout=30.0, name=container.name
+            )
+        except Exception:
+            return False
+        return result.returncode == 0 and result.stdout.strip() == "true"
+
+    async def _changes(
+        self,
+        container_files: Dict[str, str],
+        project_path: Path,
+        known_hashes: Optional[Dict[str, list]] = None,
+    ) -> ContextChanges:
+        """Context files that differ from container_files, and whether copying them is enough"""
+
+        def compute():
+            digest = compute_context_digest(project_path, known_hashes=known_hashes)
+            current = {path: entry[3] for path, entry in digest.file_hashes.items()}
+            changed = sorted(
+                path
+                for path, sha in current.items()
+                if container_files.get(path) != sha
+            )
+            deleted = sorted(path for path in container_files if path not in current)
+            plan = dockerfile_copy_plan(project_path)
+            syncable = plan.copies_context and not any(
+                _is_build_input(path, plan) for path in changed + deleted
+            )
+            return ContextChanges(digest, changed, deleted, syncable)
+
+        return await run_in_executor(compute)
+
+    async def _sync(
+        self,
+        container: WarmContainer,
+        changes: ContextChanges,
+        progress_callback: Optional[Callable[[str], None]] = None,
+    ) -> bool:
+        """Copy changed files into the container and delete removed ones"""
+        if not changes.changed and not changes.deleted:
+            return True
+        commands = []
+        archive = None
+        try:
+            if changes.changed:
+                archive = await run_in_executor(
+                    _write_archive, container.project_path, changes.changed
+                )
+                result = await self._docker(
+                    "copy_to",
+                    source=archive,
+                    destination=f"{container.name}:{SYNC_ARCHIVE}",
+                )
+                if result.returncode != 0:
+                    logger.debug(f"docker cp failed: {result.stderr.strip()}")
+                    return False
+                commands.append(
+                    f"tar -xf {SYNC_ARCHIVE} -C {shlex.quote(container.workdir)}"
+                    f" && rm -f {SYNC_ARCHIVE}"
+                )
+            if changes.deleted:
+                commands.append(
+                    f"cd {shlex.quote(container.workdir)} && rm -rf -- "
+                    + " ".join(shlex.quote(path) for path in changes.deleted)
+                )
+            result = await self._docker(
+                "exec_shell", name=container.name, command=" && ".join(commands)
+            )
+            if result.returncode != 0:
+                logger.debug(f"Sync into {container.name} failed: {result.stderr}")
+                return False
+        except Exception as e:
+            logger.debug(f"Sync into {container.name} failed: {e}")
+            return False
+        finally:
+            if archive:
+                try:
+                    os.unlink(archive)
+                except OSError:
+                    pass
+
+        if progress_callback:
+            progress_callback(
+                f"Synced {len(changes.changed)} changed and "
+                f"{len(changes.deleted)} deleted file(s) into {container.name}\n"
+            )
+        return True
+
+    async def reuse(
+        self,
+        project_path: Path,
+        docker_tag: str,
+        progress_callback: Optional[Callable[[str], None]] = None,
+    ) -> Optional[WarmContainer]:
+        """
+        The running container of docker_tag brought up to date with the build
+        context, or None when there is none or the image needs a rebuild
+        """
+        async with self._tag_lock(docker_tag):
+            return await self._reuse(
+                project_path, docker_tag, progress_callback, require_current=True
+            )
+
+    async def _reuse(
+        self,
+        project_path: Path,
+        docker_tag: str,
+        progress_callback: Optional[Callable[[str], None]],
+        require_current: bool = False,
+    ) -> Optional[WarmContainer]:
+        with self._lock:
+            container = self._containers.get(docker_tag)
+        if container is None or Path(container.project_path) != Path(project_path):
+            return None
+        image_id, running = await asyncio.gather(
+            self._image_id(docker_tag), self._is_running(container)
+        )
+        if not running or image_id != container.image_id:
+            await self._remove(container)
+            return None
+        changes = await self._changes(
+            container.files, project_path, container.known_hashes
+        )
+        container.known_hashes = changes.digest.file_hashes
+        if not changes.syncable:
+            # Runs what the image holds, like `docker run` would, unless the
+            # caller needs the current context (to skip a rebuild)
+            return None if require_current else container
+        if not await self._sync(container, changes, progress_callback):
+            await self._remove(container)
+            return None
+        container.files = {
+            path: entry[3] for path, entry in changes.digest.file_hashes.items()
+        }
+        return container
+
+    async def _start(
+        self,
+        project_path: Path,
+        docker_tag: str,
+        progress_callback: Optional[Callable[[str], None]],
+    ) -> Optional[WarmContainer]:
+        image_id = await self._image_id(docker_tag)
+        if image_id is None:
+            return None
+        name = container_name(docker_tag)
+        with self._lock:
+            old = self._containers.pop(docker_tag, None)
+        if old is not None:
+            await self._remove(old)
+        try:
+            # A container left behind by an earlier session holds the name
+            await self._docker("remove_container", timeout=30.0, name=name)
+            result = await self._docker("warm_start", name=name, tag=docker_tag)
+            if result.returncode != 0:
+                logger.debug(f"Cannot start {name}: {result.stderr.strip()}")
+                return None
+            result = await self._docker("container_workdir", timeout=30.0, name=name)
+        except Exception as e:
+            logger.debug(f"Cannot start {name}: {e}")
+            return None
+        workdir = (result.stdout.strip() if result.returncode == 0 else "") or "/"
+
+        # Files in the image: those of its recorded build, else the current ones
+        record = await run_in_executor(_build_records().load, docker_tag)
+        if record and record.get("image_id") == image_id:
+            files = {path: entry[3] for path, entry in record["files"].items()}
+        else:
+            files = None
+        container = WarmContainer(docker_tag, name, image_id, project_path, workdir)
+        changes = await self._changes(
+            files or {}, project_path, record["files"] if files else None
+        )
+        container.known_hashes = changes.digest.file_hashes
+        if files is not None and not changes.syncable:
+            container.files = files
+        else:
+            if files is not None and not await self._sync(
+                container, changes, progress_callback
+            ):
+                await self._remove(container)
+                return None
+            container.files = {
+                path: entry[3] for path, entry in changes.digest.file_hashes.items()
+            }
+
+        with self._lock:
+            self._containers[docker_tag] = container
+        self._ensure_reaper()
+        if progress_callback:
+            progress_callback(f"Started warm container {name}\n")
+        return container
+
+    @asynccontextmanager
+    async def session(
+        self,
+        project_path: Path,
+        docker_tag: str,
+        progress_callback: Optional[Callable[[str], None]] = None,
+    ) -> AsyncIterator[Optional[WarmContainer]]:
+        """
+        Hold the warm container of docker_tag (started if needed) for one
+        test run; yields None when no container could be started
+        """
+        async with self._tag_lock(docker_tag):
+            started = time.perf_counter()
+            container = await self._reuse(project_path, docker_tag, progress_callback)
+            if container is None:
+                container = await self._start(
+                    project_path, docker_tag, progress_callback
+                )
+            if container is not None and progress_callback:
+                progress_callback(
+                    f"Warm container ready in "
+                    f"{(time.perf_counter() - started) * 1000:.0f} ms\n"
+                )
+            try:
+                yield container
+            finally:
+                if container is not None:
+                    container.runs += 1
+                    container.last_used = time.monotonic()
+
+    async def _remove(self, container: WarmContainer):
+        with self._lock:
+            if self._containers.get(container.docker_tag) is container:
+                del self._containers[container.docker_tag]
+        try:
+            await self._docker("remove_container", timeout=30.0, name=container.name)
+        except Exception as e:
+            logger.debug(f"Cannot remove {container.name}: {e}")
+
+    async def reap_idle(self, now: Optional[float] = None) -> List[str]:
+        """Remove containers unused for idle_timeout; returns their names"""
+        now = time.monotonic() if now is None else now
+        reaped = []
+        for container in self.containers:
+            lock = self._tag_lock(container.docker_tag)
+            if lock.locked() or now - container.last_used < self.idle_timeout:
+                continue
+            async with lock:
+                await self._remove(container)
+            reaped.append(container.name)
+            logger.info(f"Removed idle warm container {container.name}")
+        return reaped
+
+    def _ensure_reaper(self):
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.get_running_loop().create_task(self._reap_loop())
+
+    async def _reap_loop(self):
+        while self.containers:
+            await asyncio.sleep(min(self.reap_interval, self.idle_timeout))
+            await self.reap_idle()
+
+    async def stop_all(self):
+        """Remove every warm container"""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        await asyncio.gather(*(self._remove(c) for c in self.containers))
+
+    def shutdown(self):
+        """Remove every warm container without an event loop (application exit)"""
+        reaper, self._reaper = self._reaper, None
+        if reaper is not None:
+            reaper.get_loop().call_soon_threadsafe(reaper.cancel)
+        with self._lock:
+            containers = list(self._containers.values())
+            self._containers.clear()
+        for container in containers:
+            PlatformService.run_command_with_result(
+                "DOCKER_COMMANDS",
+                subkey="remove_container",
+                name=container.name,
+            )
+
+
+def _build_records() -> BuildRecordStore:
+    directory = get_config().service.build_record_dir
+    return BuildRecordStore(Path(directory) if directory else default_record_dir())
+
+
+def _write_archive(context_dir: Path, rel_paths: List[str]) -> str:
+    """Tar of rel_paths (relative to context_dir) in a temporary file"""
+    handle, archive = tempfile.mkstemp(prefix="docker-tools-sync-", suffix=".tar")
+    with os.fdopen(handle, "wb") as f, tarfile.open(fileobj=f, mode="w") as tar:
+        for rel_path in rel_paths:
+            tar.add(Path(context_dir) / rel_path, arcname=rel_path, recursive=False)
+    return archive
+
+
+# Global instance for the application
+warm_containers = WarmContainerPool()
@@ -7,6 +7,7 @@ import os
 import json
 import threading
 import logging
+from dataclasses import asdict
 from pathlib import Path
 from typing import Dict, Any, Optional
 import time
@@ -15,6 +16,8 @@ from config.config import get_config
 
 from flask import Flask, render_template, request, jsonify, Response
 from models.project import Project
+from services.test_history import get_test_history
+from services.test_result_parser import latest_test_results
 
 
 logger = logging.getLogger(__name__)
@@ -29,6 +32,19 @@ root_dir = os.path.dirname(service_dir)
 template_dir = os.path.join(root_dir, "templates")
 static_dir = os.path.join(root_dir, "static")
 
+# Server-Sent Events timing
+SSE_KEEPALIVE_SECONDS = 15.0
+SSE_RETRY_MS = 1000
+
+
+def _publish_terminal_chunk(chunk):
+    """Forward terminal buffer chunks to event stream clients"""
+    from models.web_event_hub import web_event_hub
+
+    web_event_hub.publish(
+        "terminal", {"seq": chunk.seq, "output": chunk.text}, event_id=chunk.seq
+    )
+
 
 class WebIntegration:
     """Web interface integration for ProjectControlPanel"""
@@ -44,6 +60,11 @@ class WebIntegration:
         # Register callback for desktop selection changes
         self._setup_desktop_sync_callback()
 
+        # Push terminal output to event stream clients as it is appended
+        from models.web_terminal_buffer import web_terminal_buffer
+
+        web_terminal_buffer.add_listener(_publish_terminal_chunk)
+
     def _setup_desktop_sync_callback(self):
         """Set up callback to sync desktop selection changes to web"""
 
@@ -52,6 +73,10 @@ class WebIntegration:
             self.last_desktop_selection = group_name
             logger.info(f"Desktop selection changed to: {group_name}")
 
+            from models.web_event_hub import web_event_hub
+
+            web_event_hub.publish("selection", {"group_name": group_name})
+
         # Register the callback with the project group service
         self.control_panel.project_group_service.add_selection_callback(
             on_desktop_selection_change
@@ -648,6 +673,109 @@ class WebIntegration:
                 logger.error(f"Error in git checkout all: {e}")
                 return jsonify({"success": False, "message": str(e)})
 
+        @self.app.route("/api/action/docker-build-all", methods=["POST"])
+        def api_docker_build_all():
+            """API endpoint for build and test of all versions - calls the same method as GUI"""
+            try:
+                data = request.get_json()
+                group_name = data.get("group_name")
+
+                if not group_name:
+                    return jsonify({"success": False, "message": "Missing group name"})
+
+                self.control_panel.project_group_service.set_current_group_by_name(
+                    group_name
+                )
+                group = self.control_panel.project_group_service.get_current_group()
+                if not group:
+                    return jsonify(
+                        {"success": False, "message": "Project group not found"}
+                    )
+
+                # Call the SAME method that the GUI button calls
+                self.control_panel.docker_build_and_test_all(group)
+
+                return jsonify(
+                    {
+                        "success": True,
+                        "message": "Build and test of all versions initiated successfully",
+                    }
+                )
+
+            except Exception as e:
+                logger.error(f"Error in docker build and test all: {e}")
+                return jsonify({"success": False, "message": str(e)})
+
+        @self.app.route("/api/test-results")
+        def api_test_results():
+            """API endpoint for the latest parsed test counts of every image"""
+            try:
+                results = {
+                    docker_tag: summary.to_dict(include_cases=False)
+                    for docker_tag, summary in latest_test_results.all().items()
+                }
+                return jsonify({"success": True, "results": results})
+            except Exception as e:
+                logger.error(f"Error getting test results: {e}")
+                return jsonify({"success": False, "message": str(e)})
+
+        @self.app.route("/api/test-results/<path:docker_tag>")
+        def api_test_result(docker_tag):
+            """API endpoint for the per-test results and timings of one image"""
+            summary = latest_test_results.get(docker_tag)
+            if summary is None:
+                return jsonify(
+                    {"success": False, "message": f"No test results for {docker_tag}"}
+                )
+            return jsonify(
+                {"success": True, "docker_tag": docker_tag, "result": summary.to_dict()}
+            )
+
+        @self.app.route("/api/test-history/<group_name>/<report>")
+        def api_test_history(group_name, report):
+            """
+            API endpoint for recorded test runs of a project group: runs,
+            slowest, slower (?base=&compare=) or flaky, optionally ?version=
+            """
+            try:
+                store = get_test_history()
+                version = request.args.get("version") or None
+                limit = request.args.get("limit", 20, type=int)
+                if report == "runs":
+                    rows = [
+                        asdict(run) for run in store.runs(group_name, version, limit)
+                    ]
+                elif report == "slowest":
+                    rows = [
+                        asdict(timing)
+                        for timing in store.slowest_tests(group_name, version, limit)
+                    ]
+                elif report == "slower":
+                    rows = [
+                        dict(
+                            asdict(slowdown), delta=slowdown.delta, ratio=slowdown.ratio
+                        )
+                        for slowdown in store.slower_tests(
+                            group_name,
+                            request.args.get("base", "pre-edit"),
+                            request.args.get("compare", "post-edit"),
+                            limit=limit,
+                        )
+                    ]
+                elif report == "flaky":
+                    rows = [
+                        dict(asdict(test), failure_rate=test.failure_rate)
+                        for test in store.flaky_tests(group_name, version, limit=limit)
+                    ]
+                else:
+                    return jsonify(
+                        {"success": False, "message": f"Unknown report: {report}"}
+                    )
+                return jsonify({"success": True, "report": report, "rows": rows})
+            except Exception as e:
+                logger.error(f"Error getting test history of {group_name}: {e}")
+                return jsonify({"success": False, "message": str(e)})
+
         @self.app.route("/api/refresh")
         def api_refresh():
             """API endpoint to refresh projects - calls the same method as GUI"""
@@ -839,13 +967,32 @@ class WebIntegration:
 
         @self.app.route("/api/terminal/output")
         def api_terminal_output():
-            """API endpoint to get current terminal output"""
+            """API endpoint to get current terminal output
+
+            With ?since=<seq> only output appended after that sequence number
+            is returned, so idle polls cost next to nothing.
+            """
             try:
                 from models.web_terminal_buffer import web_terminal_buffer
 
-                output = web_terminal_buffer.get()
+                since = request.args.get("since", type=int)
+                if since is None:
+                    output = web_terminal_buffer.get()
+                    return jsonify(
+                        {"success": True, "output": output, "timestamp": time.time()}
+                    )
+
+                delta = web_terminal_buffer.get_since(since)
                 return jsonify(
-                    {"success": True, "output": output, "timestamp": time.time()}
+                    {
+                        "success": True,
+                        "output": delta.output,
+                        "seq": delta.seq,
+                        "first_seq": delta.first_seq,
+                        "epoch": delta.epoch,
+                        "reset": delta.reset,
+                        "timestamp": time.time(),
+                    }
                 )
             except Exception as e:
                 logger.error(f"Error getting terminal output: {e}")
@@ -858,11 +1005,225 @@ class WebIntegration:
                 from models.web_terminal_buffer import web_terminal_buffer
 
                 web_terminal_buffer.clear()
+
+                from models.web_event_hub import web_event_hub
+
+                web_event_hub.publish("terminal_clear", {})
                 return jsonify({"success": True, "message": "Terminal cleared"})
             except Exception as e:
                 logger.error(f"Error clearing terminal: {e}")
                 return jsonify({"success": False, "message": str(e)})
 
+        @self.app.route("/api/events")
+        def api_events():
+            """Server-Sent Events stream of terminal output, status, selection
+            and operation events
+
+            Reconnecting clients resume terminal output from ?since=<seq> or the
+            Last-Event-ID header.
+            """
+            from models.web_event_hub import web_event_hub, WebEvent
+            from models.web_terminal_buffer import web_terminal_buffer
+
+            # Browsers send Last-Event-ID on reconnect, which is newer than
+            # the ?since the stream was originally opened with
+            since = request.headers.get("Last-Event-ID", type=int)
+            if since is None:
+                since = request.args.get("since", type=int)
+
+            client = web_event_hub.subscribe(
+                event_filter=lambda event: event.type != "channel_output"
+            )
+            if client is None:
+                return self._too_many_stream_clients()
+
+            # Snapshot after subscribing so no chunk can fall between the two;
+            # clients skip chunks whose seq they have already seen
+            delta = web_terminal_buffer.get_since(since or 0)
+            try:
+                current_selection = (
+                    self.control_panel.project_group_service.get_current_group_name()
+                )
+            except Exception:
+                current_selection = None
+
+            initial_events = [
+                WebEvent(
+                    "ready",
+                    {
+                        "seq": delta.seq,
+                        "epoch": delta.epoch,
+                        "current_selection": current_selection,
+                        "last_desktop_change": self.last_desktop_selection,
+                    },
+                )
+            ]
+            if since is not None and (delta.output or delta.reset):
+                initial_events.append(
+                    WebEvent(
+                        "terminal",
+                        {
+                            "seq": delta.seq,
+                            "output": delta.output,
+                            "reset": delta.reset,
+                        },
+                        delta.seq,
+                    )
+                )
+
+            return self._event_stream_response(client, initial_events)
+
+        @self.app.route("/api/channels")
+        def api_channels():
+            """List per-operation output channels, newest first"""
+            try:
+                from models.output_channels import output_channels
+
+                return jsonify(
+                    {
+                        "success": True,
+                        "channels": [
+                            channel.to_dict() for channel in output_channels.list()
+                        ],
+                        "total_bytes": output_channels.total_bytes,
+                        "max_total_bytes": output_channels.total_max_bytes,
+                    }
+                )
+            except Exception as e:
+                logger.error(f"Error listing output channels: {e}")
+                return jsonify({"success": False, "message": str(e)}), 500
+
+        @self.app.route("/api/channels/<channel_id>/output")
+        def api_channel_output(channel_id):
+            """Get a channel's output, optionally only what follows ?since=<seq>"""
+            try:
+                from models.output_channels import output_channels
+
+                channel = output_channels.get(channel_id)
+                if channel is None:
+                    return (
+                        jsonify(
+                            {
+                                "success": False,
+                                "message": f"Channel {channel_id} not found",
+                            }
+                        ),
+                        404,
+                    )
+
+                delta = channel.buffer.get_since(
+                    request.args.get("since", default=0, type=int)
+                )
+                return jsonify(
+                    {
+                        "success": True,
+                        "channel": channel.to_dict(),
+                        "output": delta.output,
+                        "seq": delta.seq,
+                        "first_seq": delta.first_seq,
+                        "reset": delta.reset,
+                    }
+                )
+            except Exception as e:
+                logger.error(f"Error getting channel output: {e}")
+                return jsonify({"success": False, "message": str(e)}), 500
+
+        @self.app.route("/api/channels/<channel_id>/events")
+        def api_channel_events(channel_id):
+            """Server-Sent Events stream of a single channel's output
+
+            Event ids are the channel's own sequence numbers, so reconnecting
+            clients resume via Last-Event-ID.
+            """
+            from models.output_channels import output_channels
+            from models.web_event_hub import web_event_hub, WebEvent
+
+            channel = output_channels.get(channel_id)
+            if channel is None:
+                return (
+                    jsonify(
+                        {"success": False, "message": f"Channel {channel_id} not found"}
+                    ),
+                    404,
+                )
+
+            since = request.headers.get("Last-Event-ID", type=int)
+            if since is None:
+                since = request.args.get("since", default=0, type=int)
+
+            def for_channel(event):
+                if event.type == "channel_output":
+                    return event.data.get("channel_id") == channel_id
+                return event.type == "channel" and event.data.get("id") == channel_id
+
+            client = web_event_hub.subscribe(event_filter=for_channel)
+            if client is None:
+                return self._too_many_stream_clients()
+
+            delta = channel.buffer.get_since(since)
+            initial_events = [WebEvent("ready", channel.to_dict())]
+            if delta.output or delta.reset:
+                initial_events.append(
+                    WebEvent(
+                        "output",
+                        {
+                            "seq": delta.seq,
+                            "output": delta.output,
+                            "reset": delta.reset,
+                        },
+                        delta.seq,
+                    )
+                )
+
+            def to_channel_event(event):
+                if event.type != "channel_output":
+                    return event
+                # Re-key output with the channel's sequence number
+                return WebEvent(
+                    "output",
+                    {"seq": event.data["seq"], "output": event.data["output"]},
+                    event.data["seq"],
+                )
+
+            return self._event_stream_response(
+                client, initial_events, transform=to_channel_event
+            )
+
+    def _too_many_stream_clients(self):
+        return (
+            jsonify({"success": False, "message": "Too many event stream clients"}),
+            503,
+        )
+
+    def _event_stream_response(self, client, initial_events, transform=None):
+        """Stream initial events and then the client's queued hub events"""
+        from models.web_event_hub import web_event_hub
+
+        def stream():
+            try:
+                yield f"retry: {SSE_RETRY_MS}\n\n"
+                for event in initial_events:
+                    yield event.to_sse()
+
+                while True:
+                    event = client.next_event(timeout=SSE_KEEPALIVE_SECONDS)
+                    if event is None:
+                        yield ": keepalive\n\n"
+                    elif client.is_close(event):
+                        break
+                    else:
+                        if transform:
+                            event = transform(event)
+                        yield event.to_sse()
+            finally:
+                web_event_hub.unsubscribe(client)
+
+        return Response(
+            stream(),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     def start_web_server(self, host="0.0.0.0", port=5000, debug=False):
         """Start the web server in a separate thread"""
         if self.is_running:
@@ -886,6 +1247,10 @@ class WebIntegration:
         """Stop the web server"""
         if self.is_running:
             self.is_running = False
+
+            from models.web_event_hub import web_event_hub
+
+            web_event_hub.close_all()
             logger.info("Web server stopped")
 
     def get_web_url(self) -> str:
@@ -8,6 +8,7 @@ let currentProject = null;
 let loadingRequests = new Set();
 let syncCheckInterval = null;
 let lastKnownDesktopSelection = null;
+let eventSource = null;
 
 // DOM Elements
 const statusMessage = document.getElementById('status-message');
@@ -21,6 +22,7 @@ document.addEventListener('DOMContentLoaded', function() {
     initializeEventListeners();
     loadCurrentProject();
     startSyncMonitoring();
+    startEventStream();
 });
 
 /**
@@ -75,8 +77,10 @@ function initializeEventListeners() {
         if (!document.hidden) {
             // Resume sync monitoring when page becomes visible
             startSyncMonitoring();
+            startEventStream();
         } else {
             // Pause sync monitoring when page is hidden
+            stopEventStream();
             stopSyncMonitoring();
         }
     });
@@ -118,27 +122,7 @@ async function checkDesktopSync() {
             const currentSelection = result.current_selection;
             const lastDesktopChange = result.last_desktop_change;
             
-            // Update dropdown if desktop selection changed
-            if (lastDesktopChange && 
-                lastDesktopChange !== lastKnownDesktopSelection && 
-                lastDesktopChange !== currentProject) {
-                
-                lastKnownDesktopSelection = lastDesktopChange;
-                
-                // Update dropdown without triggering change event
-                updateDropdownSelection(lastDesktopChange);
-                
-                // Update current project state
-                currentProject = lastDesktopChange;
-                
-                // Show notification
-                updateStatus(`Desktop selection changed to: ${lastDesktopChange}`, 'info');
-                
-                // Reload page to show updated project
-                setTimeout(() => {
-                    window.location.href = `/?group=${encodeURIComponent(lastDesktopChange)}`;
-                }, 1000);
-            }
+            handleDesktopSelection(lastDesktopChange);
         }
     } catch (error) {
         // Silently handle sync check errors to avoid spam
@@ -146,6 +130,77 @@ async function checkDesktopSync() {
     }
 }
 
+/**
+ * Open the server-sent event stream; sync polling stays as the fallback
+ */
+function startEventStream() {
+    if (!window.EventSource) {
+        return;
+    }
+    stopEventStream();
+
+    eventSource = new EventSource('/api/events');
+
+    eventSource.addEventListener('ready', function(event) {
+        // Selection changes are pushed while the stream is up
+        stopSyncMonitoring();
+        handleDesktopSelection(JSON.parse(event.data).last_desktop_change);
+    });
+
+    eventSource.addEventListener('selection', function(event) {
+        handleDesktopSelection(JSON.parse(event.data).group_name);
+    });
+
+    eventSource.addEventListener('status', function(event) {
+        const data = JSON.parse(event.data);
+        updateStatus(data.message, data.level || 'info');
+    });
+
+    eventSource.onerror = function() {
+        // The browser reconnects on its own; poll until it does
+        if (!syncCheckInterval) {
+            startSyncMonitoring();
+        }
+    };
+}
+
+/**
+ * Close the server-sent event stream
+ */
+function stopEventStream() {
+    if (eventSource) {
+        eventSource.close();
+        eventSource = null;
+    }
+}
+
+/**
+ * Follow a project selection made in the desktop application
+ */
+function handleDesktopSelection(lastDesktopChange) {
+    // Update dropdown if desktop selection changed
+    if (lastDesktopChange && 
+        lastDesktopChange !== lastKnownDesktopSelection && 
+        lastDesktopChange !== currentProject) {
+        
+        lastKnownDesktopSelection = lastDesktopChange;
+        
+        // Update dropdown without triggering change event
+        updateDropdownSelection(lastDesktopChange);
+        
+        // Update current project state
+        currentProject = lastDesktopChange;
+        
+        // Show notification
+        updateStatus(`Desktop selection changed to: ${lastDesktopChange}`, 'info');
+        
+        // Reload page to show updated project
+        setTimeout(() => {
+            window.location.href = `/?group=${encodeURIComponent(lastDesktopChange)}`;
+        }, 1000);
+    }
+}
+
 /**
  * Update dropdown selection without triggering change event
  */
@@ -732,6 +787,82 @@ async function gitCheckoutAll(groupName) {
     }
 }
 
+/**
+ * Docker build and test all versions
+ */
+async function dockerBuildAll(groupName) {
+    updateStatus(`Building and testing all versions of: ${groupName}...`);
+    
+    try {
+        const result = await apiCall('/api/action/docker-build-all', {
+            method: 'POST',
+            body: JSON.stringify({
+                group_name: groupName
+            })
+        });
+
+        if (result.success) {
+            updateStatus('Build and test of all versions started', 'success');
+            showResultModal(
+                'Build & Test All Started',
+                `${result.message} Follow the output in the terminal view.`,
+                null,
+                'success'
+            );
+        } else {
+            updateStatus('Build and test of all versions failed', 'error');
+            showResultModal('Build & Test All Failed', result.message, null, 'error');
+        }
+    } catch (error) {
+        updateStatus('Error during build and test of all versions', 'error');
+        showResultModal('Build & Test All Error', 'An error occurred during build and test of all versions.', error.message, 'error');
+    }
+}
+
+/**
+ * Show recorded test runs: slowest, slower than pre-edit and flaky tests
+ */
+async function testHistory(groupName) {
+    updateStatus(`Loading test history of: ${groupName}...`);
+
+    try {
+        const base = `/api/test-history/${encodeURIComponent(groupName)}`;
+        const [runs, slowest, slower, flaky] = await Promise.all([
+            apiCall(`${base}/runs?limit=10`),
+            apiCall(`${base}/slowest?limit=10`),
+            apiCall(`${base}/slower?limit=10`),
+            apiCall(`${base}/flaky?limit=10`)
+        ]);
+
+        const failed = [runs, slowest, slower, flaky].find(result => !result.success);
+        if (failed) {
+            updateStatus('Loading test history failed', 'error');
+            showResultModal('Test History Failed', failed.message, null, 'error');
+            return;
+        }
+
+        const section = (title, rows, format) =>
+            `${title}:\n` + (rows.length ? rows.map(format).join('\n') : '   (none)');
+        const details = [
+            section('Recent runs', runs.rows, run =>
+                `   ${run.version}  ${run.passed} passed, ${run.failed + run.errors} failed, ` +
+                `${run.skipped} skipped  ${run.wall_seconds.toFixed(1)}s`),
+            section('Slowest tests', slowest.rows, row =>
+                `   ${row.seconds.toFixed(3)}s  ${row.version}  ${row.name}`),
+            section('Slower in post-edit than in pre-edit', slower.rows, row =>
+                `   ${row.base_seconds.toFixed(3)}s -> ${row.compare_seconds.toFixed(3)}s  ${row.name}`),
+            section('Flaky tests', flaky.rows, row =>
+                `   ${row.failures}/${row.passes + row.failures} failed  ${row.version}  ${row.name}`)
+        ].join('\n\n');
+
+        updateStatus('Test history loaded', 'success');
+        showResultModal('Test History', `Recorded test runs of ${groupName}`, details, 'success');
+    } catch (error) {
+        updateStatus('Error loading test history', 'error');
+        showResultModal('Test History Error', 'An error occurred while loading the test history.', error.message, 'error');
+    }
+}
+
 /**
  * Open terminal view
  */
@@ -775,6 +906,7 @@ function debounce(func, wait) {
 
 // Clean up intervals when page is unloaded
 window.addEventListener('beforeunload', function() {
+    stopEventStream();
     stopSyncMonitoring();
 });
 
@@ -789,6 +921,8 @@ window.editRunTests = editRunTests;
 window.validateProjectGroup = validateProjectGroup;
 window.buildDockerFiles = buildDockerFiles;
 window.gitCheckoutAll = gitCheckoutAll;
+window.dockerBuildAll = dockerBuildAll;
+window.testHistory = testHistory;
 window.closeModal = closeModal;
 window.closeAddProjectModal = closeAddProjectModal;
 window.addProject = addProject;
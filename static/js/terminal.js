@@ -6,11 +6,17 @@
 // Global state
 let terminalOutput = '';
 let lastUpdateTime = 0;
+let lastSeq = 0;
+let lastEpoch = null;
 let updateInterval = null;
 let autoScroll = true;
 let isUpdating = false;
 let syncCheckInterval = null;
 let lastKnownDesktopSelection = null;
+let eventSource = null;
+
+// Keep the client-side copy in line with the server's retention
+const MAX_TERMINAL_CHARS = 50000;
 
 // DOM Elements
 const terminalOutputElement = document.getElementById('terminal-output');
@@ -28,6 +34,7 @@ document.addEventListener('DOMContentLoaded', function() {
     startTerminalUpdates();
     startSyncMonitoring();
     loadInitialOutput();
+    startEventStream();
 });
 
 /**
@@ -65,14 +72,89 @@ function initializeEventListeners() {
             // Resume updates when page becomes visible
             startTerminalUpdates();
             startSyncMonitoring();
+            startEventStream();
         } else {
             // Pause updates when page is hidden
+            stopEventStream();
             stopTerminalUpdates();
             stopSyncMonitoring();
         }
     });
 }
 
+/**
+ * Open the server-sent event stream; polling stays as the fallback
+ */
+function startEventStream() {
+    if (!window.EventSource) {
+        return;
+    }
+    stopEventStream();
+
+    eventSource = new EventSource(`/api/events?since=${lastSeq}`);
+
+    eventSource.addEventListener('ready', function(event) {
+        const data = JSON.parse(event.data);
+
+        // Pushed events replace polling while the stream is up
+        stopTerminalUpdates();
+        stopSyncMonitoring();
+
+        if (lastEpoch !== null && data.epoch !== lastEpoch) {
+            applyTerminalOutput('', lastSeq, true, Date.now() / 1000);
+        }
+        lastEpoch = data.epoch;
+        handleDesktopSelection(data.last_desktop_change);
+    });
+
+    eventSource.addEventListener('terminal', function(event) {
+        const data = JSON.parse(event.data);
+
+        // Chunks can arrive twice around a reconnect; skip ones we have
+        if (!data.reset && data.seq <= lastSeq) {
+            return;
+        }
+        applyTerminalOutput(data.output || '', data.seq, data.reset === true, Date.now() / 1000);
+    });
+
+    eventSource.addEventListener('terminal_clear', function() {
+        applyTerminalOutput('', lastSeq, true, Date.now() / 1000);
+    });
+
+    eventSource.addEventListener('selection', function(event) {
+        handleDesktopSelection(JSON.parse(event.data).group_name);
+    });
+
+    eventSource.addEventListener('status', function(event) {
+        const data = JSON.parse(event.data);
+        updateStatusText(data.message, data.level || 'info');
+    });
+
+    eventSource.addEventListener('operation', function(event) {
+        const data = JSON.parse(event.data);
+        const level = data.state === 'failed' ? 'error' : data.state === 'completed' ? 'success' : 'info';
+        updateStatusText(`Operation ${data.name}: ${data.state}`, level);
+    });
+
+    eventSource.onerror = function() {
+        // The browser reconnects on its own; poll until it does
+        if (!updateInterval) {
+            startTerminalUpdates();
+            startSyncMonitoring();
+        }
+    };
+}
+
+/**
+ * Close the server-sent event stream
+ */
+function stopEventStream() {
+    if (eventSource) {
+        eventSource.close();
+        eventSource = null;
+    }
+}
+
 /**
  * Start terminal output updates
  */
@@ -134,24 +216,7 @@ async function checkDesktopSync() {
             const currentSelection = result.current_selection;
             const lastDesktopChange = result.last_desktop_change;
             
-            // Update dropdown if desktop selection changed
-            if (lastDesktopChange && 
-                lastDesktopChange !== lastKnownDesktopSelection && 
-                lastDesktopChange !== projectSelector.value) {
-                
-                lastKnownDesktopSelection = lastDesktopChange;
-                
-                // Update dropdown without triggering change event
-                updateDropdownSelection(lastDesktopChange);
-                
-                // Show notification
-                updateStatusText(`Desktop selection changed to: ${lastDesktopChange}`, 'info');
-                
-                // Reload page to show updated project
-                setTimeout(() => {
-                    window.location.href = `/terminal?group=${encodeURIComponent(lastDesktopChange)}`;
-                }, 1000);
-            }
+            handleDesktopSelection(lastDesktopChange);
         }
     } catch (error) {
         // Silently handle sync check errors to avoid spam
@@ -159,6 +224,30 @@ async function checkDesktopSync() {
     }
 }
 
+/**
+ * Follow a project selection made in the desktop application
+ */
+function handleDesktopSelection(lastDesktopChange) {
+    // Update dropdown if desktop selection changed
+    if (lastDesktopChange && 
+        lastDesktopChange !== lastKnownDesktopSelection && 
+        lastDesktopChange !== projectSelector.value) {
+        
+        lastKnownDesktopSelection = lastDesktopChange;
+        
+        // Update dropdown without triggering change event
+        updateDropdownSelection(lastDesktopChange);
+        
+        // Show notification
+        updateStatusText(`Desktop selection changed to: ${lastDesktopChange}`, 'info');
+        
+        // Reload page to show updated project
+        setTimeout(() => {
+            window.location.href = `/terminal?group=${encodeURIComponent(lastDesktopChange)}`;
+        }, 1000);
+    }
+}
+
 /**
  * Update dropdown selection without triggering change event
  */
@@ -189,20 +278,17 @@ async function updateTerminalOutput() {
     isUpdating = true;
     
     try {
-        const result = await apiCall('/api/terminal/output');
+        // Only ask for output appended since the last chunk we have seen
+        const result = await apiCall(`/api/terminal/output?since=${lastSeq}`);
         
         if (result.success) {
             const newOutput = result.output || '';
             const timestamp = result.timestamp || 0;
+            const epochChanged = lastEpoch !== null && result.epoch !== lastEpoch;
+            const replace = lastSeq === 0 || result.reset || epochChanged;
             
-            // Only update if there's new content
-            if (newOutput !== terminalOutput || timestamp > lastUpdateTime) {
-                terminalOutput = newOutput;
-                lastUpdateTime = timestamp;
-                
-                updateTerminalDisplay();
-                updateStatusInfo(timestamp);
-            }
+            lastEpoch = result.epoch;
+            applyTerminalOutput(newOutput, result.seq || 0, replace, timestamp);
         } else {
             console.warn('Failed to get terminal output:', result.message);
         }
@@ -214,6 +300,27 @@ async function updateTerminalOutput() {
     }
 }
 
+/**
+ * Append (or replace with) output received from the server
+ */
+function applyTerminalOutput(output, seq, replace, timestamp) {
+    lastSeq = seq;
+
+    // Only update if there's new content
+    if (!replace && !output) {
+        return;
+    }
+
+    terminalOutput = replace ? output : terminalOutput + output;
+    if (terminalOutput.length > MAX_TERMINAL_CHARS) {
+        terminalOutput = terminalOutput.slice(-MAX_TERMINAL_CHARS);
+    }
+    lastUpdateTime = timestamp;
+    
+    updateTerminalDisplay();
+    updateStatusInfo(timestamp);
+}
+
 /**
  * Update the terminal display
  */
@@ -353,6 +460,7 @@ async function clearTerminal() {
         
         if (result.success) {
             terminalOutput = '';
+            lastEpoch = null;
             updateTerminalDisplay();
             updateStatusText('Terminal cleared', 'success');
         } else {
@@ -469,6 +577,7 @@ window.goBack = goBack;
 
 // Clean up intervals when page is unloaded
 window.addEventListener('beforeunload', function() {
+    stopEventStream();
     stopSyncMonitoring();
     stopTerminalUpdates();
 }); 
\ No newline at end of file
@@ -9,7 +9,7 @@ import tempfile
 import shutil
 from pathlib import Path
 import pytest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 # Add parent directory to path to import modules
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -49,6 +49,34 @@ def mock_async_utilities():
             yield
 
 
+@pytest.fixture(autouse=True)
+def isolated_test_history(tmp_path):
+    """Record Docker test runs made by tests in a throwaway history"""
+    with patch(
+        "services.test_history.default_history_path",
+        return_value=tmp_path / "test_history.sqlite3",
+    ):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def isolated_image_usage(tmp_path):
+    """Record image use made by tests in a throwaway file"""
+    from services.image_gc import ImageUsageStore, image_gc
+
+    with patch.object(
+        image_gc, "_store", ImageUsageStore(tmp_path / "image_usage.json")
+    ):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def no_docker_engine():
+    """Keep tests off a real Docker daemon socket; they patch the docker CLI"""
+    with patch("utils.docker_engine.socket_path_from_env", return_value=None):
+        yield
+
+
 @pytest.fixture
 def temp_directory():
     """Create a temporary directory for tests"""
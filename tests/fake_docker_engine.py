@@ -0,0 +1,263 @@
+"""
+Fake Docker Engine API server for tests.
+
+Serves the subset of the Engine API used by utils/docker_engine.py on a Unix
+socket, with HTTP/1.1 keep-alive, from in-memory images and containers.
+A container's output is whatever `outputs[image]` says: an exit code and the
+(stream, bytes) frames its logs deliver; a number among the frames is a
+silence of that many seconds. Pulls are served from `registry`,
+a stand-in for a local registry, in the platform asked for.
+"""
+
+import json
+import re
+import socket
+import socketserver
+import struct
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+STDOUT, STDERR = 1, 2
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        engine = self.server.engine
+        with engine.lock:
+            engine.connections += 1
+            engine.sockets.append(self.request)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._route("GET")
+
+    def do_POST(self):
+        self._route("POST")
+
+    def do_DELETE(self):
+        self._route("DELETE")
+
+    def _json(self, status: int, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _no_content(self):
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _missing(self, what: str):
+        self._json(404, {"message": f"No such {what}"})
+
+    def _route(self, method: str):
+        engine = self.server.engine
+        url = urlsplit(self.path)
+        path = re.sub(r"^/v[\d.]+", "", url.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        with engine.lock:
+            engine.requests.append((method, path))
+
+        if (method, path) == ("GET", "/_ping"):
+            data = b"OK"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        elif (method, path) == ("GET", "/version"):
+            self._json(200, {"Version": "27.0.0-fake", "ApiVersion": "1.46"})
+        elif (method, path) == ("GET", "/info"):
+            self._json(200, {"OSType": "linux", "Architecture": "x86_64"})
+        elif (method, path) == ("GET", "/images/json"):
+            wanted = json.loads(query.get("filters", "{}")).get("reference", [])
+            self._json(
+                200,
+                [
+                    {
+                        "Id": image_id,
+                        "RepoTags": [reference],
+                        "Size": engine.sizes.get(image_id, 0),
+                    }
+                    for reference, image_id in engine.images.items()
+                    if not wanted or reference in wanted
+                ],
+            )
+        elif (method, path) == ("POST", "/images/create"):
+            self._pull(
+                query["fromImage"],
+                query.get("tag", "latest"),
+                query.get("platform", "linux/amd64"),
+            )
+        elif path.startswith("/images/"):
+            self._image(method, unquote(path[len("/images/") :]))
+        elif (method, path) == ("POST", "/containers/create"):
+            if body["Image"] not in engine.images:
+                return self._missing(f"image: {body['Image']}")
+            container_id = uuid.uuid4().hex
+            engine.containers[container_id] = dict(
+                body, Platform=query.get("platform"), Name=query.get("name")
+            )
+            engine.created.append(engine.containers[container_id])
+            self._json(201, {"Id": container_id, "Warnings": []})
+        elif path.startswith("/containers/"):
+            self._container(method, *path[len("/containers/") :].split("/", 1))
+        else:
+            self._json(404, {"message": "page not found"})
+
+    def _pull(self, repository: str, tag: str, platform: str):
+        engine = self.server.engine
+        separator = "@" if tag.startswith("sha256:") else ":"
+        reference = f"{repository}{separator}{tag}"
+        with engine.lock:
+            engine.pulls.append(reference)
+        image_id = engine.registry.get(reference)
+        if image_id is None:
+            # Like the daemon: the error is part of a 200 progress stream
+            messages = [{"error": f"manifest for {reference} not found"}]
+        else:
+            engine.images[reference] = image_id
+            engine.platforms[image_id] = platform
+            messages = [
+                {"status": f"Pulling from {repository}", "id": tag},
+                {"status": f"Digest: {image_id}"},
+            ]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        body = b"".join(json.dumps(m).encode() + b"\r\n" for m in messages)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _image(self, method: str, name: str):
+        engine = self.server.engine
+        inspect = name.endswith("/json")
+        name = name[: -len("/json")] if inspect else name
+        if "@" in name:
+            # name:tag@digest is looked up by its digest, as the daemon does
+            name, digest = name.split("@", 1)
+            if ":" in name.rsplit("/", 1)[-1]:
+                name = name.rsplit(":", 1)[0]
+            name = f"{name}@{digest}"
+        image_id = engine.images.get(name)
+        if image_id is None:
+            return self._missing(f"image: {name}")
+        if method == "GET" and inspect:
+            os_name, architecture = engine.platforms.get(image_id, "linux/amd64").split(
+                "/"
+            )[:2]
+            self._json(
+                200,
+                {
+                    "Id": image_id,
+                    "RepoTags": [name],
+                    "Os": os_name,
+                    "Architecture": architecture,
+                },
+            )
+        elif method == "DELETE":
+            del engine.images[name]
+            self._json(200, [{"Untagged": name}, {"Deleted": image_id}])
+
+    def _container(self, method: str, container_id: str, action: str = ""):
+        engine = self.server.engine
+        for known_id, known in engine.containers.items():
+            if container_id == known["Name"]:
+                container_id = known_id  # Referenced by name
+        container = engine.containers.get(container_id)
+        if container is None:
+            return self._missing(f"container: {container_id}")
+        exit_code, frames = engine.outputs.get(container["Image"], (0, []))
+        if (method, action) == ("POST", "start"):
+            container["Started"] = True
+            self._no_content()
+        elif (method, action) == ("GET", "logs"):
+            self.send_response(200)
+            self.send_header(
+                "Content-Type", "application/vnd.docker.multiplexed-stream"
+            )
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for entry in frames:
+                if isinstance(entry, (int, float)):
+                    time.sleep(entry)  # Quiet container
+                    continue
+                stream, data = entry
+                frame = struct.pack(">BxxxI", stream, len(data)) + data
+                self.wfile.write(f"{len(frame):x}\r\n".encode() + frame + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        elif (method, action) == ("GET", "stats"):
+            # Like the daemon: no readings until the container runs
+            self._json(200, engine.stats if container.get("Started") else {})
+        elif (method, action) == ("POST", "wait"):
+            self._json(200, {"StatusCode": exit_code})
+        elif (method, action) == ("DELETE", ""):
+            del engine.containers[container_id]
+            engine.removed.append(container_id)
+            self._no_content()
+        else:
+            self._json(404, {"message": "page not found"})
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class FakeDockerEngine:
+    """Engine API subset on a Unix socket; use as a context manager"""
+
+    def __init__(self, socket_path: Path):
+        self.socket_path = str(socket_path)
+        self.images: Dict[str, str] = {}
+        self.sizes: Dict[str, int] = {}  # By image id
+        self.platforms: Dict[str, str] = {}  # By image id; linux/amd64 if not set
+        self.outputs: Dict[str, Tuple[int, List[Any]]] = {}
+        self.containers: Dict[str, dict] = {}
+        self.removed: List[str] = []
+        self.created: List[dict] = []  # Every container's create request
+        self.registry: Dict[str, str] = {}  # What pulls can fetch: reference -> id
+        self.pulls: List[str] = []
+        self.stats: Dict[str, Any] = {}  # What the stats of running ones read
+        self.requests: List[Tuple[str, str]] = []
+        self.connections = 0
+        self.sockets: List[socket.socket] = []
+        self.lock = threading.Lock()
+        self._server = None
+
+    def drop_connections(self):
+        """Close every open connection from the server side (idle timeout)"""
+        with self.lock:
+            sockets, self.sockets = self.sockets, []
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def __enter__(self) -> "FakeDockerEngine":
+        self._server = _Server(self.socket_path, _Handler)
+        self._server.engine = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self.drop_connections()
+        self._server.server_close()
+        Path(self.socket_path).unlink(missing_ok=True)
@@ -20,6 +20,7 @@ from utils.async_utils import (
     run_subprocess_async,
     run_subprocess_streaming_async,
     run_in_executor,
+    stream_subprocess_lines_async,
     TkinterAsyncBridge,
     ImprovedAsyncTaskManager,
     AsyncTaskGroup,
@@ -237,6 +238,73 @@ class TestRunInExecutor:
         thread.join()
 
 
+class TestStreamSubprocessLinesAsync:
+    """Test cases for stream_subprocess_lines_async"""
+
+    @pytest.mark.asyncio
+    async def test_yields_lines_in_batches(self):
+        """Test that stdout arrives in batches before the process exits"""
+        cmd = [sys.executable, "-c", "for i in range(25): print(i)"]
+
+        batches = [
+            batch async for batch in stream_subprocess_lines_async(cmd, batch_lines=10)
+        ]
+
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+        assert [int(line) for batch in batches for line in batch] == list(range(25))
+
+    @pytest.mark.asyncio
+    async def test_nonzero_exit_raises_with_stderr(self):
+        """Test that a failing process raises after its output is consumed"""
+        cmd = [
+            sys.executable,
+            "-c",
+            "import sys; print('partial'); sys.stderr.write('boom'); sys.exit(3)",
+        ]
+
+        lines = []
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            async for batch in stream_subprocess_lines_async(cmd):
+                lines.extend(batch)
+
+        assert lines == ["partial"]
+        assert exc_info.value.returncode == 3
+        assert "boom" in exc_info.value.stderr
+
+    @pytest.mark.asyncio
+    async def test_large_stderr_does_not_deadlock(self):
+        """Test that stderr is drained while stdout is still being read"""
+        cmd = [
+            sys.executable,
+            "-c",
+            "import sys; sys.stderr.write('e' * 1000000); sys.stderr.flush(); "
+            "print('done')",
+        ]
+
+        async def collect():
+            return [batch async for batch in stream_subprocess_lines_async(cmd)]
+
+        batches = await asyncio.wait_for(collect(), timeout=30.0)
+
+        assert batches == [["done"]]
+
+    @pytest.mark.asyncio
+    async def test_early_stop_kills_process(self):
+        """Test that a consumer stopping early does not leave the process running"""
+        cmd = [
+            sys.executable,
+            "-c",
+            "import time\nwhile True:\n    print('x', flush=True)\n    time.sleep(0.01)",
+        ]
+        stream = stream_subprocess_lines_async(cmd, batch_lines=1)
+
+        async for batch in stream:
+            break
+        await stream.aclose()
+
+        assert batch == ["x"]
+
+
 class TestTkinterAsyncBridge:
     """Test cases for TkinterAsyncBridge"""
 
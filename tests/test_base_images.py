@@ -0,0 +1,190 @@
+"""
+Tests for pre-pulling the base images of the templates and projects.
+
+Pulls go to the fake Engine API server in tests/fake_docker_engine.py,
+whose registry stands in for a local registry, or to a patched docker CLI;
+no Docker or network is needed.
+"""
+
+import asyncio
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Add parent directory to path to import modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from services.base_images import (
+    FAILED,
+    PRESENT,
+    PULLED,
+    BaseImagePrepull,
+    dockerfile_base_images,
+    find_base_images,
+    platform_matches,
+    split_reference,
+)
+from services.platform_service import PlatformService
+from tests.fake_docker_engine import FakeDockerEngine
+from utils import docker_engine
+
+DEFAULTS_DIR = Path(parent_dir) / "defaults"
+
+PYTHON = (
+    "python:3.13.2-alpine3.21"
+    "@sha256:323a717dc4a010fee21e3f1aac738ee10bb485de4e7593ce242b36ee48d6b352"
+)
+
+
+class TestBaseImageDiscovery:
+    """Test finding the images FROM lines pull"""
+
+    def test_from_lines(self):
+        """Test stages, platforms, scratch, build args and continuations"""
+        dockerfile = (
+            "ARG BASE=alpine:3.21\n"
+            "FROM --platform=linux/amd64 maven:3.9 AS builder\n"
+            "RUN mvn package\n"
+            "from $BASE\n"
+            "FROM builder AS test\n"
+            "FROM \\\n    node:22-alpine\n"
+            "FROM scratch\n"
+            "FROM maven:3.9\n"
+        )
+        assert dockerfile_base_images(dockerfile) == ["maven:3.9", "node:22-alpine"]
+
+    def test_templates_and_projects(self, tmp_path):
+        """Test every defaults/ template, a project Dockerfile and none at all"""
+        project = tmp_path / "pre-edit" / "demo"
+        project.mkdir(parents=True)
+        (project / "Dockerfile").write_text(f"FROM {PYTHON}\nFROM redis:7\n")
+
+        images = find_base_images(
+            DEFAULTS_DIR, [project, tmp_path / "post-edit" / "demo"]
+        )
+
+        assert len(images) == 8
+        assert images[PYTHON][-1] == str(project / "Dockerfile")
+        assert len(images[PYTHON]) == 5  # Four python templates and the project
+        assert images["redis:7"] == [str(project / "Dockerfile")]
+        assert all("@sha256:" in image for image in images if image != "redis:7")
+
+    def test_platforms(self):
+        """Test matching an image's platform to the build platform"""
+        assert platform_matches("linux/amd64\n", "linux/amd64")
+        assert platform_matches("linux/arm64", "linux/arm64/v8")
+        assert not platform_matches("linux/arm64", "linux/amd64")
+
+    def test_pull_references(self):
+        """Test the repository and tag or digest pulled"""
+        assert split_reference(PYTHON) == ("python", PYTHON.split("@")[1])
+        assert split_reference("localhost:5000/team/app:1.2") == (
+            "localhost:5000/team/app",
+            "1.2",
+        )
+        assert split_reference("localhost:5000/app") == ("localhost:5000/app", "latest")
+
+
+@pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix sockets are not available"
+)
+class TestPrepullFromRegistry:
+    """Test pre-pulling through the Engine API from the registry stand-in"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="bi"))
+        self.engine = FakeDockerEngine(self.temp_dir / "docker.sock").__enter__()
+        self.engine.images["alpine:3.21"] = "sha256:aaaa"
+        # Pulled natively on an arm64 host, not for the build platform
+        self.engine.images["node:22-alpine"] = "sha256:arm"
+        self.engine.platforms["sha256:arm"] = "linux/arm64/v8"
+        self.engine.registry.update(
+            {
+                "python@" + PYTHON.split("@")[1]: "sha256:pppp",
+                "node:22-alpine": "sha256:nnnn",
+            }
+        )
+
+    def teardown_method(self):
+        docker_engine.get_engine_client(self.engine.socket_path).close()
+        self.engine.__exit__(None, None, None)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @pytest.mark.asyncio
+    async def test_missing_images_are_pulled(self):
+        """Test only missing images pulled, failures kept, readiness reported"""
+        prepull = BaseImagePrepull()
+        progress = []
+
+        with patch.object(
+            docker_engine, "socket_path_from_env", return_value=self.engine.socket_path
+        ):
+            states = await prepull.prepull(
+                ["alpine:3.21", PYTHON, "node:22-alpine", "ghost:1"],
+                progress_callback=progress.append,
+            )
+            # A second run pulls nothing that is there now
+            await prepull.prepull([PYTHON, "node:22-alpine"])
+
+        assert states == {
+            "alpine:3.21": PRESENT,
+            PYTHON: PULLED,
+            "node:22-alpine": PULLED,
+            "ghost:1": FAILED,
+        }
+        assert sorted(self.engine.pulls) == [
+            "ghost:1",
+            "node:22-alpine",
+            "python@" + PYTHON.split("@")[1],
+        ]
+        assert self.engine.images["node:22-alpine"] == "sha256:nnnn"
+        assert self.engine.platforms["sha256:nnnn"] == "linux/amd64"
+        assert f"Pulling base image {PYTHON}..." in progress
+        assert not prepull.ready
+        assert prepull.readiness() == (
+            "Base images ready: 3/4, 2 pulled "
+            "(failed: ghost:1 - manifest for ghost:1 not found)"
+        )
+
+
+class TestPrepullWithCli:
+    """Test pre-pulling with the docker CLI"""
+
+    @pytest.mark.asyncio
+    async def test_pulls_are_bounded(self):
+        """Test that no more than `concurrency` pulls run at once"""
+        running, most = 0, 0
+
+        async def fake_pull(group, subkey, image, platform, **kwargs):
+            nonlocal running, most
+            assert (subkey, platform) == ("pull", "linux/amd64")
+            running += 1
+            most = max(most, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return True, f"Status: Downloaded newer image for {image}\n"
+
+        missing = subprocess.CompletedProcess([], 1, stdout="", stderr="No such image")
+        prepull = BaseImagePrepull()
+
+        with patch.multiple(
+            PlatformService,
+            run_command_async=AsyncMock(return_value=missing),
+            run_command_with_result_async=AsyncMock(side_effect=fake_pull),
+        ):
+            states = await prepull.prepull(
+                [f"image{i}:1" for i in range(6)], concurrency=2
+            )
+
+        assert set(states.values()) == {PULLED}
+        assert most == 2
+        assert prepull.ready
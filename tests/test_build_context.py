@@ -0,0 +1,462 @@
+"""
+Tests for build context digests and skipping unchanged Docker builds.
+
+Docker itself is not needed: the build script run and the image lookup are
+patched, everything else works on real files.
+"""
+
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Add parent directory to path to import modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+import services.build_context as build_context
+from config.config import get_config
+from services.build_context import (
+    BuildRecordStore,
+    DockerIgnore,
+    base_image_key,
+    compute_context_digest,
+    context_file_sizes,
+    context_size_report,
+    format_context_report,
+    iter_context_entries,
+    write_context_tar,
+)
+from services.docker_service import DockerService
+from services.platform_service import PlatformService
+
+
+def write_files(root: Path, files: dict):
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+class TestDockerIgnore:
+    """Test .dockerignore matching against Docker's rules"""
+
+    @pytest.mark.parametrize(
+        "patterns, path, ignored",
+        [
+            (["*.log"], "debug.log", True),
+            (["*.log"], "logs/debug.log", False),
+            (["**/*.log"], "logs/deep/debug.log", True),
+            (["**/*.log"], "debug.log", True),
+            (["node_modules"], "node_modules/pkg/index.js", True),
+            (["/build"], "build/out.o", True),
+            (["build/"], "src/build/out.o", False),
+            (["docs/**"], "docs/guide/index.md", True),
+            (["*.log", "!keep.log"], "keep.log", False),
+            (["*.log", "!keep.log", "keep*"], "keep.log", True),
+            (["# comment", "", "tmp?"], "tmp1", True),
+            (["tmp?"], "tmp12", False),
+            (["a.b"], "axb", False),
+        ],
+    )
+    def test_patterns(self, patterns, path, ignored):
+        """Test single paths against pattern lists"""
+        assert DockerIgnore(patterns).matches(path) is ignored
+
+
+class TestBuildContextDigest:
+    """Test which files are sent and when the digest changes"""
+
+    def setup_method(self):
+        self.context = Path(tempfile.mkdtemp())
+        write_files(
+            self.context,
+            {
+                "Dockerfile": "FROM python:3.11\nCOPY . /app\n",
+                "build_docker.sh": "docker build -t $1 .\n",
+                "app/main.py": "print('hi')\n",
+                "node_modules/lib/index.js": "module.exports = 1\n",
+                "logs/run.log": "noise\n",
+                "logs/keep.log": "kept\n",
+                ".dockerignore": "node_modules\nlogs\n!logs/keep.log\nDockerfile\n",
+            },
+        )
+
+    def teardown_method(self):
+        shutil.rmtree(self.context, ignore_errors=True)
+
+    def test_sent_files_honour_dockerignore(self):
+        """Test pruning, re-inclusion below an excluded folder and Dockerfile"""
+        files = [path for path, _ in iter_context_entries(self.context)]
+
+        assert files == [
+            ".dockerignore",
+            "Dockerfile",
+            "app",
+            "app/main.py",
+            "build_docker.sh",
+            "logs/keep.log",
+        ]
+
+    def test_digest_tracks_sent_content_only(self):
+        """Test that only changes to sent files change the digest"""
+        first = compute_context_digest(self.context)
+        (self.context / "logs" / "run.log").write_text("more noise\n")
+        (self.context / "node_modules" / "new.js").write_text("x")
+        assert compute_context_digest(self.context).digest == first.digest
+
+        (self.context / "app" / "main.py").write_text("print('bye')\n")
+        changed = compute_context_digest(self.context)
+        assert changed.digest != first.digest
+
+        (self.context / "app" / "main.py").chmod(0o755)
+        assert compute_context_digest(self.context).digest != changed.digest
+        assert first.file_count == 5
+        assert compute_context_digest(self.context, extra="tag=b").digest != (
+            compute_context_digest(self.context, extra="tag=a").digest
+        )
+
+    def test_known_hashes_skip_rereading_files(self):
+        """Test that unchanged files are not read again"""
+        first = compute_context_digest(self.context)
+        (self.context / "app" / "main.py").write_text("print('changed')\n")
+
+        with patch.object(
+            build_context, "_file_sha256", wraps=build_context._file_sha256
+        ) as hashed:
+            second = compute_context_digest(
+                self.context, known_hashes=first.file_hashes
+            )
+
+        assert [call.args[0].name for call in hashed.call_args_list] == ["main.py"]
+        assert second.digest == compute_context_digest(self.context).digest
+
+
+class TestSkipUnchangedBuild:
+    """Test that DockerService skips builds of an unchanged context"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.project = self.temp_dir / "pre-edit" / "demo"
+        write_files(
+            self.project,
+            {
+                "Dockerfile": "FROM alpine\nCOPY . /app\n",
+                "build_docker.sh": "#!/bin/bash\ndocker build -t $1 .\n",
+                "run_tests.sh": "#!/bin/bash\necho ok\n",
+                "src/app.py": "VALUE = 1\n",
+            },
+        )
+        self.docker_service = DockerService()
+        self.records = BuildRecordStore(self.temp_dir / "records")
+        self.image_id = "sha256:1111"
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    async def build(self, **kwargs):
+        builds = AsyncMock(return_value=(0, "built"))
+
+        async def image_id(tag):
+            return self.image_id
+
+        with patch.object(
+            PlatformService, "run_command_streaming_async", builds
+        ), patch.object(
+            PlatformService,
+            "run_command_with_result_async",
+            AsyncMock(return_value=(True, "")),
+        ), patch.object(
+            DockerService, "_build_records", return_value=self.records
+        ), patch.object(
+            self.docker_service, "_image_id", side_effect=image_id
+        ):
+            result = await self.docker_service.build_docker_image(
+                self.project, "pre-edit_demo", **kwargs
+            )
+        assert result.is_success
+        return result.metadata["cache_hit"], builds.await_count
+
+    @pytest.mark.asyncio
+    async def test_unchanged_context_is_a_cache_hit(self):
+        """Test skip, rebuild on change, on a replaced image and when forced"""
+        assert await self.build() == (False, 1)
+        assert self.records.load("pre-edit_demo")["image_id"] == self.image_id
+
+        messages = []
+        assert await self.build(progress_callback=messages.append) == (True, 0)
+        assert "Cache hit" in "".join(messages)
+
+        (self.project / "src" / "app.py").write_text("VALUE = 2\n")
+        assert await self.build() == (False, 1)
+        assert await self.build() == (True, 0)
+
+        self.image_id = "sha256:2222"  # Tag rebuilt or replaced elsewhere
+        assert await self.build() == (False, 1)
+
+        assert await self.build(force_rebuild=True) == (False, 1)
+
+    @pytest.mark.asyncio
+    async def test_no_record_without_an_image(self):
+        """Test that nothing is recorded when the image cannot be found"""
+        self.image_id = None
+
+        assert await self.build() == (False, 1)
+        assert await self.build() == (False, 1)
+        assert self.records.load("pre-edit_demo") is None
+
+
+DEFAULTS_DIR = Path(parent_dir) / "defaults"
+
+FAKE_DOCKER = """#!/bin/sh
+echo "$@" >> "$DOCKER_ARGS_LOG"
+while [ $# -gt 0 ]; do
+    case "$1" in
+        --cache-to) dest=$(echo "$2" | sed 's/.*dest=\\([^,]*\\).*/\\1/'); shift ;;
+    esac
+    shift
+done
+[ -z "$dest" ] || { mkdir -p "$dest" && echo "{}" > "$dest/index.json"; }
+"""
+
+
+class TestBuildKitCache:
+    """Test the shared BuildKit cache in the build scripts and DockerService"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.cache_root = self.temp_dir / "buildkit"
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @pytest.mark.parametrize(
+        "language, key",
+        [
+            ("python", "python"),
+            ("javascript", "node"),
+            ("go", "golang"),
+            ("csharp", "dotnet_sdk"),
+            ("java", "maven"),
+            ("c", "alpine"),
+        ],
+    )
+    def test_cache_is_keyed_by_base_image(self, language, key):
+        """Test the cache folder name derived from the default Dockerfiles"""
+        assert base_image_key(DEFAULTS_DIR / language) == key
+
+    def test_unusual_base_images(self):
+        """Test platform flags, registries with ports, build args and no Dockerfile"""
+        write_files(
+            self.temp_dir,
+            {
+                "a/Dockerfile": "# syntax=docker/dockerfile:1\nfrom --platform=linux/amd64 localhost:5000/team/Py:3 AS b\n",
+                "b/Dockerfile": "ARG BASE=python\nFROM ${BASE}\n",
+            },
+        )
+        assert base_image_key(self.temp_dir / "a") == "team_py"
+        assert base_image_key(self.temp_dir / "b") == "default"
+        assert base_image_key(self.temp_dir / "missing") == "default"
+
+    @pytest.mark.skipif(shutil.which("sh") is None, reason="No POSIX shell")
+    def test_build_script_shares_cache_between_tags(self):
+        """Test that each tag exports its own cache and imports all others"""
+        bin_dir = self.temp_dir / "bin"
+        write_files(bin_dir, {"docker": FAKE_DOCKER})
+        (bin_dir / "docker").chmod(0o755)
+        log = self.temp_dir / "docker_args.log"
+        script = DEFAULTS_DIR / "python" / "build_docker.sh"
+
+        def build(tag, cache=True):
+            env = dict(os.environ, DOCKER_ARGS_LOG=str(log))
+            env["PATH"] = f"{bin_dir}{os.pathsep}{env['PATH']}"
+            if cache:
+                env.update(BUILD_CACHE_DIR=str(self.cache_root), BUILDX_BUILDER="bk")
+            subprocess.run(["sh", str(script), tag], env=env, check=True)
+            return log.read_text().splitlines()[-1]
+
+        first = build("pre-edit_demo")
+        assert first.startswith("buildx build --builder bk --platform linux/amd64")
+        assert "--cache-from" not in first
+        assert "--load -t pre-edit_demo ." in first
+
+        second = build("post-edit_demo")
+        assert f"--cache-from type=local,src={self.cache_root}/pre-edit_demo" in second
+        assert sorted(p.name for p in self.cache_root.iterdir()) == [
+            "post-edit_demo",
+            "pre-edit_demo",
+        ]
+
+        assert build("plain", cache=False) == (
+            "build --platform linux/amd64 -t plain ."
+        )
+
+    @pytest.mark.asyncio
+    async def test_service_passes_cache_to_build_script(self):
+        """Test the cache environment, the one-off builder setup and old scripts"""
+        project = self.temp_dir / "pre-edit" / "demo"
+        write_files(
+            project,
+            {
+                "Dockerfile": "FROM node:22-alpine\n",
+                "build_docker.sh": (
+                    DEFAULTS_DIR / "javascript" / "build_docker.sh"
+                ).read_text(),
+                "run_tests.sh": "#!/bin/sh\necho ok\n",
+            },
+        )
+        docker_service = DockerService()
+        builds = AsyncMock(return_value=(0, "built"))
+        setup = []
+
+        async def run_with_result(command_group, subkey=None, **kwargs):
+            setup.append(subkey)
+            return subkey != "buildx_inspect", ""
+
+        async def build():
+            with patch(
+                "services.docker_service.get_config"
+            ) as mock_get_config, patch.object(
+                PlatformService, "run_command_streaming_async", builds
+            ), patch.object(
+                PlatformService,
+                "run_command_with_result_async",
+                side_effect=run_with_result,
+            ):
+                service_config = mock_get_config.return_value.service
+                service_config.skip_unchanged_builds = False
+                service_config.stream_build_context = False
+                service_config.buildkit_cache = True
+                service_config.buildkit_cache_dir = str(self.cache_root)
+                service_config.buildkit_builder = "docker-tools"
+                result = await docker_service.build_docker_image(project, "demo:1")
+            assert result.is_success
+            return builds.call_args.kwargs["command"], result.metadata
+
+        command, metadata = await build()
+        assert command == (
+            f"BUILD_CACHE_DIR={self.cache_root}/node "
+            "BUILDX_BUILDER=docker-tools ./build_docker.sh demo:1"
+        )
+        assert metadata["buildkit_cache"] == str(self.cache_root / "node")
+        assert setup.count("buildx_inspect") == setup.count("buildx_create") == 1
+
+        await build()
+        assert setup.count("buildx_inspect") == 1
+
+        (project / "build_docker.sh").write_text("#!/bin/sh\ndocker build -t $1 .\n")
+        command, metadata = await build()
+        assert command == "./build_docker.sh demo:1"
+        assert metadata["buildkit_cache"] is None
+
+
+STREAMING_DOCKER = """#!/bin/sh
+echo "$@" >> "$DOCKER_ARGS_LOG"
+for last; do :; done
+[ "$last" != "-" ] || { cat > "$DOCKER_CONTEXT_LIST.tar" && tar -tvf "$DOCKER_CONTEXT_LIST.tar" > "$DOCKER_CONTEXT_LIST"; }
+"""
+
+
+class TestContextStream:
+    """Test the in-process context tar, its size report and `docker build -`"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.project = self.temp_dir / "pre-edit" / "demo"
+        write_files(
+            self.project,
+            {
+                "Dockerfile": "FROM python:3.11\nCOPY . /app\n",
+                "build_docker.sh": (
+                    DEFAULTS_DIR / "python" / "build_docker.sh"
+                ).read_text(),
+                "run_tests.sh": "#!/bin/sh\necho ok\n",
+                "app/main.py": "print('hi')\n",
+                "data/big.csv": "x" * 300_000,
+                ".venv/lib/site.py": "y" * 50_000,
+                "logs/run.log": "noise\n",
+                ".dockerignore": "logs\n",
+            },
+        )
+        os.symlink("app/main.py", self.project / "main_link.py")
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_archive_matches_the_sent_files(self):
+        """Test names, owner, modes, symlinks and the counted sizes"""
+        (self.project / "run_tests.sh").chmod(0o755)
+        buffer = io.BytesIO()
+
+        archive = write_context_tar(self.project, buffer)
+
+        buffer.seek(0)
+        with tarfile.open(fileobj=buffer) as tar:
+            members = {member.name: member for member in tar.getmembers()}
+            content = tar.extractfile("app/main.py").read()
+        assert list(members) == [path for path, _ in iter_context_entries(self.project)]
+        assert "logs/run.log" not in members
+        assert content == b"print('hi')\n"
+        assert members["main_link.py"].issym()
+        assert members["main_link.py"].linkname == "app/main.py"
+        assert members["run_tests.sh"].mode & 0o777 == 0o755
+        assert {(m.uid, m.gid, m.uname) for m in members.values()} == {(0, 0, "")}
+        assert archive.file_count == 7
+        assert archive.archive_bytes == len(buffer.getvalue())
+
+    def test_size_report_points_at_large_entries(self):
+        """Test top-level totals, largest files and the .dockerignore hint"""
+        report = context_size_report(context_file_sizes(self.project), limit=2)
+
+        assert report.file_count == 7
+        assert [entry[0] for entry in report.top_level] == ["data/", ".venv/"]
+        assert report.largest_files[0] == ("data/big.csv", 300_000)
+        text = format_context_report(report)
+        assert "293.0 KiB  data/ (1 files)" in text
+        assert ".venv/ (1 files)  <- usually belongs in .dockerignore" in text
+
+    @pytest.mark.skipif(
+        shutil.which("sh") is None or shutil.which("tar") is None,
+        reason="No POSIX shell or tar",
+    )
+    @pytest.mark.asyncio
+    async def test_build_reads_the_context_from_stdin(self):
+        """Test that docker gets `-` and the streamed tar, not the folder"""
+        bin_dir = self.temp_dir / "bin"
+        write_files(bin_dir, {"docker": STREAMING_DOCKER})
+        (bin_dir / "docker").chmod(0o755)
+        args_log = self.temp_dir / "docker_args.log"
+        listing = self.temp_dir / "context.txt"
+        messages = []
+
+        with patch.dict(
+            os.environ,
+            {
+                "PATH": f"{bin_dir}{os.pathsep}{os.environ['PATH']}",
+                "DOCKER_ARGS_LOG": str(args_log),
+                "DOCKER_CONTEXT_LIST": str(listing),
+            },
+        ), patch.object(get_config().service, "skip_unchanged_builds", False):
+            result = await DockerService().build_docker_image(
+                self.project, "pre-edit_demo", progress_callback=messages.append
+            )
+
+        assert result.is_success and result.metadata["context_streamed"]
+        assert args_log.read_text() == (
+            "build --platform linux/amd64 -t pre-edit_demo -\n"
+        )
+        sent = listing.read_text()
+        assert "data/big.csv" in sent and "logs/run.log" not in sent
+        assert "root/root" in sent or " 0/0 " in sent
+        output = "".join(messages)
+        assert "Build context: 7 files" in output
+        assert "Command: BUILD_CONTEXT=- ./build_docker.sh pre-edit_demo" in output
+        assert "Sent build context: 7 files" in output
@@ -9,7 +9,7 @@ import tempfile
 import shutil
 import asyncio
 from pathlib import Path
-from unittest.mock import Mock, patch, AsyncMock, MagicMock
+from unittest.mock import ANY, Mock, patch, AsyncMock, MagicMock
 import pytest
 
 # Add parent directory to path to import modules
@@ -19,11 +19,16 @@ if parent_dir not in sys.path:
 
 from models.project import Project
 from services.project_group_service import ProjectGroup
+from services.docker_service import VersionRunResult
 from utils.async_base import AsyncResult, ProcessError
 
 # Import all command classes
 from commands.project_commands import CleanupProjectCommand, ArchiveProjectCommand
-from commands.docker_commands import DockerBuildAndTestCommand, BuildDockerFilesCommand
+from commands.docker_commands import (
+    DockerBuildAndTestCommand,
+    DockerBuildAndTestAllCommand,
+    BuildDockerFilesCommand,
+)
 from commands.git_commands import GitViewCommand, GitCheckoutAllCommand
 from commands.sync_commands import SyncRunTestsCommand
 from commands.validation_commands import ValidateProjectGroupCommand
@@ -450,6 +455,37 @@ class TestDockerCommands:
             in result.error.message
         )
 
+    @pytest.mark.asyncio
+    async def test_docker_build_and_test_all_command_reports_matrix(self):
+        """Test that build and test all runs every version and returns the matrix"""
+        # Arrange
+        mock_docker_service = AsyncMock()
+        outcomes = [VersionRunResult("pre-edit", "pre-edit_test-project", True, True)]
+        mock_docker_service.build_and_test_group.return_value = (
+            AsyncResult.success_result(
+                outcomes,
+                message="1/1 versions built and passed their tests",
+                metadata={"matrix": "Version ...\npre-edit ...\n"},
+            )
+        )
+        self.sample_project_group.get_all_versions.return_value = [self.sample_project]
+
+        command = DockerBuildAndTestAllCommand(
+            project_group=self.sample_project_group,
+            docker_service=mock_docker_service,
+        )
+
+        # Act
+        result = await command.execute()
+
+        # Assert
+        assert result.is_success
+        assert result.data["results"][0]["version"] == "pre-edit"
+        assert result.data["matrix"].startswith("Version")
+        args, kwargs = mock_docker_service.build_and_test_group.call_args
+        assert args[0] == [self.sample_project]
+        assert kwargs["max_parallel"] >= 1
+
     @pytest.mark.asyncio
     async def test_build_docker_files_command_success(self):
         """Test successful build docker files command execution"""
@@ -804,7 +840,9 @@ class TestDockerCommands:
         assert captured_create_window_func is not None
         # Verify the terminal window was created and configured
         mock_terminal_class.assert_called_with(
-            mock_window, f"Docker Build & Test - {command.project.name}"
+            mock_window,
+            f"Docker Build & Test - {command.project.name}",
+            output_channel=command.output_channel,
         )
         mock_terminal_instance.create_window.assert_called_once()
         mock_terminal_instance.update_status.assert_called()
@@ -1042,13 +1080,13 @@ class TestGitCommands:
 
         # Verify git service calls
         mock_git_service.fetch_latest_commits.assert_called_once_with(
-            self.sample_project.path
+            self.sample_project.path, max_age=ANY
         )
         mock_git_service.get_repository_info.assert_called_once_with(
-            self.sample_project.path
+            self.sample_project.path, detailed=False
         )
         mock_git_service.get_git_commits.assert_called_once_with(
-            self.sample_project.path
+            self.sample_project.path, on_page=ANY
         )
 
     @pytest.mark.asyncio
@@ -1448,7 +1486,9 @@ class TestGitCommands:
 
         # Verify that the async execution created terminal window and processed projects
         mock_terminal_class.assert_called_with(
-            mock_window, f"Git Checkout All - {command.project_group.name}"
+            mock_window,
+            f"Git Checkout All - {command.project_group.name}",
+            output_channel=command.output_channel,
         )
         mock_terminal_instance.create_window.assert_called_once()
         mock_terminal_instance.update_status.assert_called()
@@ -2167,6 +2207,30 @@ class TestCommandProgressCallbacks:
         assert len(completion_calls) == 1
         assert completion_calls[0].is_error
 
+    @pytest.mark.asyncio
+    async def test_cancelled_command_finishes_its_output_channel(self):
+        """Test that a cancelled run does not leave its channel running"""
+        started = asyncio.Event()
+
+        async def scan_forever(*args, **kwargs):
+            started.set()
+            await asyncio.Event().wait()
+
+        mock_file_service = AsyncMock()
+        mock_file_service.scan_for_cleanup_items.side_effect = scan_forever
+        command = CleanupProjectCommand(
+            project=self.sample_project, file_service=mock_file_service
+        )
+
+        task = asyncio.ensure_future(command.run_with_progress())
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert not command.output_channel.is_running
+        assert command.output_channel.state == "cancelled"
+
 
 class TestCommandIntegration:
     """Integration tests for command interactions"""
@@ -0,0 +1,231 @@
+"""
+Tests for sampling the resource usage of test containers.
+
+`docker stats` is patched and the Engine API is the fake server in
+tests/fake_docker_engine.py, so no Docker is needed.
+"""
+
+import asyncio
+import json
+import os
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Add parent directory to path to import modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from config.config import get_config
+from services.container_stats import (
+    ContainerSampler,
+    cli_sample,
+    engine_sample,
+    memory_limit_bytes,
+    parse_size,
+)
+from services.docker_service import DockerService
+from services.platform_service import PlatformService
+from services.test_result_parser import latest_test_results
+from tests.fake_docker_engine import FakeDockerEngine
+from utils.docker_engine import DockerEngineClient
+
+MIB = 1024**2
+
+ENGINE_STATS = {
+    "read": "2026-10-18T10:00:01Z",
+    "cpu_stats": {
+        "cpu_usage": {"total_usage": 3_000_000_000},
+        "system_cpu_usage": 20_000_000_000,
+        "online_cpus": 4,
+    },
+    "precpu_stats": {
+        "cpu_usage": {"total_usage": 1_000_000_000},
+        "system_cpu_usage": 16_000_000_000,
+    },
+    "memory_stats": {
+        "usage": 300 * MIB,
+        "limit": 2048 * MIB,
+        "stats": {"inactive_file": 44 * MIB},
+    },
+    "blkio_stats": {
+        "io_service_bytes_recursive": [
+            {"major": 8, "minor": 0, "op": "read", "value": 5 * MIB},
+            {"major": 8, "minor": 0, "op": "write", "value": 1 * MIB},
+        ]
+    },
+    "pids_stats": {"current": 9},
+}
+
+
+def cli_stats(cpu: str, memory: str, pids: str) -> str:
+    """One line of `docker stats --no-stream --format "{{json .}}"`"""
+    return json.dumps(
+        {
+            "CPUPerc": cpu,
+            "MemUsage": f"{memory} / 1.944GiB",
+            "BlockIO": "12.3MB / 4.1kB",
+            "PIDs": pids,
+        }
+    )
+
+
+class TestStatsParsing:
+    """Test reading the CLI and Engine API stats"""
+
+    def test_sizes_and_limits(self):
+        """Test decimal and binary units of docker stats and --memory values"""
+        assert parse_size("1.5MiB") == int(1.5 * MIB)
+        assert parse_size("12kB") == 12000
+        assert parse_size("0B") == 0
+        assert parse_size("--") == 0
+        assert memory_limit_bytes("512m") == 512 * MIB
+        assert memory_limit_bytes("4G") == 4 * 1024 * MIB
+        with pytest.raises(ValueError):
+            memory_limit_bytes("lots")
+
+    def test_cli_and_engine_samples(self):
+        """Test the same readings from both sources"""
+        sample = cli_sample(cli_stats("187.50%", "256MiB", "9"))
+        assert sample.cpu_percent == 187.5
+        assert sample.memory_bytes == 256 * MIB
+        assert (sample.block_read_bytes, sample.block_write_bytes) == (12300000, 4100)
+        assert sample.pids == 9
+        assert cli_sample("Error: No such container") is None
+
+        sample = engine_sample(ENGINE_STATS)
+        # 2s of CPU time over 4s of 4 cores' system time: 2 cores busy
+        assert sample.cpu_percent == 200.0
+        assert sample.memory_bytes == 256 * MIB  # Page cache left out
+        assert sample.memory_limit_bytes == 2048 * MIB
+        assert (sample.block_read_bytes, sample.block_write_bytes) == (5 * MIB, MIB)
+        assert sample.pids == 9
+
+    @pytest.mark.skipif(
+        not hasattr(socket, "AF_UNIX"), reason="Unix sockets are not available"
+    )
+    @pytest.mark.asyncio
+    async def test_engine_sampling_by_container_name(self):
+        """Test no reading before the container runs, then its stats"""
+        temp_dir = Path(tempfile.mkdtemp(prefix="cs"))
+        engine = FakeDockerEngine(temp_dir / "docker.sock").__enter__()
+        engine.images["pre-edit_demo"] = "sha256:1111"
+        engine.stats = ENGINE_STATS
+        client = DockerEngineClient(engine.socket_path, timeout=10.0)
+        try:
+            sampler = ContainerSampler("docker-tools-test-1", client)
+            assert await sampler.sample() is None  # Not created yet
+
+            container_id = client.create_container(
+                "pre-edit_demo", name="docker-tools-test-1"
+            )
+            assert await sampler.sample() is None  # Not started yet
+            client.start_container(container_id)
+            sample = await sampler.sample()
+        finally:
+            client.close()
+            engine.__exit__(None, None, None)
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        assert sample.pids == 9
+        assert sample.cpu_percent == 200.0
+
+
+class TestSampledTestRuns:
+    """Test DockerService sampling its test container and limiting it"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.project = self.temp_dir / "pre-edit" / "demo"
+        self.project.mkdir(parents=True)
+        (self.project / "run_tests.sh").write_text("#!/bin/sh\npytest\n")
+        self.readings = [
+            cli_stats("35.00%", "100MiB", "4"),
+            cli_stats("180.25%", "412MiB", "12"),
+            cli_stats("90.00%", "300MiB", "7"),
+        ]
+        self.stats_calls = []
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    async def fake_stats(self, group, subkey, **kwargs):
+        if subkey != "stats":  # git and image inspects of the run's record
+            return subprocess.CompletedProcess([], 1, stdout="", stderr="")
+        self.stats_calls.append(kwargs["name"])
+        reading = self.readings[min(len(self.stats_calls), len(self.readings)) - 1]
+        return subprocess.CompletedProcess([], 0, stdout=reading + "\n", stderr="")
+
+    async def fake_run(self, *args, output_callback=None, **kwargs):
+        # Long enough for every reading to be taken
+        while len(self.stats_calls) < len(self.readings):
+            await asyncio.sleep(0.01)
+        return 0, "3 passed in 0.50s\n"
+
+    @pytest.mark.asyncio
+    async def test_peaks_are_reported_and_served(self):
+        """Test the peaks in the result data, the terminal and the latest results"""
+        service_config = get_config().service
+        cli = AsyncMock(side_effect=self.fake_run)
+        streamed = []
+
+        with patch.object(service_config, "warm_containers", False), patch.object(
+            service_config, "resource_sample_interval", 0.01
+        ), patch.object(service_config, "test_cpus", 2.0), patch.object(
+            service_config, "test_memory", "4g"
+        ), patch.object(
+            PlatformService, "run_command_async", side_effect=self.fake_stats
+        ), patch.object(
+            PlatformService, "run_command_streaming_async", cli
+        ):
+            result = await DockerService().run_docker_tests(
+                self.project, "pre-edit_demo", progress_callback=streamed.append
+            )
+
+        assert result.is_success
+        command = cli.call_args.kwargs["command"]
+        match = re.fullmatch(
+            r"docker run --rm --name (docker-tools-test-\w+) --cpus 2 --memory 4g "
+            r"pre-edit_demo \./run_tests\.sh",
+            command,
+        )
+        assert match and set(self.stats_calls) == {match.group(1)}
+
+        resources = result.data["summary"]["resources"]
+        assert resources["cpu_percent"] == 180.25
+        assert resources["memory_bytes"] == 412 * MIB
+        assert resources["pids"] == 12
+        assert resources["samples"] >= 3
+        assert "Resources (peak): CPU 180.2%, memory 412.0 MiB / 1.9 GiB" in "".join(
+            streamed
+        )
+        served = latest_test_results.get("pre-edit_demo").to_dict(include_cases=False)
+        assert served["resources"] == resources
+
+    @pytest.mark.asyncio
+    async def test_sampling_can_be_turned_off(self):
+        """Test no stats calls and no resources without sampling"""
+        service_config = get_config().service
+        with patch.object(service_config, "warm_containers", False), patch.object(
+            service_config, "resource_sampling", False
+        ), patch.object(service_config, "resource_sample_interval", 0.01), patch.object(
+            PlatformService, "run_command_async", side_effect=self.fake_stats
+        ), patch.object(
+            PlatformService,
+            "run_command_streaming_async",
+            AsyncMock(return_value=(0, "3 passed in 0.50s\n")),
+        ):
+            result = await DockerService().run_docker_tests(
+                self.project, "pre-edit_demo"
+            )
+
+        assert self.stats_calls == []
+        assert result.data["summary"]["resources"] is None
@@ -0,0 +1,329 @@
+"""
+Tests for the Docker Engine API client.
+
+Runs against the fake Engine API server in tests/fake_docker_engine.py on a
+Unix socket, so no Docker daemon is needed.
+"""
+
+import importlib.util
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Add parent directory to path to import modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from services.docker_service import DockerService
+from services.platform_service import PlatformService
+from tests.fake_docker_engine import STDERR, STDOUT, FakeDockerEngine
+from utils import docker_engine
+from utils.docker_engine import (
+    DockerEngineClient,
+    DockerEngineError,
+    get_engine_client,
+    socket_path_from_env,
+)
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix sockets are not available"
+)
+
+
+class EngineTest:
+    """A fake Engine API server on a short socket path (sun_path is limited)"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="de"))
+        self.engine = FakeDockerEngine(self.temp_dir / "docker.sock").__enter__()
+        self.engine.images["pre-edit_demo"] = "sha256:1111"
+        self.client = DockerEngineClient(self.engine.socket_path, timeout=10.0)
+
+    def teardown_method(self):
+        self.client.close()
+        self.engine.__exit__(None, None, None)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+
+class TestDockerEngineClient(EngineTest):
+    """Test the API calls, output streaming and connection reuse"""
+
+    def test_system_and_image_calls(self):
+        """Test version, info, image listing, inspect and removal"""
+        assert self.client.ping()
+        assert self.client.version()["ApiVersion"] == "1.46"
+        assert self.client.info()["OSType"] == "linux"
+        assert self.client.images("pre-edit_demo")[0]["Id"] == "sha256:1111"
+        assert self.client.images("other") == []
+        assert self.client.image_id("pre-edit_demo") == "sha256:1111"
+        assert self.client.image_id("missing") is None
+
+        self.client.remove_image("pre-edit_demo")
+        assert self.client.image_id("pre-edit_demo") is None
+        with pytest.raises(DockerEngineError) as error:
+            self.client.remove_image("pre-edit_demo")
+        assert error.value.status == 404
+        assert ("GET", "/_ping") in self.engine.requests
+
+    def test_run_streams_output_and_removes_the_container(self):
+        """Test create/start/logs/wait/remove and frames splitting characters"""
+        snowman = "☃".encode("utf-8")
+        self.engine.outputs["pre-edit_demo"] = (
+            3,
+            [
+                (STDOUT, b"collected 2 items\n" + snowman[:1]),
+                (STDERR, b"warning\n"),
+                (STDOUT, snowman[1:] + b"\n1 failed\n"),
+            ],
+        )
+        chunks = []
+
+        exit_code, stdout, stderr = self.client.run(
+            "pre-edit_demo",
+            ["./run_tests.sh"],
+            env={"TZ": "UTC"},
+            platform="linux/amd64",
+            output_callback=chunks.append,
+        )
+
+        assert exit_code == 3
+        assert stdout == "collected 2 items\n☃\n1 failed\n"
+        assert stderr == "warning\n"
+        assert "".join(chunks) == "collected 2 items\nwarning\n☃\n1 failed\n"
+        assert self.engine.containers == {} and len(self.engine.removed) == 1
+
+    def test_run_outlasts_a_silence_longer_than_the_client_timeout(self):
+        """Test that following the output has no socket timeout by default"""
+        client = DockerEngineClient(self.engine.socket_path, timeout=0.2)
+        self.engine.outputs["pre-edit_demo"] = (
+            0,
+            [(STDOUT, b"collected 1 item\n"), 0.5, (STDOUT, b"1 passed\n")],
+        )
+        try:
+            exit_code, stdout, _ = client.run("pre-edit_demo", ["./run_tests.sh"])
+            assert exit_code == 0
+            assert stdout == "collected 1 item\n1 passed\n"
+
+            with pytest.raises(TimeoutError):
+                client.run("pre-edit_demo", ["./run_tests.sh"], timeout=0.2)
+        finally:
+            client.close()
+
+    def test_run_deadline_caps_the_whole_run(self):
+        """Test TimeoutError and removal for chatty and for silent containers"""
+        chatty = [(STDOUT, b"tick\n"), 0.1] * 30
+        for frames in (chatty, [(STDOUT, b"collected 1 item\n"), 5.0]):
+            self.engine.outputs["pre-edit_demo"] = (0, frames)
+            started = time.monotonic()
+            with pytest.raises(TimeoutError):
+                self.client.run("pre-edit_demo", ["./run_tests.sh"], deadline=0.5)
+            assert time.monotonic() - started < 2.0
+            assert self.engine.containers == {}
+
+    def test_run_of_a_missing_image(self):
+        """Test that a failed create raises and leaves nothing behind"""
+        with pytest.raises(DockerEngineError):
+            self.client.run("missing", ["./run_tests.sh"])
+        assert self.engine.containers == {}
+
+    def test_connections_are_reused(self):
+        """Test keep-alive reuse, also after a streamed run"""
+        for _ in range(10):
+            self.client.image_id("pre-edit_demo")
+        self.client.run("pre-edit_demo", ["true"])
+        self.client.version()
+
+        assert self.engine.connections == 1
+        assert self.client.connections_opened == 1
+
+    def test_connection_closed_by_the_daemon_is_replaced(self):
+        """Test the retry on a new connection after an idle disconnect"""
+        assert self.client.ping()
+        self.engine.drop_connections()
+
+        assert self.client.image_id("pre-edit_demo") == "sha256:1111"
+        assert self.engine.connections == 2
+
+    def test_socket_discovery(self):
+        """Test DOCKER_HOST handling and that a missing socket means no client"""
+        assert socket_path_from_env({}) == "/var/run/docker.sock"
+        assert socket_path_from_env({"DOCKER_HOST": "unix:///run/d.sock"}) == (
+            "/run/d.sock"
+        )
+        assert socket_path_from_env({"DOCKER_HOST": "tcp://daemon:2376"}) is None
+
+        assert get_engine_client(str(self.temp_dir / "missing.sock")) is None
+        client = get_engine_client(self.engine.socket_path)
+        assert client is get_engine_client(self.engine.socket_path)
+        client.close()
+
+
+class TestDockerServiceEngine(EngineTest):
+    """Test that DockerService uses the Engine API when the socket exists"""
+
+    def setup_method(self):
+        super().setup_method()
+        self.project = self.temp_dir / "pre-edit" / "demo"
+        self.project.mkdir(parents=True)
+        (self.project / "run_tests.sh").write_text("#!/bin/sh\npytest\n")
+        self.docker_service = DockerService()
+        self.patch = patch.object(
+            docker_engine, "socket_path_from_env", return_value=self.engine.socket_path
+        )
+        self.patch.start()
+
+    def teardown_method(self):
+        self.patch.stop()
+        get_engine_client(self.engine.socket_path).close()
+        super().teardown_method()
+
+    @pytest.mark.asyncio
+    async def test_health_check_and_image_id(self):
+        """Test that no docker CLI is started for either"""
+        with patch.object(
+            PlatformService, "run_command_async", AsyncMock()
+        ) as cli, patch.object(
+            PlatformService, "run_command_with_result_async", AsyncMock()
+        ) as cli_result:
+            health = await self.docker_service.health_check()
+            image_id = await self.docker_service._image_id("pre-edit_demo")
+
+        assert health.data["engine_api"] is True
+        assert "27.0.0-fake" in health.data["docker_version"]
+        assert image_id == "sha256:1111"
+        cli.assert_not_called()
+        cli_result.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_tests_run_through_the_engine(self):
+        """Test streamed output, parsed results and the exit code"""
+        self.engine.outputs["pre-edit_demo"] = (
+            1,
+            [
+                (STDOUT, b"tests/test_a.py::test_one PASSED\n"),
+                (STDOUT, b"tests/test_a.py::test_two FAILED\n"),
+                (STDOUT, b"===== 1 failed, 1 passed in 0.10s =====\n"),
+            ],
+        )
+        streamed = []
+
+        with patch.object(
+            PlatformService, "run_command_streaming_async", AsyncMock()
+        ) as cli:
+            result = await self.docker_service.run_docker_tests(
+                self.project, "pre-edit_demo", progress_callback=streamed.append
+            )
+
+        cli.assert_not_called()
+        assert result.is_partial
+        assert result.data["return_code"] == 1
+        assert result.data["summary"]["failed"] == 1
+        assert "(Engine API)" in "".join(streamed)
+        assert "test_two FAILED" in "".join(streamed)
+
+    @pytest.mark.asyncio
+    async def test_quiet_tests_are_not_cut_off(self):
+        """Test a run silent for longer than the client timeout, without the CLI"""
+        self.engine.outputs["pre-edit_demo"] = (
+            0,
+            [0.5, (STDOUT, b"===== 1 passed in 0.50s =====\n")],
+        )
+        client = get_engine_client(self.engine.socket_path)
+
+        with patch.object(client, "timeout", 0.2), patch.object(
+            PlatformService, "run_command_streaming_async", AsyncMock()
+        ) as cli:
+            result = await self.docker_service.run_docker_tests(
+                self.project, "pre-edit_demo"
+            )
+
+        cli.assert_not_called()
+        assert result.is_success
+        assert result.data["summary"]["passed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cli_fallback_when_the_daemon_does_not_answer(self):
+        """Test that an unusable socket falls back to the docker CLI"""
+        dead_path = str(self.temp_dir / "dead.sock")
+        dead = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        dead.bind(dead_path)  # A socket nobody listens on
+        cli = AsyncMock(return_value=(0, "1 passed in 0.01s\n"))
+
+        try:
+            with patch.object(
+                docker_engine, "socket_path_from_env", return_value=dead_path
+            ), patch.object(PlatformService, "run_command_streaming_async", cli):
+                result = await self.docker_service.run_docker_tests(
+                    self.project, "pre-edit_demo"
+                )
+        finally:
+            dead.close()
+
+        assert result.is_success
+        cli.assert_awaited_once()
+
+
+def load_validator():
+    path = Path(parent_dir) / "validation-tool" / "validator.py"
+    spec = importlib.util.spec_from_file_location("validator", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestValidatorEngine(EngineTest):
+    """Test the validator's image check, test run and cleanup over the API"""
+
+    def test_validator_uses_the_engine(self, capsys):
+        """Test that the validator finds the client and needs no docker CLI"""
+        validator_module = load_validator()
+        self.engine.outputs["pre-edit_demo"] = (0, [(STDOUT, b"ok\n")])
+        extract_dir = self.temp_dir / "extracted"
+        extract_dir.mkdir()
+        (extract_dir / "run_tests.sh").write_text("#!/bin/sh\necho ok\n")
+
+        with patch.dict(
+            os.environ, {"DOCKER_HOST": f"unix://{self.engine.socket_path}"}
+        ), patch.object(validator_module.subprocess, "run") as cli:
+            validator = validator_module.SimpleValidator(cleanup=True)
+            assert validator.engine is not None
+            with validator:
+                exists = validator._verify_docker_image_exists("pre-edit_demo")
+                passed, stdout, _, _ = validator.run_tests("pre-edit_demo", extract_dir)
+                validator.cleanup_docker_image("pre-edit_demo")
+            validator.engine.close()
+
+        cli.assert_not_called()
+        assert exists and passed and stdout == "ok\n"
+        created = self.engine.requests.count(("POST", "/containers/create"))
+        assert created == 1
+        assert "pre-edit_demo" not in self.engine.images
+
+    def test_validator_test_run_times_out(self):
+        """Test that a suite printing past TEST_TIMEOUT fails as timed out"""
+        validator_module = load_validator()
+        self.engine.outputs["pre-edit_demo"] = (0, [(STDOUT, b"."), 0.1] * 30)
+        extract_dir = self.temp_dir / "extracted"
+        extract_dir.mkdir()
+        (extract_dir / "run_tests.sh").write_text("#!/bin/sh\necho ok\n")
+
+        with patch.dict(
+            os.environ, {"DOCKER_HOST": f"unix://{self.engine.socket_path}"}
+        ), patch.object(validator_module, "TEST_TIMEOUT", 0.5):
+            validator = validator_module.SimpleValidator(cleanup=True)
+            passed, _, stderr, elapsed = validator.run_tests(
+                "pre-edit_demo", extract_dir
+            )
+            validator.engine.close()
+
+        assert not passed and stderr == "Test execution timed out"
+        assert elapsed < 2.0
+        assert self.engine.containers == {}
@@ -15,8 +15,16 @@ parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
-from services.docker_service import DockerService
+from models.project import Project
+from services.docker_service import (
+    DockerService,
+    TaggedOutput,
+    VersionRunResult,
+    format_run_matrix,
+)
+from utils.async_base import ProcessError, ServiceResult
 from services.platform_service import PlatformService
+from services.test_result_parser import latest_test_results
 from config.config import get_config
 
 COLORS = get_config().gui.colors
@@ -129,9 +137,9 @@ class TestDockerService:
         result = self.docker_service._analyze_test_results("collected 0 items", "", 0)
         assert result == "COMPLETED (Success)"
 
-        # Mixed case
+        # Bare words are not test results
         result = self.docker_service._analyze_test_results("PASSED", "FAILED", 1)
-        assert result == "COMPLETED (Some Tests Failed)"
+        assert result == "FAILED TO RUN"
 
     @pytest.mark.asyncio
     async def test_run_tests_async(self):
@@ -372,6 +380,47 @@ class TestDockerService:
                 assert "1 failed" in result.data["raw_output"]
                 assert "Some Tests Failed" in result.data["status"]
 
+    @pytest.mark.asyncio
+    async def test_run_docker_tests_parses_streamed_output(self):
+        """Test that results are parsed from the streamed chunks"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            (project_path / "run_tests.sh").write_text('#!/bin/sh\ncargo test "$@"\n')
+            test_output = (
+                "running 2 tests\n"
+                "test tests::failed_input_is_rejected ... ok\n"
+                "test tests::adds ... FAILED\n"
+                "test result: FAILED. 1 passed; 1 failed; 0 ignored; 0 measured\n"
+            )
+
+            async def stream(*args, output_callback=None, **kwargs):
+                for start in range(0, len(test_output), 10):
+                    output_callback(test_output[start : start + 10])
+                return 101, test_output
+
+            output_callback = Mock()
+            with patch(
+                "services.platform_service.PlatformService.run_command_streaming_async",
+                side_effect=stream,
+            ), patch(
+                "services.docker_service.parse_test_output",
+                side_effect=AssertionError("parsed the log again"),
+            ):
+                result = await self.docker_service.run_docker_tests(
+                    project_path, "demo_tag", output_callback
+                )
+
+            assert result.is_partial
+            assert result.data["status"] == "COMPLETED (Some Tests Failed)"
+            assert result.data["summary"]["framework"] == "cargo"
+            assert result.data["summary"]["cases"] == [
+                ["tests::failed_input_is_rejected", "passed", None],
+                ["tests::adds", "failed", None],
+            ]
+            assert latest_test_results.get("demo_tag").failed == 1
+            printed = "".join(call.args[0] for call in output_callback.call_args_list)
+            assert "Tests (cargo): 1 passed, 1 failed (2 total)" in printed
+
     @pytest.mark.asyncio
     async def test_run_docker_tests_exception(self):
         """Test Docker test execution with exception"""
@@ -552,8 +601,8 @@ class TestDockerService:
             "DEPRECATION WARNING: something\nRunning tests...\nPytest collection"
         )
         result = self.docker_service._analyze_test_results(complex_output, "", 0)
-        # The actual implementation returns "COMPLETED (Success)" for return_code=0 with test keywords
-        assert result == "COMPLETED (Success)"
+        # No runner output recognised
+        assert result == "COMPLETED (No Output)"
 
         # Test with mixed output
         mixed_output = "test passed\nsome warning\ntest completed"
@@ -561,17 +610,26 @@ class TestDockerService:
         assert "COMPLETED" in result
 
         # Test with clear success indicators
-        success_output = "5 passed, 0 failed"
+        success_output = "===== 5 passed in 0.12s ====="
         result = self.docker_service._analyze_test_results(success_output, "", 0)
         assert result == "COMPLETED (All Tests Passed)"
 
+        # Test names containing outcome words do not change the verdict
+        named_output = "tests/test_auth.py::test_failed_login PASSED\n"
+        result = self.docker_service._analyze_test_results(named_output, "", 0)
+        assert result == "COMPLETED (All Tests Passed)"
+
     def test_analyze_test_results_edge_cases_extended(self):
         """Test analyze_test_results with extended edge cases"""
 
         # Test with error in output
         error_output = "ERRORS during execution"
         result = self.docker_service._analyze_test_results(error_output, "", 1)
-        # The actual implementation returns "COMPLETED (With Issues)" for non-zero return codes with test keywords
+        assert result == "FAILED TO RUN"
+
+        # A runner that started but reported no results
+        error_output = "collected 0 items / 1 error\nERRORS during collection"
+        result = self.docker_service._analyze_test_results(error_output, "", 1)
         assert result == "COMPLETED (With Issues)"
 
         # Test with warnings but success
@@ -666,5 +724,113 @@ class TestDockerService:
                 assert args[0] == "SHELL_COMMANDS"
 
 
+class TestBuildAndTestGroup:
+    """Test cases for building and testing all versions of a group"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.docker_service = DockerService()
+        self.versions = [
+            Project(
+                parent=parent,
+                name="demo",
+                path=Path(f"/test/{parent}/demo"),
+                relative_path=f"{parent}/demo",
+            )
+            for parent in ["original", "pre-edit", "post-edit", "correct-edit"]
+        ]
+
+    @pytest.mark.asyncio
+    async def test_versions_run_concurrently_up_to_the_limit(self):
+        """Test the parallelism limit, tagged output and the result matrix"""
+        running = 0
+        peak = 0
+
+        async def build(path, tag, progress_callback=None, status_callback=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            progress_callback("Step 1/2\nStep 2")
+            await asyncio.sleep(0.02)
+            progress_callback("/2\n")
+            running -= 1
+            if "post-edit" in str(path):
+                return ServiceResult.error(ProcessError("Docker build failed"))
+            return ServiceResult.success(tag)
+
+        async def run_tests(path, tag, progress_callback=None, status_callback=None):
+            await asyncio.sleep(0.01)
+            data = {"status": "COMPLETED (All Tests Passed)", "return_code": 0}
+            if "pre-edit" in str(path):
+                data["status"] = "COMPLETED (2 Failed)"
+                return ServiceResult.partial(data, ProcessError("Tests failed"))
+            return ServiceResult.success(data)
+
+        output = []
+        statuses = []
+        with patch.object(
+            self.docker_service, "build_docker_image", side_effect=build
+        ), patch.object(self.docker_service, "run_docker_tests", side_effect=run_tests):
+            result = await self.docker_service.build_and_test_group(
+                self.versions,
+                max_parallel=2,
+                progress_callback=output.append,
+                status_callback=lambda status, color: statuses.append(status),
+            )
+
+        assert peak == 2
+        assert result.is_partial
+        assert result.message.startswith("2/4 versions")
+        by_version = {r.version: r for r in result.data}
+        assert by_version["original"].passed
+        assert by_version["pre-edit"].tests_passed is False
+        assert by_version["post-edit"].tests_passed is None
+        assert by_version["post-edit"].error == "Docker build failed"
+        assert by_version["correct-edit"].docker_tag == "correct-edit_demo"
+
+        lines = "".join(output).splitlines()
+        assert lines.count("[pre-edit] Step 2/2") == 1
+        assert all(line.startswith("[") for line in lines)
+        assert statuses[-1] == "4/4 versions finished"
+        assert "post-edit" in result.metadata["matrix"]
+
+    @pytest.mark.asyncio
+    async def test_empty_group_is_rejected(self):
+        """Test that a group without versions is a validation error"""
+        result = await self.docker_service.build_and_test_group([])
+
+        assert result.is_error
+
+    def test_tagged_output_and_matrix_format(self):
+        """Test line tagging with partial lines and the matrix columns"""
+        chunks = []
+        output = TaggedOutput("pre-edit", chunks.append)
+        output("a\nb")
+        output("c")
+        output.flush()
+
+        assert chunks == ["[pre-edit] a\n", "[pre-edit] bc\n"]
+
+        matrix = format_run_matrix(
+            [
+                VersionRunResult(
+                    "original", "original_demo", True, True, "COMPLETED", 2.0, 1.5
+                ),
+                VersionRunResult("post-edit", "post-edit_demo", error="no build"),
+            ]
+        ).splitlines()
+
+        assert matrix[0].split()[:3] == ["Version", "Build", "Tests"]
+        assert matrix[1].split()[:6] == [
+            "original",
+            "pass",
+            "pass",
+            "2.0s",
+            "1.5s",
+            "3.5s",
+        ]
+        assert matrix[2].split()[:3] == ["post-edit", "FAIL", "-"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
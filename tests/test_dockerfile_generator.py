@@ -0,0 +1,261 @@
+"""
+Tests for Dockerfile generation from dependency manifests.
+"""
+
+import importlib.util
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+# Add parent directory to path to import modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from config.config import get_config
+from models.project import Project
+from services.docker_files_service import DockerFilesService
+from services.dockerfile_generator import generate_dockerfile, template_preamble
+
+TEMPLATE = """FROM python:3.13-alpine
+WORKDIR /app
+
+# your Python deps
+COPY requirements.txt .
+RUN pip install --no-cache-dir -r requirements.txt
+COPY . .
+CMD ["sh"]
+"""
+
+
+def layer_order(text: str, *markers: str):
+    """Positions of the markers in the Dockerfile, all of which must be there"""
+    positions = [text.find(marker) for marker in markers]
+    assert -1 not in positions, positions
+    return positions
+
+
+class TestGenerateDockerfile:
+    """Test the generated dependency layers per language"""
+
+    def test_template_preamble(self):
+        """Test that the base image and setup come from the template"""
+        assert template_preamble(TEMPLATE) == [
+            "FROM python:3.13-alpine",
+            "WORKDIR /app",
+        ]
+
+    def test_python_manifests_before_sources(self, tmp_path):
+        """Test requirements files and pyproject.toml ahead of COPY . ."""
+        (tmp_path / "requirements.txt").write_text("flask\n")
+        (tmp_path / "tests").mkdir()
+        (tmp_path / "tests" / "requirements.txt").write_text("pytest-mock\n")
+        (tmp_path / "pyproject.toml").write_text(
+            '[project]\nname = "demo"\ndependencies = ["requests"]\n'
+        )
+        (tmp_path / "main.py").write_text("print('hello')\n")
+
+        generated = generate_dockerfile(tmp_path, "python", TEMPLATE)
+
+        assert generated.manifests == [
+            "requirements.txt",
+            "tests/requirements.txt",
+            "pyproject.toml",
+        ]
+        text = generated.text
+        assert text.startswith("FROM python:3.13-alpine\nWORKDIR /app\n")
+        manifests, install, sources = layer_order(
+            text,
+            "COPY requirements*.tx[t] pyproject.tom[l] ./",
+            "RUN --mount=type=cache,target=/root/.cache/pip",
+            "COPY . .",
+        )
+        assert manifests < install < sources
+        assert "--no-cache-dir" not in text
+        assert "main.py" not in text
+
+    @pytest.mark.parametrize(
+        "lockfile, mount, install",
+        [
+            ("package-lock.json", "/root/.npm", "npm install"),
+            ("yarn.lock", "/usr/local/share/.cache/yarn", "yarn install"),
+            ("pnpm-lock.yaml", "/root/.local/share/pnpm/store", "pnpm install"),
+        ],
+    )
+    def test_node_package_manager_from_lockfile(
+        self, tmp_path, lockfile, mount, install
+    ):
+        """Test the package manager and its cache picked by the lockfile"""
+        (tmp_path / "package.json").write_text("{}")
+        (tmp_path / lockfile).write_text("")
+
+        generated = generate_dockerfile(tmp_path, "typescript", "FROM node:22\n")
+
+        assert generated.manifests == ["package.json", lockfile]
+        copy, install_at, sources = layer_order(
+            generated.text,
+            "COPY package.json",
+            f"--mount=type=cache,target={mount}",
+            "COPY . .",
+        )
+        assert copy < install_at < sources
+        assert install in generated.text
+
+    def test_modules_installed_in_image(self, tmp_path):
+        """Test go, cargo, maven and nuget packages kept for offline test runs"""
+        project = tmp_path / "go"
+        project.mkdir()
+        (project / "go.mod").write_text("module demo\n")
+        text = generate_dockerfile(project, "go", "FROM golang:1.24\n").text
+        assert "COPY go.mod go.su[m] ./" in text
+        shared, own = layer_order(
+            text,
+            "GOMODCACHE=/cache/gomod go mod download",
+            "GOPROXY=file:///cache/gomod/cache/download go mod download",
+        )
+        assert shared < own
+
+        project = tmp_path / "rust"
+        project.mkdir()
+        (project / "Cargo.toml").write_text('[package]\nname = "demo"\n')
+        text = generate_dockerfile(project, "rust", "FROM rust:1.87\n").text
+        fetch, sources, build = layer_order(
+            text, "cargo vendor", "COPY . .", "RUN cargo build"
+        )
+        assert fetch < sources < build
+        assert 'cargo vendor "$vendor" >> "$config"' in text
+
+        project = tmp_path / "java"
+        (project / "core").mkdir(parents=True)
+        (project / "pom.xml").write_text(
+            '<project xmlns="http://maven.apache.org/POM/4.0.0">'
+            "<modules><module>core</module></modules></project>"
+        )
+        (project / "core" / "pom.xml").write_text("<project/>")
+        generated = generate_dockerfile(project, "java", "FROM maven:3.9\n")
+        assert generated.manifests == ["pom.xml", "core/pom.xml"]
+        assert "COPY core/pom.xm[l] core/" in generated.text
+        assert "RUN \\\n    mvn --batch-mode" in generated.text
+
+        project = tmp_path / "csharp"
+        (project / "src" / "App").mkdir(parents=True)
+        (project / "src" / "App" / "App.csproj").write_text("<Project/>")
+        (project / "App.sln").write_text("")
+        generated = generate_dockerfile(project, "csharp", "FROM dotnet/sdk:8.0\n")
+        assert generated.manifests == ["App.sln", "src/App/App.csproj"]
+        assert "COPY src/App/App.cspro[j] src/App/" in generated.text
+        assert "NUGET_HTTP_CACHE_PATH=/cache/nuget dotnet restore App.sln" in (
+            generated.text
+        )
+        assert "cp -a" not in generated.text
+
+    def test_falls_back_without_manifests(self, tmp_path):
+        """Test None for projects and languages the templates cover alone"""
+        (tmp_path / "CMakeLists.txt").write_text("project(demo)\n")
+        assert generate_dockerfile(tmp_path, "python", TEMPLATE) is None
+        assert generate_dockerfile(tmp_path, "cpp", TEMPLATE) is None
+
+        (tmp_path / "Cargo.toml").write_text('[workspace]\nmembers = ["a"]\n')
+        assert generate_dockerfile(tmp_path, "rust", TEMPLATE) is None
+
+    def test_imports_without_a_toml_parser(self, tmp_path):
+        """Test that Python < 3.11 without tomli skips the TOML manifests"""
+        path = os.path.join(parent_dir, "services", "dockerfile_generator.py")
+        spec = importlib.util.spec_from_file_location("generator_no_toml", path)
+        module = importlib.util.module_from_spec(spec)
+        with patch.dict(sys.modules, {"tomllib": None, "tomli": None}):
+            spec.loader.exec_module(module)
+
+        assert module.tomllib is None
+        (tmp_path / "pyproject.toml").write_text(
+            '[project]\nname = "demo"\ndependencies = ["requests"]\n'
+        )
+        (tmp_path / "Cargo.toml").write_text('[package]\nname = "demo"\n')
+        assert module.generate_dockerfile(tmp_path, "python", TEMPLATE) is None
+        assert module.generate_dockerfile(tmp_path, "rust", TEMPLATE) is None
+
+        (tmp_path / "requirements.txt").write_text("flask\n")
+        generated = module.generate_dockerfile(tmp_path, "python", TEMPLATE)
+        assert generated.manifests == ["requirements.txt"]
+
+
+class TestCopyDockerfile:
+    """Test the generator within DockerFilesService"""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        service = DockerFilesService()
+        service.defaults_dir = tmp_path / "defaults"
+        (service.defaults_dir / "python").mkdir(parents=True)
+        (service.defaults_dir / "python" / "Dockerfile").write_text(TEMPLATE)
+        (service.defaults_dir / "python" / "Dockerfile_tkinter").write_text(TEMPLATE)
+        return service
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        path = tmp_path / "pre-edit" / "demo"
+        path.mkdir(parents=True)
+        (path / "requirements.txt").write_text("flask\n")
+        return Project(
+            parent="pre-edit", name="demo", path=path, relative_path="pre-edit/demo"
+        )
+
+    @pytest.mark.asyncio
+    async def test_generates_from_manifests(self, service, project):
+        """Test a generated Dockerfile, and the template when turned off"""
+        output_callback = Mock()
+        await service._copy_dockerfile(project, "python", False, False, output_callback)
+
+        dockerfile = (project.path / "Dockerfile").read_text()
+        assert "--mount=type=cache" in dockerfile
+        output_callback.assert_called_with(
+            "   ✅ Generated python default version Dockerfile from requirements.txt\n"
+        )
+
+        with patch.object(get_config().service, "layered_dockerfiles", False):
+            await service._copy_dockerfile(project, "python", False, False, Mock())
+        assert (project.path / "Dockerfile").read_text() == TEMPLATE
+
+    @pytest.mark.asyncio
+    async def test_variants_keep_their_template(self, service, project):
+        """Test that the tkinter/opencv variants are copied as they are"""
+        await service._copy_dockerfile(project, "python", True, False, Mock())
+        assert (project.path / "Dockerfile").read_text() == TEMPLATE
+
+
+class TestBuildScript:
+    """Test the build_docker.sh templates with a generated Dockerfile"""
+
+    @pytest.mark.parametrize(
+        "dockerfile, buildkit",
+        [
+            (TEMPLATE, ""),
+            ("FROM python:3.13\nRUN --mount=type=cache,target=/x true\n", "1"),
+        ],
+    )
+    def test_buildkit_for_cache_mounts(self, tmp_path, dockerfile, buildkit):
+        """Test DOCKER_BUILDKIT=1 only for Dockerfiles with cache mounts"""
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        docker = bin_dir / "docker"
+        docker.write_text('#!/bin/sh\necho "buildkit=$DOCKER_BUILDKIT"\n')
+        docker.chmod(0o755)
+        (tmp_path / "Dockerfile").write_text(dockerfile)
+        script = Path(parent_dir) / "defaults" / "python" / "build_docker.sh"
+        env = {k: v for k, v in os.environ.items() if k != "DOCKER_BUILDKIT"}
+        env["PATH"] = f"{bin_dir}{os.pathsep}{env.get('PATH', '')}"
+        env.pop("BUILD_CACHE_DIR", None)
+
+        result = subprocess.run(
+            ["sh", str(script), "demo"],
+            cwd=tmp_path,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+
+        assert result.stdout == f"buildkit={buildkit}\n"
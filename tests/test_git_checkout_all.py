@@ -0,0 +1,186 @@
+"""
+Tests for parallel checkout-all with fetches shared by remote URL.
+
+The end-to-end test uses real clones of a repository generated with
+`git fast-import`; no network access is needed.
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+# Add parent directory to path to import modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from commands.git_commands import GitCheckoutAllCommand
+from models.project import Project
+from services.git_service import GitService
+from services.platform_service import PlatformService
+from tests.test_git_commit_cache import add_commit, git
+from tests.test_git_commit_graph import build_synthetic_repo
+from utils.async_base import AsyncResult, ProcessError
+import services.git_service as git_service_module
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("git") is None, reason="Git is not installed"
+)
+
+
+def make_versions(root: Path, names):
+    return [
+        Project(
+            parent=name,
+            name="demo",
+            path=root / name / "demo",
+            relative_path=f"{name}/demo",
+        )
+        for name in names
+    ]
+
+
+class TestParallelCheckoutAll:
+    """Test shared fetches and bounded parallel checkouts"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.terminal = Mock()
+        self.successful = []
+        self.failed = []
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_command(self, git_service):
+        project_group = Mock()
+        project_group.name = "demo"
+        return GitCheckoutAllCommand(
+            project_group=project_group, git_service=git_service
+        )
+
+    @pytest.mark.asyncio
+    async def test_one_network_fetch_per_remote(self):
+        """Test that clones of one remote fetch once and all reach the commit"""
+        upstream = build_synthetic_repo(self.temp_dir / "upstream", 30, 2)
+        versions = make_versions(
+            self.temp_dir, ["original", "pre-edit", "post-edit", "correct-edit"]
+        )
+        for version in versions:
+            git(self.temp_dir, "clone", "-q", str(upstream), str(version.path))
+        target = add_commit(upstream, "refs/heads/master", "master", "New work")
+
+        network_fetches = []
+        local_fetches = []
+        real_command = PlatformService.run_command_async
+        real_subprocess = git_service_module.run_subprocess_async
+
+        async def count_commands(command_group, subkey=None, **kwargs):
+            if subkey == "fetch":
+                network_fetches.append(kwargs["cwd"])
+            return await real_command(command_group, subkey=subkey, **kwargs)
+
+        async def count_subprocesses(cmd, *args, **kwargs):
+            if cmd[:2] == ["git", "fetch"]:
+                local_fetches.append(kwargs["cwd"])
+            return await real_subprocess(cmd, *args, **kwargs)
+
+        command = self.create_command(GitService())
+        with patch.object(
+            PlatformService, "run_command_async", side_effect=count_commands
+        ), patch("services.git_service.run_subprocess_async", count_subprocesses):
+            await command._checkout_versions_parallel(
+                target, versions, self.terminal, self.successful, self.failed
+            )
+
+        assert self.failed == []
+        assert len(self.successful) == 4
+        assert network_fetches == [str(versions[0].path)]
+        assert sorted(local_fetches) == sorted(str(v.path) for v in versions[1:])
+        for version in versions:
+            assert git(version.path, "rev-parse", "HEAD") == target
+
+    @pytest.mark.asyncio
+    async def test_tags_reach_versions_updated_from_the_leader(self):
+        """Test that tags the leader has can be checked out in every version"""
+        upstream = build_synthetic_repo(self.temp_dir / "upstream", 10, 1)
+        versions = make_versions(self.temp_dir, ["original", "pre-edit", "post-edit"])
+        for version in versions:
+            git(self.temp_dir, "clone", "-q", str(upstream), str(version.path))
+        target = add_commit(upstream, "refs/heads/master", "master", "New work")
+        # A release tag on no branch, which the leader fetched earlier
+        release = add_commit(upstream, "refs/tags/v2.0", "master~1", "Release")
+        git(versions[0].path, "fetch", "-q", "--tags")
+
+        command = self.create_command(GitService())
+        await command._checkout_versions_parallel(
+            target, versions, self.terminal, self.successful, self.failed
+        )
+
+        assert self.failed == []
+        for version in versions:
+            assert git(version.path, "rev-parse", "HEAD") == target
+            git(version.path, "checkout", "-q", "v2.0")
+            assert git(version.path, "rev-parse", "HEAD") == release
+
+    @pytest.mark.asyncio
+    async def test_different_remotes_are_fetched_separately(self):
+        """Test that versions with different remote URLs are not grouped"""
+        versions = make_versions(self.temp_dir, ["a", "b", "c"])
+        for version, url in zip(versions, ["one", "two", "one"]):
+            git(self.temp_dir, "init", "-q", str(version.path))
+            git(version.path, "remote", "add", "origin", f"https://example.com/{url}")
+
+        groups = await GitService().group_by_remote([v.path for v in versions])
+
+        assert groups == [
+            [versions[0].path, versions[2].path],
+            [versions[1].path],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_checkouts_are_bounded_and_local_changes_prompted_after(self):
+        """Test the concurrency bound and deferred local-change prompts"""
+        versions = make_versions(self.temp_dir, [f"v{i}" for i in range(6)])
+        running = 0
+        peak = 0
+
+        async def checkout(path, commit_hash):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            if path == versions[2].path:
+                return AsyncResult.error_result(
+                    ProcessError("Your local changes would be overwritten")
+                )
+            return AsyncResult.success_result("ok", message="Checked out")
+
+        git_service = AsyncMock()
+        git_service.group_by_remote.return_value = [[v.path for v in versions]]
+        git_service.fetch_latest_commits.return_value = AsyncResult.success_result("")
+        git_service.fetch_from_clone.return_value = AsyncResult.success_result("")
+        git_service.checkout_commit.side_effect = checkout
+        command = self.create_command(git_service)
+
+        with patch("commands.git_commands.get_config") as mock_get_config, patch(
+            "tkinter.messagebox.askyesnocancel", return_value=False
+        ) as mock_prompt:
+            mock_get_config.return_value.service.max_parallel_checkouts = 2
+            await command._checkout_versions_parallel(
+                "abc1234", versions, self.terminal, self.successful, self.failed
+            )
+
+        assert peak == 2
+        git_service.fetch_latest_commits.assert_awaited_once_with(versions[0].path)
+        assert git_service.fetch_from_clone.await_count == 5
+        mock_prompt.assert_called_once()
+        assert self.failed == ["v2/demo (skipped: local changes)"]
+        assert len(self.successful) == 5
@@ -0,0 +1,176 @@
+"""
+Tests for the persistent, incrementally updated commit cache.
+
+Uses real repositories generated with `git fast-import`.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path to import modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from services.git_commit_cache import (
+    GitCommitCache,
+    find_git_dir,
+    refs_fingerprint,
+)
+from services.git_service import GitService
+from tests.test_git_commit_graph import (
+    CountingSubprocess,
+    build_synthetic_repo,
+    load_commits,
+)
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("git") is None, reason="Git is not installed"
+)
+
+GIT_ENV = {
+    **os.environ,
+    "GIT_AUTHOR_NAME": "Dev",
+    "GIT_AUTHOR_EMAIL": "dev@example.com",
+    "GIT_COMMITTER_NAME": "Dev",
+    "GIT_COMMITTER_EMAIL": "dev@example.com",
+}
+
+
+def git(repo: Path, *args, input=None) -> str:
+    return subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        capture_output=True,
+        text=True,
+        check=True,
+        env=GIT_ENV,
+        input=input,
+    ).stdout.strip()
+
+
+def add_commit(repo: Path, ref: str, parent: str, message: str) -> str:
+    tree = git(repo, "rev-parse", f"{parent}^{{tree}}")
+    commit = git(repo, "commit-tree", tree, "-p", parent, "-m", message)
+    git(repo, "update-ref", ref, commit)
+    return commit
+
+
+class TestGitCommitCache:
+    """Test cache hits, incremental updates and invalidation"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.git_service = GitService()
+        self.repo = build_synthetic_repo(Path(self.temp_dir) / "repo", 200, 8)
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    async def uncached_branches(self):
+        commits = load_commits(self.git_service, self.repo)
+        commits = await self.git_service._detect_source_branches(commits, self.repo)
+        return {c.hash: c.source_branch for c in commits}
+
+    def test_fingerprint_tracks_loose_and_packed_refs(self):
+        git_dir = find_git_dir(self.repo)
+        before = refs_fingerprint(git_dir)
+
+        git(self.repo, "pack-refs", "--all")
+        packed = refs_fingerprint(git_dir)
+        assert packed != before
+
+        add_commit(self.repo, "refs/heads/feature-00", "feature-00", "more")
+        assert refs_fingerprint(git_dir) != packed
+
+    @pytest.mark.asyncio
+    async def test_reopen_is_served_from_cache_without_git(self):
+        """Test that an unchanged repository is read back without running git"""
+        commits, state = await self.git_service._get_commits_cached(self.repo)
+        assert state == "rebuilt"
+        assert GitCommitCache.path_for(find_git_dir(self.repo)).is_file()
+
+        counter = CountingSubprocess()
+        with patch("services.git_service.run_subprocess_async", counter):
+            cached, state = await self.git_service._get_commits_cached(self.repo)
+
+        assert state == "hit"
+        assert counter.commands == []
+        assert [(c.hash, c.source_branch, c.parents) for c in cached] == [
+            (c.hash, c.source_branch, c.parents) for c in commits
+        ]
+        assert {c.hash: c.source_branch for c in cached} == (
+            await self.uncached_branches()
+        )
+
+    @pytest.mark.asyncio
+    async def test_moved_refs_only_read_new_commits(self):
+        """Test that only commits beyond the cached tips are logged"""
+        await self.git_service._get_commits_cached(self.repo)
+
+        new_commit = add_commit(
+            self.repo, "refs/heads/feature-late", "master", "Late feature"
+        )
+
+        counter = CountingSubprocess()
+        with patch("services.git_service.run_subprocess_async", counter):
+            commits, state = await self.git_service._get_commits_cached(self.repo)
+
+        assert state == "incremental"
+        log_calls = [cmd for cmd in counter.commands if cmd[:2] == ["git", "log"]]
+        assert len(log_calls) == 1 and "--stdin" in log_calls[0]
+
+        by_hash = {c.hash: c for c in commits}
+        late = next(c for c in commits if new_commit.startswith(c.hash))
+        assert late.source_branch == "feature-late"
+        assert {h: c.source_branch for h, c in by_hash.items()} == (
+            await self.uncached_branches()
+        )
+
+    @pytest.mark.asyncio
+    async def test_deleted_branch_commits_are_dropped(self):
+        """Test that commits no longer reachable from any ref leave the cache"""
+        commits, _ = await self.git_service._get_commits_cached(self.repo)
+        dropped = {c.hash for c in commits if c.source_branch == "feature-01"}
+        assert dropped
+
+        git(self.repo, "branch", "-D", "feature-01")
+        commits, state = await self.git_service._get_commits_cached(self.repo)
+
+        assert state == "incremental"
+        assert not dropped & {c.hash for c in commits}
+        assert len(commits) == len(load_commits(self.git_service, self.repo))
+
+    @pytest.mark.asyncio
+    async def test_unknown_cached_tips_trigger_rebuild(self):
+        """Test that a cache whose tips no longer exist is rebuilt"""
+        await self.git_service._get_commits_cached(self.repo)
+        cache_path = GitCommitCache.path_for(find_git_dir(self.repo))
+        data = json.loads(cache_path.read_text())
+        data["fingerprint"] = "stale"
+        data["tips"] = ["0" * 40]
+        cache_path.write_text(json.dumps(data))
+
+        commits, state = await self.git_service._get_commits_cached(self.repo)
+
+        assert state == "rebuilt"
+        assert len(commits) == len(load_commits(self.git_service, self.repo))
+
+    @pytest.mark.asyncio
+    async def test_get_git_commits_reports_cache_state(self):
+        """Test that get_git_commits uses the cache for full history"""
+        first = await self.git_service.get_git_commits(self.repo)
+        second = await self.git_service.get_git_commits(self.repo)
+
+        assert first.is_success and second.is_success
+        assert first.metadata["cache"] == "rebuilt"
+        assert second.metadata["cache"] == "hit"
+        assert len(second.data) == len(first.data)
@@ -0,0 +1,263 @@
+"""
+Tests for batch branch attribution over the in-process commit graph.
+
+Synthetic repositories are generated with `git fast-import`, so these tests
+need Git but no network access. The 5k-commit / 50-branch benchmark is marked
+slow.
+"""
+
+import copy
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path to import modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from config.config import get_config
+from services.git_commit_graph import CommitGraph
+from services.git_service import GitService
+import services.git_service as git_service_module
+
+COMMANDS = get_config().commands.commands
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("git") is None, reason="Git is not installed"
+)
+
+
+def build_synthetic_repo(
+    path: Path,
+    total_commits: int,
+    branch_count: int,
+    head_branch: str = None,
+) -> Path:
+    """
+    Create a repository with a master first-parent chain and branch_count
+    feature branches forked along it. Every other feature branch is merged
+    back into master. Roughly total_commits commits are created.
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    subprocess.run(["git", "init", "-q", str(path)], check=True)
+
+    branch_length = max(1, total_commits // (branch_count * 4)) if branch_count else 0
+    main_length = max(1, total_commits - branch_count * branch_length)
+    fork_every = max(1, main_length // (branch_count + 1))
+
+    lines = []
+    mark = 0
+    timestamp = 1700000000
+
+    def commit(ref, message, parent=None, merge=None):
+        nonlocal mark, timestamp
+        mark += 1
+        timestamp += 60
+        lines.append(f"commit {ref}")
+        lines.append(f"mark :{mark}")
+        lines.append(f"committer Dev <dev@example.com> {timestamp} +0000")
+        lines.append(f"data {len(message)}")
+        lines.append(message)
+        if parent:
+            lines.append(f"from :{parent}")
+        if merge:
+            lines.append(f"merge :{merge}")
+        lines.append("")
+        return mark
+
+    main_tip = None
+    branches_made = 0
+    for i in range(main_length):
+        main_tip = commit("refs/heads/master", f"main {i}", parent=main_tip)
+
+        if branches_made < branch_count and i and i % fork_every == 0:
+            name = f"refs/heads/feature-{branches_made:02d}"
+            tip = main_tip
+            for j in range(branch_length):
+                tip = commit(name, f"feature {branches_made} work {j}", parent=tip)
+            if branches_made % 2 == 0:
+                main_tip = commit(
+                    "refs/heads/master",
+                    f"Merge feature-{branches_made:02d}",
+                    parent=main_tip,
+                    merge=tip,
+                )
+            branches_made += 1
+
+    subprocess.run(
+        ["git", "fast-import", "--quiet"],
+        cwd=path,
+        input="\n".join(lines) + "\n",
+        text=True,
+        check=True,
+    )
+    if head_branch:
+        subprocess.run(
+            ["git", "symbolic-ref", "HEAD", f"refs/heads/{head_branch}"],
+            cwd=path,
+            check=True,
+        )
+    return path
+
+
+def load_commits(git_service: GitService, repo: Path):
+    result = subprocess.run(
+        COMMANDS["GIT_COMMANDS"]["log"] + ["--all"],
+        cwd=repo,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return git_service._parse_commits(result.stdout.strip())
+
+
+class CountingSubprocess:
+    """Wraps run_subprocess_async and records the git commands run"""
+
+    def __init__(self):
+        self.commands = []
+        self._real = git_service_module.run_subprocess_async
+
+    async def __call__(self, cmd, *args, **kwargs):
+        self.commands.append(cmd)
+        return await self._real(cmd, *args, **kwargs)
+
+
+class TestCommitGraph:
+    """Unit tests for the commit graph model"""
+
+    def setup_method(self):
+        rev_list = "\n".join(
+            [
+                "c3c3c3c3 b2b2b2b2 f1f1f1f1",
+                "f1f1f1f1 a1a1a1a1",
+                "b2b2b2b2 a1a1a1a1",
+                "a1a1a1a1",
+            ]
+        )
+        refs = "\n".join(
+            [
+                "  f1f1f1f1 refs/heads/feature",
+                "* c3c3c3c3 refs/heads/master",
+                "  c3c3c3c3 refs/remotes/origin/master",
+            ]
+        )
+        self.graph = CommitGraph.parse(rev_list, refs)
+
+    def test_parse_reads_parents_and_refs(self):
+        assert len(self.graph) == 4
+        assert self.graph.parents["c3c3c3c3"] == ["b2b2b2b2", "f1f1f1f1"]
+        assert [ref.short_name for ref in self.graph.refs] == [
+            "feature",
+            "master",
+            "origin/master",
+        ]
+        assert self.graph.find_ref("master").is_head is True
+
+    def test_resolve_abbreviated_hashes(self):
+        assert self.graph.resolve("c3c3") == "c3c3c3c3"
+        assert self.graph.resolve("0000") is None
+
+    def test_main_branch_prefers_origin_master(self):
+        assert self.graph.main_branch_tip() == "c3c3c3c3"
+        assert self.graph.first_parent_history("c3c3c3c3") == {
+            "c3c3c3c3",
+            "b2b2b2b2",
+            "a1a1a1a1",
+        }
+
+    def test_first_containing_branch_skips_checked_out_branch(self):
+        found = self.graph.first_containing_branches(["f1f1f1f1", "b2b2b2b2"])
+
+        # master is checked out and so skipped, like `git branch --contains`
+        assert found == {"f1f1f1f1": "feature"}
+
+
+class TestBatchBranchAttribution:
+    """Batch attribution against real repositories"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.git_service = GitService()
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_per_commit_attribution(self):
+        """Test that batch attribution reports the same source branches"""
+        repo = build_synthetic_repo(
+            Path(self.temp_dir) / "repo", 120, 6, head_branch="feature-01"
+        )
+        commits = load_commits(self.git_service, repo)
+
+        batch = await self.git_service._detect_source_branches(
+            copy.deepcopy(commits), repo
+        )
+        per_commit = await self.git_service._detect_source_branches_per_commit(
+            copy.deepcopy(commits), repo
+        )
+
+        assert [c.source_branch for c in batch] == [c.source_branch for c in per_commit]
+        assert any(c.source_branch for c in batch)
+
+    @pytest.mark.asyncio
+    async def test_subprocess_count_is_constant(self):
+        """Test that attribution cost in git calls does not grow with history"""
+        counts = []
+        for size, branches in ((60, 3), (600, 30)):
+            repo = build_synthetic_repo(
+                Path(self.temp_dir) / f"repo-{size}", size, branches
+            )
+            commits = load_commits(self.git_service, repo)
+
+            counter = CountingSubprocess()
+            with patch("services.git_service.run_subprocess_async", counter):
+                await self.git_service._detect_source_branches(commits, repo)
+            counts.append(len(counter.commands))
+
+        assert counts[0] == counts[1]
+        assert counts[1] <= 4
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_per_commit_detection(self):
+        """Test that detection still works when the graph cannot be loaded"""
+        repo = build_synthetic_repo(Path(self.temp_dir) / "repo", 40, 2)
+        commits = load_commits(self.git_service, repo)
+
+        with patch.object(self.git_service, "_load_commit_graph", return_value=None):
+            result = await self.git_service._detect_source_branches(commits, repo)
+
+        assert any(c.source_branch for c in result)
+
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_benchmark_5k_commits_50_branches(self):
+        """Benchmark batch attribution on a 5k-commit, 50-branch repository"""
+        repo = build_synthetic_repo(Path(self.temp_dir) / "bench", 5000, 50)
+        commits = load_commits(self.git_service, repo)
+        assert len(commits) >= 5000
+
+        counter = CountingSubprocess()
+        started = time.perf_counter()
+        with patch("services.git_service.run_subprocess_async", counter):
+            result = await self.git_service._detect_source_branches(commits, repo)
+        elapsed = time.perf_counter() - started
+
+        attributed = sum(1 for c in result if c.source_branch)
+        print(
+            f"\nbatch attribution: {len(commits)} commits, 50 branches, "
+            f"{len(counter.commands)} git calls, {attributed} attributed, "
+            f"{elapsed:.2f}s"
+        )
+        assert len(counter.commands) <= 4
+        assert attributed > 0
+        assert elapsed < 30
@@ -442,3 +442,120 @@ class TestGitCommitHighlighting:
                         "current" not in inserted_text.lower()
                     ), f"Failed case: {description}"
                     mock_listbox_instance.itemconfig.assert_not_called()
+
+
+class TestVirtualizedCommitList:
+    """Test paged rendering and filtering in the git commit window"""
+
+    def create_commits(self, count):
+        return [
+            GitCommit(
+                hash=f"{i:08x}",
+                author="Alice" if i % 2 else "Bob",
+                date="2024-01-15",
+                subject=f"Change number {i}",
+            )
+            for i in range(count)
+        ]
+
+    def create_window(self, commits, current_commit_hash=None):
+        git_window = GitCommitWindow(
+            parent_window=Mock(),
+            project_name="test-project",
+            commits=[],
+            on_checkout_callback=Mock(),
+            current_commit_hash=current_commit_hash,
+        )
+        git_window.commit_listbox = Mock()
+        git_window.status_label = Mock()
+        git_window.checkout_btn = Mock()
+        git_window.update_with_commits(commits, current_commit_hash)
+        return git_window
+
+    def test_large_history_renders_only_first_page(self):
+        """Test that only one page of rows is inserted up front"""
+        from gui.popup_windows import COMMIT_PAGE_SIZE
+
+        git_window = self.create_window(self.create_commits(10000))
+
+        assert git_window.commit_listbox.insert.call_count == COMMIT_PAGE_SIZE
+        assert git_window.has_more_rows
+
+        git_window.render_next_page()
+
+        assert git_window.commit_listbox.insert.call_count == 2 * COMMIT_PAGE_SIZE
+        assert git_window.rendered_count == 2 * COMMIT_PAGE_SIZE
+
+    def test_current_commit_highlight_uses_row_position(self):
+        """Test that a current commit on a later page is highlighted at its row"""
+        from gui.popup_windows import COMMIT_PAGE_SIZE
+
+        commits = self.create_commits(COMMIT_PAGE_SIZE + 10)
+        current = commits[COMMIT_PAGE_SIZE + 5].hash
+        git_window = self.create_window(commits, current)
+
+        git_window.commit_listbox.itemconfig.assert_not_called()
+        git_window.render_next_page()
+        git_window.commit_listbox.itemconfig.assert_called_once_with(
+            COMMIT_PAGE_SIZE + 5, bg="#27ae60", fg="white"
+        )
+
+    def test_filter_selects_commits_by_author_hash_and_subject(self):
+        """Test that the filter matches and selection maps to filtered rows"""
+        git_window = self.create_window(self.create_commits(50))
+        git_window.window = Mock()
+        git_window.filter_var = Mock()
+        git_window.filter_var.get.return_value = "alice number 1"
+
+        git_window.apply_filter()
+
+        matched = [git_window.commits[i] for i in git_window.visible_indices]
+        assert matched and all(c.author == "Alice" for c in matched)
+        assert all(
+            "1" in c.hash or "1" in c.subject for c in matched
+        ), "every term must match the hash, author or subject"
+        assert len(matched) < 25
+        assert "matching" in git_window.status_label.config.call_args[1]["text"]
+
+        git_window.commit_listbox.curselection.return_value = (1,)
+        assert git_window.get_selected_commit_hash() == matched[1].hash
+
+    def test_filter_narrows_previous_matches_incrementally(self):
+        """Test that extending a query only rescans the previous matches"""
+        from models.commit_index import CommitIndex
+
+        index = CommitIndex(self.create_commits(100))
+        broad = index.filter("alice")
+        index._search_keys = [
+            key if i in set(broad) else "alice poisoned"
+            for i, key in enumerate(index._search_keys)
+        ]
+
+        narrowed = index.filter("alice number 3")
+
+        assert narrowed and set(narrowed) <= set(broad)
+        assert index.filter("") == list(range(100))
+
+    def test_streamed_pages_append_and_refresh_rows(self):
+        """Test that streamed pages extend the list and branch updates redraw rows"""
+        commits = self.create_commits(30)
+        git_window = self.create_window(commits[:10], commits[12].hash)
+        git_window.commit_listbox.curselection.return_value = (2,)
+
+        git_window.append_commits(commits[10:30])
+
+        assert git_window.rendered_count == 30
+        assert git_window.commit_index.current_index == 12
+        git_window.commit_listbox.insert.reset_mock()
+
+        commits[12].source_branch = "feature-x"
+        git_window.refresh_commits([commits[12], commits[20]])
+
+        git_window.commit_listbox.delete.assert_any_call(12)
+        texts = {
+            call.args[0]: call.args[1]
+            for call in git_window.commit_listbox.insert.call_args_list
+        }
+        assert "[feature-x]" in texts[12] and texts[12].startswith(">> CURRENT: ")
+        assert set(texts) == {12, 20}
+        git_window.commit_listbox.selection_set.assert_called_once_with(2)
@@ -0,0 +1,153 @@
+"""
+Tests for the quick dirty check used by checkout preflights.
+
+Uses real repositories with a committed working tree; no network access is
+needed.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path to import modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from services.git_service import GitService
+from services.platform_service import PlatformService
+from tests.test_git_commit_cache import git
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("git") is None, reason="Git is not installed"
+)
+
+
+def build_working_tree(path: Path, file_count: int, per_dir: int = 100) -> Path:
+    """Create a repository with file_count committed files, per_dir per folder"""
+    path.mkdir(parents=True)
+    git(path, "init", "-q")
+    for i in range(file_count):
+        folder = path / "src" / f"pkg{i // per_dir:04d}"
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"module{i}.py").write_text(f"VALUE = {i}\n")
+    (path / ".gitignore").write_text("*.log\n")
+    git(path, "add", "-A")
+    git(path, "commit", "-q", "-m", "Initial tree")
+    return path
+
+
+class TestGitDirtyCheck:
+    """Test the diff-index based check against what git status reports"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.git_service = GitService()
+        self.repo = build_working_tree(self.temp_dir / "repo", 50, per_dir=10)
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    async def check(self, include_untracked=False):
+        result = await self.git_service.check_dirty(self.repo, include_untracked)
+        assert result.is_success, result.error
+        return result.data
+
+    @pytest.mark.asyncio
+    async def test_clean_tree_and_stat_only_changes(self):
+        """Test that touched but unchanged files do not count as changes"""
+        state = await self.check(include_untracked=True)
+        assert not state.is_dirty
+        assert state.method == "diff-index"
+        assert state.untracked_files is False
+        assert state.elapsed_ms > 0
+
+        module = self.repo / "src" / "pkg0001" / "module12.py"
+        later = time.time() + 10
+        os.utime(module, (later, later))
+
+        assert not (await self.check()).is_dirty
+
+    @pytest.mark.asyncio
+    async def test_tracked_and_untracked_changes(self):
+        """Test modified tracked files, untracked files and ignored files"""
+        (self.repo / "debug.log").write_text("ignored")
+        assert not (await self.check(include_untracked=True)).is_dirty
+
+        (self.repo / "src" / "new_module.py").write_text("NEW = 1\n")
+        assert not (await self.check()).is_dirty
+        state = await self.check(include_untracked=True)
+        assert state.is_dirty and state.untracked_files and not state.tracked_changes
+
+        (self.repo / "src" / "pkg0002" / "module20.py").write_text("VALUE = -1\n")
+        state = await self.check(include_untracked=True)
+        assert state.is_dirty and state.tracked_changes
+        assert state.untracked_files is None  # Not needed once tracked changes show
+
+    @pytest.mark.asyncio
+    async def test_unborn_branch_falls_back_to_status(self):
+        """Test a repository without commits, where there is no HEAD to diff"""
+        empty = self.temp_dir / "empty"
+        git(self.temp_dir, "init", "-q", str(empty))
+        (empty / "staged.txt").write_text("x")
+        git(empty, "add", "staged.txt")
+
+        result = await self.git_service.check_dirty(empty)
+
+        assert result.data.method == "status"
+        assert result.data.is_dirty
+
+    @pytest.mark.asyncio
+    async def test_fast_index_is_opt_in_and_enabled_once(self):
+        """Test that the untracked cache and split index are only turned on when configured"""
+        await self.check()
+        assert "untrackedcache" not in git(self.repo, "config", "--list").lower()
+
+        with patch("services.git_service.get_config") as mock_get_config:
+            mock_get_config.return_value.service.git_fast_index = True
+            await self.check(include_untracked=True)
+            with patch.object(PlatformService, "run_command_async") as mock_run:
+                mock_run.side_effect = AssertionError("enabled twice")
+                await self.git_service.enable_fast_index(self.repo)
+
+        assert git(self.repo, "config", "core.untrackedCache") == "true"
+        assert git(self.repo, "config", "core.splitIndex") == "true"
+        assert list((self.repo / ".git").glob("sharedindex.*"))
+        (self.repo / "src" / "new_module.py").write_text("NEW = 1\n")
+        assert (await self.check(include_untracked=True)).untracked_files is True
+
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_benchmark_preflight_on_large_tree(self):
+        """Benchmark the quick check against git status on a 20k-file tree"""
+        big = build_working_tree(self.temp_dir / "big", 20000)
+        (big / "src" / "scratch.txt").write_text("untracked")
+
+        def status_ms():
+            started = time.perf_counter()
+            git(big, "status", "--porcelain")
+            return (time.perf_counter() - started) * 1000
+
+        async def check_ms(include_untracked):
+            result = await self.git_service.check_dirty(big, include_untracked)
+            assert result.data.is_dirty is include_untracked
+            return result.data.elapsed_ms
+
+        # Best of three, to keep scheduler noise out of the comparison
+        status = min(status_ms() for _ in range(3))
+        with patch("services.git_service.get_config") as mock_get_config:
+            mock_get_config.return_value.service.git_fast_index = True
+            tracked = min([await check_ms(False) for _ in range(3)])
+            untracked = min([await check_ms(True) for _ in range(3)])
+
+        print(
+            f"\n20k files: git status {status:.0f} ms, tracked check "
+            f"{tracked:.0f} ms, with untracked (cached) {untracked:.0f} ms"
+        )
+        assert tracked < status
@@ -0,0 +1,195 @@
+"""
+Tests for the background fetch scheduler and the fetch freshness cache.
+
+Clones of a local repository generated with `git fast-import` stand in for
+checkouts of a remote; no network access is needed.
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Add parent directory to path to import modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from commands.git_commands import fetch_age_note
+from services.git_fetch_scheduler import (
+    FetchFreshness,
+    GitFetchScheduler,
+    fetch_freshness,
+    format_fetch_age,
+)
+from services.git_service import GitService
+from services.platform_service import PlatformService
+from tests.test_git_commit_cache import git
+from tests.test_git_commit_graph import build_synthetic_repo
+from utils.async_base import AsyncResult
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("git") is None, reason="Git is not installed"
+)
+
+
+class TestFetchFreshness:
+    """Test the last-fetch bookkeeping and the fetch skip in GitService"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        upstream = build_synthetic_repo(self.temp_dir / "upstream", 20, 1)
+        self.clone = self.temp_dir / "clone"
+        git(self.temp_dir, "clone", "-q", f"file://{upstream}", str(self.clone))
+        self.git_service = GitService()
+
+    def teardown_method(self):
+        fetch_freshness.forget(self.clone)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_falls_back_to_fetch_head_and_prefers_records(self):
+        """Test FETCH_HEAD mtime as the last fetch until a fetch is recorded"""
+        freshness = FetchFreshness()
+        assert freshness.last_fetch(self.clone) is None
+
+        git(self.clone, "fetch", "-q")
+        fetch_head = self.clone / ".git" / "FETCH_HEAD"
+        os.utime(fetch_head, (time.time() - 600, time.time() - 600))
+        assert 590 < freshness.age(self.clone) < 700
+        assert not freshness.is_fresh(self.clone, 300)
+
+        freshness.record(self.clone)
+        assert freshness.age(self.clone) < 5
+        assert freshness.is_fresh(self.clone, 300)
+
+    @pytest.mark.asyncio
+    async def test_fresh_repository_is_not_fetched_again(self):
+        """Test that max_age skips git fetch and reports the age"""
+        fetches = []
+        real = PlatformService.run_command_async
+
+        async def counting(command_group, subkey=None, **kwargs):
+            if subkey == "fetch":
+                fetches.append(kwargs["cwd"])
+            return await real(command_group, subkey=subkey, **kwargs)
+
+        with patch.object(PlatformService, "run_command_async", side_effect=counting):
+            first = await self.git_service.fetch_latest_commits(self.clone, max_age=300)
+            second = await self.git_service.fetch_latest_commits(
+                self.clone, max_age=300
+            )
+            forced = await self.git_service.fetch_latest_commits(self.clone)
+
+        assert first.is_success and first.metadata["skipped"] is False
+        assert second.is_success and second.metadata["skipped"] is True
+        assert second.metadata["age"] < 300
+        assert forced.metadata["skipped"] is False
+        assert fetches == [str(self.clone), str(self.clone)]
+
+    @pytest.mark.asyncio
+    async def test_fetch_from_clone_inherits_source_freshness(self):
+        """Test that a clone updated from another is as fresh as its source"""
+        other = self.temp_dir / "other"
+        git(self.temp_dir, "clone", "-q", str(self.clone), str(other))
+        git(
+            other,
+            "remote",
+            "set-url",
+            "origin",
+            git(self.clone, "remote", "get-url", "origin"),
+        )
+        fetch_freshness.record(self.clone, time.time() - 42)
+
+        try:
+            result = await self.git_service.fetch_from_clone(other, self.clone)
+            assert result.is_success, result.error
+            assert 40 < fetch_freshness.age(other) < 60
+        finally:
+            fetch_freshness.forget(other)
+
+    def test_age_is_described_for_the_status_line(self):
+        """Test the "fetched N s ago" indicator"""
+        assert format_fetch_age(8.6) == "fetched 8 s ago"
+        assert format_fetch_age(150) == "fetched 2 min ago"
+        assert format_fetch_age(7300) == "fetched 2 h ago"
+
+        skipped = AsyncResult.success_result("", metadata={"age": 12.0})
+        assert fetch_age_note(skipped) == " - fetched 12 s ago"
+        assert fetch_age_note(AsyncResult.success_result("")) == ""
+
+
+class TestGitFetchScheduler:
+    """Test which repositories the scheduler fetches, and how many at a time"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.paths = []
+        for i in range(5):
+            path = self.temp_dir / f"v{i}" / "demo"
+            path.mkdir(parents=True)
+            self.paths.append(path)
+        self.freshness = FetchFreshness()
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_scheduler(self, **kwargs):
+        options = dict(interval=60, jitter=0.2, max_concurrent=2, viewed_ttl=600)
+        options.update(kwargs)
+        return GitFetchScheduler(self.freshness, **options)
+
+    @pytest.mark.asyncio
+    async def test_fetches_stale_viewed_repositories_with_bounded_concurrency(self):
+        """Test that only viewed, stale repositories are fetched, two at a time"""
+        running = 0
+        peak = 0
+
+        async def fetch(path, max_age=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            self.freshness.record(path)
+            return AsyncResult.success_result("fetch_completed")
+
+        git_service = AsyncMock()
+        git_service.fetch_latest_commits.side_effect = fetch
+        scheduler = self.create_scheduler()
+        scheduler.note_viewed(self.paths[:4])
+        self.freshness.record(self.paths[0])
+
+        fetched = await scheduler.fetch_due(git_service)
+
+        assert fetched == {path: True for path in self.paths[1:4]}
+        assert peak == 2
+        assert await scheduler.fetch_due(git_service) == {}
+
+    def test_views_expire_and_are_capped(self):
+        """Test the viewed-repository TTL and the most-recently-viewed cap"""
+        scheduler = self.create_scheduler(max_viewed=3)
+        scheduler.note_viewed(self.paths)
+        assert scheduler.due_paths() == self.paths[2:]
+
+        scheduler.note_viewed([self.paths[2]])
+        assert scheduler.due_paths() == [self.paths[3], self.paths[4], self.paths[2]]
+
+        with patch(
+            "services.git_fetch_scheduler.time.monotonic",
+            return_value=time.monotonic() + 601,
+        ):
+            assert scheduler.due_paths() == []
+
+    def test_delay_is_jittered_around_interval(self):
+        """Test that successive delays vary within interval +/- jitter"""
+        scheduler = self.create_scheduler(interval=100, jitter=0.25)
+        delays = [scheduler.next_delay() for _ in range(50)]
+
+        assert all(75 <= delay <= 125 for delay in delays)
+        assert len(set(delays)) > 1
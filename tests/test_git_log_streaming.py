@@ -0,0 +1,123 @@
+"""
+Tests for the streaming, paginated git log used by the git view.
+
+Uses real repositories generated with `git fast-import`.
+"""
+
+import copy
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path to import modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from services.git_commit_cache import GitCommitCache, find_git_dir
+from services.git_service import GitService
+from tests.test_git_commit_graph import build_synthetic_repo, load_commits
+from utils.async_base import ProcessError
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("git") is None, reason="Git is not installed"
+)
+
+
+class TestStreamGitCommits:
+    """Test paging, progressive attribution and the cached second open"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.git_service = GitService()
+        self.repo = build_synthetic_repo(Path(self.temp_dir) / "repo", 600, 10)
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    async def collect(self, **kwargs):
+        return [
+            page
+            async for page in self.git_service.stream_git_commits(self.repo, **kwargs)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_first_page_arrives_before_branch_attribution(self):
+        """Test that commits are paged out first and branches follow"""
+        pages = []
+        async for page in self.git_service.stream_git_commits(self.repo, page_size=50):
+            if not pages:
+                # Shown before any branch has been attributed
+                assert page.kind == "commits" and len(page.commits) == 50
+                assert all(c.source_branch is None for c in page.commits)
+            pages.append(page)
+
+        assert pages[-1].kind == "branches" and pages[-1].done
+        assert sum(page.done for page in pages) == 1
+
+        commits = [c for page in pages if page.kind == "commits" for c in page.commits]
+        assert pages[-1].total == len(commits)
+        assert [c.hash for c in commits] == [
+            c.hash for c in load_commits(self.git_service, self.repo)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_attributed_branches_match_get_git_commits(self):
+        """Test that progressive attribution matches a full attribution"""
+        expected = await self.git_service._detect_source_branches(
+            copy.deepcopy(load_commits(self.git_service, self.repo)), self.repo
+        )
+
+        with patch("services.git_service.ATTRIBUTION_CHUNK_SIZE", 100):
+            pages = await self.collect(page_size=50)
+
+        commits = [c for page in pages if page.kind == "commits" for c in page.commits]
+        assert {c.hash: c.source_branch for c in commits} == {
+            c.hash: c.source_branch for c in expected
+        }
+        assert any(c.source_branch for c in commits)
+
+    @pytest.mark.asyncio
+    async def test_second_open_is_served_from_cache(self):
+        """Test that a streamed read leaves a cache for the next open"""
+        streamed = await self.collect()
+        assert GitCommitCache.path_for(find_git_dir(self.repo)).is_file()
+
+        with patch(
+            "services.git_service.stream_subprocess_lines_async",
+            side_effect=AssertionError("git log should not run"),
+        ):
+            cached = await self.collect(page_size=100)
+
+        assert all(page.kind == "commits" for page in cached)
+        assert cached[-1].done and cached[-1].total == len(
+            [c for page in streamed if page.kind == "commits" for c in page.commits]
+        )
+        assert any(c.source_branch for page in cached for c in page.commits)
+
+    @pytest.mark.asyncio
+    async def test_get_git_commits_reports_each_page(self):
+        """Test that get_git_commits forwards pages to on_page"""
+        pages = []
+
+        result = await self.git_service.get_git_commits(self.repo, on_page=pages.append)
+
+        assert result.is_success
+        assert result.metadata["streamed"] is True
+        assert len(result.data) == pages[-1].total
+        assert pages[0].kind == "commits" and pages[-1].done
+
+    @pytest.mark.asyncio
+    async def test_log_failure_raises_process_error(self):
+        """Test that a failing git log surfaces as a ProcessError"""
+        not_a_repo = Path(self.temp_dir) / "plain"
+        not_a_repo.mkdir()
+
+        with pytest.raises(ProcessError):
+            async for _ in self.git_service.stream_git_commits(not_a_repo):
+                pass
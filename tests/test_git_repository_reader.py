@@ -0,0 +1,156 @@
+"""
+Tests for reading repository state from the git directory without git.
+
+Uses real repositories generated with `git fast-import`.
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path to import modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from services.git_repository_reader import read_git_dir_state, resolve_ref
+from services.git_service import GitService
+from services.platform_service import PlatformService
+from tests.test_git_commit_cache import git
+from tests.test_git_commit_graph import build_synthetic_repo
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("git") is None, reason="Git is not installed"
+)
+
+
+class TestGitRepositoryReader:
+    """Compare the in-process reader with what git reports"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.git_service = GitService()
+        self.repo = build_synthetic_repo(Path(self.temp_dir) / "repo", 40, 2)
+        git(self.repo, "remote", "add", "origin", "https://example.com/a.git")
+        git(self.repo, "remote", "add", "upstream", "https://example.com/b.git")
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    async def info_via_git(self, path: Path):
+        with patch("services.git_service.read_git_dir_state", return_value=None):
+            return (await self.git_service.get_repository_info(path)).data
+
+    @pytest.mark.asyncio
+    async def test_matches_git_for_branch_commit_and_remotes(self):
+        """Test that reading .git reports what the git commands report"""
+        fast = (await self.git_service.get_repository_info(self.repo)).data
+        slow = await self.info_via_git(self.repo)
+
+        assert fast == slow
+        assert fast.current_branch == "master"
+        assert fast.remote_urls == ["origin", "upstream"]
+        assert fast.has_remote is True
+
+    def test_packed_refs_and_detached_head(self):
+        """Test that packed refs resolve and a detached HEAD has no branch"""
+        head = git(self.repo, "rev-parse", "HEAD")
+        git(self.repo, "pack-refs", "--all")
+        assert not (self.repo / ".git" / "refs" / "heads" / "master").exists()
+
+        state = read_git_dir_state(self.repo)
+        assert state.current_branch == "master"
+        assert state.current_commit == head
+
+        git(self.repo, "checkout", "-q", "--detach", "feature-00")
+        state = read_git_dir_state(self.repo)
+        assert state.current_branch == ""
+        assert state.current_commit == git(self.repo, "rev-parse", "feature-00")
+
+    def test_unborn_branch_has_no_commit(self):
+        """Test that a freshly initialised repository reports no commit"""
+        empty = Path(self.temp_dir) / "empty"
+        git(Path(self.temp_dir), "init", "-q", "-b", "trunk", str(empty))
+
+        state = read_git_dir_state(empty)
+
+        assert state.current_branch == "trunk"
+        assert state.current_commit is None
+        assert state.remotes == []
+
+    def test_worktree_reads_refs_from_common_dir(self):
+        """Test that a linked worktree resolves its own HEAD and shared refs"""
+        worktree = Path(self.temp_dir) / "worktree"
+        git(self.repo, "worktree", "add", "-q", str(worktree), "feature-01")
+
+        state = read_git_dir_state(worktree)
+
+        assert state.current_branch == "feature-01"
+        assert state.current_commit == git(self.repo, "rev-parse", "feature-01")
+        assert state.remotes == ["origin", "upstream"]
+        assert resolve_ref(state.git_dir, "refs/heads/master") == git(
+            self.repo, "rev-parse", "master"
+        )
+
+    def test_subdirectory_falls_back_to_git(self):
+        """Test that paths other than a repository root are left to git"""
+        subdir = self.repo / "sub"
+        subdir.mkdir()
+        assert read_git_dir_state(subdir) is None
+
+    @pytest.mark.asyncio
+    async def test_only_status_runs_git(self):
+        """Test that a preflight only runs the quick tracked-files check"""
+        calls = []
+        real = PlatformService.run_command_async
+
+        async def counting(command_group, subkey=None, **kwargs):
+            calls.append(subkey)
+            return await real(command_group, subkey=subkey, **kwargs)
+
+        (self.repo / "untracked.txt").write_text("new")
+        with patch.object(PlatformService, "run_command_async", side_effect=counting):
+            quick = await self.git_service.get_repository_info(
+                self.repo, detailed=False
+            )
+            full = await self.git_service.get_repository_info(self.repo)
+
+        assert calls == ["diff_index_quiet", "status_porcelain"]
+        assert quick.data.is_clean is True
+        assert full.data.is_clean is False
+
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_benchmark_checkout_all_preflight(self):
+        """Benchmark repository info for 4 versions, in-process vs git"""
+        versions = [self.repo]
+        for i in range(3):
+            clone = Path(self.temp_dir) / f"version-{i}"
+            git(Path(self.temp_dir), "clone", "-q", str(self.repo), str(clone))
+            versions.append(clone)
+
+        async def preflight():
+            started = time.perf_counter()
+            for _ in range(5):
+                results = await asyncio.gather(
+                    *(
+                        self.git_service.get_repository_info(path, detailed=False)
+                        for path in versions
+                    )
+                )
+                assert all(result.is_success for result in results)
+            return time.perf_counter() - started
+
+        fast = await preflight()
+        with patch("services.git_service.read_git_dir_state", return_value=None):
+            slow = await preflight()
+
+        print(f"\n4-version preflight x5: in-process {fast:.2f}s, git {slow:.2f}s")
+        assert fast < slow
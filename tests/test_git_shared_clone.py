@@ -0,0 +1,118 @@
+"""
+Tests for deriving project versions from one clone when adding a project.
+
+The upstream is a local repository served over file://, so the seed clone
+goes through the normal transport (no hardlinks) like a network clone.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path to import modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from services.git_service import GitService
+from services.project_service import ProjectService
+from tests.test_git_commit_cache import git
+from tests.test_git_commit_graph import build_synthetic_repo
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("git") is None, reason="Git is not installed"
+)
+
+
+def pack_files(repo: Path):
+    return sorted((repo / ".git" / "objects" / "pack").glob("*.pack"))
+
+
+class TestCloneFromSeed:
+    """Test hardlink and reference clones derived from a seed clone"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.git_service = GitService()
+        upstream = build_synthetic_repo(self.temp_dir / "upstream", 200, 4)
+        self.repo_url = f"file://{upstream}"
+        self.seed = self.temp_dir / "source" / "original" / "demo"
+        git(self.temp_dir, "clone", "-q", self.repo_url, str(self.seed))
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def assert_like_seed(self, clone: Path):
+        assert git(clone, "remote", "get-url", "origin") == self.repo_url
+        assert git(clone, "rev-parse", "HEAD") == git(self.seed, "rev-parse", "HEAD")
+        assert git(clone, "branch", "-r") == git(self.seed, "branch", "-r")
+        assert not (clone / ".git" / "objects" / "info" / "alternates").exists()
+        git(clone, "fsck", "--connectivity-only")
+
+    @pytest.mark.asyncio
+    async def test_hardlink_clone_shares_pack_files(self):
+        """Test that a hardlink clone tracks the remote and shares object files"""
+        target = self.temp_dir / "source" / "pre-edit" / "demo"
+
+        result = await self.git_service.clone_from_seed(
+            self.repo_url, self.seed, target, "hardlink"
+        )
+
+        assert result.is_success, result.error
+        self.assert_like_seed(target)
+        seed_inodes = {p.stat().st_ino for p in pack_files(self.seed)}
+        assert seed_inodes & {p.stat().st_ino for p in pack_files(target)}
+
+    @pytest.mark.asyncio
+    async def test_reference_clone_is_dissociated(self):
+        """Test that a --reference/--dissociate clone stands alone"""
+        target = self.temp_dir / "source" / "post-edit" / "demo"
+
+        result = await self.git_service.clone_from_seed(
+            self.repo_url, self.seed, target, "reference"
+        )
+
+        assert result.is_success, result.error
+        self.assert_like_seed(target)
+
+        shutil.rmtree(self.seed)
+        git(target, "fsck", "--connectivity-only")
+
+    @pytest.mark.asyncio
+    async def test_layout_is_found_as_two_layer_projects(self):
+        """Test that derived clones keep the folder layout projects are found by"""
+        for version in ("pre-edit", "post-edit", "correct-edit"):
+            result = await self.git_service.clone_from_seed(
+                self.repo_url,
+                self.seed,
+                self.temp_dir / "source" / version / "demo",
+            )
+            assert result.is_success
+
+        projects = ProjectService(
+            str(self.temp_dir / "source")
+        ).find_two_layer_projects()
+
+        assert sorted(p.parent for p in projects if p.name == "demo") == [
+            "correct-edit",
+            "original",
+            "post-edit",
+            "pre-edit",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_existing_target_and_unknown_strategy_are_rejected(self):
+        """Test that invalid requests fail without touching the filesystem"""
+        unknown = await self.git_service.clone_from_seed(
+            self.repo_url, self.seed, self.temp_dir / "x" / "demo", "copy"
+        )
+        existing = await self.git_service.clone_from_seed(
+            self.repo_url, self.seed, self.seed
+        )
+
+        assert unknown.is_error and not (self.temp_dir / "x").exists()
+        assert existing.is_error
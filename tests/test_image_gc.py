@@ -0,0 +1,202 @@
+"""
+Tests for the disk-budgeted garbage collection of project images.
+
+The docker CLI is patched and the Engine API is the fake server in
+tests/fake_docker_engine.py, so no Docker is needed.
+"""
+
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Add parent directory to path to import modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from config.config import get_config
+from services.docker_service import DockerService
+from services.image_gc import (
+    GIB,
+    ProjectImage,
+    format_gc_report,
+    image_gc,
+    plan_eviction,
+)
+from services.platform_service import PlatformService
+from services.warm_containers import warm_containers
+from tests.fake_docker_engine import FakeDockerEngine
+from utils import docker_engine
+
+
+class TestEvictionPlan:
+    """Test which images a collection removes"""
+
+    def test_least_recently_used_until_within_budget(self):
+        """Test LRU order, stopping at the budget and skipping protected images"""
+        images = [
+            ProjectImage("sha256:a", 4 * GIB, ["a:latest"], last_used=300.0),
+            ProjectImage("sha256:b", 3 * GIB, ["b:latest"], last_used=100.0),
+            ProjectImage("sha256:c", 2 * GIB, ["c:latest", "c2:latest"], 200.0),
+            ProjectImage("sha256:d", 1 * GIB, ["d:latest"], last_used=400.0),
+        ]
+
+        evict, skipped = plan_eviction(images, 6 * GIB)
+        assert [image.image_id for image in evict] == ["sha256:b", "sha256:c"]
+        assert skipped == []
+
+        evict, skipped = plan_eviction(images, 6 * GIB, protected=["c2"])
+        assert [image.image_id for image in evict] == ["sha256:b", "sha256:a"]
+        assert [image.image_id for image in skipped] == ["sha256:c"]
+
+        assert plan_eviction(images, 10 * GIB) == ([], [])
+
+
+class TestImageGarbageCollector:
+    """Test collections over the docker CLI and the Engine API"""
+
+    def setup_method(self):
+        self.store = image_gc.store
+        for tag, when in {
+            "old": 100.0,
+            "mid": 200.0,
+            "new": 300.0,
+            "gone": 50.0,
+        }.items():
+            self.store.touch(tag, when)
+        # Tag -> "image id, size" as `docker image inspect` prints them
+        self.cli_images = {
+            "old:latest": f"sha256:o {3 * GIB}",
+            "mid:latest": f"sha256:m {3 * GIB}",
+            "new:latest": f"sha256:n {3 * GIB}",
+        }
+        self.removed = []
+
+    async def fake_inspect(self, group, subkey, tag, **kwargs):
+        assert subkey == "image_size"
+        image = self.cli_images.get(tag)
+        return subprocess.CompletedProcess(
+            [], 0 if image else 1, stdout=image or "", stderr=""
+        )
+
+    async def fake_rmi(self, group, subkey, image_name, **kwargs):
+        assert subkey == "rmi"
+        self.removed.append(image_name)
+        return True, f"Untagged: {image_name}\n"
+
+    def patch_cli(self):
+        return patch.multiple(
+            PlatformService,
+            run_command_async=AsyncMock(side_effect=self.fake_inspect),
+            run_command_with_result_async=AsyncMock(side_effect=self.fake_rmi),
+        )
+
+    @pytest.mark.asyncio
+    async def test_collect_removes_least_recently_used(self):
+        """Test eviction over the CLI and forgetting tags whose image is gone"""
+        with self.patch_cli():
+            report = await image_gc.collect(budget_gb=4.0)
+
+        assert self.removed == ["old:latest", "mid:latest"]
+        assert report.total_bytes == 9 * GIB
+        assert report.freed_bytes == 6 * GIB
+        assert report.forgotten == ["gone:latest"]
+        assert list(self.store.last_used()) == ["new:latest"]
+        text = format_gc_report(report)
+        assert "Removed 2 least recently used tag(s), freed 6.00 GiB" in text
+
+    @pytest.mark.asyncio
+    async def test_images_in_use_are_kept(self):
+        """Test that leased tags and warm containers are never removed"""
+        warm = SimpleNamespace(docker_tag="mid")
+        with self.patch_cli(), patch.dict(warm_containers._containers, {"mid": warm}):
+            with image_gc.in_use("old"):
+                report = await image_gc.collect(budget_gb=4.0)
+
+        # Eviction moves on to the next least recently used image
+        assert self.removed == ["new:latest"]
+        assert report.protected == ["mid:latest", "old:latest"]
+        assert "Kept, in use" in format_gc_report(report)
+        # The lease recorded a fresh use of the tag
+        assert self.store.last_used()["old:latest"] > 300.0
+
+    @pytest.mark.asyncio
+    async def test_nested_leases_record_one_use(self):
+        """Test that only the outermost lease writes, off the event loop"""
+        loop_thread = threading.get_ident()
+        writers = []
+
+        def touch(tag, when=None):
+            writers.append((tag, threading.get_ident()))
+
+        with patch.object(self.store, "touch", side_effect=touch):
+            async with image_gc.in_use("demo"):
+                async with image_gc.in_use("demo"), image_gc.in_use("demo"):
+                    assert image_gc.protected_tags() == ["demo:latest"]
+                assert writers == [("demo:latest", writers[0][1])]
+
+        assert [tag for tag, _ in writers] == ["demo:latest", "demo:latest"]
+        assert all(thread != loop_thread for _, thread in writers)
+        assert image_gc.protected_tags() == []
+
+    @pytest.mark.skipif(
+        not hasattr(socket, "AF_UNIX"), reason="Unix sockets are not available"
+    )
+    @pytest.mark.asyncio
+    async def test_collect_over_engine_api(self):
+        """Test listing and removal through the Engine API, one size per image"""
+        temp_dir = Path(tempfile.mkdtemp(prefix="gc"))
+        engine = FakeDockerEngine(temp_dir / "docker.sock").__enter__()
+        engine.images.update(
+            {
+                "old:latest": "sha256:o",
+                "mid:latest": "sha256:o",  # Same image, two tags
+                "new:latest": "sha256:n",
+                "base:latest": "sha256:b",  # Not created by the tool
+            }
+        )
+        engine.sizes.update({"sha256:o": 3 * GIB, "sha256:n": 2 * GIB})
+        try:
+            with patch.object(
+                docker_engine, "socket_path_from_env", return_value=engine.socket_path
+            ):
+                report = await image_gc.collect(budget_gb=4.0)
+        finally:
+            docker_engine.get_engine_client(engine.socket_path).close()
+            engine.__exit__(None, None, None)
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        assert report.total_bytes == 5 * GIB
+        assert sorted(report.removed) == ["mid:latest", "old:latest"]
+        assert report.freed_bytes == 3 * GIB
+        assert set(engine.images) == {"new:latest", "base:latest"}
+
+    @pytest.mark.asyncio
+    async def test_test_runs_hold_a_lease(self, tmp_path):
+        """Test that a running test protects its image and records its use"""
+        project = tmp_path / "pre-edit" / "demo"
+        project.mkdir(parents=True)
+        (project / "run_tests.sh").write_text("#!/bin/sh\npytest\n")
+        leased_during_run = []
+
+        async def fake_run(*args, **kwargs):
+            leased_during_run.extend(image_gc.protected_tags())
+            return 0, "1 passed in 0.01s\n"
+
+        with patch.object(get_config().service, "warm_containers", False), patch.object(
+            PlatformService, "run_command_streaming_async", side_effect=fake_run
+        ):
+            await DockerService().run_docker_tests(project, "pre-edit_demo")
+
+        assert leased_during_run == ["pre-edit_demo:latest"]
+        assert image_gc.protected_tags() == []
+        assert "pre-edit_demo:latest" in self.store.last_used()
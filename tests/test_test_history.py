@@ -0,0 +1,208 @@
+"""
+Tests for the persistent test run history.
+
+Runs are recorded into a SQLite database in a temporary directory; Docker is
+not needed for the DockerService check, the test command is patched.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Add parent directory to path to import modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from services.docker_service import DockerService
+from services.platform_service import PlatformService
+from services.test_history import (
+    TestHistoryStore,
+    format_history_report,
+    get_test_history,
+)
+from services.test_result_parser import CaseResult, ResultSummary
+
+
+def summary(*cases):
+    """ResultSummary of (name, outcome, duration) tuples"""
+    results = [CaseResult(*case) for case in cases]
+    return ResultSummary(
+        framework="pytest",
+        passed=sum(case.outcome == "passed" for case in results),
+        failed=sum(case.outcome == "failed" for case in results),
+        cases=results,
+    )
+
+
+class TestHistoryRecording:
+    """Test recording, pruning and the reports of the history store"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.store = TestHistoryStore(
+            self.temp_dir / "history.sqlite3", max_runs_per_version=3
+        )
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def record(self, version, *cases, commit="abc", image="sha256:1"):
+        return self.store.record_run(
+            "demo",
+            version,
+            f"{version}_demo",
+            summary(*cases),
+            wall_seconds=2.0,
+            return_code=0,
+            commit_sha=commit,
+            image_id=image,
+        )
+
+    def test_runs_are_recorded_and_pruned(self):
+        """Test that only the newest runs of each version are kept"""
+        ids = [self.record("pre-edit", ("t::a", "passed", 0.1)) for _ in range(5)]
+        self.record("post-edit", ("t::a", "passed", 0.1))
+
+        runs = self.store.runs("demo", "pre-edit")
+        assert [run.id for run in runs] == ids[:1:-1]
+        assert runs[0].passed == 1 and runs[0].commit_sha == "abc"
+        assert len(self.store.runs("demo")) == 4
+
+        # Cases of pruned runs go with them
+        assert self.store.slowest_tests("demo", "pre-edit", window=50)[0].runs == 3
+
+    def test_slowest_uses_the_median_of_recent_runs(self):
+        """Test that a single outlier does not make a test the slowest"""
+        for duration in (0.2, 5.0, 0.3):
+            self.record(
+                "pre-edit",
+                ("t::a", "passed", duration),
+                ("t::b", "passed", 1),
+                ("t::c", "skipped", None),
+            )
+
+        timings = self.store.slowest_tests("demo", "pre-edit")
+
+        assert [(t.name, t.seconds, t.runs) for t in timings] == [
+            ("t::b", 1.0, 3),
+            ("t::a", 0.3, 3),
+        ]
+
+    def test_slower_tests_between_versions(self):
+        """Test the ratio and absolute thresholds for slowdowns"""
+        self.record(
+            "pre-edit",
+            ("t::slow", "passed", 0.5),
+            ("t::tiny", "passed", 0.001),
+            ("t::same", "passed", 1.0),
+            ("t::new_base", "passed", 0.1),
+            ("t::instant", "passed", 0.0),
+        )
+        self.record(
+            "post-edit",
+            ("t::slow", "passed", 1.5),
+            ("t::tiny", "passed", 0.01),
+            ("t::same", "passed", 1.05),
+            ("t::new", "passed", 9.0),
+            ("t::instant", "passed", 0.5),
+        )
+
+        slower = self.store.slower_tests("demo")
+
+        assert [(s.name, s.delta, s.ratio) for s in slower] == [
+            ("t::slow", 1.0, 3.0),
+            ("t::instant", 0.5, None),  # No ratio from 0.00s
+        ]
+
+    def test_flaky_tests_need_the_same_commit_and_image(self):
+        """Test that outcomes only count as flaky for an unchanged commit and image"""
+        self.record("pre-edit", ("t::a", "passed", 0.1), ("t::b", "passed", 0.1))
+        self.record("pre-edit", ("t::a", "failed", 0.1), ("t::b", "passed", 0.1))
+        self.record("pre-edit", ("t::a", "passed", 0.1))
+        self.record("post-edit", ("t::b", "passed", 0.1), commit="def")
+        self.record("post-edit", ("t::b", "failed", 0.1), commit="123")
+
+        flaky = self.store.flaky_tests("demo")
+
+        assert [(f.version, f.name, f.passes, f.failures) for f in flaky] == [
+            ("pre-edit", "t::a", 2, 1)
+        ]
+
+    def test_report_lists_each_section(self):
+        """Test the plain text report shown by the GUI"""
+        self.record("pre-edit", ("t::a", "passed", 0.5), ("t::b", "passed", 0.0))
+        self.record("post-edit", ("t::a", "passed", 2.0), ("t::b", "passed", 0.5))
+
+        report = format_history_report(
+            self.store, "demo", "pre-edit", ("post-edit", "alt")
+        )
+
+        assert "=== TEST HISTORY: demo ===" in report
+        assert "Slower in post-edit than in pre-edit:" in report
+        assert "(x4.0)  t::a" in report
+        assert "(x-)  t::b" in report  # From 0.00s
+        assert "Slower in alt than in pre-edit:\n   (none)" in report
+        assert "Flaky tests" in report
+
+    def test_empty_history_report(self):
+        """Test the report of a group without recorded runs"""
+        report = format_history_report(self.store, "missing")
+
+        assert "(no recorded runs)" in report
+        assert "(no timings recorded)" in report
+
+
+class TestHistoryFromDockerTests:
+    """Test that DockerService records test runs"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.project = self.temp_dir / "pre-edit" / "demo"
+        self.project.mkdir(parents=True)
+        (self.project / "run_tests.sh").write_text("#!/bin/sh\npytest -v\n")
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @pytest.mark.asyncio
+    async def test_docker_test_run_is_recorded(self):
+        """Test the recorded version, commit, image and per-test durations"""
+        output = (
+            "tests/test_a.py::test_one PASSED\n"
+            "tests/test_a.py::test_two FAILED\n"
+            "0.40s call     tests/test_a.py::test_two\n"
+            "========== 1 failed, 1 passed in 0.50s ==========\n"
+        )
+        docker_service = DockerService()
+
+        with patch.object(
+            PlatformService,
+            "run_command_streaming_async",
+            AsyncMock(return_value=(1, output)),
+        ), patch.object(
+            docker_service, "_head_commit", AsyncMock(return_value="c0ffee")
+        ), patch.object(
+            docker_service, "_image_id", AsyncMock(return_value="sha256:2")
+        ):
+            result = await docker_service.run_docker_tests(
+                self.project, "pre-edit_demo"
+            )
+
+        assert result.is_partial
+        run = get_test_history().runs("demo", "pre-edit")[0]
+        assert (run.docker_tag, run.commit_sha, run.image_id) == (
+            "pre-edit_demo",
+            "c0ffee",
+            "sha256:2",
+        )
+        assert (run.passed, run.failed, run.return_code) == (1, 1, 1)
+        slowest = get_test_history().slowest_tests("demo")
+        assert [(t.name, t.seconds) for t in slowest] == [
+            ("tests/test_a.py::test_two", 0.4)
+        ]
@@ -0,0 +1,289 @@
+"""
+Tests for the streaming test result parsers.
+
+The samples are trimmed console output of each runner as run by the default
+run_tests.sh scripts.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path to import modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from services.test_result_parser import (
+    TestResultCollector,
+    framework_for_script,
+    parse_test_output,
+    run_status,
+)
+
+PYTEST_OUTPUT = """\
+============================= test session starts ==============================
+platform linux -- Python 3.13.2, pytest-8.3.5, pluggy-1.5.0 -- /usr/local/bin/python
+collected 5 items
+
+tests/test_auth.py::test_failed_login PASSED                             [ 20%]
+tests/test_auth.py::test_login_error_message PASSED                      [ 40%]
+tests/test_auth.py::test_lockout printing from the test
+FAILED                                                                   [ 60%]
+tests/test_auth.py::test_param[a b] SKIPPED (needs network)              [ 80%]
+tests/test_auth.py::test_legacy XFAIL                                    [100%]
+
+=================================== FAILURES ===================================
+_________________________________ test_lockout _________________________________
+E       assert 'passed' == 'failed'
+============================= slowest 3 durations ==============================
+1.50s call     tests/test_auth.py::test_lockout
+0.20s setup    tests/test_auth.py::test_lockout
+0.01s call     tests/test_auth.py::test_failed_login
+=========================== short test summary info ============================
+FAILED tests/test_auth.py::test_lockout - assert 'passed' == 'failed'
+============== 1 failed, 2 passed, 1 skipped, 1 xfailed in 2.04s ===============
+"""
+
+JEST_OUTPUT = """\
+> demo@1.0.0 test
+> jest
+
+PASS src/sum.test.js
+  sum
+    ✓ adds 1 + 2 (3 ms)
+    ✓ handles failed input
+FAIL src/api.test.js
+  api
+    ✕ returns data (1204 ms)
+    ○ skipped retries
+    ✎ todo pagination
+
+Test Suites: 1 failed, 1 passed, 2 total
+Tests:       1 failed, 1 skipped, 1 todo, 2 passed, 5 total
+Snapshots:   0 total
+Time:        2.315 s
+"""
+
+CARGO_OUTPUT = """\
+   Compiling demo v0.1.0 (/app)
+     Running unittests src/lib.rs (target/debug/deps/demo-1a2b)
+
+running 3 tests
+test tests::adds ... ok
+test tests::rejects_failed_input ... FAILED
+test tests::slow ... ignored, takes a minute
+
+test result: FAILED. 1 passed; 1 failed; 1 ignored; 0 measured; 0 filtered out; finished in 0.01s
+
+   Doc-tests demo
+
+running 1 test
+test src/lib.rs - add (line 5) ... ok
+
+test result: ok. 1 passed; 0 failed; 0 ignored; 0 measured; 0 filtered out; finished in 0.25s
+"""
+
+GO_OUTPUT = """\
+=== RUN   TestAdd
+--- PASS: TestAdd (0.00s)
+=== RUN   TestTable
+=== RUN   TestTable/failed_case
+    table_test.go:12: got 1, want 2
+    --- FAIL: TestTable/failed_case (0.02s)
+--- FAIL: TestTable (0.03s)
+FAIL
+FAIL\texample.com/demo/calc\t0.041s
+ok  \texample.com/demo/util\t(cached)
+?   \texample.com/demo/cmd\t[no test files]
+"""
+
+DOTNET_OUTPUT = """\
+  Determining projects to restore...
+Starting test execution, please wait...
+A total of 1 test files matched the specified pattern.
+  Failed Demo.Tests.CalculatorTests.Divide_ByZero [12 ms]
+  Error Message:
+   Assert.Equal() Failure
+  Passed Demo.Tests.CalculatorTests.Add [1 s 204 ms]
+  Skipped Demo.Tests.CalculatorTests.Slow
+
+Failed!  - Failed:     1, Passed:     5, Skipped:     1, Total:     7, Duration: 1 s 320 ms - Demo.Tests.dll (net8.0)
+"""
+
+SUREFIRE_OUTPUT = """\
+[INFO] -------------------------------------------------------
+[INFO]  T E S T S
+[INFO] -------------------------------------------------------
+[INFO] Running com.example.AppTest
+[ERROR] Tests run: 3, Failures: 1, Errors: 0, Skipped: 1, Time elapsed: 0.052 s <<< FAILURE! -- in com.example.AppTest
+[ERROR] com.example.AppTest.testFailedLogin -- Time elapsed: 0.011 s <<< FAILURE!
+org.opentest4j.AssertionFailedError: expected: <true> but was: <false>
+[INFO] Running com.example.UtilTest
+[INFO] Tests run: 2, Failures: 0, Errors: 0, Skipped: 0, Time elapsed: 0.004 s -- in com.example.UtilTest
+[INFO]
+[INFO] Results:
+[INFO]
+[ERROR] Failures:
+[ERROR]   AppTest.testFailedLogin:14 expected: <true> but was: <false>
+[INFO]
+[ERROR] Tests run: 5, Failures: 1, Errors: 0, Skipped: 1
+"""
+
+CTEST_OUTPUT = """\
+-- Build files have been written to: /app/build
+[100%] Built target calc_tests
+UpdateCTestConfiguration  from :/app/build/DartConfiguration.tcl
+test 1
+    Start 1: test_add
+1: Test command: /app/build/calc_tests "add"
+1/3 Test #1: test_add .........................   Passed    0.01 sec
+2/3 Test #2: test_divide ......................***Failed    0.25 sec
+3/3 Test #3: test_slow ........................***Not Run (Disabled)   0.00 sec
+
+50% tests passed, 1 tests failed out of 2
+
+Total Test time (real) =   0.27 sec
+"""
+
+
+def counts(summary):
+    return (summary.passed, summary.failed, summary.errors, summary.skipped)
+
+
+class TestRunnerParsers:
+    """Test each runner's output through the auto-detecting collector"""
+
+    def test_pytest(self):
+        """Test verbose lines, output between name and status and durations"""
+        summary = parse_test_output(PYTEST_OUTPUT)
+
+        assert summary.framework == "pytest"
+        assert counts(summary) == (2, 1, 0, 2)
+        assert summary.duration == 2.04
+        cases = {case.name: case for case in summary.cases}
+        assert cases["tests/test_auth.py::test_failed_login"].outcome == "passed"
+        assert cases["tests/test_auth.py::test_lockout"].outcome == "failed"
+        assert cases["tests/test_auth.py::test_lockout"].duration == 1.7
+        assert cases["tests/test_auth.py::test_param[a b]"].outcome == "skipped"
+        assert len(summary.cases) == 5
+        assert run_status(summary, 1) == "COMPLETED (Some Tests Failed)"
+
+    def test_jest(self):
+        """Test check marks per file and the Tests: summary line"""
+        summary = parse_test_output(JEST_OUTPUT)
+
+        assert summary.framework == "jest"
+        assert counts(summary) == (2, 1, 0, 2)
+        assert summary.cases[0] == ("src/sum.test.js › adds 1 + 2", "passed", 0.003)
+        assert summary.cases[2] == ("src/api.test.js › returns data", "failed", 1.204)
+        assert summary.cases[3].name == "src/api.test.js › retries"
+        assert summary.duration == 2.315
+
+    def test_cargo(self):
+        """Test that unit and doc test results are summed"""
+        summary = parse_test_output(CARGO_OUTPUT)
+
+        assert summary.framework == "cargo"
+        assert counts(summary) == (2, 1, 0, 1)
+        assert [case.outcome for case in summary.cases] == [
+            "passed",
+            "failed",
+            "skipped",
+            "passed",
+        ]
+        assert summary.cases[3].name == "src/lib.rs - add (line 5)"
+        assert summary.duration == pytest.approx(0.26)
+
+    def test_go(self):
+        """Test subtests with -v and packages whose tests were not listed"""
+        summary = parse_test_output(GO_OUTPUT)
+
+        assert summary.framework == "go"
+        assert counts(summary) == (2, 2, 0, 1)
+        assert summary.cases[1] == (
+            "example.com/demo/calc.TestTable/failed_case",
+            "failed",
+            0.02,
+        )
+        assert summary.cases[3] == ("example.com/demo/util", "passed", None)
+
+    def test_dotnet(self):
+        """Test the assembly summary and dotnet's duration format"""
+        summary = parse_test_output(DOTNET_OUTPUT)
+
+        assert summary.framework == "dotnet"
+        assert counts(summary) == (5, 1, 0, 1)
+        assert summary.cases[0] == (
+            "Demo.Tests.CalculatorTests.Divide_ByZero",
+            "failed",
+            0.012,
+        )
+        assert summary.cases[1].duration == 1.204
+        assert summary.duration == 1.32
+
+    def test_surefire(self):
+        """Test the module total and per-test failure lines"""
+        summary = parse_test_output(SUREFIRE_OUTPUT)
+
+        assert summary.framework == "surefire"
+        assert counts(summary) == (3, 1, 0, 1)
+        assert summary.cases == [
+            ("com.example.AppTest.testFailedLogin", "failed", 0.011)
+        ]
+        assert summary.duration == pytest.approx(0.056)
+
+    def test_ctest(self):
+        """Test result lines after a build log and disabled tests"""
+        summary = parse_test_output(CTEST_OUTPUT)
+
+        assert summary.framework == "ctest"
+        assert counts(summary) == (1, 1, 0, 1)
+        assert summary.slowest(1)[0] == ("test_divide", "failed", 0.25)
+        assert summary.duration == 0.27
+
+
+class TestStreamingCollector:
+    """Test streaming, framework hints and statuses"""
+
+    @pytest.mark.parametrize("size", [1, 7, 64, 4096])
+    def test_chunk_boundaries_do_not_matter(self, size):
+        """Test that output split anywhere parses the same as in one piece"""
+        for output in (PYTEST_OUTPUT, JEST_OUTPUT, GO_OUTPUT, CTEST_OUTPUT):
+            collector = TestResultCollector()
+            for start in range(0, len(output), size):
+                collector.feed(output[start : start + size])
+            assert collector.close() == parse_test_output(output)
+
+    def test_script_hint_picks_the_parser(self):
+        """Test runner detection from run_tests.sh and its effect"""
+        scripts = {
+            "pytest -vv -s tests/": "pytest",
+            "export CI=true\nnpm run build\nnpm test ${@}": "jest",
+            'cargo test "$@"': "cargo",
+            'go test "${@:-./...}"': "go",
+            'dotnet test "${@}"': "dotnet",
+            "mvn \\\n    --batch-mode compile test": "surefire",
+            "mkdir -p build && cd build && cmake .. && make\nctest --verbose": "ctest",
+            "./custom_runner": None,
+        }
+        for script, framework in scripts.items():
+            assert framework_for_script(script) == framework
+
+        # C++ build noise such as "std::vector" is not mistaken for pytest
+        collector = TestResultCollector("ctest")
+        collector.feed("src/calc.cpp:3: warning: std::vector::at unused\n")
+        collector.feed(CTEST_OUTPUT)
+        assert collector.close().framework == "ctest"
+
+    def test_colored_output_and_unrecognised_logs(self):
+        """Test ANSI colour codes and output from no known runner"""
+        colored = "\x1b[32mtest tests::adds ... \x1b[32mok\x1b[0m\r\n"
+        summary = parse_test_output("running 1 test\n" + colored)
+        assert counts(summary) == (1, 0, 0, 0)
+
+        unknown = parse_test_output("all tests passed, none failed\n")
+        assert not unknown.recognised
+        assert run_status(unknown, 0) == "COMPLETED (No Output)"
+        assert run_status(unknown, 2) == "FAILED TO RUN"
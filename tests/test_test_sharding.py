@@ -0,0 +1,226 @@
+"""
+Tests for running a test suite split over several containers.
+
+The docker command is patched; each shard's output is made up from the test
+files in its command, so no Docker is needed.
+"""
+
+import os
+import re
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Add parent directory to path to import modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from config.config import get_config
+from services.docker_service import DockerService
+from services.platform_service import PlatformService
+from services.test_history import get_test_history
+from services.test_result_parser import CaseResult, ResultSummary
+from services.test_sharding import (
+    discover_test_files,
+    merge_summaries,
+    plan_shards,
+    shard_command,
+)
+from utils.async_base import ServiceResult
+
+
+def write_files(root: Path, files: dict):
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+class TestShardPlanning:
+    """Test file discovery, balancing and merging of shard results"""
+
+    def test_discovery_matches_the_edit_window(self, tmp_path):
+        """Test language directories and patterns, relative sorted paths"""
+        write_files(
+            tmp_path,
+            {
+                "tests/test_b.py": "",
+                "tests/unit/a_test.py": "",
+                "tests/helpers.py": "",
+                "test_root.py": "",
+                "src/app.test.js": "",
+            },
+        )
+
+        assert discover_test_files(tmp_path, "python") == [
+            "tests/test_b.py",
+            "tests/unit/a_test.py",
+        ]
+        assert discover_test_files(tmp_path, "javascript") == ["src/app.test.js"]
+
+    def test_longest_files_are_spread_first(self):
+        """Test that recorded durations balance the shards"""
+        durations = {"a.py": 10.0, "b.py": 6.0, "c.py": 5.0, "d.py": 4.0}
+
+        shards = plan_shards(["a.py", "b.py", "c.py", "d.py"], 2, durations)
+
+        assert [shard.files for shard in shards] == [["a.py", "d.py"], ["b.py", "c.py"]]
+        assert [shard.estimated_seconds for shard in shards] == [14.0, 11.0]
+
+    def test_files_without_timings_and_small_suites(self):
+        """Test the median estimate and no more shards than files"""
+        shards = plan_shards(["a.py", "b.py", "new.py"], 2, {"a.py": 2.0, "b.py": 4.0})
+        assert [shard.files for shard in shards] == [["b.py"], ["a.py", "new.py"]]
+        assert shards[1].estimated_seconds == 5.0
+
+        assert len(plan_shards(["a.py"], 8)) == 1
+        assert plan_shards([], 4) == []
+
+    def test_shard_command_and_merge(self):
+        """Test the per-shard command and one summary for all shards"""
+        assert shard_command("python", ["tests/test_a.py", "tests/my test.py"]) == (
+            "pytest -vv -s tests/test_a.py 'tests/my test.py' --durations=0"
+        )
+        first = ResultSummary(
+            "pytest", passed=2, duration=3.0, cases=[CaseResult("a", "passed", 1.0)]
+        )
+        second = ResultSummary(
+            "pytest",
+            failed=1,
+            skipped=1,
+            duration=5.0,
+            cases=[CaseResult("b", "failed")],
+        )
+
+        merged = merge_summaries([first, second, ResultSummary()])
+
+        assert (merged.passed, merged.failed, merged.skipped) == (2, 1, 1)
+        assert merged.duration == 5.0
+        assert [case.name for case in merged.cases] == ["a", "b"]
+
+
+def shard_output(command: str) -> str:
+    """pytest output for the test files named in a shard's command"""
+    files = re.findall(r"tests/test_\w+\.py", command)
+    lines = [f"{path}::test_it PASSED" for path in files if "fail" not in path]
+    lines += [f"{path}::test_it FAILED" for path in files if "fail" in path]
+    failed = sum("fail" in path for path in files)
+    lines += [f"0.02s call     {path}::test_it" for path in files]
+    counts = f"{len(files) - failed} passed" + (f", {failed} failed" if failed else "")
+    return "\n".join(lines + [f"===== {counts} in 0.10s ====="]) + "\n"
+
+
+class TestShardedDockerTests:
+    """Test DockerService running shards side by side and merging them"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.project = self.temp_dir / "pre-edit" / "demo"
+        write_files(
+            self.project,
+            {
+                "run_tests.sh": "#!/bin/sh\npytest -vv -s tests/\n",
+                "app.py": "",
+                **{f"tests/test_{name}.py": "" for name in "abcd"},
+                "tests/test_fail.py": "",
+            },
+        )
+        self.docker_service = DockerService()
+        self.commands = []
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    async def fake_run(self, *args, command, output_callback=None, **kwargs):
+        self.commands.append(command)
+        output = shard_output(command)
+        if output_callback:
+            output_callback(output)
+        return (1 if "FAILED" in output else 0), output
+
+    @pytest.mark.asyncio
+    async def test_shards_run_in_parallel_and_merge(self):
+        """Test one container per shard, prefixed output and a merged report"""
+        streamed = []
+        with patch.object(
+            PlatformService, "run_command_streaming_async", side_effect=self.fake_run
+        ):
+            result = await self.docker_service.run_sharded_tests(
+                self.project, "pre-edit_demo", 2, progress_callback=streamed.append
+            )
+
+        assert result.is_partial
+        assert len(self.commands) == 2
+        assert all(
+            command.startswith("docker run --rm pre-edit_demo sh -c 'pytest -vv -s ")
+            for command in self.commands
+        )
+        run_files = sorted(re.findall(r"tests/test_\w+\.py", " ".join(self.commands)))
+        assert run_files == discover_test_files(self.project, "python")
+
+        data = result.data
+        assert data["return_code"] == 1
+        assert (data["summary"]["passed"], data["summary"]["failed"]) == (4, 1)
+        assert len(data["summary"]["cases"]) == 5
+        assert [shard["index"] for shard in data["shards"]] == [1, 2]
+        assert "=== shard 2/2:" in data["raw_output"]
+        output = "".join(streamed)
+        assert "Running 2 test shards in parallel" in output
+        assert "[shard 1/2] tests/" in output and "[shard 2/2] tests/" in output
+
+        # The merged run is recorded once, with per-file timings for the next plan
+        history = get_test_history()
+        assert len(history.runs("demo", "pre-edit")) == 1
+        assert history.file_durations("demo", "pre-edit") == dict.fromkeys(
+            run_files, 0.02
+        )
+
+    @pytest.mark.asyncio
+    async def test_build_and_test_uses_shards_when_enabled(self):
+        """Test the config switch and the automatic shard count"""
+        build = AsyncMock(return_value=ServiceResult.success("pre-edit_demo"))
+        service_config = get_config().service
+
+        with patch.object(service_config, "test_sharding", True), patch.object(
+            service_config, "test_shard_cpu_fraction", 1.0
+        ), patch("services.test_sharding.os.cpu_count", return_value=3), patch.object(
+            self.docker_service, "build_docker_image", build
+        ), patch.object(
+            PlatformService, "run_command_streaming_async", side_effect=self.fake_run
+        ):
+            result = await self.docker_service.build_and_test(
+                self.project, "pre-edit_demo"
+            )
+
+        assert result.is_partial
+        assert len(self.commands) == 3
+        assert len(result.data["test_data"]["shards"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_unsplittable_suites_run_once(self):
+        """Test the fallback to one run for other languages"""
+        go_project = self.temp_dir / "pre-edit" / "go-demo"
+        write_files(
+            go_project,
+            {"run_tests.sh": "#!/bin/sh\ngo test ./...\n", "main_test.go": ""},
+        )
+        cli = AsyncMock(return_value=(0, "ok  \tdemo\t0.01s\n"))
+        streamed = []
+
+        with patch.object(PlatformService, "run_command_streaming_async", cli):
+            result = await self.docker_service.run_sharded_tests(
+                go_project, "pre-edit_go-demo", 4, progress_callback=streamed.append
+            )
+
+        assert result.is_success
+        assert re.fullmatch(
+            r"docker run --rm --name docker-tools-test-\w+ pre-edit_go-demo "
+            r"\./run_tests\.sh",
+            cli.call_args.kwargs["command"],
+        )
+        assert "Not sharding the tests: go test commands" in "".join(streamed)
@@ -0,0 +1,271 @@
+"""
+Tests for warm test containers.
+
+A fake `docker` on PATH keeps each container's file system in a folder, so
+starting, syncing, exec and removal run real processes without Docker.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Add parent directory to path to import modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from config.config import get_config
+from services.docker_service import DockerService
+from services.platform_service import PlatformService
+from services.warm_containers import (
+    WarmContainerPool,
+    container_name,
+    dockerfile_copy_plan,
+)
+from utils.async_base import ServiceResult
+
+DEFAULTS_DIR = Path(parent_dir) / "defaults"
+
+FAKE_DOCKER = f"""#!{sys.executable}
+import os, shutil, subprocess, sys
+from pathlib import Path
+
+root = Path(os.environ["FAKE_DOCKER_ROOT"])
+with open(root / "calls.log", "a") as log:
+    log.write(" ".join(sys.argv[1:]) + "\\n")
+args = sys.argv[1:]
+containers = root / "containers"
+
+def container(name):
+    return containers / name
+
+if args[:2] == ["image", "inspect"]:
+    image = root / "images" / args[-1]
+    sys.exit(print(image.read_text()) if image.exists() else 1)
+if args[0] == "run":
+    name, tag = args[args.index("--name") + 1], args[-3]
+    shutil.copytree(root / "image_files" / tag, container(name) / "app")
+    print(name)
+elif args[0] == "inspect":
+    if not container(args[-1]).exists():
+        sys.exit(1)
+    print("true" if "Running" in args[2] else "/app")
+elif args[0] == "cp":
+    name, path = args[2].split(":", 1)
+    target = container(name) / path.lstrip("/")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy(args[1], target)
+elif args[0] == "exec":
+    cwd = container(args[1])
+    command = args[-1].replace(" /", " " + str(cwd) + "/")
+    sys.exit(subprocess.run(command, shell=True, cwd=cwd).returncode)
+elif args[0] == "rm":
+    shutil.rmtree(container(args[-1]), ignore_errors=True)
+"""
+
+
+def write_files(root: Path, files: dict):
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+class TestDockerfileCopyPlan:
+    """Test which context files a Dockerfile uses before copying everything"""
+
+    def test_default_python_dockerfile(self):
+        """Test the whole-context copy and the requirement files"""
+        plan = dockerfile_copy_plan(DEFAULTS_DIR / "python")
+
+        assert plan.copies_context
+        assert "requirements.txt" in plan.build_inputs
+        assert "tests/requirements.tx[t]" in plan.build_inputs
+
+    def test_context_copied_elsewhere(self, tmp_path):
+        """Test that a copy outside the WORKDIR or from a stage does not count"""
+        write_files(
+            tmp_path,
+            {
+                "a/Dockerfile": "FROM alpine\nWORKDIR /app\nCOPY . /src\n",
+                "b/Dockerfile": "FROM alpine AS b\nCOPY --from=b . .\n",
+                "c/Dockerfile": "FROM alpine\nWORKDIR /srv\nWORKDIR app\nCOPY --chown=1 ./ /srv/app\n",
+            },
+        )
+
+        assert not dockerfile_copy_plan(tmp_path / "a").copies_context
+        assert dockerfile_copy_plan(tmp_path / "a").build_inputs == ["."]
+        assert not dockerfile_copy_plan(tmp_path / "b").copies_context
+        assert dockerfile_copy_plan(tmp_path / "c").copies_context
+        assert not dockerfile_copy_plan(tmp_path / "missing").copies_context
+
+
+class FakeDockerTest:
+    """Fake docker on PATH and a python project whose image holds its files"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.root = self.temp_dir / "docker"
+        self.project = self.temp_dir / "pre-edit" / "demo"
+        write_files(
+            self.project,
+            {
+                "Dockerfile": (DEFAULTS_DIR / "python" / "Dockerfile").read_text(),
+                "requirements.txt": "requests\n",
+                "run_tests.sh": "#!/bin/sh\npytest\n",
+                "tests/test_a.py": "def test_a(): pass\n",
+                "tests/test_old.py": "def test_old(): pass\n",
+            },
+        )
+        write_files(self.root, {"calls.log": ""})
+        write_files(self.temp_dir / "bin", {"docker": FAKE_DOCKER})
+        (self.temp_dir / "bin" / "docker").chmod(0o755)
+        self.image("pre-edit_demo", "sha256:1")
+
+        self.patches = [
+            patch.dict(
+                os.environ,
+                {
+                    "FAKE_DOCKER_ROOT": str(self.root),
+                    "PATH": f"{self.temp_dir / 'bin'}{os.pathsep}{os.environ['PATH']}",
+                },
+            ),
+            patch.object(
+                get_config().service, "build_record_dir", str(self.temp_dir / "r")
+            ),
+        ]
+        for active in self.patches:
+            active.start()
+
+    def teardown_method(self):
+        for active in self.patches:
+            active.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def image(self, tag, image_id):
+        """Tag an image holding the project's current files"""
+        shutil.rmtree(self.root / "image_files" / tag, ignore_errors=True)
+        shutil.copytree(self.project, self.root / "image_files" / tag)
+        write_files(self.root, {f"images/{tag}": image_id})
+
+    def in_container(self, rel_path, tag="pre-edit_demo"):
+        return self.root / "containers" / container_name(tag) / "app" / rel_path
+
+    def calls(self, command):
+        lines = (self.root / "calls.log").read_text().splitlines()
+        return [line for line in lines if line.startswith(command)]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Fake docker needs a shebang")
+class TestWarmContainerPool(FakeDockerTest):
+    """Test starting, syncing, replacing and reaping warm containers"""
+
+    def setup_method(self):
+        super().setup_method()
+        self.pool = WarmContainerPool(idle_timeout=60.0)
+
+    async def session(self):
+        messages = []
+        async with self.pool.session(
+            self.project, "pre-edit_demo", messages.append
+        ) as container:
+            return container, "".join(messages)
+
+    @pytest.mark.asyncio
+    async def test_changed_test_files_are_synced(self):
+        """Test that edits reach the running container without restarting it"""
+        first, messages = await self.session()
+        assert "Started warm container" in messages
+        assert first.exec_command() == (
+            f"docker exec {container_name('pre-edit_demo')} ./run_tests.sh"
+        )
+
+        (self.project / "tests" / "test_a.py").write_text("def test_a(): 1\n")
+        (self.project / "tests" / "test_b.py").write_text("def test_b(): pass\n")
+        (self.project / "tests" / "test_old.py").unlink()
+        second, messages = await self.session()
+
+        assert second is first and second.runs == 2
+        assert "Synced 2 changed and 1 deleted file(s)" in messages
+        assert self.in_container("tests/test_a.py").read_text() == "def test_a(): 1\n"
+        assert self.in_container("tests/test_b.py").exists()
+        assert not self.in_container("tests/test_old.py").exists()
+        assert len(self.calls("run")) == 1
+
+        await self.pool.stop_all()
+        assert not self.in_container("").exists()
+
+    @pytest.mark.asyncio
+    async def test_build_inputs_and_rebuilt_images(self):
+        """Test that dependency changes are not synced and a new image restarts"""
+        container, _ = await self.session()
+        (self.project / "requirements.txt").write_text("requests\nflask\n")
+
+        assert await self.pool.reuse(self.project, "pre-edit_demo") is None
+        same, messages = await self.session()
+        assert same is container and "Synced" not in messages
+        assert self.in_container("requirements.txt").read_text() == "requests\n"
+
+        self.image("pre-edit_demo", "sha256:2")
+        rebuilt, messages = await self.session()
+        assert rebuilt is not container and rebuilt.image_id == "sha256:2"
+        assert "Started warm container" in messages
+        assert "flask" in self.in_container("requirements.txt").read_text()
+        await self.pool.stop_all()
+
+    @pytest.mark.asyncio
+    async def test_idle_containers_are_reaped(self):
+        """Test that only containers unused for the idle timeout are removed"""
+        container, _ = await self.session()
+
+        assert await self.pool.reap_idle(now=container.last_used + 30) == []
+        reaped = await self.pool.reap_idle(now=container.last_used + 61)
+
+        assert reaped == [container.name]
+        assert self.pool.containers == []
+        assert not self.in_container("").exists()
+        await self.pool.stop_all()  # Ends the reaper task
+
+    @pytest.mark.asyncio
+    async def test_no_image_means_no_container(self):
+        """Test that a missing image yields no container, for a cold run"""
+        async with self.pool.session(self.project, "other_tag") as container:
+            assert container is None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Fake docker needs a shebang")
+class TestWarmBuildAndTest(FakeDockerTest):
+    """Test that DockerService runs tests in the warm container"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_runs_skip_build_and_exec(self):
+        """Test build skipping and docker exec once the container is warm"""
+        docker_service = DockerService()
+        tests = AsyncMock(return_value=(0, "1 passed in 0.01s\n"))
+        build = AsyncMock(return_value=ServiceResult.success("pre-edit_demo"))
+
+        with patch.object(get_config().service, "warm_containers", True), patch.object(
+            PlatformService, "run_command_streaming_async", tests
+        ), patch.object(docker_service, "build_docker_image", build), patch(
+            "services.docker_service.warm_containers", WarmContainerPool()
+        ) as pool:
+            first = await docker_service.build_and_test(self.project, "pre-edit_demo")
+            (self.project / "tests" / "test_a.py").write_text("def test_a(): 2\n")
+            second = await docker_service.build_and_test(self.project, "pre-edit_demo")
+            synced = self.in_container("tests/test_a.py").read_text()
+            await pool.stop_all()
+
+        assert first.is_success and second.is_success
+        assert build.await_count == 1
+        commands = [call.kwargs["command"] for call in tests.call_args_list]
+        assert (
+            commands
+            == [f"docker exec {container_name('pre-edit_demo')} ./run_tests.sh"] * 2
+        )
+        assert synced == "def test_a(): 2\n"
+        assert second.data["build_data"] == "pre-edit_demo"
@@ -24,6 +24,8 @@ from services.web_integration_service import WebIntegration
 from services.project_group_service import ProjectGroupService
 from models.project import Project
 from models.web_terminal_buffer import WebTerminalBuffer
+from services.test_history import TestHistoryStore
+from services.test_result_parser import TestResultStore, parse_test_output
 
 
 class TestWebIntegrationProjectSelectionSync:
@@ -437,6 +439,98 @@ class TestWebIntegrationActionExecution:
                 "test_group"
             )
 
+    def test_web_docker_build_all_action_calls_same_method_as_desktop(self):
+        """Test that web build and test all action calls the same method as desktop button."""
+        self.mock_control_panel.docker_build_and_test_all = Mock()
+
+        mock_group = Mock()
+        mock_group.name = "test_group"
+        self.mock_project_group_service.set_current_group_by_name.return_value = True
+        self.mock_project_group_service.get_current_group.return_value = mock_group
+
+        with self.web_integration.app.test_client() as client:
+            response = client.post(
+                "/api/action/docker-build-all",
+                json={"group_name": "test_group"},
+                content_type="application/json",
+            )
+
+            assert response.status_code == 200
+            data = json.loads(response.data)
+            assert data["success"] is True
+            assert "Build and test of all versions initiated" in data["message"]
+
+            self.mock_control_panel.docker_build_and_test_all.assert_called_once_with(
+                mock_group
+            )
+
+    def test_web_test_results_report_parsed_counts_and_timings(self):
+        """Test the test result endpoints serve the latest parsed runs"""
+        store = TestResultStore()
+        store.record(
+            "pre-edit_demo",
+            parse_test_output(
+                "tests/test_a.py::test_one PASSED\n"
+                "tests/test_a.py::test_two FAILED\n"
+                "0.25s call     tests/test_a.py::test_two\n"
+                "===== 1 passed, 1 failed in 0.31s =====\n"
+            ),
+        )
+
+        with patch(
+            "services.web_integration_service.latest_test_results", store
+        ), self.web_integration.app.test_client() as client:
+            listing = json.loads(client.get("/api/test-results").data)
+            detail = json.loads(client.get("/api/test-results/pre-edit_demo").data)
+            missing = json.loads(client.get("/api/test-results/other").data)
+
+        assert listing["results"]["pre-edit_demo"]["failed"] == 1
+        assert "cases" not in listing["results"]["pre-edit_demo"]
+        assert detail["result"]["cases"] == [
+            ["tests/test_a.py::test_one", "passed", None],
+            ["tests/test_a.py::test_two", "failed", 0.25],
+        ]
+        assert missing["success"] is False
+
+    def test_web_test_history_reports(self):
+        """Test the recorded run, slowest and slower test endpoints"""
+        store = TestHistoryStore(Path(self.temp_dir) / "history.sqlite3")
+        for version, duration, instant in (
+            ("pre-edit", 0.25, 0.0),
+            ("post-edit", 1.0, 0.5),
+        ):
+            store.record_run(
+                "demo",
+                version,
+                f"{version}_demo",
+                parse_test_output(
+                    "tests/test_a.py::test_two PASSED\n"
+                    "tests/test_a.py::test_three PASSED\n"
+                    f"{duration}s call     tests/test_a.py::test_two\n"
+                    f"{instant:.2f}s call     tests/test_a.py::test_three\n"
+                ),
+                wall_seconds=3.0,
+            )
+
+        with patch(
+            "services.web_integration_service.get_test_history", return_value=store
+        ), self.web_integration.app.test_client() as client:
+            runs = json.loads(client.get("/api/test-history/demo/runs").data)
+            slowest = json.loads(
+                client.get("/api/test-history/demo/slowest?version=pre-edit").data
+            )
+            slower = json.loads(client.get("/api/test-history/demo/slower").data)
+            unknown = json.loads(client.get("/api/test-history/demo/other").data)
+
+        assert [run["version"] for run in runs["rows"]] == ["post-edit", "pre-edit"]
+        assert slowest["rows"][0]["seconds"] == 0.25
+        ratios = {row["name"]: row["ratio"] for row in slower["rows"]}
+        assert ratios == {
+            "tests/test_a.py::test_two": 4.0,
+            "tests/test_a.py::test_three": None,  # From 0.00s
+        }
+        assert unknown["success"] is False
+
     def test_web_refresh_action_calls_same_method_as_desktop(self):
         """Test that web refresh action calls the same method as desktop button."""
         # Mock the control panel's refresh method
@@ -647,6 +741,88 @@ class TestWebIntegrationTerminalStreaming:
         assert len(content) <= 50000
         assert content == large_text[-50000:]
 
+    def test_terminal_buffer_limit_is_in_bytes(self):
+        """Test that the buffer limit counts UTF-8 bytes, not characters."""
+        buffer = WebTerminalBuffer(max_bytes=100)
+
+        for _ in range(20):
+            buffer.append("✅✅✅✅✅\n")  # 16 bytes, 6 characters
+
+        assert buffer.size_bytes <= 100
+        assert len(buffer.get().encode("utf-8")) <= 100
+        assert buffer.get().endswith("✅✅✅✅✅\n")
+
+    def test_terminal_buffer_assigns_increasing_sequence_numbers(self):
+        """Test that each append gets a higher sequence number."""
+        buffer = WebTerminalBuffer()
+
+        seqs = [buffer.append(f"line {i}\n") for i in range(5)]
+
+        assert seqs == [1, 2, 3, 4, 5]
+        assert buffer.last_seq == 5
+
+    def test_terminal_buffer_get_since_returns_only_new_output(self):
+        """Test incremental fetch returns only chunks after the given seq."""
+        buffer = WebTerminalBuffer()
+        buffer.append("first\n")
+        seq = buffer.append("second\n")
+        buffer.append("third\n")
+
+        delta = buffer.get_since(seq)
+        assert delta.output == "third\n"
+        assert delta.seq == 3
+        assert delta.reset is False
+
+        idle = buffer.get_since(delta.seq)
+        assert idle.output == ""
+        assert idle.reset is False
+
+    def test_terminal_buffer_get_since_flags_evicted_output(self):
+        """Test that a cursor older than the retained window triggers a reset."""
+        buffer = WebTerminalBuffer(max_bytes=10)
+        for i in range(10):
+            buffer.append(f"{i}{i}{i}{i}\n")
+
+        delta = buffer.get_since(1)
+        assert delta.reset is True
+        assert delta.output == buffer.get()
+        assert delta.first_seq > 2
+
+    def test_terminal_buffer_clear_keeps_sequence_monotonic(self):
+        """Test that clearing bumps the epoch without reusing sequence numbers."""
+        buffer = WebTerminalBuffer()
+        buffer.append("old output\n")
+        epoch = buffer.epoch
+
+        buffer.clear()
+        seq = buffer.append("new output\n")
+
+        assert seq == 2
+        assert buffer.epoch == epoch + 1
+        assert buffer.get() == "new output\n"
+
+    def test_terminal_output_api_supports_since_parameter(self):
+        """Test that the output API returns incremental output with ?since."""
+        buffer = WebTerminalBuffer()
+        first_seq = buffer.append("line 1\n")
+        buffer.append("line 2\n")
+
+        with patch("models.web_terminal_buffer.web_terminal_buffer", buffer):
+            with self.web_integration.app.test_client() as client:
+                data = json.loads(
+                    client.get(f"/api/terminal/output?since={first_seq}").data
+                )
+                assert data["success"] is True
+                assert data["output"] == "line 2\n"
+                assert data["seq"] == 2
+                assert data["reset"] is False
+
+                idle = json.loads(
+                    client.get(f"/api/terminal/output?since={data['seq']}").data
+                )
+                assert idle["output"] == ""
+                assert idle["seq"] == 2
+
     def test_terminal_streaming_integration_with_actions(self):
         """Test that terminal streaming works with action execution."""
         # Mock the web terminal buffer to track appends
@@ -916,3 +1092,278 @@ class TestWebIntegrationOverallBehavior:
 
         # This comprehensive test verifies the entire synchronization workflow
         # between web and desktop interfaces works as expected
+
+
+class TestWebEventStream:
+    """Test the server-sent event hub and /api/events endpoint."""
+
+    def setup_method(self):
+        """Set up test fixtures for each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.mock_control_panel = Mock()
+        self.mock_project_group_service = Mock()
+        self.mock_project_group_service.get_current_group_name.return_value = "project1"
+        self.mock_control_panel.project_group_service = self.mock_project_group_service
+        self.mock_control_panel.root_dir = Path(self.temp_dir)
+
+        self.web_integration = WebIntegration(self.mock_control_panel)
+        self.web_integration.setup_flask_app()
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_event_serializes_to_sse_wire_format(self):
+        """Test that events are serialized as text/event-stream frames."""
+        from models.web_event_hub import WebEvent
+
+        frame = WebEvent("terminal", {"seq": 3, "output": "hi\n"}, 3).to_sse()
+
+        assert frame.startswith("id: 3\nevent: terminal\ndata: ")
+        assert frame.endswith("\n\n")
+        payload = json.loads(frame.split("data: ", 1)[1])
+        assert payload == {"seq": 3, "output": "hi\n"}
+
+    def test_hub_delivers_events_to_every_client(self):
+        """Test that a published event reaches all subscribed clients."""
+        from models.web_event_hub import WebEventHub
+
+        hub = WebEventHub()
+        first = hub.subscribe()
+        second = hub.subscribe()
+
+        hub.publish("selection", {"group_name": "project2"})
+
+        for client in (first, second):
+            event = client.next_event(timeout=0.1)
+            assert event.type == "selection"
+            assert event.data == {"group_name": "project2"}
+
+    def test_hub_drops_slow_clients(self):
+        """Test that a client whose queue fills up is disconnected."""
+        from models.web_event_hub import WebEventHub
+
+        hub = WebEventHub(max_queue_size=3)
+        slow = hub.subscribe()
+        fast = hub.subscribe()
+
+        for i in range(3):
+            hub.publish("status", {"message": str(i)})
+            fast.next_event(timeout=0.1)
+
+        hub.publish("status", {"message": "overflow"})
+
+        assert slow.dropped is True
+        assert hub.client_count == 1
+        assert slow.is_close(slow.next_event(timeout=0.1))
+        assert fast.next_event(timeout=0.1).data == {"message": "overflow"}
+
+    def test_hub_rejects_clients_over_limit(self):
+        """Test that subscribing beyond the client cap fails."""
+        from models.web_event_hub import WebEventHub
+
+        hub = WebEventHub(max_clients=1)
+
+        assert hub.subscribe() is not None
+        assert hub.subscribe() is None
+
+    def test_terminal_buffer_appends_are_pushed(self):
+        """Test that terminal buffer chunks are forwarded to the hub."""
+        from models.web_event_hub import WebEventHub
+
+        hub = WebEventHub()
+        buffer = WebTerminalBuffer()
+        client = hub.subscribe()
+
+        with patch("models.web_event_hub.web_event_hub", hub):
+            from services.web_integration_service import _publish_terminal_chunk
+
+            buffer.add_listener(_publish_terminal_chunk)
+            seq = buffer.append("pushed output\n")
+
+        event = client.next_event(timeout=0.1)
+        assert event.type == "terminal"
+        assert event.id == seq
+        assert event.data["output"] == "pushed output\n"
+
+    def test_events_endpoint_streams_backlog_and_published_events(self):
+        """Test that /api/events replays output after since and then streams."""
+        from models.web_event_hub import WebEventHub
+
+        hub = WebEventHub()
+        buffer = WebTerminalBuffer()
+        first_seq = buffer.append("seen\n")
+        buffer.append("missed\n")
+
+        with patch("models.web_event_hub.web_event_hub", hub), patch(
+            "models.web_terminal_buffer.web_terminal_buffer", buffer
+        ):
+            with self.web_integration.app.test_client() as client:
+                response = client.get(f"/api/events?since={first_seq}", buffered=False)
+                assert response.status_code == 200
+                assert response.mimetype == "text/event-stream"
+
+                frames = (frame.decode() for frame in response.response)
+                assert next(frames).startswith("retry:")
+
+                ready = next(frames)
+                assert "event: ready" in ready
+                assert '"current_selection": "project1"' in ready
+
+                backlog = next(frames)
+                assert "event: terminal" in backlog
+                assert "missed" in backlog and "seen" not in backlog
+
+                hub.publish("selection", {"group_name": "project2"})
+                pushed = next(frames)
+                assert "event: selection" in pushed
+                assert "project2" in pushed
+
+                response.close()
+
+        assert hub.client_count == 0
+
+
+class TestOutputChannels:
+    """Test per-operation output channels and their web endpoints."""
+
+    def setup_method(self):
+        """Set up test fixtures for each test method."""
+        from models.output_channels import OutputChannelRegistry
+
+        self.temp_dir = tempfile.mkdtemp()
+        self.mock_control_panel = Mock()
+        self.mock_control_panel.project_group_service = Mock()
+        self.mock_control_panel.root_dir = Path(self.temp_dir)
+
+        self.web_integration = WebIntegration(self.mock_control_panel)
+        self.web_integration.setup_flask_app()
+        self.registry = OutputChannelRegistry(
+            channel_max_bytes=1000, total_max_bytes=2500
+        )
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_concurrent_operations_do_not_interleave(self):
+        """Test that each channel only holds its own operation's output."""
+        docker = self.registry.open("Docker Build & Test")
+        validation = self.registry.open("Validation")
+
+        docker.append("building\n")
+        validation.append("validating\n")
+        docker.append("testing\n")
+
+        assert docker.id != validation.id
+        assert docker.buffer.get() == "building\ntesting\n"
+        assert validation.buffer.get() == "validating\n"
+        assert [c.id for c in self.registry.list()] == [validation.id, docker.id]
+
+    def test_finished_channels_evicted_lru_under_memory_cap(self):
+        """Test that least recently used finished channels are evicted first."""
+        first = self.registry.open("first")
+        second = self.registry.open("second")
+        first.append("a" * 1000)
+        second.append("b" * 1000)
+        first.finish()
+        second.finish()
+
+        # Touch the older channel so the newer one becomes least recently used
+        self.registry.get(first.id)
+
+        third = self.registry.open("third")
+        third.append("c" * 1000)
+
+        assert self.registry.get(second.id) is None
+        assert self.registry.get(first.id) is first
+        assert self.registry.total_bytes <= self.registry.total_max_bytes
+        assert self.registry.evicted_channels == 1
+
+    def test_running_channels_are_never_evicted(self):
+        """Test that the memory cap only evicts finished channels."""
+        channels = [self.registry.open(f"op {i}") for i in range(4)]
+        for channel in channels:
+            channel.append("x" * 1000)
+
+        assert all(self.registry.get(c.id) is c for c in channels)
+
+        channels[1].finish("failed")
+
+        assert self.registry.get(channels[1].id) is None
+        assert len(self.registry.list()) == 3
+
+    @pytest.mark.asyncio
+    async def test_async_command_run_gets_its_own_channel(self):
+        """Test that running a command opens and finishes an output channel."""
+        from utils.async_base import AsyncCommand, AsyncResult
+
+        class EchoCommand(AsyncCommand):
+            async def execute(self):
+                self.output_channel.append("hello\n")
+                return AsyncResult.partial_result({}, None)
+
+        command = EchoCommand()
+        with patch("models.output_channels.output_channels", self.registry):
+            await command.run_with_progress()
+
+        channel = self.registry.get(command.output_channel.id)
+        assert channel.title == "EchoCommand"
+        assert channel.state == "partial"
+        assert channel.finished_at is not None
+        assert channel.buffer.get() == "hello\n"
+
+    def test_channel_endpoints_list_and_fetch_output(self):
+        """Test listing channels and fetching one channel's output since a seq."""
+        channel = self.registry.open("Validation - project1")
+        first_seq = channel.append("one\n")
+        channel.append("two\n")
+
+        with patch("models.output_channels.output_channels", self.registry):
+            with self.web_integration.app.test_client() as client:
+                listing = json.loads(client.get("/api/channels").data)
+                output = json.loads(
+                    client.get(
+                        f"/api/channels/{channel.id}/output?since={first_seq}"
+                    ).data
+                )
+                missing = client.get("/api/channels/op-999/output")
+
+        assert listing["success"] is True
+        assert listing["channels"][0]["title"] == "Validation - project1"
+        assert output["output"] == "two\n"
+        assert output["seq"] == first_seq + 1
+        assert output["channel"]["state"] == "running"
+        assert missing.status_code == 404
+
+    def test_channel_event_stream_only_carries_that_channel(self):
+        """Test that a channel stream is keyed by the channel's own seq."""
+        from models.web_event_hub import WebEventHub
+
+        hub = WebEventHub()
+        other = self.registry.open("other")
+        channel = self.registry.open("watched")
+        channel.append("backlog\n")
+
+        with patch("models.web_event_hub.web_event_hub", hub), patch(
+            "models.output_channels.output_channels", self.registry
+        ):
+            with self.web_integration.app.test_client() as client:
+                response = client.get(
+                    f"/api/channels/{channel.id}/events", buffered=False
+                )
+                frames = (frame.decode() for frame in response.response)
+
+                assert next(frames).startswith("retry:")
+                assert "event: ready" in next(frames)
+                assert "backlog" in next(frames)
+
+                other.append("not for this stream\n")
+                seq = channel.append("live\n")
+                pushed = next(frames)
+
+                assert f"id: {seq}\nevent: output" in pushed
+                assert "live" in pushed
+                response.close()
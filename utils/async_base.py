@@ -237,19 +237,49 @@ class AsyncCommand(ABC):
         self.progress_callback = progress_callback
         self.completion_callback = completion_callback
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.output_channel = None
 
     @abstractmethod
     async def execute(self) -> AsyncResult:
         """Execute the command and return result"""
         pass
 
+    def channel_title(self) -> str:
+        """Title of this run's output channel"""
+        return self.__class__.__name__
+
+    def _open_output_channel(self):
+        """Give this run its own output channel for the web interface"""
+        try:
+            from models.output_channels import output_channels
+
+            self.output_channel = output_channels.open(
+                self.channel_title(), {"command": self.__class__.__name__}
+            )
+        except Exception as e:
+            self.logger.debug(f"Could not open output channel: {e}")
+            self.output_channel = None
+
+    def _finish_output_channel(self, result: AsyncResult):
+        if not self.output_channel:
+            return
+        if result.is_success:
+            state = "completed"
+        elif result.is_partial:
+            state = "partial"
+        else:
+            state = "failed"
+        self.output_channel.finish(state)
+
     async def run_with_progress(self) -> AsyncResult:
         """Template method with standard progress handling"""
+        self._open_output_channel()
         try:
             if self.progress_callback:
                 self.progress_callback("Starting operation...", "info")
 
             result = await self.execute()
+            self._finish_output_channel(result)
 
             if self.completion_callback:
                 self.completion_callback(result)
@@ -260,12 +290,19 @@ class AsyncCommand(ABC):
             error_result = AsyncResult.error_result(
                 ProcessError(f"Command failed: {e}", error_code="COMMAND_ERROR")
             )
+            self._finish_output_channel(error_result)
             if self.completion_callback:
                 self.completion_callback(error_result)
             return error_result
+        finally:
+            # Cancelled: the registry never evicts a channel left running
+            if self.output_channel and self.output_channel.is_running:
+                self.output_channel.finish("cancelled")
 
     def _update_progress(self, message: str, level: str = "info"):
         """Helper method to update progress"""
+        if self.output_channel:
+            self.output_channel.set_status(message)
         if self.progress_callback:
             self.progress_callback(message, level)
 
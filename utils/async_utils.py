@@ -4,12 +4,13 @@ Async utilities for the Project Control Panel - Improved Version
 
 import asyncio
 import contextlib
+import io
 import subprocess
 import threading
 import time
 import weakref
 import logging
-from typing import Callable, Any, Optional, Tuple, Set
+from typing import AsyncIterator, BinaryIO, Callable, Any, List, Optional, Tuple, Set
 from concurrent.futures import ThreadPoolExecutor
 import functools
 
@@ -53,6 +54,24 @@ async def run_subprocess_async(
     return await run_in_executor(run_subprocess)
 
 
+def _feed_stdin(process: subprocess.Popen, input_writer: Callable[[BinaryIO], None]):
+    """Run input_writer on a buffered binary view of the process's stdin"""
+    # process.stdin is unbuffered text; raw pipe writes may be partial
+    stdin = io.BufferedWriter(process.stdin.buffer)
+    try:
+        input_writer(stdin)
+        stdin.flush()
+    except (BrokenPipeError, ConnectionResetError):
+        logger.debug("Process exited before reading all of its input")
+    except Exception:
+        logger.exception("Error writing subprocess input")
+    finally:
+        try:
+            stdin.close()
+        except OSError:
+            pass
+
+
 async def run_subprocess_streaming_async(
     cmd,
     shell: bool = False,
@@ -62,10 +81,13 @@ async def run_subprocess_streaming_async(
     cwd: Optional[str] = None,
     output_callback: Optional[Callable[[str], None]] = None,
     timeout: Optional[float] = None,
+    input_writer: Optional[Callable[[BinaryIO], None]] = None,
     **kwargs,
 ) -> Tuple[int, str]:
     """
-    Run subprocess with streaming output asynchronously using thread pool
+    Run subprocess with streaming output asynchronously using thread pool.
+    input_writer, if given, is called on its own thread with the process's
+    stdin (binary), which is closed when it returns.
     Returns (return_code, full_output)
     """
 
@@ -101,6 +123,7 @@ async def run_subprocess_streaming_async(
                     bufsize=0,  # Unbuffered for real-time streaming
                     universal_newlines=True,
                     env=env,  # Pass modified environment
+                    stdin=subprocess.PIPE if input_writer else None,
                 )
             else:
                 process = subprocess.Popen(
@@ -114,7 +137,18 @@ async def run_subprocess_streaming_async(
                     bufsize=0,  # Unbuffered for real-time streaming
                     universal_newlines=True,
                     env=env,  # Pass modified environment
+                    stdin=subprocess.PIPE if input_writer else None,
+                )
+
+            feeder = None
+            if input_writer:
+                feeder = threading.Thread(
+                    target=_feed_stdin,
+                    args=(process, input_writer),
+                    name="subprocess-stdin",
+                    daemon=True,
                 )
+                feeder.start()
 
             full_output = ""
             buffer = ""  # Buffer to batch small chunks
@@ -189,6 +223,8 @@ async def run_subprocess_streaming_async(
 
             # Wait for process to complete
             return_code = process.wait()
+            if feeder is not None:
+                feeder.join()  # Writes fail fast once the process is gone
             return return_code, full_output
 
         except Exception as e:
@@ -219,6 +255,97 @@ async def run_in_executor(func: Callable, *args, **kwargs) -> Any:
         raise RuntimeError("No async event loop available") from e
 
 
+async def stream_subprocess_lines_async(
+    cmd: list,
+    cwd: str = None,
+    batch_lines: int = 200,
+    input: str = None,
+) -> AsyncIterator[List[str]]:
+    """
+    Run a subprocess and yield its stdout in batches of up to batch_lines
+    lines as they are produced, so callers can start work before the process
+    exits.
+
+    Raises:
+        subprocess.CalledProcessError: If the process exits non-zero
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    process = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+
+    stderr_chunks: List[str] = []
+
+    def read_stderr():
+        # Drained alongside stdout: a child blocked on a full stderr pipe
+        # would never close its stdout
+        with contextlib.suppress(OSError, ValueError):
+            stderr_chunks.append(process.stderr.read())
+
+    def write_stdin():
+        with contextlib.suppress(OSError, ValueError):
+            process.stdin.write(input)
+            process.stdin.close()
+
+    def read_stdout():
+        try:
+            batch = []
+            for line in process.stdout:
+                batch.append(line.rstrip("\n"))
+                if len(batch) >= batch_lines:
+                    loop.call_soon_threadsafe(queue.put_nowait, batch)
+                    batch = []
+            if batch:
+                loop.call_soon_threadsafe(queue.put_nowait, batch)
+        except (OSError, ValueError):
+            # Pipe closed because the consumer stopped early
+            pass
+        finally:
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    helpers = [threading.Thread(target=read_stderr, daemon=True)]
+    if input is not None:
+        helpers.append(threading.Thread(target=write_stdin, daemon=True))
+    for helper in helpers:
+        helper.start()
+    reader = threading.Thread(target=read_stdout, daemon=True)
+    reader.start()
+
+    finished = False
+    try:
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                break
+            yield batch
+
+        return_code = await run_in_executor(process.wait)
+        for helper in helpers:
+            await run_in_executor(helper.join)
+        stderr = "".join(stderr_chunks)
+        finished = True
+        if return_code != 0:
+            raise subprocess.CalledProcessError(
+                return_code, cmd, output=None, stderr=stderr
+            )
+    finally:
+        if not finished and process.poll() is None:
+            process.kill()
+        for stream in (process.stdout, process.stderr):
+            with contextlib.suppress(OSError):
+                stream.close()
+
+
 class TkinterAsyncBridge:
     """
     Bridge for coordinating between async operations and tkinter GUI
@@ -294,6 +421,25 @@ class ImprovedAsyncTaskManager:
         self._thread: Optional[threading.Thread] = None
         self._shutdown_requested = False
         self._loop_ready = threading.Event()  # Synchronization for loop startup
+        self._task_counter = 0
+
+    def _publish_operation_event(
+        self, task_id: int, task_name: str, state: str, **data
+    ):
+        """Publish an operation lifecycle event to web event stream clients"""
+        with contextlib.suppress(Exception):
+            from models.web_event_hub import web_event_hub
+
+            web_event_hub.publish(
+                "operation",
+                {
+                    "id": task_id,
+                    "name": task_name or "unnamed",
+                    "state": state,
+                    "timestamp": time.time(),
+                    **data,
+                },
+            )
 
     def setup_event_loop(self):
         """Setup event loop in background thread with improved error handling"""
@@ -413,12 +559,30 @@ class ImprovedAsyncTaskManager:
             future = asyncio.run_coroutine_threadsafe(wrapped_coro(), self._loop)
             self._tasks.add(future)
 
+            self._task_counter += 1
+            task_id = self._task_counter
+            started_at = time.time()
+            self._publish_operation_event(task_id, task_name, "started")
+
             # Set up cleanup and callback
             def cleanup_and_callback(completed_future):
                 """Handle task completion with proper cleanup"""
                 # Remove from tracking set
                 self._tasks.discard(completed_future)
 
+                if completed_future.cancelled():
+                    state = "cancelled"
+                elif completed_future.exception() is not None:
+                    state = "failed"
+                else:
+                    state = "completed"
+                self._publish_operation_event(
+                    task_id,
+                    task_name,
+                    state,
+                    duration=round(time.time() - started_at, 3),
+                )
+
                 # Call user callback if provided
                 if callback:
                     try:
@@ -0,0 +1,460 @@
+"""
+Docker Engine API client over the Unix socket
+
+Talks HTTP/1.1 to the daemon's socket (DOCKER_HOST=unix://..., default
+/var/run/docker.sock) instead of starting the `docker` CLI for every call.
+Connections are kept alive and reused, a few at a time, so a burst of
+inspects costs one connect. Covers what this project needs: version/info,
+image listing, inspect and removal, and running a container (create, start,
+follow its logs, wait, remove).
+
+Standard library only, so validation-tool/validator.py can load this file
+without the rest of the package.
+"""
+
+import codecs
+import http.client
+import json
+import os
+import socket
+import stat
+import struct
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+DEFAULT_SOCKET = "/var/run/docker.sock"
+API_VERSION = "1.41"  # Docker 20.10+
+
+# Stream ids of multiplexed container output (containers without a TTY)
+STDIN, STDOUT, STDERR = 0, 1, 2
+
+# Timeout that blocks for as long as it takes (None means the client's own)
+NO_TIMEOUT: Any = object()
+
+# Raised on a reused keep-alive connection the daemon already closed
+_STALE_CONNECTION = (
+    http.client.RemoteDisconnected,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+class DockerEngineError(Exception):
+    """Error response from the Docker daemon"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Docker Engine API error {status}: {message}")
+        self.status = status
+        self.message = message
+
+
+# What an unreachable or failing daemon raises; callers fall back to the CLI
+ENGINE_ERRORS = (OSError, http.client.HTTPException, DockerEngineError)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: Optional[float]):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+def socket_path_from_env(environ: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """Daemon socket from DOCKER_HOST; None when that names a TCP/SSH host"""
+    environ = os.environ if environ is None else environ
+    host = environ.get("DOCKER_HOST", "")
+    if not host:
+        return DEFAULT_SOCKET
+    if host.startswith("unix://"):
+        return host[len("unix://") :]
+    return None
+
+
+def is_socket(path: str) -> bool:
+    try:
+        return stat.S_ISSOCK(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+def _error_message(data: bytes) -> str:
+    try:
+        return json.loads(data).get("message", "") or data.decode("utf-8", "replace")
+    except (ValueError, AttributeError):
+        return data.decode("utf-8", "replace").strip()
+
+
+class DockerEngineClient:
+    """Blocking Engine API client; safe to share between threads"""
+
+    def __init__(
+        self,
+        socket_path: str = DEFAULT_SOCKET,
+        timeout: float = 60.0,
+        api_version: str = API_VERSION,
+        max_idle: int = 4,
+    ):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.api_version = api_version
+        self.max_idle = max_idle
+        self.connections_opened = 0
+        self._idle: List[_UnixHTTPConnection] = []
+        self._lock = threading.Lock()
+
+    # Connections
+
+    def _checkout(self) -> Tuple[_UnixHTTPConnection, bool]:
+        """An idle keep-alive connection, or a new one; (connection, reused)"""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+            self.connections_opened += 1
+        return _UnixHTTPConnection(self.socket_path, self.timeout), False
+
+    def _checkin(self, connection: _UnixHTTPConnection):
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def _release(self, connection, response: http.client.HTTPResponse):
+        if response.will_close:
+            connection.close()
+        else:
+            self._checkin(connection)
+
+    def close(self):
+        """Close the idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Any = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[_UnixHTTPConnection, http.client.HTTPResponse]:
+        url = f"/v{self.api_version}{path}"
+        if params:
+            url += "?" + urlencode(params)
+        headers = {}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        if timeout is None:
+            timeout = self.timeout
+        elif timeout is NO_TIMEOUT:
+            timeout = None
+
+        while True:
+            connection, reused = self._checkout()
+            connection.timeout = timeout
+            if connection.sock is not None:
+                connection.sock.settimeout(timeout)
+            try:
+                connection.request(method, url, body=payload, headers=headers)
+                return connection, connection.getresponse()
+            except _STALE_CONNECTION:
+                connection.close()
+                if not reused:
+                    raise
+                # The daemon closed the idle connection; retry on a new one
+            except BaseException:
+                connection.close()
+                raise
+
+    def _call(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Any = None,
+        timeout: Optional[float] = None,
+        allow_404: bool = False,
+    ) -> Any:
+        """Send a request and return its decoded JSON (or text) body"""
+        connection, response = self._send(method, path, params, body, timeout)
+        try:
+            data = response.read()
+        except BaseException:
+            connection.close()
+            raise
+        self._release(connection, response)
+
+        if response.status == 404 and allow_404:
+            return None
+        if response.status >= 400:
+            raise DockerEngineError(response.status, _error_message(data))
+        if response.getheader("Content-Type", "").startswith("application/json"):
+            return json.loads(data) if data else None
+        return data.decode("utf-8", "replace")
+
+    # System
+
+    def ping(self) -> bool:
+        try:
+            return self._call("GET", "/_ping", timeout=5.0) == "OK"
+        except ENGINE_ERRORS:
+            return False
+
+    def version(self) -> Dict[str, Any]:
+        return self._call("GET", "/version")
+
+    def info(self) -> Dict[str, Any]:
+        return self._call("GET", "/info")
+
+    # Images
+
+    def images(self, reference: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Local images, optionally only those matching reference (name[:tag])"""
+        params = {}
+        if reference:
+            params["filters"] = json.dumps({"reference": [reference]})
+        return self._call("GET", "/images/json", params)
+
+    def inspect_image(self, name: str) -> Optional[Dict[str, Any]]:
+        return self._call("GET", f"/images/{quote(name, safe='')}/json", allow_404=True)
+
+    def image_id(self, name: str) -> Optional[str]:
+        image = self.inspect_image(name)
+        return image.get("Id") if image else None
+
+    def pull_image(
+        self,
+        repository: str,
+        tag: str,
+        timeout: Optional[float] = None,
+        platform: Optional[str] = None,
+    ):
+        """
+        `docker pull [--platform platform] repository:tag` (tag may be a
+        sha256: digest); returns once the image is stored. Errors arrive in
+        the progress stream.
+        """
+        params = {"fromImage": repository, "tag": tag}
+        if platform:
+            params["platform"] = platform
+        connection, response = self._send(
+            "POST", "/images/create", params, timeout=timeout
+        )
+        try:
+            data = response.read()
+        except BaseException:
+            connection.close()
+            raise
+        self._release(connection, response)
+
+        if response.status >= 400:
+            raise DockerEngineError(response.status, _error_message(data))
+        for line in data.splitlines():
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(message, dict) and message.get("error"):
+                raise DockerEngineError(response.status, message["error"])
+
+    def remove_image(self, name: str, force: bool = False) -> List[Dict[str, str]]:
+        params = {"force": "1"} if force else None
+        return self._call("DELETE", f"/images/{quote(name, safe='')}", params)
+
+    # Containers
+
+    def create_container(
+        self,
+        image: str,
+        command: Optional[List[str]] = None,
+        env: Optional[Dict[str, str]] = None,
+        name: Optional[str] = None,
+        platform: Optional[str] = None,
+        labels: Optional[Dict[str, str]] = None,
+        host_config: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Create a container without a TTY; returns its id"""
+        body: Dict[str, Any] = {
+            "Image": image,
+            "Tty": False,
+            "AttachStdout": True,
+            "AttachStderr": True,
+        }
+        if command is not None:
+            body["Cmd"] = command
+        if env:
+            body["Env"] = [f"{key}={value}" for key, value in env.items()]
+        if labels:
+            body["Labels"] = labels
+        if host_config:
+            body["HostConfig"] = host_config
+        params = {}
+        if name:
+            params["name"] = name
+        if platform:
+            params["platform"] = platform
+        return self._call("POST", "/containers/create", params, body)["Id"]
+
+    def start_container(self, container_id: str):
+        self._call("POST", f"/containers/{container_id}/start")
+
+    def wait_container(self, container_id: str, timeout: Optional[float] = None) -> int:
+        """Block until the container exits; returns its exit code"""
+        result = self._call("POST", f"/containers/{container_id}/wait", timeout=timeout)
+        return int(result.get("StatusCode", -1))
+
+    def remove_container(self, container_id: str, force: bool = True):
+        params = {"force": "1"} if force else None
+        self._call("DELETE", f"/containers/{container_id}", params, allow_404=True)
+
+    def stats(self, container_id: str) -> Dict[str, Any]:
+        """One reading of a container's resource usage, with the previous CPU one"""
+        return self._call("GET", f"/containers/{container_id}/stats", {"stream": "0"})
+
+    def logs(
+        self,
+        container_id: str,
+        follow: bool = True,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+    ) -> Iterator[Tuple[int, bytes]]:
+        """
+        (stream, data) frames of a container's output (STDOUT or STDERR), as
+        they are produced when following; TimeoutError once time.monotonic()
+        passes deadline, also while the container is silent
+        """
+        params = {"stdout": "1", "stderr": "1", "follow": "1" if follow else "0"}
+        connection, response = self._send(
+            "GET", f"/containers/{container_id}/logs", params, timeout=timeout
+        )
+        finished = False
+        try:
+            if response.status >= 400:
+                raise DockerEngineError(
+                    response.status, _error_message(response.read())
+                )
+            while True:
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"Container {container_id} timed out")
+                    if connection.timeout is not None:
+                        remaining = min(remaining, connection.timeout)
+                    connection.sock.settimeout(remaining)
+                try:
+                    header = response.read(8)
+                except socket.timeout:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        raise TimeoutError(f"Container {container_id} timed out")
+                    raise
+                if len(header) < 8:
+                    break
+                stream, size = header[0], struct.unpack(">I", header[4:])[0]
+                data = response.read(size)
+                if data:
+                    yield stream, data
+            finished = True
+        finally:
+            if finished:
+                self._release(connection, response)
+            else:
+                connection.close()
+
+    def run(
+        self,
+        image: str,
+        command: Optional[List[str]] = None,
+        env: Optional[Dict[str, str]] = None,
+        platform: Optional[str] = None,
+        output_callback: Optional[Callable[[str], None]] = None,
+        timeout: Optional[float] = NO_TIMEOUT,
+        name: Optional[str] = None,
+        host_config: Optional[Dict[str, Any]] = None,
+        deadline: Optional[float] = None,
+    ) -> Tuple[int, str, str]:
+        """
+        `docker run --rm`: create, start, stream the output to
+        output_callback as it arrives, wait and remove.
+        timeout is the longest silence while following the output; by
+        default there is none, as tests may go quiet for minutes. deadline
+        caps the whole run in seconds, as `subprocess.run(timeout=...)` does
+        for the CLI: past it the container is removed and TimeoutError raised.
+        Returns (exit code, stdout, stderr).
+        """
+        ends = None if deadline is None else time.monotonic() + deadline
+        container_id = self.create_container(
+            image, command, env, name=name, platform=platform, host_config=host_config
+        )
+        output = {STDOUT: [], STDERR: []}
+        decoders = {
+            stream: codecs.getincrementaldecoder("utf-8")("replace")
+            for stream in output
+        }
+        try:
+            self.start_container(container_id)
+            for stream, data in self.logs(
+                container_id, follow=True, timeout=timeout, deadline=ends
+            ):
+                stream = STDERR if stream == STDERR else STDOUT
+                text = decoders[stream].decode(data)
+                output[stream].append(text)
+                if output_callback and text:
+                    output_callback(text)
+            exit_code = self.wait_container(container_id, timeout=timeout)
+        finally:
+            try:
+                self.remove_container(container_id)
+            except ENGINE_ERRORS:
+                pass
+        for stream, decoder in decoders.items():
+            output[stream].append(decoder.decode(b"", final=True))
+        return exit_code, "".join(output[STDOUT]), "".join(output[STDERR])
+
+
+_clients: Dict[str, DockerEngineClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_engine_client(
+    socket_path: Optional[str] = None,
+) -> Optional[DockerEngineClient]:
+    """
+    Shared client for the daemon socket (DOCKER_HOST or the default), or
+    None when there is no such socket and the docker CLI has to be used
+    """
+    path = socket_path or socket_path_from_env()
+    if not path or not is_socket(path):
+        return None
+    with _clients_lock:
+        client = _clients.get(path)
+        if client is None:
+            client = _clients[path] = DockerEngineClient(path)
+        return client
+
+
+def configured_engine_client() -> Optional[DockerEngineClient]:
+    """
+    The shared client when service.docker_engine_api is on and the daemon
+    socket exists, else None and the docker CLI is used
+    """
+    # Imported here so the validator can load this file on its own
+    from config.config import get_config
+
+    if not get_config().service.docker_engine_api:
+        return None
+    return get_engine_client()
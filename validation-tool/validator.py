@@ -7,15 +7,38 @@ import tempfile
 import shutil
 import time
 import hashlib
+import importlib.util
 from pathlib import Path
 from typing import Dict, Tuple
 from datetime import datetime
 
+TEST_ENV = {"LANG": "C.UTF-8", "LC_ALL": "C.UTF-8", "TZ": "UTC"}
+TEST_TIMEOUT = 1200  # Seconds for a whole test run
+
+
+def load_engine_client():
+    """Docker Engine API client (utils/docker_engine.py of the Docker Tools
+    checkout this validator is part of) when the daemon socket answers;
+    None means the docker CLI is used, e.g. with DOCKER_HOST=tcp://"""
+    module_path = Path(__file__).resolve().parent.parent / "utils" / "docker_engine.py"
+    if not module_path.exists():
+        return None
+    try:
+        spec = importlib.util.spec_from_file_location("docker_engine", module_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        client = module.get_engine_client()
+    except Exception:
+        return None
+    return client if client is not None and client.ping() else None
+
+
 class SimpleValidator:
     def __init__(self, cleanup: bool = True):
         self.cleanup = cleanup
         self.work_dir = Path(tempfile.mkdtemp(prefix="validation_"))
         self.results = []
+        self.engine = load_engine_client()
         print(f"Working directory: {self.work_dir}")
         
     def __enter__(self):
@@ -199,6 +222,11 @@ class SimpleValidator:
     
     def _verify_docker_image_exists(self, image_name: str) -> bool:
         """Verify that a Docker image exists in the local registry"""
+        if self.engine is not None:
+            try:
+                return bool(self.engine.images(image_name))
+            except Exception as e:
+                print(f"Warning: Docker Engine API failed, using the docker CLI: {e}")
         try:
             result = subprocess.run(
                 ["docker", "images", "-q", image_name],
@@ -226,31 +254,40 @@ class SimpleValidator:
         try:
             print(f"Running tests for: {image_name}")
             
-            result = subprocess.run([
-                "docker", "run", 
-                "--rm",
-                "--platform", "linux/amd64",
-                "--env", "LANG=C.UTF-8",
-                "--env", "LC_ALL=C.UTF-8",
-                "--env", "TZ=UTC",
-                image_name, 
-                "./run_tests.sh"
-            ],
-                capture_output=True,
-                text=True,
-                timeout=1200
-            )
+            if self.engine is not None:
+                returncode, stdout, stderr = self.engine.run(
+                    image_name,
+                    ["./run_tests.sh"],
+                    env=TEST_ENV,
+                    platform="linux/amd64",
+                    deadline=TEST_TIMEOUT
+                )
+            else:
+                env_args = [arg for key, value in TEST_ENV.items() for arg in ("--env", f"{key}={value}")]
+                result = subprocess.run([
+                    "docker", "run", 
+                    "--rm",
+                    "--platform", "linux/amd64",
+                    *env_args,
+                    image_name, 
+                    "./run_tests.sh"
+                ],
+                    capture_output=True,
+                    text=True,
+                    timeout=TEST_TIMEOUT
+                )
+                returncode, stdout, stderr = result.returncode, result.stdout, result.stderr
             
             execution_time = time.time() - start_time
             
-            if result.returncode == 0:
+            if returncode == 0:
                 print(f"✓ Tests passed ({execution_time:.1f}s)")
-                return True, result.stdout, result.stderr, execution_time
+                return True, stdout, stderr, execution_time
             else:
                 print(f"✗ Tests failed ({execution_time:.1f}s)")
-                return False, result.stdout, result.stderr, execution_time
+                return False, stdout, stderr, execution_time
                 
-        except subprocess.TimeoutExpired:
+        except (subprocess.TimeoutExpired, TimeoutError):
             execution_time = time.time() - start_time
             return False, "", "Test execution timed out", execution_time
         except Exception as e:
@@ -260,11 +297,14 @@ class SimpleValidator:
     def cleanup_docker_image(self, image_name: str):
         """Remove Docker image"""
         try:
-            subprocess.run(
-                ["docker", "rmi", image_name],
-                capture_output=True,
-                check=False
-            )
+            if self.engine is not None:
+                self.engine.remove_image(image_name)
+            else:
+                subprocess.run(
+                    ["docker", "rmi", image_name],
+                    capture_output=True,
+                    check=False
+                )
             print(f"Cleaned up Docker image: {image_name}")
         except Exception as e:
             print(f"Warning: Could not remove image {image_name}: {e}")